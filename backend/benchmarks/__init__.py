@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for the conversation pipeline.
+
+Run from the backend directory, e.g. `python -m benchmarks.pipeline_benchmark`.
+"""
@@ -0,0 +1,207 @@
+"""
+Fast-path outcome classifier report.
+
+Runs FastPathClassifier over saved transcripts and compares it with the
+Claude evaluation (DisputeEvaluator.evaluate_transcript) of the same calls:
+
+- hit rate: share of calls the fast path decides without Claude
+- agreement with Claude on those hits, and on every pattern match
+- per-pattern matches, agreement and recalibrated confidence
+- the disagreements, for reviewing the lexicon
+
+Claude labels are cached in a JSON file, so repeated runs only evaluate new
+transcripts; --offline labels with the Anthropic stand-in instead (no cache).
+--save-calibration writes the recalibrated confidences for
+OUTCOME_CALIBRATION_PATH.
+
+    python -m benchmarks.fast_path_report --transcripts transcripts
+    python -m benchmarks.fast_path_report --save-calibration outcome_calibration.json
+"""
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from stripe_integration.outcome_classifier import FastPathClassifier
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_LABELS = RESULTS_DIR / "fast_path_labels.json"
+
+
+def load_transcripts(directory: Path) -> dict[str, list[dict[str, Any]]]:
+    """Saved transcripts (TranscriptStorage JSON files) by conversation ID."""
+    transcripts = {}
+    for path in sorted(directory.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("transcript"):
+            transcripts[data.get("conversation_id") or path.stem] = data["transcript"]
+    return transcripts
+
+
+def llm_labels(
+    transcripts: dict[str, list[dict[str, Any]]],
+    evaluator,
+    cache_path: Path | None = None,
+) -> dict[str, str]:
+    """
+    Resolution type assigned by the Claude evaluation to each transcript.
+
+    Args:
+        transcripts: Transcripts by conversation ID
+        evaluator: DisputeEvaluator without a fast path
+        cache_path: JSON file of labels from earlier runs (updated with new ones)
+
+    Returns:
+        Resolution type by conversation ID
+    """
+    labels = {}
+    if cache_path is not None and cache_path.exists():
+        labels = json.loads(cache_path.read_text())
+
+    missing = [cid for cid in transcripts if cid not in labels]
+    for index, conversation_id in enumerate(missing, 1):
+        print(f"🤖 Evaluating {conversation_id} with Claude ({index}/{len(missing)})...")
+        evaluation = evaluator.evaluate_transcript(transcripts[conversation_id], charge_id="")
+        labels[conversation_id] = evaluation["resolution_type"]
+
+    if cache_path is not None and missing:
+        cache_path.parent.mkdir(exist_ok=True)
+        cache_path.write_text(json.dumps(labels, indent=2))
+    return {cid: labels[cid] for cid in transcripts}
+
+
+def build_report(
+    classifier: FastPathClassifier,
+    transcripts: dict[str, list[dict[str, Any]]],
+    labels: dict[str, str],
+) -> dict[str, Any]:
+    """Compare the fast path with the Claude labels; see the module docstring."""
+    calls = len(transcripts)
+    matched = hits = agree_matched = agree_hits = 0
+    patterns: dict[str, dict[str, Any]] = {
+        p.name: {"matches": 0, "agree": 0, "confidence": p.confidence} for p in classifier.patterns
+    }
+    disagreements = []
+
+    for conversation_id, transcript in transcripts.items():
+        result = classifier.classify(transcript)
+        if result is None:
+            continue
+        agrees = result.resolution_type == labels[conversation_id]
+        matched += 1
+        agree_matched += agrees
+        hits += result.confident
+        agree_hits += result.confident and agrees
+        patterns[result.pattern]["matches"] += 1
+        patterns[result.pattern]["agree"] += agrees
+        if not agrees:
+            disagreements.append(
+                {
+                    "conversation_id": conversation_id,
+                    "fast_path": result.resolution_type,
+                    "llm": labels[conversation_id],
+                    "pattern": result.pattern,
+                    "confidence": result.confidence,
+                    "evidence": result.evidence,
+                }
+            )
+
+    calibrated = classifier.calibrate((transcripts[cid], labels[cid]) for cid in transcripts)
+    for pattern in calibrated.patterns:
+        patterns[pattern.name]["calibrated"] = pattern.confidence
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "threshold": classifier.threshold,
+        "calls": calls,
+        "matched": matched,
+        "fast_path_hits": hits,
+        "hit_rate": round(hits / calls, 4) if calls else 0.0,
+        "agreement_on_hits": round(agree_hits / hits, 4) if hits else None,
+        "agreement_on_matches": round(agree_matched / matched, 4) if matched else None,
+        "patterns": patterns,
+        "disagreements": disagreements,
+        "calibrated": calibrated,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\n" + "=" * 80)
+    print(f"⚡ Fast-path outcome classifier (threshold {report['threshold']})")
+    print("=" * 80)
+    print(f"Calls: {report['calls']}  matched: {report['matched']}  fast-path hits: {report['fast_path_hits']}")
+    print(f"Hit rate (Claude calls avoided): {report['hit_rate']:.1%}")
+    for key, label in (("agreement_on_hits", "hits"), ("agreement_on_matches", "all matches")):
+        value = report[key]
+        print(f"Agreement with Claude on {label}: {'n/a' if value is None else f'{value:.1%}'}")
+    print("-" * 80)
+    print(f"{'pattern':<22}{'matches':>10}{'agree':>10}{'confidence':>14}{'calibrated':>14}")
+    for name, row in report["patterns"].items():
+        print(
+            f"{name:<22}{row['matches']:>10}{row['agree']:>10}"
+            f"{row['confidence']:>14.3f}{row['calibrated']:>14.3f}"
+        )
+    if report["disagreements"]:
+        print("-" * 80)
+        for row in report["disagreements"]:
+            print(
+                f"❌ {row['conversation_id']}: fast path {row['fast_path']} ({row['pattern']}) "
+                f"vs Claude {row['llm']} - \"{row['evidence']}\""
+            )
+    print("=" * 80)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fast-path classifier hit rate and agreement with Claude")
+    parser.add_argument("--transcripts", type=Path, default=Path("transcripts"))
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--calibration", type=Path, default=None, help="Confidences to start from")
+    parser.add_argument("--labels", type=Path, default=DEFAULT_LABELS, help="Claude label cache")
+    parser.add_argument("--offline", action="store_true", help="Label with the Anthropic stand-in")
+    parser.add_argument("--save-calibration", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None, help="JSON output path")
+    args = parser.parse_args()
+
+    from stripe_integration.dispute_evaluator import DisputeEvaluator
+
+    if args.calibration:
+        classifier = FastPathClassifier.load(str(args.calibration), threshold=args.threshold)
+    else:
+        classifier = FastPathClassifier(threshold=args.threshold)
+
+    transcripts = load_transcripts(args.transcripts)
+    if not transcripts:
+        print(f"❌ No saved transcripts in {args.transcripts}")
+        return
+
+    if args.offline:
+        from benchmarks.standins import AnthropicStandIn
+
+        evaluator = DisputeEvaluator(
+            stripe_api_key="sk_test_standin", anthropic_client=AnthropicStandIn().client()
+        )
+        labels = llm_labels(transcripts, evaluator)
+    else:
+        labels = llm_labels(transcripts, DisputeEvaluator(), args.labels)
+
+    report = build_report(classifier, transcripts, labels)
+    calibrated = report.pop("calibrated")
+    print_report(report)
+
+    if args.save_calibration:
+        calibrated.save(str(args.save_calibration))
+        print(f"💾 Calibrated confidences saved to: {args.save_calibration}")
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = RESULTS_DIR / f"fast_path_{stamp}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
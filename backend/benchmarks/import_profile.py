@@ -0,0 +1,167 @@
+"""
+Import-time profile of the API server.
+
+Measures what a cold start (or a recycled worker) pays before it can serve
+requests, each in a fresh interpreter:
+
+- wall time of `import main`, median over several runs
+- the slowest modules by cumulative import time (python -X importtime)
+- which heavy SDKs were imported eagerly (they should only load on first use)
+- the one-off cost of building ConversationService on the first request
+
+    python -m benchmarks.import_profile --runs 5 --top 15
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Modules the API server must not import until a request needs them
+HEAVY_MODULES = [
+    "conversation.service",
+    "stripe",
+    "anthropic",
+    "openai",
+    "pinecone",
+    "elevenlabs",
+    "elevenlabs.conversational_ai.default_audio_interface",
+]
+
+_WALL_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+_SERVICE_SNIPPET = """
+import json, os, time
+os.environ.setdefault("OPENAI_API_KEY", "profile")
+os.environ.setdefault("PINECONE_API_KEY", "profile")
+os.environ.setdefault("STRIPE_SECRET_KEY", "sk_test_profile")
+os.environ.setdefault("ANTHROPIC_API_KEY", "profile")
+import main
+from conversation.controller import build_conversation_service
+start = time.perf_counter()
+build_conversation_service()
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+
+def _run_python(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def measure_import(module: str = "main", runs: int = 5) -> dict[str, Any]:
+    """Wall time of importing `module` in fresh interpreters, plus eagerly loaded heavy modules."""
+    samples = []
+    modules: list[str] = []
+    for _ in range(runs):
+        output = json.loads(_run_python(["-c", _WALL_SNIPPET.format(module=module)]).stdout.splitlines()[-1])
+        samples.append(output["seconds"])
+        modules = output["modules"]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+        "eager_heavy_modules": [name for name in HEAVY_MODULES if name in modules],
+    }
+
+
+def profile_modules(module: str = "main", top: int = 15) -> list[dict[str, Any]]:
+    """Slowest modules by cumulative import time, from `python -X importtime`."""
+    stderr = _run_python(["-X", "importtime", "-c", f"import {module}"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue  # Header line
+        rows.append(
+            {"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000}
+        )
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def measure_first_service_build() -> dict[str, Any]:
+    """Time to build ConversationService on first use (placeholder keys; no network calls)."""
+    try:
+        output = _run_python(["-c", _SERVICE_SNIPPET]).stdout.splitlines()[-1]
+        return {"ms": round(json.loads(output)["seconds"] * 1000, 2)}
+    except subprocess.CalledProcessError as e:
+        return {"ms": None, "error": e.stderr.strip().splitlines()[-1] if e.stderr else str(e)}
+
+
+def run_profile(runs: int = 5, top: int = 15, service: bool = True) -> dict[str, Any]:
+    """Run the full import profile and return the report dictionary."""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "import_main": measure_import("main", runs),
+        "slowest_modules": profile_modules("main", top),
+        "first_service_build": measure_first_service_build() if service else None,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    imports = report["import_main"]
+    print("\n" + "=" * 80)
+    print("⏱️  API import profile")
+    print("=" * 80)
+    print(
+        f"import main: {imports['median_ms']:.1f} ms median "
+        f"({imports['min_ms']:.1f}-{imports['max_ms']:.1f} ms over {imports['runs']} runs)"
+    )
+    eager = imports["eager_heavy_modules"]
+    print(f"Eager heavy modules: {', '.join(eager) if eager else 'none'}")
+    if report["first_service_build"]:
+        build = report["first_service_build"]
+        if build["ms"] is not None:
+            print(f"First ConversationService build: {build['ms']:.1f} ms")
+        else:
+            print(f"First ConversationService build failed: {build['error']}")
+    print("-" * 80)
+    print(f"{'module':<60}{'cumulative ms':>20}")
+    for row in report["slowest_modules"]:
+        print(f"{row['module']:<60}{row['cumulative_ms']:>20.1f}")
+    print("=" * 80)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile API server import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--no-service", action="store_true", help="Skip the first service build")
+    parser.add_argument("--output", type=Path, default=None, help="JSON output path")
+    args = parser.parse_args()
+
+    report = run_profile(args.runs, args.top, service=not args.no_service)
+    print_report(report)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = RESULTS_DIR / f"imports_{stamp}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+End-to-end, per-stage benchmark of ConversationService.run_conversation.
+
+Drives the full pipeline against local stand-ins (fake Stripe, Claude,
+OpenAI embeddings, Pinecone and the ElevenLabs call simulator) and reports:
+
+- p50/p95/p99 latency per stage and end to end
+- sustained conversations per minute at a given concurrency
+- memory per in-flight conversation (tracemalloc)
+- the per-conversation span timeline (every external call) aggregated by span
+
+Results are written as JSON so runs can be compared across commits:
+
+    python -m benchmarks.pipeline_benchmark --conversations 200 --concurrency 32
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.standins import LatencyModel, StandInConfig, build_offline_service
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Pipeline stages, as recorded in each ConversationResult timeline ("pipeline.<stage>").
+# The call is split into dialing (the outbound call request) and waiting (for the
+# call to end). Summary and evaluation are one stage, "analysis": they come from a
+# single Claude request, or the fast path plus a summary request.
+# Post-call stages run concurrently, so stage times do not add up to end_to_end.
+STAGES = [
+    "stripe_fetch",
+    "argument_generation",
+    "rag",
+    "dialing",
+    "waiting",
+    "save_transcript",
+    "analysis",
+    "dispute_lookup",
+    "evidence",
+]
+
+
+def stage_times(spans: dict[str, float]) -> dict[str, float]:
+    """Seconds per STAGES entry for one conversation, from its span totals."""
+    times = {
+        name[len("pipeline."):]: seconds for name, seconds in spans.items() if name.startswith("pipeline.")
+    }
+    call = times.pop("call", None)
+    if call is not None:
+        times["dialing"] = spans.get("elevenlabs.dial", 0.0)
+        times["waiting"] = call - times["dialing"]
+    return times
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Summarize latencies (seconds) as milliseconds."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def run_batch(
+    env, count: int, concurrency: int
+) -> tuple[list[float], list[str], list[dict[str, float]], float]:
+    """
+    Run `count` conversations with `concurrency` workers.
+
+    Returns:
+        (latencies, statuses, per-conversation span totals from the timeline, wall_time)
+    """
+    service = env.service
+    charge_ids = env.charge_ids
+
+    def one(i: int) -> tuple[float, str, dict[str, float]]:
+        conversation_id = service.create_conversation(charge_ids[i % len(charge_ids)])
+        start = time.perf_counter()
+        service.run_conversation(conversation_id, fake_conv=False, update_stripe=True)
+        elapsed = time.perf_counter() - start
+        result = service.get_conversation_result(conversation_id)
+
+        spans: dict[str, float] = {}
+        for stage in result.timeline or []:
+            spans[stage.name] = spans.get(stage.name, 0.0) + stage.duration_ms / 1000
+        return elapsed, result.status.value, spans
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(count)))
+    wall = time.perf_counter() - start
+
+    return [o[0] for o in outcomes], [o[1] for o in outcomes], [o[2] for o in outcomes], wall
+
+
+def measure_memory(env, concurrency: int) -> dict[str, float]:
+    """Peak traced allocation while `concurrency` conversations are in flight."""
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    run_batch(env, concurrency, concurrency)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "in_flight": concurrency,
+        "peak_bytes": peak - baseline,
+        "retained_bytes": current - baseline,
+        "bytes_per_in_flight_conversation": round((peak - baseline) / concurrency),
+        "retained_bytes_per_conversation": round((current - baseline) / concurrency),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(
+    config: StandInConfig,
+    conversations: int,
+    concurrency: int,
+    warmup: int = 2,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """
+    Run the full benchmark and return the report dictionary.
+
+    Args:
+        config: Stand-in latencies
+        conversations: Number of measured conversations
+        concurrency: Number of conversations in flight at once
+        warmup: Unmeasured conversations run first
+        memory: Whether to run the (slower) tracemalloc phase
+    """
+    with tempfile.TemporaryDirectory() as storage_dir:
+        env = build_offline_service(config, storage_dir)
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            if warmup:
+                run_batch(env, warmup, min(warmup, concurrency))
+
+            latencies, statuses, span_samples, wall = run_batch(env, conversations, concurrency)
+            memory_report = measure_memory(env, concurrency) if memory else None
+
+    completed = statuses.count("completed")
+    stage_samples = [stage_times(sample) for sample in span_samples]
+    stage_report = {
+        stage: percentiles([s[stage] for s in stage_samples if stage in s]) for stage in STAGES
+    }
+    span_names = sorted(
+        {name for sample in span_samples for name in sample if not name.startswith("pipeline.")}
+    )
+    span_report = {
+        name: percentiles([s[name] for s in span_samples if name in s]) for name in span_names
+    }
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "parameters": {
+            "conversations": conversations,
+            "concurrency": concurrency,
+            "standins": asdict(config),
+        },
+        "stages": stage_report,
+        "end_to_end": percentiles(latencies),
+        "spans": span_report,
+        "throughput": {
+            "wall_seconds": round(wall, 3),
+            "completed": completed,
+            "failed": len(statuses) - completed,
+            "conversations_per_minute": round(completed / wall * 60, 2) if wall else 0.0,
+        },
+        "memory": memory_report,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\n" + "=" * 80)
+    print(f"📊 Pipeline benchmark ({report['git_commit'] or 'uncommitted'})")
+    print("=" * 80)
+    print(f"{'stage':<30}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    print("-" * 80)
+    for stage, stats in list(report["stages"].items()) + [("end_to_end", report["end_to_end"])]:
+        if not stats.get("count"):
+            print(f"{stage:<30}{'-':>10}{'-':>10}{'-':>10}{'-':>10}")
+            continue
+        print(
+            f"{stage:<30}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['p99_ms']:>10.1f}{stats['mean_ms']:>10.1f}"
+        )
+    print("-" * 80)
+    for name, stats in report["spans"].items():
+        print(
+            f"{name:<30}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['p99_ms']:>10.1f}{stats['mean_ms']:>10.1f}"
+        )
+    print("-" * 80)
+    throughput = report["throughput"]
+    print(
+        f"Throughput: {throughput['conversations_per_minute']} conversations/min "
+        f"at concurrency {report['parameters']['concurrency']} "
+        f"({throughput['completed']} completed, {throughput['failed']} failed)"
+    )
+    if report["memory"]:
+        per_conv = report["memory"]["bytes_per_in_flight_conversation"] / 1024
+        print(f"Memory: {per_conv:.1f} KiB per in-flight conversation")
+    print("=" * 80)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the conversation pipeline offline")
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--stripe-latency-ms", type=float, default=80)
+    parser.add_argument("--claude-latency-ms", type=float, default=400)
+    parser.add_argument("--claude-ms-per-token", type=float, default=2)
+    parser.add_argument("--embedding-latency-ms", type=float, default=60)
+    parser.add_argument("--pinecone-latency-ms", type=float, default=40)
+    parser.add_argument(
+        "--embedding-backend",
+        choices=["hashing", "openai"],
+        default="hashing",
+        help="Local hashing index, or the OpenAI embeddings and Pinecone stand-ins",
+    )
+    parser.add_argument("--call-time-scale", type=float, default=1.0, help="Scale simulated call durations")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc phase")
+    parser.add_argument("--output", type=Path, default=None, help="JSON output path")
+    args = parser.parse_args()
+
+    config = StandInConfig()
+    config.stripe.latency_ms = args.stripe_latency_ms
+    config.claude = LatencyModel(args.claude_latency_ms, args.claude_latency_ms / 2, args.claude_ms_per_token)
+    config.embeddings = LatencyModel(args.embedding_latency_ms, args.embedding_latency_ms / 2)
+    config.pinecone = LatencyModel(args.pinecone_latency_ms, args.pinecone_latency_ms / 2)
+    config.embedding_backend = args.embedding_backend
+    config.calls.time_scale = args.call_time_scale
+
+    report = run_benchmark(
+        config, args.conversations, args.concurrency, args.warmup, memory=not args.no_memory
+    )
+    print_report(report)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = RESULTS_DIR / f"pipeline_{stamp}_{report['git_commit'] or 'local'}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
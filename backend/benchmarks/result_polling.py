@@ -0,0 +1,275 @@
+"""
+GET /api/conversation/{id} throughput under concurrent pollers.
+
+Fills a ResultStore with completed conversations of realistic size
+(transcript, evidence texts, timeline, usage) and has concurrent pollers GET
+them from the conversation router, calling the ASGI app directly so that
+neither a network nor an HTTP client is measured. Response paths:
+
+- validated: the handler before results were pre-serialized - a sync service
+  dependency run in the threadpool, and the result validated against
+  response_model and encoded by FastAPI on every GET
+- preserialized: the body serialized once per version, served as bytes
+- not_modified: If-None-Match with the current ETag (empty 304)
+- fields: a fields=status,summary projection rendered per GET
+
+    python -m benchmarks.result_polling --pollers 32 --requests 4000
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+from fastapi import Depends, FastAPI
+
+from benchmarks.pipeline_benchmark import git_commit, percentiles
+from conversation.controller import get_conversation_service, router
+from conversation.models import (
+    ConversationResult,
+    ConversationStatus,
+    ConversationUsage,
+    DisputeEvaluation,
+    EvidenceResult,
+    StageTiming,
+    TranscriptEntry,
+    UsageTotals,
+)
+from conversation.result_store import ResultStore
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+PATHS = ("validated", "preserialized", "not_modified", "fields")
+
+
+class StoreService:
+    """The part of ConversationService the result endpoint uses"""
+
+    def __init__(self, store: ResultStore):
+        self.results = store
+
+    def get_conversation_result(self, conversation_id: str) -> ConversationResult | None:
+        return self.results.get(conversation_id)
+
+    def get_stored_result(self, conversation_id: str):
+        return self.results.get_stored(conversation_id)
+
+
+def sample_result(conversation_id: str, turns: int = 40, evidence_chars: int = 1500) -> ConversationResult:
+    """A completed result about the size of a real call's."""
+    line = "I filed the chargeback because I could not find how to cancel the subscription. "
+    usage = UsageTotals(calls=3, input_tokens=5200, output_tokens=900, cost_usd=0.031, latency_ms_total=5400.0)
+    return ConversationResult(
+        conversation_id=conversation_id,
+        status=ConversationStatus.COMPLETED,
+        transcript=[
+            TranscriptEntry(speaker="agent" if i % 2 == 0 else "user", text=line, timestamp=i * 4.5)
+            for i in range(turns)
+        ],
+        duration_seconds=turns * 4.5,
+        summary="Customer agreed to renew the subscription and withdraw the chargeback.",
+        evidence_result=EvidenceResult(
+            dispute_id=f"du_{conversation_id}",
+            evaluation=DisputeEvaluation(
+                resolved=True, resolution_type="renewed", confidence=0.95, reasoning="Explicit renewal"
+            ),
+            evidence_generated={
+                f"field_{i}": "Customer accepted the terms of service at signup. " * (evidence_chars // 52)
+                for i in range(8)
+            },
+            status="submitted",
+            submitted_to_stripe=False,
+        ),
+        timeline=[
+            StageTiming(name=f"pipeline.stage_{i}", start_offset_ms=i * 120.0, duration_ms=110.0)
+            for i in range(24)
+        ],
+        usage=ConversationUsage(totals=usage, by_stage={"pipeline.analysis": usage, "pipeline.evidence": usage}),
+    )
+
+
+def current_app(service: StoreService) -> FastAPI:
+    """The conversation router, with the service returned on the event loop as once it is built."""
+    app = FastAPI()
+    app.include_router(router)
+
+    async def built_service() -> StoreService:
+        return service
+
+    app.dependency_overrides[get_conversation_service] = built_service
+    return app
+
+
+def validated_app(service: StoreService) -> FastAPI:
+    """
+    The result endpoint as it was: a sync service dependency (a threadpool hop),
+    response_model validation and FastAPI's encoder on every GET.
+    """
+    app = FastAPI()
+
+    def conversation_service() -> StoreService:
+        return service
+
+    @app.get("/api/conversation/{conversation_id}", response_model=ConversationResult)
+    async def get_conversation_result(
+        conversation_id: str, conversation_service: StoreService = Depends(conversation_service)
+    ) -> ConversationResult:
+        return conversation_service.get_conversation_result(conversation_id)
+
+    return app
+
+
+async def asgi_get(app: FastAPI, path: str, query: str = "", headers: dict[str, str] | None = None) -> tuple[int, int]:
+    """Call an ASGI app with a GET request; returns (status, body bytes)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    response = {"status": 0, "bytes": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["bytes"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return response["status"], response["bytes"]
+
+
+async def poll(
+    app: FastAPI,
+    request_for: Callable[[int], tuple[str, str, dict[str, str]]],
+    requests: int,
+    pollers: int,
+) -> dict[str, Any]:
+    """Issue `requests` GETs from `pollers` concurrent tasks; returns throughput and latency."""
+    latencies: list[float] = []
+    sizes: list[int] = []
+    statuses: set[int] = set()
+
+    async def poller(offset: int) -> None:
+        for i in range(offset, requests, pollers):
+            path, query, headers = request_for(i)
+            start = time.perf_counter()
+            status, size = await asgi_get(app, path, query, headers)
+            latencies.append(time.perf_counter() - start)
+            sizes.append(size)
+            statuses.add(status)
+            # Let the other pollers interleave, as concurrent connections would
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(poller(offset) for offset in range(pollers)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency": percentiles(latencies),
+        "mean_response_bytes": round(sum(sizes) / len(sizes)),
+        "statuses": sorted(statuses),
+    }
+
+
+def run_benchmark(conversations: int = 50, requests: int = 4000, pollers: int = 32) -> dict[str, Any]:
+    """Measure every response path against the same stored results."""
+    with tempfile.TemporaryDirectory() as spill_dir:
+        store = ResultStore(spill_dir)
+        ids = [f"conv_bench{i:04d}" for i in range(conversations)]
+        for conversation_id in ids:
+            store.put(sample_result(conversation_id))
+        service = StoreService(store)
+        etags = {conversation_id: store.get_stored(conversation_id).etag for conversation_id in ids}
+        apps = {"validated": validated_app(service), "current": current_app(service)}
+
+        def request(path_name: str) -> Callable[[int], tuple[str, str, dict[str, str]]]:
+            def request_for(i: int) -> tuple[str, str, dict[str, str]]:
+                conversation_id = ids[i % len(ids)]
+                path = f"/api/conversation/{conversation_id}"
+                if path_name == "not_modified":
+                    return path, "", {"If-None-Match": etags[conversation_id]}
+                if path_name == "fields":
+                    return path, urlencode({"fields": "status,summary"}), {}
+                return path, "", {}
+            return request_for
+
+        async def measure() -> dict[str, Any]:
+            results = {}
+            for path_name in PATHS:
+                app = apps["validated" if path_name == "validated" else "current"]
+                await poll(app, request(path_name), min(requests, 200), pollers)  # warm-up
+                results[path_name] = await poll(app, request(path_name), requests, pollers)
+            return results
+
+        paths = asyncio.run(measure())
+
+    baseline = paths["validated"]["requests_per_second"]
+    for stats in paths.values():
+        stats["speedup"] = round(stats["requests_per_second"] / baseline, 2)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "parameters": {"conversations": conversations, "requests": requests, "pollers": pollers},
+        "paths": paths,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    parameters = report["parameters"]
+    print("\n" + "=" * 80)
+    print(
+        f"📡 Result polling: {parameters['requests']} GETs from {parameters['pollers']} pollers "
+        f"({report['git_commit'] or 'uncommitted'})"
+    )
+    print("=" * 80)
+    print(f"{'path':<16}{'req/s':>10}{'speedup':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'bytes':>10}")
+    print("-" * 80)
+    for name, stats in report["paths"].items():
+        latency = stats["latency"]
+        print(
+            f"{name:<16}{stats['requests_per_second']:>10.0f}{stats['speedup']:>8.1f}x"
+            f"{latency['p50_ms']:>9.2f}{latency['p95_ms']:>9.2f}{latency['p99_ms']:>9.2f}"
+            f"{stats['mean_response_bytes']:>10}"
+        )
+    print("=" * 80)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark conversation result GETs under concurrent pollers")
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--pollers", type=int, default=32)
+    parser.add_argument("--output", type=Path, default=None, help="JSON output path")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.conversations, args.requests, args.pollers)
+    print_report(report)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = RESULTS_DIR / f"result_polling_{stamp}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Retrieval quality of the embedding providers on backend/data.
+
+Runs a hand-labelled set of RAG queries (chargeback reason, product,
+customer - the query RAGService builds) against a LocalVectorIndex of the
+knowledge base, once per embedding provider, with the same per-type
+filtered queries RAGService makes. Reports per provider:
+
+- hit@1 / hit@3: share of (query, record type) pairs with a relevant record
+  in the top 1 / 3 matches of that type
+- MRR: mean reciprocal rank of the first relevant record
+- query latency (embedding + search) and index build time
+
+Providers: the hashing provider (word + character n-grams, and words only),
+the random-vector stand-in used by the offline benchmarks as a baseline, and
+OpenAI text-embedding-3-small when OPENAI_API_KEY is set.
+
+    python -m benchmarks.retrieval_quality
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from benchmarks.standins import OpenAIEmbeddingsStandIn
+from retrieval import (
+    EmbeddingProvider,
+    HashingEmbeddingProvider,
+    LocalVectorIndex,
+    OpenAIEmbeddingProvider,
+    load_records,
+)
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (reason, product, customer) -> relevant record IDs per record type
+LABELLED_QUERIES: list[tuple[tuple[str, str, str], dict[str, set[str]]]] = [
+    (
+        ("product_not_received", "Blue Wireless Headphones", "John Smith"),
+        {
+            "dispute_script": {"script-1"},
+            "policy": {"policy-3", "policy-2"},
+            "common_confusion": {"confusion-4", "confusion-5"},
+            "order": {"order-1"},
+        },
+    ),
+    (
+        ("product_not_received", "Mechanical Keyboard RGB", "David Kim"),
+        {
+            "dispute_script": {"script-1"},
+            "policy": {"policy-3", "policy-2"},
+            "common_confusion": {"confusion-4", "confusion-5"},
+            "order": {"order-5"},
+        },
+    ),
+    (
+        ("subscription_canceled", "Netflix Premium Subscription", "Michael Chen"),
+        {
+            "dispute_script": {"script-6"},
+            "policy": {"policy-4"},
+            "common_confusion": {"confusion-2"},
+            "order": {"order-3"},
+        },
+    ),
+    (
+        ("subscription_canceled", "Spotify Premium Subscription", "Amanda White"),
+        {
+            "dispute_script": {"script-6"},
+            "policy": {"policy-4"},
+            "common_confusion": {"confusion-2"},
+            "order": {"order-8"},
+        },
+    ),
+    (
+        ("fraudulent", "Standing Desk Pro", "Sarah Johnson"),
+        {"dispute_script": {"script-3"}, "resolution_authority": {"authority-3"}, "order": {"order-2"}},
+    ),
+    (
+        ("unrecognized", "Smart Home Hub", "Lauren Harris"),
+        {"dispute_script": {"script-2"}, "common_confusion": {"confusion-1"}, "order": {"order-10"}},
+    ),
+    (
+        ("duplicate", "Coffee Maker Deluxe", "Robert Taylor"),
+        {"dispute_script": {"script-7"}, "common_confusion": {"confusion-3"}, "order": {"order-7"}},
+    ),
+    (
+        ("product_unacceptable", "Fitness Tracker Watch", "Jessica Martinez"),
+        {
+            "dispute_script": {"script-5"},
+            "policy": {"policy-5", "policy-6", "policy-7"},
+            "order": {"order-6"},
+        },
+    ),
+    (
+        ("credit_not_processed", "Yoga Mat Premium", "Emily Rodriguez"),
+        {"policy": {"policy-1", "policy-6"}, "order": {"order-4"}},
+    ),
+    (
+        ("general", "Laptop Backpack Pro", "Chris Anderson"),
+        {"dispute_script": {"script-4"}, "order": {"order-9"}},
+    ),
+]
+
+
+class RandomVectorProvider:
+    """The OpenAI embeddings stand-in's pseudo-random vectors, as a no-signal baseline."""
+
+    model = "random-standin"
+    dimensions = 1536
+    local = True
+    score_floor = 0.0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return np.asarray([OpenAIEmbeddingsStandIn.vector_for(text) for text in texts], dtype=np.float32)
+
+
+def evaluate_provider(provider: EmbeddingProvider, ranks_for: int = 10) -> dict[str, Any]:
+    """
+    Score one provider on LABELLED_QUERIES.
+
+    Args:
+        provider: Embedding provider (fitted, for the hashing provider)
+        ranks_for: Matches retrieved per (query, type) when looking for the first relevant record
+
+    Returns:
+        hit@1, hit@3, MRR, latencies and the per-type MRR
+    """
+    start = time.perf_counter()
+    index = LocalVectorIndex.from_records(load_records(), provider)
+    build_seconds = time.perf_counter() - start
+
+    reciprocal_ranks: list[float] = []
+    by_type: dict[str, list[float]] = {}
+    latencies = []
+    for (reason, product, customer), relevant in LABELLED_QUERIES:
+        query_start = time.perf_counter()
+        vector = provider.embed([f"{reason} {product} {customer}"])[0]
+        results = {
+            record_type: index.query(vector, top_k=ranks_for, filter={"type": {"$eq": record_type}})
+            for record_type in relevant
+        }
+        latencies.append(time.perf_counter() - query_start)
+
+        for record_type, ids in relevant.items():
+            ranked = [match["id"] for match in results[record_type]["matches"]]
+            rank = next((i for i, record_id in enumerate(ranked, 1) if record_id in ids), None)
+            reciprocal_rank = 1 / rank if rank else 0.0
+            reciprocal_ranks.append(reciprocal_rank)
+            by_type.setdefault(record_type, []).append(reciprocal_rank)
+
+    latencies.sort()
+    return {
+        "model": provider.model,
+        "pairs": len(reciprocal_ranks),
+        "hit@1": round(sum(rr == 1 for rr in reciprocal_ranks) / len(reciprocal_ranks), 4),
+        "hit@3": round(sum(rr >= 1 / 3 for rr in reciprocal_ranks) / len(reciprocal_ranks), 4),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "mrr_by_type": {t: round(float(np.mean(rrs)), 4) for t, rrs in sorted(by_type.items())},
+        "query_p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "index_build_ms": round(build_seconds * 1000, 3),
+    }
+
+
+def default_providers(include_openai: bool = True) -> dict[str, EmbeddingProvider]:
+    """The providers compared by default (OpenAI only when an API key is configured)."""
+    corpus = [record.text for record in load_records()]
+    providers: dict[str, EmbeddingProvider] = {
+        "hashing": HashingEmbeddingProvider().fit(corpus),
+        "hashing_words": HashingEmbeddingProvider(char_weight=0).fit(corpus),
+        "random_standin": RandomVectorProvider(),
+    }
+    if include_openai and os.getenv("OPENAI_API_KEY"):
+        providers["openai"] = OpenAIEmbeddingProvider()
+    return providers
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\n" + "=" * 80)
+    print(f"🔎 Retrieval quality on backend/data ({len(LABELLED_QUERIES)} labelled queries)")
+    print("=" * 80)
+    print(f"{'provider':<18}{'hit@1':>8}{'hit@3':>8}{'MRR':>8}{'query p50 ms':>15}{'build ms':>12}")
+    print("-" * 80)
+    for name, row in report["providers"].items():
+        print(
+            f"{name:<18}{row['hit@1']:>8.2f}{row['hit@3']:>8.2f}{row['mrr']:>8.3f}"
+            f"{row['query_p50_ms']:>15.2f}{row['index_build_ms']:>12.1f}"
+        )
+    print("=" * 80)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare embedding providers on the knowledge base")
+    parser.add_argument("--no-openai", action="store_true", help="Skip OpenAI even if a key is set")
+    parser.add_argument("--output", type=Path, default=None, help="JSON output path")
+    args = parser.parse_args()
+
+    from config import load_config
+
+    load_config()
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "providers": {
+            name: evaluate_provider(provider)
+            for name, provider in default_providers(not args.no_openai).items()
+        },
+    }
+    print_report(report)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = RESULTS_DIR / f"retrieval_quality_{stamp}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
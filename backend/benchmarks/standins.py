@@ -0,0 +1,348 @@
+"""
+Offline stand-ins for every external service the conversation pipeline calls.
+
+Stand-ins sit at the network boundary (httpx transports, the Stripe HTTP
+client, a Pinecone-compatible index), so the real SDK and pipeline code runs
+unchanged and only the remote latency is simulated.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from anthropic import Anthropic, AsyncAnthropic
+from openai import OpenAI
+
+from elevenlabs_wrapper.call_simulator import CallSimulator, CallSimulatorConfig, Duration
+from elevenlabs_wrapper.phone_caller import PhoneCaller
+from retrieval import LocalVectorIndex, build_embedding_provider, load_records, matches_filter
+from stripe_integration.fake_backend import FakeStripeBackend, FakeStripeConfig, install_fake_backend
+
+EMBEDDING_DIMENSIONS = 1536
+
+
+@dataclass
+class LatencyModel:
+    """Simulated remote latency: base + jitter + per-output-token generation time."""
+
+    base_ms: float = 0.0
+    jitter_ms: float = 0.0
+    per_output_token_ms: float = 0.0
+
+    def delay(self, rng: random.Random, output_tokens: int = 0) -> float:
+        """Sampled latency in seconds."""
+        delay_ms = self.base_ms + rng.uniform(0, self.jitter_ms)
+        delay_ms += self.per_output_token_ms * output_tokens
+        return max(0.0, delay_ms / 1000)
+
+    def sleep(self, rng: random.Random, output_tokens: int = 0) -> None:
+        time.sleep(self.delay(rng, output_tokens))
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class AnthropicStandIn:
+    """Serves the Claude Messages API with canned, prompt-aware responses."""
+
+    EVALUATION = {
+        "resolved": True,
+        "resolution_type": "renewed",
+        "customer_sentiment": "satisfied",
+        "key_points": ["Customer agreed to renew the subscription"],
+        "recommendation": "Submit evidence and keep the subscription active",
+    }
+    ANALYSIS = {
+        "summary": "user decided to renew",
+        **EVALUATION,
+        "confidence": 0.9,
+        "reasoning": "Customer explicitly agreed to renew",
+    }
+
+    def __init__(self, latency: LatencyModel | None = None, output_chars: int = 1200, seed: int = 0):
+        """
+        Args:
+            latency: Latency model applied to every request
+            output_chars: Length of free-text responses (drives output token count)
+            seed: Random seed for jitter
+        """
+        self.latency = latency or LatencyModel()
+        self.output_chars = output_chars
+        self._rng = random.Random(seed)
+        self.request_count = 0
+
+    def _build(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        """Build the response and its simulated latency (seconds)."""
+        body = json.loads(request.content)
+        prompt = "\n".join(
+            [body.get("system") or ""]
+            + [
+                m["content"] if isinstance(m["content"], str) else json.dumps(m["content"])
+                for m in body.get("messages", [])
+            ]
+        )
+
+        if body.get("tool_choice", {}).get("type") == "tool":
+            content = [
+                {
+                    "type": "tool_use",
+                    "id": f"toolu_{uuid.uuid4().hex[:24]}",
+                    "name": body["tool_choice"]["name"],
+                    "input": self.ANALYSIS,
+                }
+            ]
+            stop_reason = "tool_use"
+            output_tokens = _estimate_tokens(json.dumps(self.ANALYSIS))
+        else:
+            if "Return ONLY the JSON" in prompt:
+                text = json.dumps(self.EVALUATION)
+            elif "customer decisions" in prompt or "Output format: 'user" in prompt:
+                text = "user decided to renew"
+            else:
+                text = ("1. Customer continued to use the service after the billing date.\n" * 40)[
+                    : self.output_chars
+                ]
+            content = [{"type": "text", "text": text}]
+            stop_reason = "end_turn"
+            output_tokens = min(_estimate_tokens(text), body.get("max_tokens", 4096))
+
+        self.request_count += 1
+        response = httpx.Response(
+            200,
+            json={
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "claude-sonnet-4-20250514"),
+                "content": content,
+                "stop_reason": stop_reason,
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": _estimate_tokens(prompt),
+                    "output_tokens": output_tokens,
+                    "cache_read_input_tokens": 0,
+                    "cache_creation_input_tokens": 0,
+                },
+            },
+        )
+        return response, self.latency.delay(self._rng, output_tokens)
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        response, delay = self._build(request)
+        time.sleep(delay)
+        return response
+
+    async def _respond_async(self, request: httpx.Request) -> httpx.Response:
+        # Async clients must not block the event loop while "waiting" for Claude
+        response, delay = self._build(request)
+        await asyncio.sleep(delay)
+        return response
+
+    def client(self) -> Anthropic:
+        return Anthropic(
+            api_key="sk-ant-standin",
+            http_client=httpx.Client(transport=httpx.MockTransport(self._respond)),
+        )
+
+    def async_client(self) -> AsyncAnthropic:
+        return AsyncAnthropic(
+            api_key="sk-ant-standin",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self._respond_async)),
+        )
+
+
+class OpenAIEmbeddingsStandIn:
+    """Serves the OpenAI embeddings API with deterministic pseudo-random vectors."""
+
+    def __init__(self, latency: LatencyModel | None = None, seed: int = 0):
+        self.latency = latency or LatencyModel()
+        self._rng = random.Random(seed)
+        self.request_count = 0
+
+    @staticmethod
+    def vector_for(text: str) -> list[float]:
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        return [rng.uniform(-1, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        self.latency.sleep(self._rng)
+        self.request_count += 1
+
+        data = []
+        for i, text in enumerate(inputs):
+            vector = self.vector_for(text)
+            if body.get("encoding_format") == "base64":
+                packed = struct.pack(f"<{len(vector)}f", *vector)
+                embedding: Any = base64.b64encode(packed).decode("ascii")
+            else:
+                embedding = vector
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+
+        tokens = sum(_estimate_tokens(t) for t in inputs)
+        return httpx.Response(
+            200,
+            json={
+                "object": "list",
+                "data": data,
+                "model": body.get("model", "text-embedding-3-small"),
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            },
+        )
+
+    def client(self) -> OpenAI:
+        return OpenAI(
+            api_key="sk-standin",
+            http_client=httpx.Client(transport=httpx.MockTransport(self._respond)),
+        )
+
+
+class PineconeIndexStandIn:
+    """Pinecone-compatible index over the records in backend/data."""
+
+    def __init__(self, latency: LatencyModel | None = None, seed: int = 0):
+        self.latency = latency or LatencyModel()
+        self._rng = random.Random(seed)
+        self.records = load_knowledge_base_records()
+        self.request_count = 0
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        include_metadata: bool = True,
+        filter: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        self.latency.sleep(self._rng)
+        self.request_count += 1
+
+        candidates = self.records
+        if filter:
+            candidates = [r for r in candidates if matches_filter(r["metadata"], filter)]
+
+        matches = [
+            {
+                "id": record["id"],
+                "score": self._rng.uniform(0.2, 0.9),
+                "metadata": record["metadata"] if include_metadata else None,
+            }
+            for record in candidates
+        ]
+        matches.sort(key=lambda m: m["score"], reverse=True)
+        return {"matches": matches[:top_k], "namespace": ""}
+
+
+def load_knowledge_base_records() -> list[dict[str, Any]]:
+    """Load backend/data records with the same metadata upload_to_pinecone.py writes."""
+    return [{"id": record.id, "metadata": record.metadata} for record in load_records()]
+
+
+@dataclass
+class StandInConfig:
+    """Latencies for every stand-in used by build_offline_service()."""
+
+    stripe: FakeStripeConfig = field(default_factory=lambda: FakeStripeConfig(latency_ms=80, latency_jitter_ms=40))
+    claude: LatencyModel = field(default_factory=lambda: LatencyModel(base_ms=400, jitter_ms=200, per_output_token_ms=2))
+    embeddings: LatencyModel = field(default_factory=lambda: LatencyModel(base_ms=60, jitter_ms=40))
+    pinecone: LatencyModel = field(default_factory=lambda: LatencyModel(base_ms=40, jitter_ms=30))
+    calls: CallSimulatorConfig = field(
+        default_factory=lambda: CallSimulatorConfig(
+            ring=Duration("uniform", 0.2, 0.6),
+            talk=Duration("uniform", 1.0, 3.0),
+            processing=Duration("uniform", 0.1, 0.4),
+            dial_latency_ms=150,
+            poll_latency_ms=30,
+        )
+    )
+    # "hashing": local hashing embeddings and index (no embedding/Pinecone latency);
+    # "openai": the OpenAI embeddings and Pinecone stand-ins above
+    embedding_backend: str = "hashing"
+    claude_output_chars: int = 1200
+    poll_interval: float = 0.1
+    scenario_copies: int = 20
+    seed: int = 0
+
+
+@dataclass
+class OfflineEnvironment:
+    """Everything build_offline_service() created."""
+
+    service: Any
+    charge_ids: list[str]
+    stripe_backend: FakeStripeBackend
+    simulator: CallSimulator
+    claude: AnthropicStandIn
+    embeddings: OpenAIEmbeddingsStandIn
+    index: PineconeIndexStandIn | LocalVectorIndex
+
+
+def build_offline_service(config: StandInConfig, storage_dir: str) -> OfflineEnvironment:
+    """
+    Build a ConversationService wired entirely to local stand-ins.
+
+    Args:
+        config: Stand-in latencies
+        storage_dir: Directory for saved transcripts
+
+    Returns:
+        OfflineEnvironment with the service and the seeded disputed charge IDs
+    """
+    from config import Settings
+    from conversation.service import ConversationService
+    from rag_service import RAGService
+    from stripe_integration.dispute_evaluator import DisputeEvaluator
+    from stripe_integration.dispute_response_generator import DisputeResponseGenerator
+
+    stripe_backend = FakeStripeBackend(config.stripe)
+    charge_ids = stripe_backend.seed_from_scenarios(copies=config.scenario_copies)
+    install_fake_backend(stripe_backend)
+
+    claude = AnthropicStandIn(config.claude, config.claude_output_chars, seed=config.seed)
+    embeddings = OpenAIEmbeddingsStandIn(config.embeddings, seed=config.seed)
+    if config.embedding_backend == "openai":
+        index = PineconeIndexStandIn(config.pinecone, seed=config.seed)
+        rag_service = RAGService(index=index, openai_client=embeddings.client())
+    else:
+        provider = build_embedding_provider(config.embedding_backend)
+        index = LocalVectorIndex.from_records(load_records(), provider)
+        rag_service = RAGService(index=index, embedding_provider=provider)
+    simulator = CallSimulator(config.calls)
+
+    service = ConversationService(
+        storage_dir=storage_dir,
+        rag_service=rag_service,
+        dispute_response_generator=DisputeResponseGenerator(
+            stripe_api_key="sk_test_standin", anthropic_client=claude.client()
+        ),
+        dispute_evaluator=DisputeEvaluator(
+            stripe_api_key="sk_test_standin", anthropic_client=claude.client()
+        ),
+        phone_caller=PhoneCaller(
+            api_key="standin", phone_number_id="standin", transport=simulator.transport()
+        ),
+        anthropic_client=claude.async_client(),
+        poll_interval=config.poll_interval,
+        call_timeout=120,
+        settings=Settings(agent_id="agent_standin", customer_cooldown_seconds=0),
+    )
+
+    return OfflineEnvironment(
+        service=service,
+        charge_ids=charge_ids,
+        stripe_backend=stripe_backend,
+        simulator=simulator,
+        claude=claude,
+        embeddings=embeddings,
+        index=index,
+    )
@@ -0,0 +1,88 @@
+"""
+Configuration - Load the environment (.env) once per process.
+
+Modules read their API keys when a client is constructed, not at import time;
+load_config() makes sure the .env file has been applied by then without
+re-parsing it for every module. get_settings() returns a cached snapshot of
+the settings the API server itself needs.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def load_config() -> None:
+    """Apply the .env file to os.environ, once. Existing variables are not overridden."""
+    global _loaded
+    if _loaded:
+        return
+    with _load_lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment settings used by the conversation pipeline."""
+
+    agent_id: str | None = None
+    anthropic_api_key: str | None = None
+    job_queue_path: str | None = None
+    usage_ledger_path: str | None = None
+    usage_ledger_max_records: int = 100_000
+    customer_cooldown_seconds: float = 0.0
+    fast_path_threshold: float = 0.9
+    fast_path_calibration_path: str | None = None
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_ttl_seconds: float = 3600.0
+    result_spill_dir: str | None = None
+    batch_concurrency: int = 4
+    campaign_lines: tuple[str, ...] = ()
+    campaign_line_concurrency: int = 1
+    calling_window: str = "09:00-20:00"
+    calling_days: str = "0,1,2,3,4,5"
+    default_customer_timezone: str = "America/New_York"
+    campaign_max_attempts: int = 3
+    campaign_retry_backoff_seconds: float = 1800.0
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Read settings from the environment (after loading .env)."""
+        load_config()
+        return cls(
+            agent_id=os.getenv("AGENT_ID"),
+            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+            job_queue_path=os.getenv("JOB_QUEUE_PATH"),
+            usage_ledger_path=os.getenv("USAGE_LEDGER_PATH"),
+            usage_ledger_max_records=int(os.getenv("USAGE_LEDGER_MAX_RECORDS", "100000")),
+            customer_cooldown_seconds=float(os.getenv("CUSTOMER_CALL_COOLDOWN_SECONDS", "0")),
+            fast_path_threshold=float(os.getenv("OUTCOME_FAST_PATH_THRESHOLD", "0.9")),
+            fast_path_calibration_path=os.getenv("OUTCOME_CALIBRATION_PATH"),
+            result_cache_max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            result_cache_ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600")),
+            result_spill_dir=os.getenv("RESULT_SPILL_DIR"),
+            batch_concurrency=int(os.getenv("BATCH_CONCURRENCY", "4")),
+            campaign_lines=tuple(
+                line.strip() for line in os.getenv("CAMPAIGN_LINES", "").split(",") if line.strip()
+            ),
+            campaign_line_concurrency=int(os.getenv("CAMPAIGN_LINE_CONCURRENCY", "1")),
+            calling_window=os.getenv("CALLING_WINDOW", "09:00-20:00"),
+            calling_days=os.getenv("CALLING_DAYS", "0,1,2,3,4,5"),
+            default_customer_timezone=os.getenv("DEFAULT_CUSTOMER_TIMEZONE", "America/New_York"),
+            campaign_max_attempts=int(os.getenv("CAMPAIGN_MAX_ATTEMPTS", "3")),
+            campaign_retry_backoff_seconds=float(os.getenv("CAMPAIGN_RETRY_BACKOFF_SECONDS", "1800")),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """The process-wide settings, read from the environment on first use."""
+    return Settings.from_env()
@@ -0,0 +1,63 @@
+"""
+Conversation batches - Start many conversations with shared preparation.
+
+Starting a campaign one POST /start per charge makes every conversation fetch
+its charge from Stripe and retrieve its knowledge base context on its own.
+ConversationService.start_batch() prepares a whole batch up front:
+
+- charge details are loaded with bulk Stripe requests (StripeClient.get_charges)
+- the reason/product part of retrieval runs once per distinct (reason,
+  product) and is shared by every conversation of the group
+- the conversations are started under a concurrency limit: on a pool of
+  `concurrency` threads in this process, or enqueued for the workers (whose
+  --concurrency applies)
+
+Each conversation is handed its prepared charge details and shared
+retrieval, so its pipeline skips those steps. A batch only records which
+conversation each charge got; its progress is read from their results.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+@dataclass
+class BatchItem:
+    """One charge of a batch and the conversation started for it."""
+
+    charge_id: str
+    conversation_id: str | None = None
+    deduplicated: bool = False  # The charge already had an active conversation
+    error: str | None = None  # Why no conversation was started
+
+
+@dataclass
+class ConversationBatch:
+    """Conversations started together by one batch request."""
+
+    batch_id: str
+    concurrency: int
+    items: list[BatchItem] = field(default_factory=list)
+    shared_retrievals: int = 0  # Distinct (reason, product) retrievals for the whole batch
+    created_at: float = field(default_factory=time.time)
+
+
+class BatchRegistry:
+    """The batches started by this process, oldest dropped first beyond `max_batches`."""
+
+    def __init__(self, max_batches: int = 200):
+        self.max_batches = max_batches
+        self._batches: OrderedDict[str, ConversationBatch] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, batch: ConversationBatch) -> None:
+        with self._lock:
+            self._batches[batch.batch_id] = batch
+            while len(self._batches) > self.max_batches:
+                self._batches.popitem(last=False)
+
+    def get(self, batch_id: str) -> ConversationBatch | None:
+        with self._lock:
+            return self._batches.get(batch_id)
@@ -0,0 +1,600 @@
+"""
+Call campaigns - Schedule outbound calls into customer-local calling windows.
+
+POST /start dials at once, whatever the customer's local time, and a call
+nobody answers simply ends FAILED. A campaign plans its calls instead:
+
+- every call gets a slot inside the customer's calling window
+  (CALLING_WINDOW / CALLING_DAYS in the customer's timezone, see
+  customer_timezone())
+- slots are spread evenly: time is cut into buckets that hold as many calls
+  as the lines can complete in them, and each call goes to the least loaded
+  bucket of its window within the next day, customers with the fewest
+  buckets to choose from placed first
+- calls that are not answered, or fail before the customer was on the line,
+  are retried with exponential backoff (never sooner than the customer
+  cooldown) in a later slot of their window, up to CAMPAIGN_MAX_ATTEMPTS
+  attempts; a call that connected and then failed is not dialed again
+- at most CAMPAIGN_LINE_CONCURRENCY calls run at once on each outbound line
+  (CAMPAIGN_LINES, ElevenLabs phone number IDs)
+
+The CampaignScheduler's dispatcher thread starts due calls on free lines and
+collects the outcomes of finished ones. A line is free again as soon as its
+call hangs up (ConversationService.add_call_listener), while the transcript
+analysis and evidence submission still run; every attempt records the call's
+own duration, so a campaign reports its completed conversations per telephony
+hour. Campaigns live in the memory of the process that created them; with a
+job queue their calls are enqueued when due and run by the workers, which do
+not report call ends, so a line is only freed once the worker's result is in.
+"""
+
+import datetime as dt
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Literal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from prometheus_client import Counter
+
+from conversation.models import ConversationResult, ConversationStatus
+from conversation.start_guard import CustomerCooldownError
+
+if TYPE_CHECKING:
+    from conversation.service import ConversationService
+    from elevenlabs_wrapper.conversation_manager import ConversationData
+
+CAMPAIGN_ATTEMPTS = Counter(
+    "chargeback_campaign_call_attempts_total",
+    "Campaign call attempts by outcome (completed, no_answer, failed)",
+    ["outcome"],
+)
+
+# Termination reasons of calls the customer did not pick up
+NO_ANSWER_REASONS = frozenset({"no_answer", "no-answer", "busy"})
+
+# Country calling codes of countries with a single timezone
+_COUNTRY_TIMEZONES = {
+    "+353": "Europe/Dublin",
+    "+31": "Europe/Amsterdam",
+    "+33": "Europe/Paris",
+    "+34": "Europe/Madrid",
+    "+39": "Europe/Rome",
+    "+44": "Europe/London",
+    "+48": "Europe/Warsaw",
+    "+49": "Europe/Berlin",
+    "+81": "Asia/Tokyo",
+    "+91": "Asia/Kolkata",
+}
+
+
+def customer_timezone(metadata: dict[str, Any], default: str) -> ZoneInfo:
+    """
+    Timezone a customer is called in.
+
+    Uses the charge metadata's customer_timezone if it names a valid zone,
+    otherwise the country of customer_phone if it has a single zone, otherwise
+    `default`.
+    """
+    phone = "+" + "".join(ch for ch in str(metadata.get("customer_phone", "")) if ch.isdigit())
+    candidates = [metadata.get("customer_timezone")]
+    candidates += [zone for code, zone in _COUNTRY_TIMEZONES.items() if phone.startswith(code)]
+    candidates.append(default)
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+    return ZoneInfo("UTC")
+
+
+@dataclass(frozen=True)
+class CallingWindow:
+    """Local hours and weekdays (Monday is 0) at which customers may be called."""
+
+    start: dt.time = dt.time(9)
+    end: dt.time = dt.time(20)
+    weekdays: frozenset[int] = frozenset(range(7))
+
+    @classmethod
+    def parse(cls, hours: str, weekdays: str = "0,1,2,3,4,5,6") -> "CallingWindow":
+        """
+        Parse a window from settings.
+
+        Args:
+            hours: Local hours as "HH:MM-HH:MM", e.g. "09:00-20:00"
+            weekdays: Comma-separated weekdays, Monday is 0
+
+        Raises:
+            ValueError: If the window is malformed or empty
+        """
+        start, _, end = hours.partition("-")
+        window = cls(
+            start=dt.time.fromisoformat(start.strip()),
+            end=dt.time.fromisoformat(end.strip()),
+            weekdays=frozenset(int(day) for day in weekdays.split(",") if day.strip()),
+        )
+        if window.start >= window.end or not window.weekdays <= set(range(7)) or not window.weekdays:
+            raise ValueError(f"Invalid calling window {hours!r} on days {weekdays!r}")
+        return window
+
+    def is_open(self, tz: ZoneInfo, at: float) -> bool:
+        """Whether a customer in `tz` may be called at timestamp `at`."""
+        local = dt.datetime.fromtimestamp(at, tz)
+        return local.weekday() in self.weekdays and self.start <= local.time() < self.end
+
+    def intervals(self, tz: ZoneInfo, start: float, end: float) -> list[tuple[float, float]]:
+        """The (open, close) timestamps of the window between `start` and `end`."""
+        day = dt.datetime.fromtimestamp(start, tz).date()
+        intervals = []
+        while True:
+            opens = dt.datetime.combine(day, self.start, tz).timestamp()
+            if opens >= end:
+                return intervals
+            if day.weekday() in self.weekdays:
+                closes = dt.datetime.combine(day, self.end, tz).timestamp()
+                low, high = max(opens, start), min(closes, end)
+                if low < high:
+                    intervals.append((low, high))
+            day += dt.timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how soon failed and unanswered calls are tried again."""
+
+    max_attempts: int = 3
+    backoff_seconds: float = 1800.0
+    multiplier: float = 2.0
+    max_backoff_seconds: float = 6 * 3600.0
+
+    def delay(self, attempts: int) -> float:
+        """Seconds to wait before the next attempt, after `attempts` attempts."""
+        return min(self.backoff_seconds * self.multiplier ** (attempts - 1), self.max_backoff_seconds)
+
+
+class SlotPlanner:
+    """
+    Planned calls per time bucket, shared by all campaigns of a scheduler.
+
+    A bucket holds `capacity` calls: as many as the lines complete in it at the
+    expected call length. A call goes to the least loaded bucket its window
+    allows within a day of its earliest start (the earliest of equally loaded
+    ones), or to the next day once those are full.
+    """
+
+    def __init__(self, calls_per_hour: float, bucket_seconds: float = 900.0, horizon_days: int = 7):
+        """
+        Initialize the planner.
+
+        Args:
+            calls_per_hour: Calls all lines together complete per hour
+            bucket_seconds: Length of a bucket
+            horizon_days: How far ahead a slot is searched for
+        """
+        self.bucket_seconds = bucket_seconds
+        self.capacity = max(1, int(calls_per_hour * bucket_seconds / 3600))
+        self.horizon_days = horizon_days
+        self._load: dict[int, int] = {}  # bucket index -> planned calls
+        self._lock = threading.Lock()
+
+    def _buckets(
+        self, window: CallingWindow, tz: ZoneInfo, start: float, end: float
+    ) -> list[tuple[int, float, float]]:
+        """(bucket, first, last) slot times of the buckets the window overlaps."""
+        buckets = []
+        for low, high in window.intervals(tz, start, end):
+            bucket = int(low // self.bucket_seconds)
+            while bucket * self.bucket_seconds < high:
+                first = max(bucket * self.bucket_seconds, low)
+                last = min((bucket + 1) * self.bucket_seconds, high)
+                buckets.append((bucket, first, last))
+                bucket += 1
+        return buckets
+
+    def choices(self, window: CallingWindow, tz: ZoneInfo, not_before: float) -> int:
+        """Buckets a call could be placed in within a day of `not_before`."""
+        return len(self._buckets(window, tz, not_before, not_before + 86400))
+
+    def assign(self, window: CallingWindow, tz: ZoneInfo, not_before: float) -> float | None:
+        """
+        Reserve a slot for a call.
+
+        Returns:
+            The slot's timestamp, or None if no bucket has room within the horizon
+        """
+        with self._lock:
+            for day in range(self.horizon_days):
+                start = not_before + day * 86400
+                open_buckets = [
+                    (self._load.get(bucket, 0), bucket, first, last)
+                    for bucket, first, last in self._buckets(window, tz, start, start + 86400)
+                    if self._load.get(bucket, 0) < self.capacity
+                ]
+                if not open_buckets:
+                    continue
+                load, bucket, first, last = min(open_buckets)
+                self._load[bucket] = load + 1
+                # Stagger the calls of a bucket over its length
+                return min(first + load * self.bucket_seconds / self.capacity, last - 1e-3)
+        return None
+
+    def release(self, slot_at: float) -> None:
+        """Give back the place of a slot that will not be used."""
+        with self._lock:
+            bucket = int(slot_at // self.bucket_seconds)
+            if self._load.get(bucket, 0) > 1:
+                self._load[bucket] -= 1
+            else:
+                self._load.pop(bucket, None)
+
+    def prune(self, now: float) -> None:
+        """Forget the buckets that have passed."""
+        with self._lock:
+            current = int(now // self.bucket_seconds)
+            for bucket in [bucket for bucket in self._load if bucket < current]:
+                del self._load[bucket]
+
+    def load(self) -> dict[int, int]:
+        """Planned calls per bucket index."""
+        with self._lock:
+            return dict(self._load)
+
+
+@dataclass
+class CallAttempt:
+    """One dial of a campaign call."""
+
+    conversation_id: str
+    line: str | None
+    started_at: float
+    holds_line: bool = False  # Counted against the line's concurrency until the call ends
+    call_ended_at: float | None = None  # When the call hung up and freed the line
+    call_seconds: float | None = None  # Duration of the call itself (telephony time)
+    ended_at: float | None = None  # When the outcome was collected, after the post-call stages
+    outcome: Literal["completed", "no_answer", "failed"] | None = None
+    termination_reason: str | None = None
+
+
+@dataclass
+class ScheduledCall:
+    """A charge of a campaign: its slot, attempts and status."""
+
+    charge_id: str
+    timezone: ZoneInfo
+    charge_details: dict[str, Any]
+    status: Literal["scheduled", "calling", "completed", "failed"] = "scheduled"
+    slot_at: float | None = None
+    attempts: list[CallAttempt] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class Campaign:
+    """Calls scheduled together by one campaign request."""
+
+    campaign_id: str
+    calls: list[ScheduledCall]
+    fake_conv: bool = False
+    update_stripe: bool = False
+    created_at: float = field(default_factory=time.time)
+
+
+class CampaignScheduler:
+    """Plans campaign calls into slots and dispatches them on the outbound lines."""
+
+    def __init__(
+        self,
+        service: "ConversationService",
+        lines: tuple[str | None, ...] = (None,),
+        line_concurrency: int = 1,
+        window: CallingWindow | None = None,
+        default_timezone: str = "America/New_York",
+        retry: RetryPolicy | None = None,
+        expected_call_seconds: float = 180.0,
+        bucket_seconds: float = 900.0,
+        tick_interval: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            service: Service that starts and runs the conversations
+            lines: Outbound phone number IDs (None is the phone caller's own)
+            line_concurrency: Calls run at once on each line
+            window: Local calling window (defaults to 09:00-20:00 every day)
+            default_timezone: Timezone of customers whose zone is unknown
+            retry: Retry policy for failed and unanswered calls
+            expected_call_seconds: Line time of an average call (dial to hang-up),
+                which sets how many calls fit in a bucket
+            bucket_seconds: Granularity at which load is spread
+            tick_interval: Seconds between dispatcher passes
+            clock: Time source (tests pass a fake one)
+        """
+        self.service = service
+        self.lines = tuple(lines) or (None,)
+        self.line_concurrency = line_concurrency
+        self.window = window or CallingWindow()
+        self.default_timezone = default_timezone
+        self.retry = retry or RetryPolicy()
+        self.tick_interval = tick_interval
+        self.clock = clock
+        self.planner = SlotPlanner(
+            calls_per_hour=len(self.lines) * line_concurrency * 3600 / expected_call_seconds,
+            bucket_seconds=bucket_seconds,
+        )
+        self._campaigns: dict[str, Campaign] = {}
+        self._active: dict[str, tuple[Campaign, ScheduledCall]] = {}  # conversation_id -> call
+        self._line_calls: dict[str | None, int] = {line: 0 for line in self.lines}
+        self._lock = threading.RLock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        service.add_call_listener(self._call_ended)
+
+    def create(
+        self, charge_ids: list[str], fake_conv: bool = False, update_stripe: bool = False
+    ) -> Campaign:
+        """
+        Load the charges of a campaign and plan a slot for each call.
+
+        Charges that do not exist, or that no slot could be found for, are
+        recorded as failed calls.
+
+        Args:
+            charge_ids: Stripe charge IDs (duplicates are ignored)
+            fake_conv: Simulate the calls (see ConversationService.run_conversation)
+            update_stripe: Submit evidence to Stripe
+
+        Returns:
+            The campaign, with its calls' slots
+        """
+        charge_ids = list(dict.fromkeys(charge_ids))
+        charge_details = self.service.dispute_response_generator.get_charge_details_bulk(charge_ids)
+        campaign = Campaign(
+            campaign_id=f"campaign_{uuid.uuid4().hex[:12]}",
+            calls=[
+                ScheduledCall(
+                    charge_id=charge_id,
+                    timezone=customer_timezone(
+                        charge_details.get(charge_id, {}).get("metadata", {}), self.default_timezone
+                    ),
+                    charge_details=charge_details.get(charge_id),
+                )
+                for charge_id in charge_ids
+            ],
+            fake_conv=fake_conv,
+            update_stripe=update_stripe,
+        )
+
+        now = self.clock()
+        for call in campaign.calls:
+            if call.charge_details is None:
+                call.status, call.error = "failed", f"No such charge: {call.charge_id}"
+        # Customers with the fewest buckets to choose from are placed first
+        to_plan = [call for call in campaign.calls if call.status == "scheduled"]
+        to_plan.sort(key=lambda call: self.planner.choices(self.window, call.timezone, now))
+        with self._lock:
+            for call in to_plan:
+                self._plan(call, now)
+            self._campaigns[campaign.campaign_id] = campaign
+
+        planned = [call.slot_at for call in campaign.calls if call.slot_at is not None]
+        print(
+            f"📅 {campaign.campaign_id}: {len(planned)} of {len(campaign.calls)} calls scheduled"
+            + (f", first at {dt.datetime.fromtimestamp(min(planned)).isoformat()}" if planned else "")
+        )
+        return campaign
+
+    def _plan(self, call: ScheduledCall, not_before: float) -> None:
+        """(Re)assign a call's slot, or fail it if there is none."""
+        if call.slot_at is not None:
+            self.planner.release(call.slot_at)
+        call.slot_at = self.planner.assign(self.window, call.timezone, not_before)
+        if call.slot_at is None:
+            call.status = "failed"
+            call.error = f"No calling slot within {self.planner.horizon_days} days"
+        else:
+            call.status = "scheduled"
+
+    def start(self) -> None:
+        """Start the dispatcher thread (once)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="campaign-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the dispatcher thread; calls in progress finish on their own."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.tick_interval):
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️  Campaign dispatcher pass failed: {e}")
+
+    def tick(self) -> None:
+        """One dispatcher pass: collect finished calls, then start due ones on free lines."""
+        now = self.clock()
+        with self._lock:
+            self._collect(now)
+            self._dispatch(now)
+        self.planner.prune(now)
+
+    def _call_ended(self, conversation_id: str, conversation_data: "ConversationData") -> None:
+        """Free the line of a campaign call that hung up (service call listener)."""
+        with self._lock:
+            entry = self._active.get(conversation_id)
+            if entry is not None:
+                self._free_line(
+                    entry[1].attempts[-1], conversation_data.metadata.call_duration_secs or 0.0
+                )
+
+    def _free_line(self, attempt: CallAttempt, call_seconds: float) -> None:
+        if attempt.call_ended_at is None:
+            attempt.call_ended_at = self.clock()
+            attempt.call_seconds = call_seconds
+        if attempt.holds_line:
+            attempt.holds_line = False
+            self._line_calls[attempt.line] -= 1
+
+    @staticmethod
+    def _call_seconds(result: ConversationResult | None) -> float:
+        """Call duration of a finished conversation whose call end was not reported."""
+        if result is not None and result.status == ConversationStatus.COMPLETED:
+            return result.duration_seconds or 0.0
+        return 0.0  # Failed results carry the pipeline's duration, not the call's
+
+    def _collect(self, now: float) -> None:
+        for conversation_id, (campaign, call) in list(self._active.items()):
+            result = self.service.get_conversation_result(conversation_id)
+            if result is not None and result.status == ConversationStatus.IN_PROGRESS:
+                continue
+            del self._active[conversation_id]
+            attempt = call.attempts[-1]
+            self._free_line(attempt, self._call_seconds(result))
+            attempt.ended_at = now
+            attempt.termination_reason = result.termination_reason if result else None
+
+            if result is not None and result.status == ConversationStatus.COMPLETED:
+                attempt.outcome = "completed"
+                call.status = "completed"
+            else:
+                no_answer = attempt.termination_reason in NO_ANSWER_REASONS
+                attempt.outcome = "no_answer" if no_answer else "failed"
+                call.error = result.error if result else "Conversation result not found"
+                # A call that reached the customer is not dialed again
+                connected = not no_answer and attempt.termination_reason is not None
+                if not connected and len(call.attempts) < self.retry.max_attempts:
+                    delay = max(
+                        self.retry.delay(len(call.attempts)), self.service.start_guard.cooldown_seconds
+                    )
+                    self._plan(call, now + delay)
+                else:
+                    call.status = "failed"
+            CAMPAIGN_ATTEMPTS.labels(attempt.outcome).inc()
+
+    def _dispatch(self, now: float) -> None:
+        due = [
+            (call.slot_at, index, campaign, call)
+            for campaign in self._campaigns.values()
+            for index, call in enumerate(campaign.calls)
+            if call.status == "scheduled" and call.slot_at <= now
+        ]
+        for _, _, campaign, call in sorted(due, key=lambda entry: entry[:2]):
+            if not self.window.is_open(call.timezone, now):
+                # Waited for a line past the window's end
+                self._plan(call, now)
+                continue
+            line = min(self.lines, key=lambda line: self._line_calls[line])
+            if self._line_calls[line] >= self.line_concurrency:
+                return  # Every line is busy; due calls wait for the next pass
+
+            try:
+                conversation_id, created = self.service.start_conversation(
+                    call.charge_id,
+                    fake_conv=campaign.fake_conv,
+                    update_stripe=campaign.update_stripe,
+                    phone_number_id=line,
+                    prepared={"charge_details": call.charge_details},
+                )
+            except CustomerCooldownError as e:
+                self._plan(call, now + e.retry_after)
+                continue
+
+            call.status = "calling"
+            call.slot_at = None
+            # A conversation already running for the charge is followed, but not on this line
+            call.attempts.append(
+                CallAttempt(
+                    conversation_id=conversation_id,
+                    line=line if created else None,
+                    started_at=now,
+                    holds_line=created,
+                )
+            )
+            self._active[conversation_id] = (campaign, call)
+            if created:
+                self._line_calls[line] += 1
+            if created and self.service.job_queue is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=len(self.lines) * self.line_concurrency,
+                        thread_name_prefix="campaign",
+                    )
+                self._executor.submit(
+                    self.service.run_conversation,
+                    conversation_id,
+                    campaign.fake_conv,
+                    campaign.update_stripe,
+                )
+
+    def progress(self, campaign_id: str) -> dict | None:
+        """Progress of a campaign created by this scheduler, with every call's attempts."""
+        with self._lock:
+            campaign = self._campaigns.get(campaign_id)
+            if campaign is None:
+                return None
+
+            counts = {"scheduled": 0, "calling": 0, "completed": 0, "failed": 0}
+            attempts = no_answers = on_line = 0
+            telephony_seconds = 0.0
+            calls = []
+            for call in campaign.calls:
+                counts[call.status] += 1
+                attempts += len(call.attempts)
+                no_answers += sum(1 for attempt in call.attempts if attempt.outcome == "no_answer")
+                telephony_seconds += sum(attempt.call_seconds or 0.0 for attempt in call.attempts)
+                if call.status == "calling" and call.attempts[-1].holds_line:
+                    on_line += 1
+                calls.append(
+                    {
+                        "charge_id": call.charge_id,
+                        "timezone": call.timezone.key,
+                        "status": call.status,
+                        "slot_at": _datetime(call.slot_at),
+                        "attempts": [
+                            {
+                                "conversation_id": attempt.conversation_id,
+                                "line": attempt.line,
+                                "started_at": _datetime(attempt.started_at),
+                                "call_ended_at": _datetime(attempt.call_ended_at),
+                                "call_seconds": attempt.call_seconds,
+                                "ended_at": _datetime(attempt.ended_at),
+                                "outcome": attempt.outcome,
+                                "termination_reason": attempt.termination_reason,
+                            }
+                            for attempt in call.attempts
+                        ],
+                        "error": call.error,
+                    }
+                )
+
+        hours = telephony_seconds / 3600
+        return {
+            "campaign_id": campaign.campaign_id,
+            "total": len(campaign.calls),
+            **counts,
+            "done": counts["scheduled"] == 0 and counts["calling"] == 0,
+            "on_line": on_line,
+            "attempts": attempts,
+            "no_answers": no_answers,
+            "telephony_seconds": round(telephony_seconds, 3),
+            "completed_per_telephony_hour": round(counts["completed"] / hours, 2) if hours else 0.0,
+            "calls": calls,
+        }
+
+
+def _datetime(timestamp: float | None) -> dt.datetime | None:
+    return dt.datetime.fromtimestamp(timestamp, dt.timezone.utc) if timestamp is not None else None
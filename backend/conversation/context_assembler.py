@@ -0,0 +1,233 @@
+"""
+Context assembler - Token-budgeted knowledge and argument sections for the agent prompt.
+
+The ElevenLabs agent re-reads its whole prompt on every turn, so prompt size is
+paid for in response latency on the phone. The assembler:
+
+- drops RAG matches below the score floor of the embeddings that scored them
+- removes near-duplicate snippets (word-shingle Jaccard similarity)
+- fills each section in score order up to its own token budget
+- reports per-section and final prompt sizes
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from prometheus_client import Histogram
+
+PROMPT_TOKENS = Histogram(
+    "chargeback_agent_prompt_tokens",
+    "Estimated tokens of the assembled agent prompt, per section and in total",
+    ["section"],
+    buckets=(100, 250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000),
+)
+
+# Knowledge sections in prompt order: (context key, heading)
+KNOWLEDGE_SECTIONS = [
+    ("dispute_scripts", "## DISPUTE RESOLUTION SCRIPTS"),
+    ("policies", "## COMPANY POLICIES"),
+    ("resolution_authority", "## YOUR AUTHORITY TO RESOLVE"),
+    ("orders", "## RELEVANT ORDER INFORMATION"),
+    ("common_confusions", "## COMMON CUSTOMER QUESTIONS"),
+]
+
+_WORD = re.compile(r"[a-z0-9$%.]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class ContextBudget:
+    """Per-section token budgets and filtering thresholds."""
+
+    dispute_scripts: int = 300
+    policies: int = 300
+    resolution_authority: int = 200
+    orders: int = 150
+    common_confusions: int = 200
+    arguments: int = 400
+    min_score: float = 0.3  # For matches that do not carry their provider's score_floor
+    duplicate_similarity: float = 0.7
+
+    def for_section(self, name: str) -> int:
+        return getattr(self, name)
+
+
+@dataclass
+class SectionReport:
+    """What happened to one section's candidate snippets."""
+
+    name: str
+    budget_tokens: int
+    tokens: int = 0
+    kept: int = 0
+    dropped_low_score: int = 0
+    dropped_duplicate: int = 0
+    dropped_over_budget: int = 0
+
+
+@dataclass
+class AssembledContext:
+    """Budgeted prompt sections plus a report of what was kept."""
+
+    knowledge: str
+    arguments: str
+    sections: list[SectionReport] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return sum(section.tokens for section in self.sections)
+
+
+class ContextAssembler:
+    """Builds the knowledge and argument sections of the agent prompt within budget."""
+
+    def __init__(self, budget: ContextBudget | None = None):
+        """
+        Initialize the assembler.
+
+        Args:
+            budget: Section budgets and thresholds (defaults to ContextBudget())
+        """
+        self.budget = budget or ContextBudget()
+
+    def assemble(self, rag_context: dict[str, Any], response_arguments: str) -> AssembledContext:
+        """
+        Select and format RAG matches and Claude arguments within budget.
+
+        Args:
+            rag_context: Result of RAGService.query_context()
+            response_arguments: Numbered argument list from DisputeResponseGenerator
+
+        Returns:
+            AssembledContext with the formatted sections and a per-section report
+        """
+        seen: list[set[tuple[str, ...]]] = []  # Shingles of every kept snippet
+        reports = []
+        knowledge_parts = []
+
+        for key, heading in KNOWLEDGE_SECTIONS:
+            report = SectionReport(key, self.budget.for_section(key))
+            candidates = []
+            for item in rag_context.get(key, []):
+                # Scores are only comparable to the floor of the embeddings that produced them
+                min_score = item.get("score_floor")
+                if min_score is None:
+                    min_score = self.budget.min_score
+                if item.get("score", 1.0) < min_score:
+                    report.dropped_low_score += 1
+                else:
+                    candidates.append(item)
+            candidates.sort(key=lambda item: item.get("score", 0.0), reverse=True)
+
+            lines = self._fill(
+                [self._format_item(key, item) for item in candidates], report, seen
+            )
+            if lines:
+                knowledge_parts.append("\n".join([heading] + lines))
+            reports.append(report)
+
+        argument_report = SectionReport("arguments", self.budget.arguments)
+        argument_lines = self._fill(
+            [line.strip() for line in response_arguments.splitlines() if line.strip()],
+            argument_report,
+            seen,
+        )
+        reports.append(argument_report)
+
+        return AssembledContext(
+            knowledge="\n\n".join(knowledge_parts),
+            arguments="\n".join(argument_lines),
+            sections=reports,
+        )
+
+    def report_prompt(self, prompt: str, assembled: AssembledContext) -> int:
+        """
+        Log and export the final prompt size.
+
+        Args:
+            prompt: The complete agent prompt
+            assembled: The assembled sections included in it
+
+        Returns:
+            Estimated prompt tokens
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        PROMPT_TOKENS.labels("total").observe(prompt_tokens)
+        for section in assembled.sections:
+            PROMPT_TOKENS.labels(section.name).observe(section.tokens)
+
+        dropped = sum(
+            s.dropped_low_score + s.dropped_duplicate + s.dropped_over_budget
+            for s in assembled.sections
+        )
+        print(
+            f"📏 Agent prompt: ~{prompt_tokens} tokens ({len(prompt)} chars); "
+            f"context sections ~{assembled.tokens} tokens, {dropped} snippets dropped"
+        )
+        return prompt_tokens
+
+    def _fill(
+        self,
+        snippets: list[str],
+        report: SectionReport,
+        seen: list[set[tuple[str, ...]]],
+    ) -> list[str]:
+        """Keep snippets in order, skipping near-duplicates, until the budget is used."""
+        kept = []
+        for snippet in snippets:
+            shingles = _shingles(snippet)
+            if any(_jaccard(shingles, other) >= self.budget.duplicate_similarity for other in seen):
+                report.dropped_duplicate += 1
+                continue
+
+            line = snippet if snippet.startswith(("-", "*")) or snippet[:1].isdigit() else f"- {snippet}"
+            tokens = estimate_tokens(line) + 1  # newline
+            if report.tokens + tokens > report.budget_tokens:
+                if kept:
+                    report.dropped_over_budget += 1
+                    continue
+                # Never leave a section empty: trim its best snippet to the budget
+                line = _truncate(line, report.budget_tokens - 1)
+                tokens = estimate_tokens(line) + 1
+
+            kept.append(line)
+            seen.append(shingles)
+            report.tokens += tokens
+            report.kept += 1
+        return kept
+
+    @staticmethod
+    def _format_item(key: str, item: dict[str, Any]) -> str:
+        if key == "orders":
+            return (
+                f"Order for {item['product']}: ${item['amount']} on {item['date']}, "
+                f"Status: {item['status']}, Customer: {item['customer']}"
+            )
+        return str(item.get("content") or "")
+
+
+def _shingles(text: str, size: int = 2) -> set[tuple[str, ...]]:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens at a word boundary."""
+    max_chars = max(0, max_tokens * 4 - 1)
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(",;:") + "…"
@@ -1,15 +1,76 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, status
-from typing import List
+import threading
+from fastapi.concurrency import run_in_threadpool
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response, status
+from typing import TYPE_CHECKING, List, Optional
 from conversation.models import (
+    BatchProgress,
+    BatchStartRequest,
+    CampaignProgress,
+    CampaignStartRequest,
     ConversationRequestLegacy,
     ConversationStartResponse,
     ConversationResult,
+    ConversationUsage,
+    ResultMemoryStats,
 )
-from conversation.service import ConversationService
+from conversation.result_view import etag_matches, parse_fields, render_result
+from conversation.start_guard import CustomerCooldownError, IdempotencyKeyConflictError
+
+if TYPE_CHECKING:
+    from conversation.service import ConversationService
 
 router = APIRouter(prefix="/api/conversation", tags=["conversation"])
 
-conversation_service = ConversationService()
+_conversation_service: "ConversationService | None" = None
+_service_lock = threading.Lock()
+
+
+def build_conversation_service() -> "ConversationService":
+    """
+    The process-wide ConversationService, built on the first call.
+
+    The service (and the Stripe, Claude, OpenAI and Pinecone SDKs behind it) is
+    imported and built when first needed, not when the app is imported.
+    """
+    global _conversation_service
+    if _conversation_service is None:
+        with _service_lock:
+            if _conversation_service is None:
+                from conversation.service import ConversationService
+
+                _conversation_service = ConversationService()
+    return _conversation_service
+
+
+async def get_conversation_service() -> "ConversationService":
+    """
+    Dependency providing the process-wide ConversationService.
+
+    The first request builds it in the threadpool; after that it is returned on
+    the event loop, so polls do not pay a threadpool hop for a sync dependency.
+    Tests can swap it via app.dependency_overrides.
+    """
+    if _conversation_service is not None:
+        return _conversation_service
+    return await run_in_threadpool(build_conversation_service)
+
+
+def peek_conversation_service() -> "ConversationService | None":
+    """
+    Dependency providing the service if it has been built, without building it.
+
+    Used by /health, which must stay cheap before the first conversation.
+    """
+    return _conversation_service
+
+
+def reset_conversation_service() -> None:
+    """Drop the cached service so the next request builds a fresh one."""
+    global _conversation_service
+    with _service_lock:
+        if _conversation_service is not None:
+            _conversation_service.rag_service.close()
+        _conversation_service = None
 
 
 @router.post(
@@ -26,10 +87,20 @@ async def start_conversation(
     update_stripe: bool = Query(
         False, description="Actually submit evidence to Stripe (set to false for testing)"
     ),
+    idempotency_key: Optional[str] = Header(
+        None, description="Client key that makes retries of this request return the same conversation"
+    ),
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
 ) -> ConversationStartResponse:
     """
     Start a new phone conversation with the agent.
     The call will be made in the background and you can check the status later.
+    If JOB_QUEUE_PATH is set, the conversation is queued for a worker process instead.
+
+    Starting is idempotent: a repeated Idempotency-Key, or a charge that already has
+    a conversation in progress, returns the existing conversation (deduplicated=true).
+    With a per-customer cooldown (CUSTOMER_CALL_COOLDOWN_SECONDS, off by default),
+    a customer called within it gets 429.
 
     For testing, use ?fake_conv=true to simulate a conversation without making a real phone call.
     Use ?update_stripe=true to actually submit evidence to Stripe.
@@ -37,36 +108,248 @@ async def start_conversation(
     Request body only requires the Stripe charge_id - all other information
     (customer details, product info, etc.) will be fetched automatically from Stripe.
     """
-    conversation_id = conversation_service.create_conversation(
-        request.charge_id, phone_number_override=request.phone_number
+    try:
+        # Enqueueing may wait on the job queue's SQLite write lock
+        conversation_id, created = await run_in_threadpool(
+            conversation_service.start_conversation,
+            request.charge_id,
+            phone_number_override=request.phone_number,
+            fake_conv=fake_conv,
+            update_stripe=update_stripe,
+            idempotency_key=idempotency_key,
+        )
+    except CustomerCooldownError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    queued = conversation_service.job_queue is not None
+    if created and not queued:
+        background_tasks.add_task(
+            conversation_service.run_conversation, conversation_id, fake_conv, update_stripe
+        )
+
+    return ConversationStartResponse(
+        conversation_id=conversation_id,
+        status="queued" if queued else "started",
+        deduplicated=not created,
     )
 
-    background_tasks.add_task(
-        conversation_service.run_conversation, conversation_id, fake_conv, update_stripe
+
+@router.post(
+    "/batch",
+    response_model=BatchProgress,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_batch(
+    request: BatchStartRequest,
+    fake_conv: bool = Query(
+        False, description="Use fake conversations for testing (no real phone calls)"
+    ),
+    update_stripe: bool = Query(
+        False, description="Actually submit evidence to Stripe (set to false for testing)"
+    ),
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> BatchProgress:
+    """
+    Start conversations for many charges at once.
+
+    Charges are loaded with bulk Stripe requests and knowledge base retrieval is
+    shared by charges with the same dispute reason and product. Conversations
+    run under a concurrency limit; poll GET /batch/{batch_id} for progress.
+    """
+    batch = await run_in_threadpool(
+        conversation_service.start_batch,
+        request.charge_ids,
+        fake_conv=fake_conv,
+        update_stripe=update_stripe,
+        concurrency=request.concurrency,
     )
+    return BatchProgress(**conversation_service.batch_progress(batch.batch_id))
+
+
+@router.get("/batch/{batch_id}", response_model=BatchProgress)
+async def get_batch_progress(
+    batch_id: str,
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> BatchProgress:
+    """
+    Get the aggregate progress of a batch and the status of each of its conversations.
+    """
+    progress = conversation_service.batch_progress(batch_id)
 
-    return ConversationStartResponse(conversation_id=conversation_id, status="started")
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch with ID {batch_id} not found",
+        )
 
+    return BatchProgress(**progress)
 
-@router.get("/{conversation_id}", response_model=ConversationResult)
-async def get_conversation_result(conversation_id: str) -> ConversationResult:
+
+@router.post(
+    "/campaign",
+    response_model=CampaignProgress,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_campaign(
+    request: CampaignStartRequest,
+    fake_conv: bool = Query(
+        False, description="Use fake conversations for testing (no real phone calls)"
+    ),
+    update_stripe: bool = Query(
+        False, description="Actually submit evidence to Stripe (set to false for testing)"
+    ),
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> CampaignProgress:
+    """
+    Schedule calls for many charges instead of dialing them at once.
+
+    Each call gets a slot inside the customer's local calling window
+    (CALLING_WINDOW), with load spread evenly over the day. Calls run on the
+    outbound lines (CAMPAIGN_LINES) at most CAMPAIGN_LINE_CONCURRENCY at a time
+    per line; failed and unanswered calls are retried with backoff up to
+    CAMPAIGN_MAX_ATTEMPTS times. Poll GET /campaign/{campaign_id} for progress.
+    """
+    campaign = await run_in_threadpool(
+        conversation_service.start_campaign,
+        request.charge_ids,
+        fake_conv=fake_conv,
+        update_stripe=update_stripe,
+    )
+    return CampaignProgress(**conversation_service.campaigns.progress(campaign.campaign_id))
+
+
+@router.get("/campaign/{campaign_id}", response_model=CampaignProgress)
+async def get_campaign_progress(
+    campaign_id: str,
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> CampaignProgress:
+    """
+    Get the progress of a campaign, its telephony time and every call's attempts.
+    """
+    progress = conversation_service.campaigns.progress(campaign_id)
+
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Campaign with ID {campaign_id} not found",
+        )
+
+    return CampaignProgress(**progress)
+
+
+@router.get("/usage/rollup", response_model=List[dict])
+async def get_usage_rollup(
+    group_by: str = Query(
+        "stage,model",
+        description="Comma-separated fields: conversation_id, stage, provider, model",
+    ),
+    since: Optional[float] = Query(
+        None, description="Only include usage recorded at or after this unix timestamp"
+    ),
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> List[dict]:
+    """
+    Roll up token, cost and latency usage across all conversations.
+    Rows are ordered by estimated cost, most expensive first.
+    """
+    fields = [field.strip() for field in group_by.split(",") if field.strip()]
+    try:
+        return conversation_service.usage_rollup(group_by=fields, since=since)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/memory", response_model=ResultMemoryStats)
+async def get_result_memory_stats(
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> ResultMemoryStats:
+    """
+    Get the memory use of the conversation results held by this process.
+    Finished results beyond the byte budget or TTL are spilled to disk.
+    """
+    return ResultMemoryStats(**conversation_service.result_memory_stats())
+
+
+@router.get("/{conversation_id}/usage", response_model=ConversationUsage)
+async def get_conversation_usage(
+    conversation_id: str,
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> ConversationUsage:
+    """
+    Get token, cost and latency totals of a conversation, overall and per stage.
+    """
+    usage = conversation_service.get_conversation_usage(conversation_id)
+
+    if usage is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation with ID {conversation_id} not found",
+        )
+
+    return usage
+
+
+@router.get(
+    "/{conversation_id}",
+    response_model=ConversationResult,
+    responses={304: {"description": "Unchanged since the version in If-None-Match"}},
+)
+async def get_conversation_result(
+    conversation_id: str,
+    since: Optional[int] = Query(
+        None, ge=0, description="Only return transcript entries from this message index on"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (e.g. status,summary)"
+    ),
+    if_none_match: Optional[str] = Header(
+        None, description="ETag of the version the client has; returns 304 if unchanged"
+    ),
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> Response:
     """
     Get the result and transcript of a conversation.
-    Returns the current status and transcript if completed.
+    Returns the current status and the transcript, so far while the call is in progress.
+
+    Pollers should send the last ETag in If-None-Match, and can request only
+    new transcript entries (since) or some of the fields (fields).
     """
-    result = conversation_service.get_conversation_result(conversation_id)
+    try:
+        projection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Spilled results are read from disk, and worker results from the job queue
+    stored = await run_in_threadpool(conversation_service.get_stored_result, conversation_id)
 
-    if result is None:
+    if stored is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversation with ID {conversation_id} not found",
         )
 
-    return result
+    headers = {"ETag": stored.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, stored.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # The full body was serialized once for this version; views are rendered per request
+    if since is None and projection is None:
+        body = stored.body
+    else:
+        body = render_result(stored.result, since=since, fields=projection)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/", response_model=List[dict])
-async def list_saved_transcripts() -> List[dict]:
+async def list_saved_transcripts(
+    conversation_service: "ConversationService" = Depends(get_conversation_service),
+) -> List[dict]:
     """
     List all saved transcripts from the storage.
     """
@@ -0,0 +1,370 @@
+"""
+Job queue - Durable, lease-based queue of conversation jobs (SQLite).
+
+The API enqueues one job per conversation; worker processes
+(`python -m conversation.worker`) claim jobs, run them and store the final
+ConversationResult back on the job, where the API reads it.
+
+A claimed job is leased to its worker for `lease_seconds`. The worker renews
+the lease with heartbeats while the call runs; if the worker crashes, the
+lease expires and the next claim() hands the job to another worker. A job
+whose lease has expired `max_attempts` times is marked failed instead of
+being retried forever.
+
+SQLite in WAL mode allows any number of worker processes on one host; the
+queue only needs a file path, so workers on other nodes can use a shared
+volume (or a different JobQueue backend with the same methods).
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Literal
+
+from conversation.start_guard import IdempotencyKeyConflictError
+
+JobStatus = Literal["queued", "running", "done", "failed"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status);
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    dedupe_key TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS customer_calls (
+    customer_key TEXT PRIMARY KEY,
+    charge_id TEXT,
+    called_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS customer_calls_charge ON customer_calls (charge_id, called_at);
+"""
+
+
+@dataclass
+class Job:
+    """A conversation job and its current lease."""
+
+    job_id: str
+    payload: dict[str, Any]
+    status: JobStatus
+    attempts: int = 0
+    worker_id: str | None = None
+    lease_expires_at: float | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            job_id=row["job_id"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            worker_id=row["worker_id"],
+            lease_expires_at=row["lease_expires_at"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+
+class SQLiteJobQueue:
+    """Lease-based job queue stored in a SQLite database file."""
+
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 3):
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            path: SQLite database file, shared by the API and all workers
+            lease_seconds: How long a claimed job stays leased without a heartbeat
+            max_attempts: Claims per job before an expired lease marks it failed
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # Take the write lock up front
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, job_id: str, payload: dict[str, Any]) -> Job:
+        """
+        Add a job.
+
+        Args:
+            job_id: Unique job ID (the conversation ID)
+            payload: JSON-serializable job arguments
+
+        Returns:
+            The queued Job
+
+        Raises:
+            ValueError: If a job with this ID already exists
+        """
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, payload, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (job_id, json.dumps(payload), now, now),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Job {job_id} already exists")
+        return Job(job_id, payload, "queued", created_at=now, updated_at=now)
+
+    def enqueue_unique(
+        self,
+        job_id: str,
+        payload: dict[str, Any],
+        dedupe_key: str,
+        idempotency_key: str | None = None,
+        idempotency_ttl: float = 24 * 3600,
+        before_create: Callable[[], None] | None = None,
+    ) -> tuple[Job, bool]:
+        """
+        Add a job unless an equivalent one exists, atomically across processes.
+
+        Args:
+            job_id: ID for the new job
+            payload: JSON-serializable job arguments
+            dedupe_key: Key of which only one job may be queued or running (the charge ID)
+            idempotency_key: Optional client key that always maps to the job it first created
+            idempotency_ttl: Seconds an idempotency key is remembered
+            before_create: Called before a new job is inserted; raising aborts the enqueue
+
+        Returns:
+            (job, created): the existing job and False if the key was seen before or
+            a job with the same dedupe_key is still queued or running
+
+        Raises:
+            IdempotencyKeyConflictError: If the key was used with another dedupe_key
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            if idempotency_key:
+                conn.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (now - idempotency_ttl,))
+                row = conn.execute(
+                    "SELECT job_id, dedupe_key FROM idempotency_keys WHERE key = ?", (idempotency_key,)
+                ).fetchone()
+                if row is not None:
+                    if row["dedupe_key"] != dedupe_key:
+                        raise IdempotencyKeyConflictError(
+                            f"Idempotency-Key was already used for charge {row['dedupe_key']}"
+                        )
+                    existing = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+                    if existing is not None:
+                        return Job.from_row(existing), False
+
+            existing = conn.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running') "
+                "ORDER BY created_at LIMIT 1",
+                (dedupe_key,),
+            ).fetchone()
+            if existing is None:
+                if before_create is not None:
+                    before_create()
+                conn.execute(
+                    "INSERT INTO jobs (job_id, payload, dedupe_key, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (job_id, json.dumps(payload), dedupe_key, now, now),
+                )
+                job, created = Job(job_id, payload, "queued", created_at=now, updated_at=now), True
+            else:
+                job, created = Job.from_row(existing), False
+
+            if idempotency_key:
+                conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys (key, job_id, dedupe_key, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (idempotency_key, job.job_id, dedupe_key, now),
+                )
+        return job, created
+
+    def claim(self, worker_id: str) -> Job | None:
+        """
+        Lease the oldest runnable job to a worker.
+
+        Runnable jobs are queued ones and running ones whose lease has expired
+        (their worker stopped heartbeating). Expired jobs that are out of
+        attempts are marked failed instead.
+
+        Args:
+            worker_id: ID of the claiming worker
+
+        Returns:
+            The claimed Job, or None if there is nothing to run
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', worker_id = NULL, lease_expires_at = NULL, "
+                "error = ?, updated_at = ? "
+                "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                (
+                    f"Worker lease expired {self.max_attempts} times; giving up",
+                    now,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            row = conn.execute(
+                "SELECT job_id FROM jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, attempts = attempts + 1, "
+                "lease_expires_at = ?, updated_at = ? WHERE job_id = ?",
+                (worker_id, now + self.lease_seconds, now, row["job_id"]),
+            )
+            claimed = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+        return Job.from_row(claimed)
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend a job's lease.
+
+        Returns:
+            False if the worker no longer holds the lease (it expired and the
+            job was reclaimed or failed)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (now + self.lease_seconds, now, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: dict[str, Any]) -> bool:
+        """Mark a leased job done with its result; False if the lease was lost."""
+        return self._finish(job_id, worker_id, "done", result, None)
+
+    def fail(
+        self, job_id: str, worker_id: str, error: str, result: dict[str, Any] | None = None
+    ) -> bool:
+        """Mark a leased job failed; False if the lease was lost."""
+        return self._finish(job_id, worker_id, "failed", result, error)
+
+    def _finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: JobStatus,
+        result: dict[str, Any] | None,
+        error: str | None,
+    ) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, lease_expires_at = NULL, "
+                "updated_at = ? WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                    worker_id,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def last_call(
+        self, customer_key: str | None = None, charge_id: str | None = None
+    ) -> tuple[str, float] | None:
+        """(customer_key, called_at) of the last call to a customer, or for a charge."""
+        with self._connect() as conn:
+            if customer_key is not None:
+                row = conn.execute(
+                    "SELECT customer_key, called_at FROM customer_calls WHERE customer_key = ?",
+                    (customer_key,),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT customer_key, called_at FROM customer_calls WHERE charge_id = ? "
+                    "ORDER BY called_at DESC LIMIT 1",
+                    (charge_id,),
+                ).fetchone()
+        return (row["customer_key"], row["called_at"]) if row else None
+
+    def claim_call(self, customer_key: str, charge_id: str | None, cooldown: float) -> float | None:
+        """
+        Record a call unless the customer is within the cooldown (shared by all workers).
+
+        Returns:
+            None if the call may go ahead, otherwise seconds until it may
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT called_at FROM customer_calls WHERE customer_key = ?", (customer_key,)
+            ).fetchone()
+            if row is not None and now - row["called_at"] < cooldown:
+                return cooldown - (now - row["called_at"])
+            conn.execute(
+                "INSERT OR REPLACE INTO customer_calls (customer_key, charge_id, called_at) VALUES (?, ?, ?)",
+                (customer_key, charge_id, now),
+            )
+        return None
+
+    def get(self, job_id: str) -> Job | None:
+        """A job by ID, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in ("queued", "running", "done", "failed")}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
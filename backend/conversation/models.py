@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 from enum import Enum
 
 
@@ -61,11 +62,98 @@ class ConversationRequestLegacy(BaseModel):
     }
 
 
+class BatchStartRequest(BaseModel):
+    charge_ids: List[str] = Field(
+        ..., min_length=1, max_length=500, description="Stripe charge IDs to call about"
+    )
+    concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        le=50,
+        description="Conversations run at once (defaults to BATCH_CONCURRENCY; "
+        "with a job queue the workers' concurrency applies)",
+    )
+
+
+class BatchConversation(BaseModel):
+    charge_id: str
+    conversation_id: Optional[str] = None
+    status: Literal["in_progress", "completed", "failed", "skipped"]
+    deduplicated: bool = Field(
+        False, description="The charge already had an active conversation, which is reused"
+    )
+    error: Optional[str] = Field(None, description="Why no conversation was started")
+
+
+class BatchProgress(BaseModel):
+    """Aggregate progress of a batch of conversations."""
+
+    batch_id: str
+    total: int
+    in_progress: int
+    completed: int
+    failed: int
+    skipped: int = Field(..., description="Charges without a conversation (not found, cooldown)")
+    done: bool
+    concurrency: int
+    shared_retrievals: int = Field(
+        ..., description="Knowledge base retrievals shared by the batch (one per reason and product)"
+    )
+    conversations: List[BatchConversation]
+
+
+class CampaignStartRequest(BaseModel):
+    charge_ids: List[str] = Field(
+        ..., min_length=1, max_length=5000, description="Stripe charge IDs to call about"
+    )
+
+
+class CampaignAttempt(BaseModel):
+    conversation_id: str
+    line: Optional[str] = Field(None, description="Outbound line (phone number ID) of the call")
+    started_at: datetime
+    call_ended_at: Optional[datetime] = Field(None, description="When the call hung up and freed its line")
+    call_seconds: Optional[float] = Field(None, description="Duration of the call itself")
+    ended_at: Optional[datetime] = Field(None, description="When the outcome was known, after the post-call stages")
+    outcome: Optional[Literal["completed", "no_answer", "failed"]] = None
+    termination_reason: Optional[str] = None
+
+
+class CampaignCall(BaseModel):
+    charge_id: str
+    timezone: str = Field(..., description="Customer timezone the calling window applies in")
+    status: Literal["scheduled", "calling", "completed", "failed"]
+    slot_at: Optional[datetime] = Field(None, description="When the next attempt is due")
+    attempts: List[CampaignAttempt]
+    error: Optional[str] = None
+
+
+class CampaignProgress(BaseModel):
+    """Progress of a call campaign and how well it used its telephony time."""
+
+    campaign_id: str
+    total: int
+    scheduled: int
+    calling: int
+    completed: int
+    failed: int = Field(..., description="Calls out of attempts, or without a slot")
+    done: bool
+    on_line: int = Field(..., description="Calls currently connected on a line")
+    attempts: int
+    no_answers: int
+    telephony_seconds: float = Field(..., description="Duration of the campaign's ended calls")
+    completed_per_telephony_hour: float
+    calls: List[CampaignCall]
+
+
 class ConversationStartResponse(BaseModel):
     conversation_id: str = Field(
         ..., description="Unique ID to track this conversation"
     )
-    status: Literal["started"] = "started"
+    status: Literal["started", "queued"] = "started"
+    deduplicated: bool = Field(
+        False, description="True if an existing conversation was returned instead of starting one"
+    )
 
 
 class TranscriptEntry(BaseModel):
@@ -98,6 +186,77 @@ class DisputeEvaluation(BaseModel):
     )
 
 
+class LiveOutcome(BaseModel):
+    """Running outcome estimate of a call, updated while the call is in progress."""
+
+    resolution_type: str = Field(
+        ..., description="Estimated resolution type ('pending' until the customer decides)"
+    )
+    resolved: bool = False
+    confidence: float = Field(0.0, description="Confidence of the estimate (0.0-1.0)")
+    customer_decision: Optional[str] = Field(
+        None, description="Customer statement the estimate is based on"
+    )
+    source: Literal["rules", "llm"] = Field(
+        "rules", description="Keyword pass or LLM checkpoint"
+    )
+    turns: int = Field(0, description="Transcript messages scored so far")
+
+
+class StageTiming(BaseModel):
+    """One timed pipeline stage or external call within a conversation."""
+
+    name: str = Field(
+        ..., description="Span name (e.g., 'pipeline.rag', 'stripe.get_charge')"
+    )
+    start_offset_ms: float = Field(
+        ..., description="Milliseconds from the start of the conversation run"
+    )
+    duration_ms: float = Field(..., description="Duration in milliseconds")
+    outcome: Literal["ok", "error"] = "ok"
+
+
+class UsageTotals(BaseModel):
+    """Aggregated token, cost and latency usage."""
+
+    calls: int = Field(0, description="Number of LLM/telephony calls")
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cost_usd: float = Field(0.0, description="Estimated LLM cost in USD")
+    call_credits: float = Field(0.0, description="ElevenLabs credits spent on calls")
+    call_seconds: float = 0.0
+    latency_ms_total: float = 0.0
+    latency_ms_mean: float = 0.0
+    latency_ms_p95: float = 0.0
+
+
+class ConversationUsage(BaseModel):
+    """Usage of one conversation, overall and per stage (span name)."""
+
+    totals: UsageTotals
+    by_stage: Dict[str, UsageTotals] = Field(default_factory=dict)
+
+
+class ResultMemoryStats(BaseModel):
+    """Memory use of the conversation results held by the API process."""
+
+    entries: int = Field(..., description="Results held in memory")
+    in_progress: int = Field(..., description="Results of running conversations (never evicted)")
+    bytes: int = Field(..., description="Estimated bytes of the results held in memory")
+    in_progress_bytes: int = 0
+    max_bytes: int = Field(..., description="Budget above which finished results are spilled")
+    ttl_seconds: float = Field(..., description="Seconds a finished result stays in memory after its last read")
+    spilled: int = Field(..., description="Results on disk only")
+    hits: int = 0
+    misses: int = 0
+    rehydrations: int = Field(0, description="Spilled results read back into memory")
+    spills: int = 0
+    expirations: int = 0
+    peak_rss_bytes: int = Field(..., description="Peak resident set size of the process")
+
+
 class EvidenceResult(BaseModel):
     """Result of evidence generation and submission."""
 
@@ -118,6 +277,21 @@ class ConversationResult(BaseModel):
     summary: Optional[str] = None
     evidence_result: Optional[EvidenceResult] = None
     error: Optional[str] = None
+    termination_reason: Optional[str] = Field(
+        None, description="How the call ended (e.g., 'user_ended_call', 'no_answer')"
+    )
+    timeline: Optional[List[StageTiming]] = Field(
+        None, description="Per-stage timing breakdown of this conversation"
+    )
+    usage: Optional[ConversationUsage] = Field(
+        None, description="Token, cost and latency totals of this conversation"
+    )
+    live_outcome: Optional[LiveOutcome] = Field(
+        None, description="Outcome estimate, updated as the call transcript arrives"
+    )
+    version: int = Field(
+        0, description="Incremented on every change of the result; the basis of its ETag"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -155,6 +329,7 @@ class ConversationResult(BaseModel):
                         "submitted_to_stripe": True,
                     },
                     "error": None,
+                    "version": 4,
                 }
             ]
         }
@@ -0,0 +1,259 @@
+"""
+Result store - Bounded in-memory conversation results that spill to disk.
+
+ConversationService keeps the result of every conversation it ran so that
+GET /api/conversation/{id} can serve it. Completed results carry the whole
+transcript, timeline and usage, so an API process that runs calls all day
+would grow without bound. ResultStore keeps them in memory under a byte
+budget and a TTL:
+
+- in-progress results are pinned: the pipeline and the outcome scorer update
+  them in place, so they are never evicted
+- completed and failed results are kept in LRU order; one that has not been
+  read for `ttl` seconds, or the least recently used ones while the store is
+  over `max_bytes`, is written to `<spill_dir>/<conversation_id>.json` and
+  dropped from memory
+- get() of a spilled result reads it back (rehydrates it) into memory
+
+Every put() bumps the result's version and serializes it once: a
+StoredResult holds the result with its JSON body and ETag at that version,
+so GETs are served from bytes without validating or encoding anything, and
+spilling writes the same bytes. Sizes are the length of that body, which is
+proportional to what the result holds in memory. stats() reports them with
+the process' peak RSS so pods can be sized from a running service.
+"""
+
+import os
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from prometheus_client import Counter, Gauge
+from pydantic_core import to_json
+
+from conversation.models import ConversationResult, ConversationStatus
+from conversation.result_view import result_etag
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600.0
+
+# Conversation IDs are used as file names; anything else is never on disk
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+RESULT_STORE_EVENTS = Counter(
+    "chargeback_result_store_events_total",
+    "Conversation result store events (hit, miss, rehydrate, spill, expire)",
+    ["event"],
+)
+RESULT_STORE_BYTES = Gauge(
+    "chargeback_result_store_bytes",
+    "Estimated bytes of conversation results held in memory",
+)
+
+
+class StoredResult(NamedTuple):
+    """A result with its JSON body and ETag, taken together at one version."""
+
+    result: ConversationResult
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, result: ConversationResult, body: bytes | None = None) -> "StoredResult":
+        return cls(result, to_json(result) if body is None else body, result_etag(result))
+
+
+def result_size(result: ConversationResult) -> int:
+    """Estimated size of a result: the length of its JSON serialization."""
+    return len(to_json(result))
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ResultStore:
+    """Thread-safe, memory-bounded store of conversation results."""
+
+    def __init__(
+        self,
+        spill_dir: Path | str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            spill_dir: Directory evicted results are written to (created if missing);
+                results already in it are served as spilled
+            max_bytes: Budget for results held in memory
+            ttl: Seconds a finished result stays in memory after it was last read
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pinned: dict[str, StoredResult] = {}
+        # conversation_id -> (stored result, last access), least recently used first
+        self._entries: OrderedDict[str, tuple[StoredResult, float]] = OrderedDict()
+        self._bytes = 0
+        self._spilled = {path.stem for path in self.spill_dir.glob("*.json")}
+        self._counts = {"hits": 0, "misses": 0, "rehydrations": 0, "spills": 0, "expirations": 0}
+
+    def put(self, result: ConversationResult) -> None:
+        """Insert or replace a result and bump its version (call again after updating one in place)."""
+        conversation_id = result.conversation_id
+        with self._lock:
+            result.version = max(result.version, self._version(conversation_id)) + 1
+            stored = StoredResult.of(result)
+            self._remove(conversation_id)
+            if result.status == ConversationStatus.IN_PROGRESS:
+                self._pinned[conversation_id] = stored
+            else:
+                self._entries[conversation_id] = (stored, self._clock())
+            self._bytes += len(stored.body)
+            self._evict()
+
+    def get(self, conversation_id: str) -> ConversationResult | None:
+        """The result of a conversation, read back from disk if it was spilled."""
+        stored = self.get_stored(conversation_id)
+        return stored.result if stored is not None else None
+
+    def get_stored(self, conversation_id: str) -> StoredResult | None:
+        """The result of a conversation with its serialized body, read back from disk if it was spilled."""
+        with self._lock:
+            stored = self._pinned.get(conversation_id)
+            if stored is not None:
+                self._count("hits", "hit")
+                return stored
+
+            entry = self._entries.get(conversation_id)
+            if entry is not None:
+                stored = entry[0]
+                self._entries[conversation_id] = (stored, self._clock())
+                self._entries.move_to_end(conversation_id)
+                self._count("hits", "hit")
+                self._evict()
+                return stored
+
+            stored = self._read_spilled(conversation_id)
+            if stored is None:
+                self._count("misses", "miss")
+                return None
+            self._entries[conversation_id] = (stored, self._clock())
+            self._bytes += len(stored.body)
+            self._count("rehydrations", "rehydrate")
+            self._evict()
+            return stored
+
+    def pop(self, conversation_id: str) -> None:
+        """Forget a conversation, in memory and on disk."""
+        with self._lock:
+            self._remove(conversation_id)
+            if conversation_id in self._spilled:
+                self._spilled.discard(conversation_id)
+                self._spill_path(conversation_id).unlink(missing_ok=True)
+            self._publish_bytes()
+
+    def __contains__(self, conversation_id: str) -> bool:
+        with self._lock:
+            return (
+                conversation_id in self._pinned
+                or conversation_id in self._entries
+                or conversation_id in self._spilled
+            )
+
+    def stats(self) -> dict:
+        """Memory and eviction statistics of the store."""
+        with self._lock:
+            self._evict()
+            pinned_bytes = sum(len(stored.body) for stored in self._pinned.values())
+            return {
+                "entries": len(self._entries) + len(self._pinned),
+                "in_progress": len(self._pinned),
+                "bytes": self._bytes,
+                "in_progress_bytes": pinned_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "spilled": len(self._spilled),
+                **self._counts,
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+
+    def _count(self, key: str, event: str) -> None:
+        self._counts[key] += 1
+        RESULT_STORE_EVENTS.labels(event).inc()
+
+    def _version(self, conversation_id: str) -> int:
+        """Version of the result currently held in memory (0 if none)."""
+        stored = self._pinned.get(conversation_id)
+        if stored is None and conversation_id in self._entries:
+            stored = self._entries[conversation_id][0]
+        return stored.result.version if stored is not None else 0
+
+    def _remove(self, conversation_id: str) -> None:
+        stored = self._pinned.pop(conversation_id, None)
+        if stored is not None:
+            self._bytes -= len(stored.body)
+        entry = self._entries.pop(conversation_id, None)
+        if entry is not None:
+            self._bytes -= len(entry[0].body)
+
+    def _evict(self) -> None:
+        """Spill expired results, then least recently used ones until within budget."""
+        expired_before = self._clock() - self.ttl
+        while self._entries:
+            conversation_id, (_, accessed_at) = next(iter(self._entries.items()))
+            if accessed_at > expired_before:
+                break
+            self._spill(conversation_id)
+            self._count("expirations", "expire")
+        while self._entries and self._bytes > self.max_bytes:
+            self._spill(next(iter(self._entries)))
+        self._publish_bytes()
+
+    def _spill(self, conversation_id: str) -> None:
+        stored, _ = self._entries.pop(conversation_id)
+        self._bytes -= len(stored.body)
+        if not _SAFE_ID.match(conversation_id):
+            # Cannot be stored under its ID; it is dropped like an expired entry
+            print(f"⚠️  Dropping result {conversation_id!r}: ID is not a valid file name")
+            return
+        path = self._spill_path(conversation_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.spill_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(stored.body)
+        os.replace(tmp_path, path)
+        self._spilled.add(conversation_id)
+        self._count("spills", "spill")
+
+    def _read_spilled(self, conversation_id: str) -> StoredResult | None:
+        if conversation_id not in self._spilled:
+            return None
+        try:
+            body = self._spill_path(conversation_id).read_bytes()
+        except FileNotFoundError:
+            # Removed behind our back (e.g. by another process sharing the directory)
+            self._spilled.discard(conversation_id)
+            return None
+        return StoredResult.of(ConversationResult.model_validate_json(body), body)
+
+    def _spill_path(self, conversation_id: str) -> Path:
+        return self.spill_dir / f"{conversation_id}.json"
+
+    def _publish_bytes(self) -> None:
+        RESULT_STORE_BYTES.set(self._bytes)
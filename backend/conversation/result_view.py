@@ -0,0 +1,77 @@
+"""
+Result views - ETags, transcript deltas and field projections of results.
+
+Dashboards poll GET /api/conversation/{id} every few seconds, and a
+completed result carries the whole transcript and every evidence text. These
+helpers let a poll return only what it needs:
+
+- result_etag(): an ETag per result version; a matching If-None-Match gets a
+  304 without a body
+- since=<message index>: only the transcript entries from that index on (the
+  next poll asks for since + number of entries received)
+- fields=status,summary: only the listed top-level fields
+  (conversation_id and version are always included)
+
+Bodies are serialized straight to bytes by pydantic-core; the full body of
+each version is serialized once, by ResultStore, and served as is.
+"""
+
+from pydantic_core import to_json
+
+from conversation.models import ConversationResult
+
+RESULT_FIELDS = tuple(ConversationResult.model_fields)
+ALWAYS_INCLUDED = ("conversation_id", "version")
+
+
+def result_etag(result: ConversationResult) -> str:
+    """ETag of a result's current version."""
+    # The status is part of the tag: results synthesized from job queue state carry no version
+    return f'"{result.version}-{result.status.value}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """
+    Parse a comma-separated fields= projection.
+
+    Raises:
+        ValueError: If a field is not a ConversationResult field
+    """
+    if not fields:
+        return None
+    names = tuple(name.strip() for name in fields.split(",") if name.strip())
+    unknown = [name for name in names if name not in RESULT_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Supported: {', '.join(RESULT_FIELDS)}"
+        )
+    return names
+
+
+def render_result(
+    result: ConversationResult,
+    since: int | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> bytes:
+    """
+    JSON body of a result, restricted to a transcript delta and fields.
+
+    Args:
+        result: Conversation result
+        since: Only include transcript entries from this message index on
+        fields: Only include these top-level fields (plus conversation_id and version)
+    """
+    include = set(fields) | set(ALWAYS_INCLUDED) if fields else None
+    if since is not None and result.transcript is not None:
+        # Shallow copy: only the new entries are serialized, nothing is re-validated
+        result = result.model_copy(update={"transcript": result.transcript[since:]})
+    return to_json(result, include=include)
@@ -1,36 +1,58 @@
+import asyncio
 import os
 import time
 import uuid
 import threading
-import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable
 
-from dotenv import load_dotenv
 from anthropic import AsyncAnthropic
+from config import Settings, get_settings
 from conversation.models import (
     ConversationResult,
     ConversationStatus,
     TranscriptEntry,
     EvidenceResult,
     DisputeEvaluation,
+    StageTiming,
+    ConversationUsage,
+    LiveOutcome,
 )
+from conversation.batch import BatchItem, BatchRegistry, ConversationBatch
+from conversation.campaign import Campaign, CallingWindow, CampaignScheduler, RetryPolicy
+from conversation.context_assembler import ContextAssembler
+from conversation.job_queue import SQLiteJobQueue
+from conversation.result_store import ResultStore, StoredResult
+from conversation.start_guard import CustomerCooldownError, StartGuard
+from conversation.stage_graph import StageGraph
 from elevenlabs_wrapper.phone_caller import PhoneCaller
 from elevenlabs_wrapper.agent import Agent, AgentPromptOverride, AgentConfigOverride
 from elevenlabs_wrapper.transcript_storage import TranscriptStorage
+from elevenlabs_wrapper.post_call_analyzer import PostCallAnalysis, PostCallAnalyzer
 from elevenlabs_wrapper.transcript_summarizer import TranscriptSummarizer
+from elevenlabs_wrapper.outcome_scorer import IncrementalOutcomeScorer, OutcomeEstimate
 from elevenlabs_wrapper.conversation_manager import (
+    CallFailedError,
     ConversationData,
     TranscriptMessage,
     ConversationMetadata,
 )
+from observability import UsageRecord, get_ledger, span, track_timeline
+from observability.tracing import CONVERSATIONS, CONVERSATIONS_IN_PROGRESS
 from rag_service import RAGService
 from stripe_integration.dispute_response_generator import DisputeResponseGenerator
 from stripe_integration.dispute_evaluator import DisputeEvaluator
+from stripe_integration.outcome_classifier import FastPathClassifier
+
+# Cap on RAG matches per record type; the RAG type quotas set the counts
+RAG_TOP_K = 10
+
 
-load_dotenv()
+def charge_dispute_reason(charge_details: dict[str, Any]) -> str:
+    """Dispute reason the pipeline retrieves context for (generic if the details have none)."""
+    return charge_details.get("dispute_reason", "subscription_canceled")
 
-agent_id = os.getenv("AGENT_ID")
-anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
 
 # Base agent prompt - will be combined with RAG context
 BASE_AGENT_PROMPT = """# Personality
@@ -94,15 +116,103 @@ Customer Says: "But why can't you just reverse it?" You Respond: "We need to use
 
 
 class ConversationService:
-    def __init__(self, storage_dir: str = "transcripts"):
-        self._conversations: dict[str, ConversationResult] = {}
+    def __init__(
+        self,
+        storage_dir: str = "transcripts",
+        rag_service: RAGService | None = None,
+        dispute_response_generator: DisputeResponseGenerator | None = None,
+        dispute_evaluator: DisputeEvaluator | None = None,
+        phone_caller: PhoneCaller | None = None,
+        anthropic_client: AsyncAnthropic | None = None,
+        context_assembler: ContextAssembler | None = None,
+        poll_interval: float = 1.5,
+        call_timeout: int = 600,
+        settings: Settings | None = None,
+        job_queue: SQLiteJobQueue | None = None,
+        outcome_classifier: FastPathClassifier | None = None,
+        result_store: ResultStore | None = None,
+    ):
+        """
+        Initialize the conversation service.
+
+        Every external dependency can be injected (e.g. offline stand-ins for
+        benchmarks); anything not provided is built from environment variables.
+
+        Args:
+            storage_dir: Directory for saved transcripts
+            rag_service: Knowledge base retrieval service
+            dispute_response_generator: Stripe + Claude argument generator
+            dispute_evaluator: Transcript evaluator and evidence submitter
+            phone_caller: Outbound caller (a new one is built per call if not provided)
+            anthropic_client: Async Claude client used for summaries (a new one is
+                built per call from ANTHROPIC_API_KEY if not provided)
+            context_assembler: Token-budgeted builder of the prompt's knowledge and
+                argument sections (default budgets if not provided)
+            poll_interval: Seconds between call status polls
+            call_timeout: Maximum seconds to wait for a call to finish
+            settings: Agent ID and API keys (read from the environment if not provided)
+            job_queue: Queue that conversations are handed to for worker processes
+                (`python -m conversation.worker`); defaults to one at JOB_QUEUE_PATH
+                if set, otherwise conversations run in this process
+            outcome_classifier: Rule-based classifier whose confident outcomes skip
+                the Claude analysis; defaults to one with the settings' threshold
+                and calibration
+            result_store: Memory-bounded store of conversation results; defaults to
+                one with the settings' byte budget and TTL that spills to
+                RESULT_SPILL_DIR (or `<storage_dir>/results`)
+        """
+        self.settings = settings or get_settings()
+        if job_queue is None and self.settings.job_queue_path:
+            job_queue = SQLiteJobQueue(self.settings.job_queue_path)
+        self.job_queue = job_queue
+        # With a queue, call times live in the queue database so all workers share them
+        self.start_guard = StartGuard(self.settings.customer_cooldown_seconds, call_log=job_queue)
+        self.results = result_store or ResultStore(
+            spill_dir=self.settings.result_spill_dir or os.path.join(storage_dir, "results"),
+            max_bytes=self.settings.result_cache_max_bytes,
+            ttl=self.settings.result_cache_ttl_seconds,
+        )
         self._charge_ids: dict[str, str] = {}  # Maps conversation_id -> charge_id
         self._phone_number_overrides: dict[str, str] = {}  # Maps conversation_id -> phone_number override
+        self._prepared: dict[str, dict] = {}  # Maps conversation_id -> batch preparation (see start_batch)
+        self._lines: dict[str, str] = {}  # Maps conversation_id -> outbound phone number ID
+        self._call_listeners: list[Callable[[str, ConversationData], None]] = []
+        self.batches = BatchRegistry()
+        self.campaigns = CampaignScheduler(
+            self,
+            lines=self.settings.campaign_lines or (None,),
+            line_concurrency=self.settings.campaign_line_concurrency,
+            window=CallingWindow.parse(self.settings.calling_window, self.settings.calling_days),
+            default_timezone=self.settings.default_customer_timezone,
+            retry=RetryPolicy(
+                max_attempts=self.settings.campaign_max_attempts,
+                backoff_seconds=self.settings.campaign_retry_backoff_seconds,
+            ),
+        )
         self._lock = threading.Lock()
         self.storage = TranscriptStorage(storage_dir=storage_dir)
-        self.rag_service = RAGService()
-        self.dispute_response_generator = DisputeResponseGenerator()
-        self.dispute_evaluator = DisputeEvaluator()
+        self.rag_service = rag_service or RAGService()
+        self.dispute_response_generator = (
+            dispute_response_generator or DisputeResponseGenerator()
+        )
+        if outcome_classifier is None:
+            outcome_classifier = (
+                FastPathClassifier.load(
+                    self.settings.fast_path_calibration_path,
+                    threshold=self.settings.fast_path_threshold,
+                )
+                if self.settings.fast_path_calibration_path
+                else FastPathClassifier(threshold=self.settings.fast_path_threshold)
+            )
+        self.outcome_classifier = outcome_classifier
+        self.dispute_evaluator = dispute_evaluator or DisputeEvaluator(
+            outcome_classifier=outcome_classifier
+        )
+        self.phone_caller = phone_caller
+        self.anthropic_client = anthropic_client
+        self.context_assembler = context_assembler or ContextAssembler()
+        self.poll_interval = poll_interval
+        self.call_timeout = call_timeout
 
     def _create_fake_conversation(
         self, product_name: str, first_name: str, reason: str
@@ -156,32 +266,162 @@ class ConversationService:
 
         return ConversationData(
             conversation_id=f"fake_{uuid.uuid4().hex[:8]}",
-            agent_id=agent_id or "fake_agent",
+            agent_id=self.settings.agent_id or "fake_agent",
             status="done",
             transcript=mock_transcript,
             metadata=mock_metadata,
         )
 
-    def create_conversation(self, charge_id: str, phone_number_override: str | None = None) -> str:
-        conversation_id = f"conv_{uuid.uuid4().hex[:12]}"
+    def create_conversation(
+        self,
+        charge_id: str,
+        phone_number_override: str | None = None,
+        conversation_id: str | None = None,
+        prepared: dict | None = None,
+        phone_number_id: str | None = None,
+    ) -> str:
+        conversation_id = conversation_id or f"conv_{uuid.uuid4().hex[:12]}"
 
         with self._lock:
-            self._conversations[conversation_id] = ConversationResult(
-                conversation_id=conversation_id,
-                status=ConversationStatus.IN_PROGRESS,
+            self.results.put(
+                ConversationResult(
+                    conversation_id=conversation_id,
+                    status=ConversationStatus.IN_PROGRESS,
+                )
             )
             self._charge_ids[conversation_id] = charge_id
             if phone_number_override:
                 self._phone_number_overrides[conversation_id] = phone_number_override
+            if prepared:
+                self._prepared[conversation_id] = prepared
+            if phone_number_id:
+                self._lines[conversation_id] = phone_number_id
 
         return conversation_id
 
+    def start_conversation(
+        self,
+        charge_id: str,
+        phone_number_override: str | None = None,
+        fake_conv: bool = False,
+        update_stripe: bool = False,
+        idempotency_key: str | None = None,
+        prepared: dict | None = None,
+        phone_number_id: str | None = None,
+    ) -> tuple[str, bool]:
+        """
+        Create a conversation for a charge, or return the one already answering this request.
+
+        A repeated Idempotency-Key, or a charge that already has a queued or
+        running conversation, returns the existing conversation ID. A new
+        conversation is refused while its customer is within the call cooldown.
+        With a job queue, a new conversation is enqueued for the workers;
+        otherwise the caller runs it with run_conversation().
+
+        Args:
+            charge_id: Stripe charge ID
+            phone_number_override: Optional number to call instead of the customer's
+            fake_conv: Simulate the call (queued conversations only; see run_conversation)
+            update_stripe: Submit evidence to Stripe (queued conversations only)
+            idempotency_key: Optional client key for safe retries
+            prepared: Charge details and shared retrieval prepared by start_batch()
+            phone_number_id: Outbound line to call from (defaults to the phone caller's)
+
+        Returns:
+            (conversation_id, created)
+
+        Raises:
+            CustomerCooldownError: If the customer was called within the cooldown
+            IdempotencyKeyConflictError: If the key was already used for another charge
+        """
+        conversation_id = f"conv_{uuid.uuid4().hex[:12]}"
+
+        def check_cooldown():
+            self.start_guard.check_cooldown(charge_id, phone_number_override)
+
+        if self.job_queue is not None:
+            job, created = self.job_queue.enqueue_unique(
+                conversation_id,
+                {
+                    "charge_id": charge_id,
+                    "phone_number_override": phone_number_override,
+                    "fake_conv": fake_conv,
+                    "update_stripe": update_stripe,
+                    "prepared": prepared,
+                    "phone_number_id": phone_number_id,
+                },
+                dedupe_key=charge_id,
+                idempotency_key=idempotency_key,
+                idempotency_ttl=self.start_guard.idempotency_ttl,
+                before_create=check_cooldown,
+            )
+            return job.job_id, created
+
+        def register():
+            check_cooldown()
+            self.create_conversation(
+                charge_id,
+                phone_number_override,
+                conversation_id=conversation_id,
+                prepared=prepared,
+                phone_number_id=phone_number_id,
+            )
+
+        return self.start_guard.reserve(
+            charge_id, conversation_id, idempotency_key, before_create=register
+        )
+
     def run_conversation(
         self,
         conversation_id: str,
         fake_conv: bool = False,
         update_stripe: bool = False,
     ) -> None:
+        """
+        Run the full pipeline for a conversation and record its stage timeline.
+
+        Every span recorded while the pipeline runs (Stripe, Claude, embeddings,
+        Pinecone, ElevenLabs, disk) is attached to the ConversationResult, along
+        with the token and cost usage ledgered for this conversation.
+        """
+        CONVERSATIONS_IN_PROGRESS.inc()
+        try:
+            with track_timeline(conversation_id) as timeline:
+                self._run_conversation(conversation_id, fake_conv, update_stripe)
+        finally:
+            CONVERSATIONS_IN_PROGRESS.dec()
+            self.start_guard.release(conversation_id)
+            with self._lock:
+                # Run arguments are only read when the run starts
+                self._charge_ids.pop(conversation_id, None)
+                self._phone_number_overrides.pop(conversation_id, None)
+                self._prepared.pop(conversation_id, None)
+                self._lines.pop(conversation_id, None)
+                result = self.results.get(conversation_id)
+                if result is not None:
+                    result.timeline = [
+                        StageTiming(
+                            name=record.name,
+                            start_offset_ms=round(record.start_offset * 1000, 3),
+                            duration_ms=round(record.duration * 1000, 3),
+                            outcome=record.outcome,
+                        )
+                        for record in timeline.snapshot()
+                    ]
+                    result.usage = ConversationUsage(
+                        **get_ledger().conversation_usage(conversation_id)
+                    )
+                    # Re-measures the result now that it carries its timeline and usage
+                    self.results.put(result)
+                    CONVERSATIONS.labels(result.status.value).inc()
+
+    def _run_conversation(
+        self,
+        conversation_id: str,
+        fake_conv: bool,
+        update_stripe: bool,
+    ) -> None:
+        agent_id = self.settings.agent_id
         if not agent_id:
             raise ValueError("AGENT_ID must be set in environment variables")
 
@@ -189,20 +429,28 @@ class ConversationService:
         with self._lock:
             charge_id = self._charge_ids.get(conversation_id)
             phone_number_override = self._phone_number_overrides.get(conversation_id)
+            prepared = self._prepared.get(conversation_id) or {}
+            phone_number_id = self._lines.get(conversation_id)
 
         if not charge_id:
             raise ValueError(f"No charge_id found for conversation {conversation_id}")
 
-        phone_caller = PhoneCaller()
+        phone_caller = self.phone_caller or PhoneCaller()
 
-        # Fetch comprehensive charge details from Stripe
-        print(f"💳 Fetching Stripe charge details: {charge_id}")
-        charge_details = self.dispute_response_generator.get_charge_details(charge_id)
+        # Fetch comprehensive charge details from Stripe (unless a batch loaded them)
+        charge_details = prepared.get("charge_details")
+        if charge_details is None:
+            print(f"💳 Fetching Stripe charge details: {charge_id}")
+            with span("pipeline.stripe_fetch"):
+                charge_details = self.dispute_response_generator.get_charge_details(charge_id)
 
         # Generate AI-powered response arguments
-        response_arguments, phone_number, name = (
-            self.dispute_response_generator.generate_dispute_response(charge_id)
-        )
+        with span("pipeline.argument_generation"):
+            response_arguments, phone_number, name = (
+                self.dispute_response_generator.generate_dispute_response(
+                    charge_id, metadata=charge_details["metadata"]
+                )
+            )
 
         # Check for phone number override from request, then environment
         if phone_number_override:
@@ -226,19 +474,21 @@ class ConversationService:
         print(f"   - Phone: {phone_number}")
 
         # Get dispute reason from charge details (if available, otherwise use generic)
-        dispute_reason = charge_details.get("dispute_reason", "subscription_canceled")
+        dispute_reason = charge_dispute_reason(charge_details)
 
         # Query RAG for relevant context before making the call
         print(f"🔍 Querying RAG for: {dispute_reason} - {product_info['name']}")
-        rag_context = self.rag_service.query_context(
-            chargeback_reason=dispute_reason,
-            product_name=product_info["name"],  # Use actual product name from Stripe
-            customer_name=customer_info["name"],  # Use actual customer name from Stripe
-            top_k=10,  # Get top 10 most relevant results
-        )
+        with span("pipeline.rag"):
+            rag_context = self.rag_service.query_context(
+                chargeback_reason=dispute_reason,
+                product_name=product_info["name"],  # Use actual product name from Stripe
+                customer_name=customer_info["name"],  # Use actual customer name from Stripe
+                top_k=RAG_TOP_K,
+                shared_results=prepared.get("shared_context"),
+            )
 
-        # Format the context for the agent
-        context_string = self.rag_service.format_context_for_agent(rag_context)
+        # Fit the RAG context and arguments into their token budgets
+        assembled = self.context_assembler.assemble(rag_context, response_arguments)
 
         # Log what RAG found
         print(f"✅ RAG Results:")
@@ -246,7 +496,7 @@ class ConversationService:
         print(f"   - {len(rag_context['policies'])} policies")
         print(f"   - {len(rag_context['orders'])} orders")
         print(f"   - {len(rag_context['resolution_authority'])} resolution authorities")
-        print(f"   - Context length: {len(context_string)} chars")
+        print(f"   - Context length: {len(assembled.knowledge)} chars")
 
         # Create dynamic variables with actual Stripe data
         dynamic_variables = {
@@ -269,6 +519,7 @@ class ConversationService:
         agent = Agent(
             agent_id=agent_id,
             dynamic_variables=dynamic_variables,
+            phone_number_id=phone_number_id,
         )
 
         # Combine base prompt with RAG context
@@ -293,18 +544,21 @@ PRODUCT & CHARGE DETAILS:
 - Dispute Reason: {dispute_reason}
 
 RELEVANT KNOWLEDGE BASE:
-{context_string}
+{assembled.knowledge}
 
 KEY EVIDENCE-BASED ARGUMENTS TO LEVERAGE:
-{response_arguments}
+{assembled.arguments}
 
 Note: Use the above information to support your procedural guidance. The evidence-based arguments are particularly important - they come directly from our records and can help resolve the dispute. Maintain your established tone and approach."""
 
         # Combine base prompt with RAG supplement
         full_prompt = DISCOUNT_AGENT_PROMPT + rag_supplement
+        self.context_assembler.report_prompt(full_prompt, assembled)
         agent.set_prompt(prompt=full_prompt)
 
         start_time = time.time()
+        scorer = None
+        conversation_data = None
 
         try:
             if fake_conv:
@@ -318,71 +572,60 @@ Note: Use the above information to support your procedural guidance. The evidenc
                 )
                 print(f"✅ Fake conversation completed")
             else:
+                # Refuse to dial a customer who was called within the cooldown
+                self.start_guard.claim_call(phone_number, charge_id)
+
+                # Score the outcome as the transcript arrives
+                scorer = self._outcome_scorer(conversation_id)
+
                 # Make real phone call and wait for completion
-                conversation_data = phone_caller.make_call_and_wait(
-                    agent=agent,
-                    to_number=phone_number,  # Use phone number from Stripe
-                    poll_interval=1.5,
-                    timeout=600,  # 10 minute timeout
-                    print_transcript=False,  # Don't print to console in background task
+                with span("pipeline.call"):
+                    conversation_data = phone_caller.make_call_and_wait(
+                        agent=agent,
+                        to_number=phone_number,  # Use phone number from Stripe
+                        poll_interval=self.poll_interval,
+                        timeout=self.call_timeout,
+                        print_transcript=False,  # Don't print to console in background task
+                        on_update=scorer.observe,
+                    )
+
+                # Record telephony cost (ElevenLabs credits) in the usage ledger
+                get_ledger().record(
+                    UsageRecord(
+                        stage="elevenlabs.call",
+                        provider="elevenlabs",
+                        conversation_id=conversation_id,
+                        latency_ms=round((time.time() - start_time) * 1000, 3),
+                        call_credits=conversation_data.metadata.cost or 0,
+                        call_seconds=conversation_data.metadata.call_duration_secs or 0,
+                    )
                 )
 
+            # The call is over (its line is free); the post-call stages follow
+            self._call_ended(conversation_id, conversation_data)
+
             end_time = time.time()
             duration = end_time - start_time
 
             # Convert transcript to API format
-            transcript = [
-                TranscriptEntry(
-                    speaker=(
-                        msg.role if msg.role in ("user", "agent") else "agent"
-                    ),  # Ensure valid literal type
-                    text=msg.message,
-                    timestamp=msg.time_in_call_secs,
-                )
-                for msg in conversation_data.transcript
-            ]
+            transcript = self._transcript_entries(conversation_data.transcript)
 
-            # Save transcript to storage
-            self.storage.save_transcript(conversation_data, filename=conversation_id)
+            # Run the post-call stages; independent ones run concurrently
+            outcomes = self._post_call_graph(
+                conversation_data, charge_id, conversation_id, update_stripe, scorer
+            ).run()
 
-            # Generate summary using TranscriptSummarizer
-            summary = None
-            if anthropic_api_key:
-                try:
-                    summarizer = TranscriptSummarizer()
-                    anthropic_client = AsyncAnthropic(api_key=anthropic_api_key)
-                    summary = asyncio.run(
-                        summarizer.summarize(
-                            client=anthropic_client,
-                            transcript=conversation_data.transcript,
-                        )
-                    )
-                except Exception as e:
-                    # Log error but don't fail the whole conversation
-                    print(f"Warning: Failed to generate summary: {e}")
+            # A transcript that could not be saved fails the conversation
+            if not outcomes["save_transcript"].ok:
+                raise outcomes["save_transcript"].error
 
-            # Evaluate transcript and submit evidence to Stripe
-            print("\n🔍 Evaluating transcript and submitting evidence to Stripe...")
-            evidence_result_data = None
-            try:
-                # Convert transcript to format expected by DisputeEvaluator
-                evaluator_transcript = [
-                    {
-                        "role": msg.role,
-                        "message": msg.message,
-                        "time_in_call_secs": msg.time_in_call_secs,
-                    }
-                    for msg in conversation_data.transcript
-                ]
-
-                # Submit evidence immediately to Stripe
-                evidence_dict = self.dispute_evaluator.submit_evidence_to_stripe(
-                    charge_id=charge_id,
-                    transcript=evaluator_transcript,
-                    submit_immediately=True,  # Submit to bank immediately
-                    send_to_stripe=update_stripe,  # Actually send to Stripe based on flag
-                )
+            analysis = outcomes["analysis"].result
+            summary = analysis.summary if analysis else None
 
+            evidence_result_data = None
+            evidence = outcomes["evidence"]
+            if evidence.ok:
+                evidence_dict = evidence.result
                 print("✅ Evidence submitted successfully!")
                 print(f"   - Dispute ID: {evidence_dict['dispute_id']}")
                 print(f"   - Resolved: {evidence_dict['evaluation']['resolved']}")
@@ -415,41 +658,430 @@ Note: Use the above information to support your procedural guidance. The evidenc
                     status=evidence_dict["status"],
                     submitted_to_stripe=update_stripe,
                 )
-            except Exception as e:
+            else:
                 # Log error but don't fail the whole conversation
-                print(f"⚠️  Warning: Failed to submit evidence to Stripe: {e}")
-                import traceback
-
-                traceback.print_exc()
+                error = evidence.error or outcomes["dispute_lookup"].error
+                print(f"⚠️  Warning: Failed to submit evidence to Stripe: {error}")
 
-            with self._lock:
-                self._conversations[conversation_id] = ConversationResult(
+            self.results.put(
+                ConversationResult(
                     conversation_id=conversation_id,
                     status=ConversationStatus.COMPLETED,
                     transcript=transcript,
                     duration_seconds=conversation_data.metadata.call_duration_secs,
                     summary=summary,
                     evidence_result=evidence_result_data,
+                    termination_reason=conversation_data.metadata.termination_reason,
+                    live_outcome=self._live_outcome(scorer.estimate) if scorer else None,
                 )
+            )
 
         except Exception as e:
             end_time = time.time()
             duration = end_time - start_time
+            if isinstance(e, CallFailedError):
+                self._call_ended(conversation_id, e.conversation)
+                conversation_data = e.conversation
 
-            with self._lock:
-                self._conversations[conversation_id] = ConversationResult(
+            self.results.put(
+                ConversationResult(
                     conversation_id=conversation_id,
                     status=ConversationStatus.FAILED,
                     transcript=None,
                     duration_seconds=duration,
                     error=str(e),
+                    # Set whenever the call took place, also if a post-call stage failed
+                    termination_reason=(
+                        conversation_data.metadata.termination_reason if conversation_data else None
+                    ),
                 )
+            )
+        finally:
+            if scorer is not None:
+                scorer.close()
+
+    def add_call_listener(self, listener: Callable[[str, ConversationData], None]) -> None:
+        """
+        Register a callback for calls of this process that have ended.
+
+        `listener(conversation_id, conversation_data)` runs in the conversation's
+        thread as soon as the call hangs up (or failed), before the post-call
+        stages; calls run by queue workers are not reported.
+        """
+        self._call_listeners.append(listener)
+
+    def _call_ended(self, conversation_id: str, conversation_data: ConversationData) -> None:
+        for listener in self._call_listeners:
+            try:
+                listener(conversation_id, conversation_data)
+            except Exception as e:
+                print(f"⚠️  Call listener failed: {e}")
+
+    def _async_anthropic_client(self) -> AsyncAnthropic | None:
+        if self.anthropic_client is None and self.settings.anthropic_api_key:
+            return AsyncAnthropic(api_key=self.settings.anthropic_api_key)
+        return self.anthropic_client
+
+    def _outcome_scorer(self, conversation_id: str) -> IncrementalOutcomeScorer:
+        """
+        Build the in-call outcome scorer of a conversation.
+
+        Every changed estimate is published as the conversation's live_outcome
+        while it is in progress, together with the transcript so far, so pollers
+        can follow the call with since=. LLM checkpoints use the post-call analyzer, so the final
+        one (started as soon as the call ends) is the post-call analysis.
+        Checkpoints are skipped while the fast path is confident.
+        """
+        anthropic_client = self._async_anthropic_client()
+        checkpoint = None
+        if anthropic_client is not None:
+            def checkpoint(transcript: list[TranscriptMessage]) -> PostCallAnalysis | None:
+                fast_path = self.outcome_classifier and self.outcome_classifier.classify(transcript)
+                if fast_path and fast_path.confident:
+                    return None
+                # Runs in the scorer's thread, on its own event loop
+                return asyncio.run(
+                    PostCallAnalyzer().analyze(client=anthropic_client, transcript=transcript)
+                )
+
+        def publish(estimate: OutcomeEstimate) -> None:
+            with self._lock:
+                result = self.results.get(conversation_id)
+                if result is None or result.status != ConversationStatus.IN_PROGRESS:
+                    return
+                live_outcome = self._live_outcome(estimate)
+                transcript = scorer.transcript
+                # Every put is a new version (and ETag); unchanged results keep theirs
+                if result.live_outcome == live_outcome and len(result.transcript or []) == len(transcript):
+                    return
+                result.live_outcome = live_outcome
+                result.transcript = self._transcript_entries(transcript)
+                self.results.put(result)
+
+        scorer = IncrementalOutcomeScorer(checkpoint=checkpoint, on_update=publish)
+        return scorer
+
+    @staticmethod
+    def _transcript_entries(messages: list[TranscriptMessage]) -> list[TranscriptEntry]:
+        return [
+            TranscriptEntry(
+                speaker=(
+                    msg.role if msg.role in ("user", "agent") else "agent"
+                ),  # Ensure valid literal type
+                text=msg.message,
+                timestamp=msg.time_in_call_secs,
+            )
+            for msg in messages
+        ]
+
+    @staticmethod
+    def _live_outcome(estimate: OutcomeEstimate) -> LiveOutcome:
+        return LiveOutcome(
+            resolution_type=estimate.resolution_type,
+            resolved=estimate.resolved,
+            confidence=estimate.confidence,
+            customer_decision=estimate.customer_decision,
+            source=estimate.source,
+            turns=estimate.turns,
+        )
+
+    def _post_call_graph(
+        self,
+        conversation_data: ConversationData,
+        charge_id: str,
+        conversation_id: str,
+        update_stripe: bool,
+        scorer: IncrementalOutcomeScorer | None = None,
+    ) -> StageGraph:
+        """
+        Build the post-call stage graph.
+
+        save_transcript, analysis and dispute_lookup are independent and run
+        concurrently; evidence waits for the analysis (its evaluation), the
+        dispute lookup and the saved transcript, so a conversation that fails
+        for lack of a transcript has submitted nothing to Stripe. Analysis is
+        optional: if it fails, the evaluator falls back to its own transcript
+        evaluation. A confident fast-path outcome replaces the evaluation, so
+        Claude is only asked for the summary; if the in-call scorer already
+        analyzed the final transcript, that analysis is used as is.
+        """
+        anthropic_client = self._async_anthropic_client()
+
+        def save_transcript():
+            return self.storage.save_transcript(conversation_data, filename=conversation_id)
+
+        async def analysis():
+            # Unambiguous outcomes don't need Claude
+            if self.outcome_classifier is not None:
+                fast_path = self.outcome_classifier.decide(conversation_data.transcript)
+                if fast_path is not None:
+                    summary = None
+                    if anthropic_client is not None:
+                        try:
+                            summary = await TranscriptSummarizer().summarize(
+                                client=anthropic_client, transcript=conversation_data.transcript
+                            )
+                        except Exception as e:
+                            print(f"⚠️  Call summary failed: {e}")
+                    return PostCallAnalysis(summary=summary, **fast_path.to_evaluation())
+
+            # Usually started by the scorer while the call was wrapping up
+            checkpoint = scorer.analysis_for(conversation_data.transcript) if scorer else None
+            if checkpoint is not None:
+                try:
+                    analysis = await asyncio.wrap_future(checkpoint)
+                    if analysis is not None:
+                        return analysis
+                except Exception as e:
+                    print(f"⚠️  Final outcome checkpoint failed, analyzing again: {e}")
+
+            # Summarize and evaluate the call in a single Claude request
+            if anthropic_client is None:
+                return None
+            return await PostCallAnalyzer().analyze(
+                client=anthropic_client, transcript=conversation_data.transcript
+            )
+
+        def dispute_lookup():
+            return self.dispute_evaluator.fetch_dispute_context(charge_id)
+
+        def evidence(analysis, dispute_lookup, save_transcript):
+            # Convert transcript to format expected by DisputeEvaluator
+            evaluator_transcript = [
+                {
+                    "role": msg.role,
+                    "message": msg.message,
+                    "time_in_call_secs": msg.time_in_call_secs,
+                }
+                for msg in conversation_data.transcript
+            ]
+
+            print("\n🔍 Generating evidence and submitting it to Stripe...")
+            return self.dispute_evaluator.submit_evidence_to_stripe(
+                charge_id=charge_id,
+                transcript=evaluator_transcript,
+                submit_immediately=True,  # Submit to bank immediately
+                send_to_stripe=update_stripe,  # Actually send to Stripe based on flag
+                evaluation=analysis.to_evaluation() if analysis else None,
+                dispute_context=dispute_lookup,
+            )
+
+        return (
+            StageGraph(span_prefix="pipeline")
+            .add("save_transcript", save_transcript, retries=2, retry_delay=0.2)
+            .add("analysis", analysis, optional=True, retries=1)
+            .add("dispute_lookup", dispute_lookup, retries=2)
+            .add("evidence", evidence, depends_on=("analysis", "dispute_lookup", "save_transcript"))
+        )
 
     def get_conversation_result(
         self, conversation_id: str
     ) -> ConversationResult | None:
+        result = self.results.get(conversation_id)
+        if result is not None or self.job_queue is None:
+            return result
+        return self._queued_result(conversation_id)
+
+    def get_stored_result(self, conversation_id: str) -> StoredResult | None:
+        """The result of a conversation with its JSON body and ETag, for serving as is."""
+        stored = self.results.get_stored(conversation_id)
+        if stored is not None or self.job_queue is None:
+            return stored
+        result = self._queued_result(conversation_id)
+        return StoredResult.of(result) if result is not None else None
+
+    def _queued_result(self, conversation_id: str) -> ConversationResult | None:
+        """The result of a conversation run by a worker, from the job queue."""
+        job = self.job_queue.get(conversation_id)
+        if job is None:
+            return None
+        if job.result is not None:
+            return ConversationResult.model_validate(job.result)
+        if job.status == "failed":
+            return ConversationResult(
+                conversation_id=conversation_id, status=ConversationStatus.FAILED, error=job.error
+            )
+        return ConversationResult(conversation_id=conversation_id, status=ConversationStatus.IN_PROGRESS)
+
+    def release_conversation(self, conversation_id: str) -> None:
+        """Forget a conversation held by this process (e.g. once a worker has stored its result)."""
         with self._lock:
-            return self._conversations.get(conversation_id)
+            self.results.pop(conversation_id)
+            self._charge_ids.pop(conversation_id, None)
+            self._phone_number_overrides.pop(conversation_id, None)
+            self._prepared.pop(conversation_id, None)
+            self._lines.pop(conversation_id, None)
+
+    def get_conversation_usage(self, conversation_id: str) -> ConversationUsage | None:
+        """Usage totals for a conversation, including one that is still running."""
+        running_here = conversation_id in self.results
+        if not running_here:
+            # Conversations run by a worker carry their usage in the stored result
+            result = self.get_conversation_result(conversation_id)
+            if result is None:
+                return None
+            if result.usage is not None:
+                return result.usage
+        return ConversationUsage(**get_ledger().conversation_usage(conversation_id))
+
+    def start_batch(
+        self,
+        charge_ids: list[str],
+        fake_conv: bool = False,
+        update_stripe: bool = False,
+        concurrency: int | None = None,
+    ) -> ConversationBatch:
+        """
+        Start conversations for many charges with shared preparation (see conversation.batch).
+
+        Charges that do not exist, or whose customer is within the call cooldown,
+        are recorded in the batch with an error instead of failing it; charges
+        with an active conversation get that conversation.
+
+        Args:
+            charge_ids: Stripe charge IDs (duplicates are ignored)
+            fake_conv: Simulate the calls (see run_conversation)
+            update_stripe: Submit evidence to Stripe
+            concurrency: Conversations run at once in this process (defaults to
+                the settings' batch concurrency; with a job queue the workers'
+                concurrency applies instead)
+
+        Returns:
+            The batch, already registered for batch_progress()
+        """
+        charge_ids = list(dict.fromkeys(charge_ids))
+        batch = ConversationBatch(
+            batch_id=f"batch_{uuid.uuid4().hex[:12]}",
+            concurrency=concurrency or self.settings.batch_concurrency,
+        )
+
+        print(f"💳 Loading {len(charge_ids)} charges for {batch.batch_id}")
+        with span("batch.stripe_fetch"):
+            charge_details = self.dispute_response_generator.get_charge_details_bulk(charge_ids)
+
+        # The reason/product part of retrieval, once per group of charges
+        shared_context: dict[tuple[str, str], dict] = {}
+        with span("batch.rag"):
+            for details in charge_details.values():
+                group = (charge_dispute_reason(details), details["product_info"]["name"])
+                if group not in shared_context:
+                    shared_context[group] = self.rag_service.shared_context(*group, top_k=RAG_TOP_K)
+        batch.shared_retrievals = len(shared_context)
+
+        to_run = []
+        for charge_id in charge_ids:
+            item = BatchItem(charge_id=charge_id)
+            batch.items.append(item)
+            details = charge_details.get(charge_id)
+            if details is None:
+                item.error = f"No such charge: {charge_id}"
+                continue
+            group = (charge_dispute_reason(details), details["product_info"]["name"])
+            try:
+                item.conversation_id, created = self.start_conversation(
+                    charge_id,
+                    fake_conv=fake_conv,
+                    update_stripe=update_stripe,
+                    prepared={"charge_details": details, "shared_context": shared_context[group]},
+                )
+            except CustomerCooldownError as e:
+                item.error = str(e)
+                continue
+            item.deduplicated = not created
+            if created and self.job_queue is None:
+                to_run.append(item.conversation_id)
+
+        self.batches.add(batch)
+        if to_run:
+            executor = ThreadPoolExecutor(
+                max_workers=batch.concurrency, thread_name_prefix=batch.batch_id
+            )
+            for conversation_id in to_run:
+                executor.submit(self.run_conversation, conversation_id, fake_conv, update_stripe)
+            # Queued runs still execute; the threads exit once the batch is done
+            executor.shutdown(wait=False)
+
+        started = sum(1 for item in batch.items if item.conversation_id and not item.deduplicated)
+        print(
+            f"✅ {batch.batch_id}: {started} conversations started, "
+            f"{batch.shared_retrievals} shared retrievals"
+        )
+        return batch
+
+    def batch_progress(self, batch_id: str) -> dict | None:
+        """Aggregate progress of a batch started by this process, with each conversation's status."""
+        batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+
+        counts = {"in_progress": 0, "completed": 0, "failed": 0, "skipped": 0}
+        conversations = []
+        for item in batch.items:
+            if item.conversation_id is None:
+                item_status = "skipped"
+            else:
+                result = self.get_conversation_result(item.conversation_id)
+                item_status = result.status.value if result is not None else "failed"
+            counts[item_status] += 1
+            conversations.append(
+                {
+                    "charge_id": item.charge_id,
+                    "conversation_id": item.conversation_id,
+                    "status": item_status,
+                    "deduplicated": item.deduplicated,
+                    "error": item.error,
+                }
+            )
+
+        return {
+            "batch_id": batch.batch_id,
+            "total": len(batch.items),
+            **counts,
+            "done": counts["in_progress"] == 0,
+            "concurrency": batch.concurrency,
+            "shared_retrievals": batch.shared_retrievals,
+            "conversations": conversations,
+        }
+
+    def start_campaign(
+        self,
+        charge_ids: list[str],
+        fake_conv: bool = False,
+        update_stripe: bool = False,
+    ) -> Campaign:
+        """
+        Schedule calls for many charges into the customers' calling windows (see conversation.campaign).
+
+        Args:
+            charge_ids: Stripe charge IDs (duplicates are ignored)
+            fake_conv: Simulate the calls (see run_conversation)
+            update_stripe: Submit evidence to Stripe
+
+        Returns:
+            The campaign; progress is reported by campaigns.progress()
+        """
+        campaign = self.campaigns.create(charge_ids, fake_conv=fake_conv, update_stripe=update_stripe)
+        self.campaigns.start()
+        return campaign
+
+    def usage_rollup(
+        self, group_by: list[str], since: float | None = None
+    ) -> list[dict]:
+        """
+        Aggregate ledgered usage across conversations.
+
+        Args:
+            group_by: Any of conversation_id, stage, provider, model
+            since: Only include usage recorded at or after this unix time
+
+        Raises:
+            ValueError: If a group_by field is not supported
+        """
+        return get_ledger().rollup(group_by=group_by, since=since)
+
+    def result_memory_stats(self) -> dict:
+        """Memory and eviction statistics of the conversation results held by this process."""
+        return self.results.stats()
 
     def list_saved_transcripts(self) -> list[dict]:
         """List all saved transcripts from storage."""
@@ -0,0 +1,155 @@
+"""
+Stage graph - Run dependent pipeline stages concurrently, with timing and retries.
+
+Stages form a DAG: each stage starts as soon as all of its dependencies have
+finished, so the wall time is set by the critical path rather than the sum of
+all stages. Stage functions receive their dependencies' results as keyword
+arguments; coroutine functions run on the event loop and plain functions in a
+worker thread.
+
+Example:
+    graph = StageGraph()
+    graph.add("save", save_transcript)
+    graph.add("analysis", analyze, optional=True)
+    graph.add("lookup", fetch_dispute, retries=2)
+    graph.add("evidence", submit_evidence, depends_on=("analysis", "lookup"))
+    outcomes = graph.run()
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Literal
+
+from observability import span
+
+StageStatus = Literal["ok", "failed", "skipped"]
+
+
+@dataclass
+class Stage:
+    """A named unit of work in a StageGraph."""
+
+    name: str
+    func: Callable[..., Any] | Callable[..., Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+    retries: int = 0
+    retry_delay: float = 0.5
+    optional: bool = False
+
+
+@dataclass
+class StageOutcome:
+    """Result of running one stage."""
+
+    name: str
+    status: StageStatus
+    result: Any = None
+    error: BaseException | None = None
+    attempts: int = 0
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+class StageGraph:
+    """Executor for a small DAG of pipeline stages."""
+
+    def __init__(self, span_prefix: str = "pipeline"):
+        """
+        Initialize an empty graph.
+
+        Args:
+            span_prefix: Prefix of the timing span recorded for each stage
+                (e.g. "pipeline" -> "pipeline.analysis")
+        """
+        self.span_prefix = span_prefix
+        self._stages: dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends_on: tuple[str, ...] | list[str] = (),
+        retries: int = 0,
+        retry_delay: float = 0.5,
+        optional: bool = False,
+    ) -> "StageGraph":
+        """
+        Add a stage. Dependencies must already be in the graph, which keeps it acyclic.
+
+        Args:
+            name: Unique stage name; also the keyword its result is passed under
+            func: Function or coroutine function called with dependency results as kwargs
+            depends_on: Names of stages that must finish first
+            retries: Extra attempts after a failure
+            retry_delay: Delay before the first retry, doubled on each further retry
+            optional: If True, a failure passes None to dependents instead of skipping them
+
+        Returns:
+            The graph, for chaining
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' already exists")
+        unknown = [dep for dep in depends_on if dep not in self._stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(unknown)}")
+
+        self._stages[name] = Stage(name, func, tuple(depends_on), retries, retry_delay, optional)
+        return self
+
+    def run(self) -> dict[str, StageOutcome]:
+        """Run the graph on a new event loop; see run_async()."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> dict[str, StageOutcome]:
+        """
+        Run every stage as soon as its dependencies are done.
+
+        Returns:
+            Outcome per stage name, in the order stages were added. A stage whose
+            required (non-optional) dependency failed or was skipped is skipped.
+        """
+        tasks: dict[str, asyncio.Task] = {}
+        for name, stage in self._stages.items():
+            dependencies = {dep: tasks[dep] for dep in stage.depends_on}
+            tasks[name] = asyncio.create_task(self._run_stage(stage, dependencies))
+
+        await asyncio.gather(*tasks.values())
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, stage: Stage, dependencies: dict[str, asyncio.Task]) -> StageOutcome:
+        kwargs = {}
+        for dep_name, task in dependencies.items():
+            outcome: StageOutcome = await task
+            if not outcome.ok and not self._stages[dep_name].optional:
+                return StageOutcome(stage.name, "skipped")
+            kwargs[dep_name] = outcome.result
+
+        start = time.perf_counter()
+        attempts = 0
+        try:
+            with span(f"{self.span_prefix}.{stage.name}"):
+                while True:
+                    attempts += 1
+                    try:
+                        if inspect.iscoroutinefunction(stage.func):
+                            result = await stage.func(**kwargs)
+                        else:
+                            result = await asyncio.to_thread(stage.func, **kwargs)
+                        break
+                    except Exception as e:
+                        print(f"⚠️  Stage '{stage.name}' failed (attempt {attempts}): {e}")
+                        if attempts > stage.retries:
+                            raise
+                    await asyncio.sleep(stage.retry_delay * 2 ** (attempts - 1))
+        except Exception as e:
+            return StageOutcome(stage.name, "failed", None, e, attempts, time.perf_counter() - start)
+
+        return StageOutcome(stage.name, "ok", result, None, attempts, time.perf_counter() - start)
@@ -0,0 +1,172 @@
+"""
+Start guard - Idempotent conversation starts and per-customer call cooldown.
+
+Repeated /start requests (a double click, a retrying integration) must not
+prepare a second prompt or phone the customer twice:
+
+- an Idempotency-Key maps to the conversation it first created
+- a charge with an active conversation returns that conversation
+- a customer (the phone number dialed) is not called again within the cooldown
+
+The in-memory index covers conversations run in this process. With a job
+queue, SQLiteJobQueue does the same checks transactionally so that several API
+processes and workers share them.
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class CustomerCooldownError(Exception):
+    """The customer was called too recently to be called again."""
+
+    def __init__(self, customer_key: str, retry_after: float):
+        self.customer_key = customer_key
+        self.retry_after = retry_after
+        super().__init__(
+            f"Customer {customer_key} was called recently; retry in {retry_after:.0f} seconds"
+        )
+
+
+class IdempotencyKeyConflictError(Exception):
+    """An Idempotency-Key was reused for a different charge."""
+
+
+class CallLog:
+    """In-memory record of when each customer was last called."""
+
+    def __init__(self):
+        self._calls: dict[str, tuple[str | None, float]] = {}  # customer -> (charge_id, called_at)
+        self._lock = threading.Lock()
+
+    def last_call(self, customer_key: str | None = None, charge_id: str | None = None) -> tuple[str, float] | None:
+        """(customer_key, called_at) of the last call to a customer, or for a charge."""
+        with self._lock:
+            if customer_key is not None:
+                entry = self._calls.get(customer_key)
+                return (customer_key, entry[1]) if entry else None
+            matches = [(key, at) for key, (charge, at) in self._calls.items() if charge == charge_id]
+            return max(matches, key=lambda match: match[1]) if matches else None
+
+    def claim_call(self, customer_key: str, charge_id: str | None, cooldown: float) -> float | None:
+        """
+        Record a call unless the customer is within the cooldown.
+
+        Returns:
+            None if the call may go ahead, otherwise seconds until it may
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._calls.get(customer_key)
+            if entry and now - entry[1] < cooldown:
+                return cooldown - (now - entry[1])
+            self._calls[customer_key] = (charge_id, now)
+        return None
+
+
+class StartGuard:
+    """Index of active conversations by charge and Idempotency-Key, plus the call cooldown."""
+
+    def __init__(
+        self,
+        cooldown_seconds: float = 0.0,
+        call_log: CallLog | None = None,
+        idempotency_ttl: float = 24 * 3600,
+    ):
+        """
+        Initialize the guard.
+
+        Args:
+            cooldown_seconds: Minimum time between calls to the same customer (0 disables)
+            call_log: Where call times are kept (a SQLiteJobQueue shares them across processes)
+            idempotency_ttl: Seconds an Idempotency-Key is remembered
+        """
+        self.cooldown_seconds = cooldown_seconds
+        self.call_log = call_log or CallLog()
+        self.idempotency_ttl = idempotency_ttl
+        self._active: dict[str, str] = {}  # charge_id -> conversation_id
+        self._keys: dict[str, tuple[str, str, float]] = {}  # key -> (conversation_id, charge_id, expires_at)
+        self._lock = threading.Lock()
+
+    def reserve(
+        self,
+        charge_id: str,
+        conversation_id: str,
+        idempotency_key: str | None = None,
+        before_create: Callable[[], None] | None = None,
+    ) -> tuple[str, bool]:
+        """
+        Register a new conversation for a charge unless one already answers the request.
+
+        Args:
+            charge_id: Charge the conversation is about
+            conversation_id: ID to use if a new conversation is created
+            idempotency_key: Optional client-supplied key
+            before_create: Called before a new conversation is registered; raising aborts it
+
+        Returns:
+            (conversation_id, created): the existing conversation and False if the
+            key was seen before or the charge has an active conversation
+
+        Raises:
+            IdempotencyKeyConflictError: If the key was used for another charge
+        """
+        now = time.time()
+        with self._lock:
+            self._keys = {k: v for k, v in self._keys.items() if v[2] > now}
+            if idempotency_key and idempotency_key in self._keys:
+                existing_id, existing_charge, _ = self._keys[idempotency_key]
+                if existing_charge != charge_id:
+                    raise IdempotencyKeyConflictError(
+                        f"Idempotency-Key was already used for charge {existing_charge}"
+                    )
+                return existing_id, False
+
+            existing_id = self._active.get(charge_id)
+            if existing_id is None:
+                if before_create is not None:
+                    before_create()
+                self._active[charge_id] = conversation_id
+                existing_id, created = conversation_id, True
+            else:
+                created = False
+            if idempotency_key:
+                self._keys[idempotency_key] = (existing_id, charge_id, now + self.idempotency_ttl)
+            return existing_id, created
+
+    def release(self, conversation_id: str) -> None:
+        """Mark a conversation finished so its charge can be started again."""
+        with self._lock:
+            for charge_id, active_id in list(self._active.items()):
+                if active_id == conversation_id:
+                    del self._active[charge_id]
+
+    def check_cooldown(self, charge_id: str, customer_key: str | None = None) -> None:
+        """
+        Reject a start if the customer (given, or last called for this charge) is cooling down.
+
+        Raises:
+            CustomerCooldownError: With the seconds until the customer may be called
+        """
+        if self.cooldown_seconds <= 0:
+            return
+        last = self.call_log.last_call(customer_key=customer_key) if customer_key else None
+        last = last or self.call_log.last_call(charge_id=charge_id)
+        if last is None:
+            return
+        key, called_at = last
+        remaining = self.cooldown_seconds - (time.time() - called_at)
+        if remaining > 0:
+            raise CustomerCooldownError(key, remaining)
+
+    def claim_call(self, customer_key: str, charge_id: str | None = None) -> None:
+        """
+        Record that a customer is about to be dialed, enforcing the cooldown.
+
+        Raises:
+            CustomerCooldownError: If the customer was called within the cooldown
+        """
+        retry_after = self.call_log.claim_call(customer_key, charge_id, self.cooldown_seconds)
+        if retry_after is not None:
+            raise CustomerCooldownError(customer_key, retry_after)
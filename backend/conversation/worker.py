@@ -0,0 +1,177 @@
+"""
+Conversation worker - Run queued conversations outside the API process.
+
+Each worker thread claims a job from the queue, runs the full conversation
+pipeline, heartbeats the job's lease while the call is in progress and stores
+the final ConversationResult on the job. Run any number of processes per
+node, independently of the web tier:
+
+    JOB_QUEUE_PATH=jobs.db python -m conversation.worker --concurrency 4
+
+Delivery is at-least-once: if a worker dies mid-call, its lease expires and
+another worker runs the job again from the start. A redelivered job does not
+re-dial a customer inside the call cooldown (CUSTOMER_CALL_COOLDOWN_SECONDS):
+the earlier dial is in the shared call log, so the job fails with
+CustomerCooldownError rather than phoning the customer twice. With the
+cooldown disabled (the default) the customer is called again.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+from config import get_settings
+from conversation.job_queue import Job, SQLiteJobQueue
+from conversation.models import ConversationStatus
+
+
+class ConversationWorker:
+    """Claims conversation jobs from a queue and runs them with a ConversationService."""
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        service,
+        worker_id: str | None = None,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float | None = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Job queue shared with the API
+            service: ConversationService that runs the pipeline in this process
+            worker_id: Unique worker ID (defaults to host:pid:thread)
+            poll_interval: Seconds to wait before polling an empty queue again
+            heartbeat_interval: Seconds between lease renewals (defaults to a third
+                of the queue's lease)
+        """
+        self.queue = queue
+        self.service = service
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or queue.lease_seconds / 3
+
+    def run(self, stop: threading.Event | None = None, max_jobs: int | None = None) -> int:
+        """
+        Process jobs until `stop` is set (the current job is always finished first).
+
+        Args:
+            stop: Event that ends the loop
+            max_jobs: Optional number of jobs after which to return
+
+        Returns:
+            Number of jobs processed
+        """
+        stop = stop or threading.Event()
+        processed = 0
+        while not stop.is_set() and (max_jobs is None or processed < max_jobs):
+            if self.run_once():
+                processed += 1
+            else:
+                stop.wait(self.poll_interval)
+        return processed
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False if the queue had nothing runnable."""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+
+        print(f"👷 Worker {self.worker_id} running {job.job_id} (attempt {job.attempts})")
+        lease_lost = threading.Event()
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job, done, lease_lost), daemon=True
+        )
+        heartbeat.start()
+        try:
+            self._run_job(job)
+        finally:
+            done.set()
+            heartbeat.join()
+
+        if lease_lost.is_set():
+            print(f"⚠️  Worker {self.worker_id} lost the lease on {job.job_id}; result discarded")
+        return True
+
+    def _run_job(self, job: Job) -> None:
+        payload = job.payload
+        try:
+            self.service.create_conversation(
+                payload["charge_id"],
+                phone_number_override=payload.get("phone_number_override"),
+                conversation_id=job.job_id,
+                prepared=payload.get("prepared"),
+                phone_number_id=payload.get("phone_number_id"),
+            )
+            self.service.run_conversation(
+                job.job_id,
+                fake_conv=payload.get("fake_conv", False),
+                update_stripe=payload.get("update_stripe", False),
+            )
+            result = self.service.get_conversation_result(job.job_id)
+        except Exception as e:
+            traceback.print_exc()
+            self.queue.fail(job.job_id, self.worker_id, str(e))
+            return
+        finally:
+            self.service.release_conversation(job.job_id)
+
+        data = result.model_dump(mode="json")
+        if result.status == ConversationStatus.COMPLETED:
+            self.queue.complete(job.job_id, self.worker_id, data)
+        else:
+            self.queue.fail(job.job_id, self.worker_id, result.error or "Conversation failed", data)
+
+    def _heartbeat(self, job: Job, done: threading.Event, lease_lost: threading.Event) -> None:
+        while not done.wait(self.heartbeat_interval):
+            if not self.queue.heartbeat(job.job_id, self.worker_id):
+                lease_lost.set()
+                return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run queued chargeback conversations")
+    parser.add_argument("--queue", default=None, help="SQLite queue path (default: JOB_QUEUE_PATH)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Conversations run at once")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--lease-seconds", type=float, default=60.0)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    args = parser.parse_args()
+
+    path = args.queue or get_settings().job_queue_path
+    if not path:
+        parser.error("Set JOB_QUEUE_PATH or pass --queue")
+
+    from conversation.service import ConversationService
+
+    queue = SQLiteJobQueue(path, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+    service = ConversationService(job_queue=queue)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    workers = [
+        ConversationWorker(queue, service, f"{host}:{i}", poll_interval=args.poll_interval)
+        for i in range(args.concurrency)
+    ]
+    threads = [threading.Thread(target=worker.run, args=(stop,)) for worker in workers]
+    print(f"🚀 {args.concurrency} conversation worker(s) on {host}, queue {path}")
+    for thread in threads:
+        thread.start()
+
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(0.5)  # Keep the main thread responsive to signals
+    print("👋 Workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,72 @@
 """
 ElevenLabs Wrapper - Conversational AI client with agent configuration.
+
+Exports are resolved lazily on first attribute access, so importing one
+submodule (e.g. the phone caller used by the API server) does not pull in the
+others; in particular the local audio client and its DefaultAudioInterface
+dependencies are only imported when ElevenLabsClient is used.
 """
 
-from .agent import Agent, AgentConfigOverride, AgentPromptOverride
-from .client import ElevenLabsClient
-from .phone_caller import PhoneCaller
-from .transcript_manager import TranscriptManager
-from .conversation_manager import (
-    ConversationManager,
-    ConversationData,
-    TranscriptMessage,
-    ConversationMetadata,
-)
-from .transcript_storage import TranscriptStorage
-from .transcript_summarizer import TranscriptSummarizer
-
-__all__ = [
-    "Agent",
-    "AgentConfigOverride",
-    "AgentPromptOverride",
-    "ElevenLabsClient",
-    "PhoneCaller",
-    "TranscriptManager",
-    "ConversationManager",
-    "ConversationData",
-    "TranscriptMessage",
-    "ConversationMetadata",
-    "TranscriptStorage",
-    "TranscriptSummarizer",
-]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "Agent": ".agent",
+    "AgentConfigOverride": ".agent",
+    "AgentPromptOverride": ".agent",
+    "ElevenLabsClient": ".client",
+    "PhoneCaller": ".phone_caller",
+    "TranscriptManager": ".transcript_manager",
+    "TranscriptBus": ".transcript_bus",
+    "TranscriptEvent": ".transcript_bus",
+    "TranscriptSnapshot": ".transcript_bus",
+    "ConversationManager": ".conversation_manager",
+    "ConversationData": ".conversation_manager",
+    "TranscriptMessage": ".conversation_manager",
+    "ConversationMetadata": ".conversation_manager",
+    "CallFailedError": ".conversation_manager",
+    "TranscriptStorage": ".transcript_storage",
+    "TranscriptSummarizer": ".transcript_summarizer",
+    "PostCallAnalysis": ".post_call_analyzer",
+    "PostCallAnalyzer": ".post_call_analyzer",
+    "IncrementalOutcomeScorer": ".outcome_scorer",
+    "OutcomeEstimate": ".outcome_scorer",
+    "CallSimulator": ".call_simulator",
+    "CallSimulatorConfig": ".call_simulator",
+}
+
+if TYPE_CHECKING:
+    from .agent import Agent, AgentConfigOverride, AgentPromptOverride
+    from .client import ElevenLabsClient
+    from .phone_caller import PhoneCaller
+    from .transcript_manager import TranscriptManager
+    from .transcript_bus import TranscriptBus, TranscriptEvent, TranscriptSnapshot
+    from .conversation_manager import (
+        ConversationManager,
+        ConversationData,
+        TranscriptMessage,
+        ConversationMetadata,
+        CallFailedError,
+    )
+    from .transcript_storage import TranscriptStorage
+    from .transcript_summarizer import TranscriptSummarizer
+    from .post_call_analyzer import PostCallAnalysis, PostCallAnalyzer
+    from .outcome_scorer import IncrementalOutcomeScorer, OutcomeEstimate
+    from .call_simulator import CallSimulator, CallSimulatorConfig
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_EXPORTS))
+
+
+__all__ = list(_EXPORTS)
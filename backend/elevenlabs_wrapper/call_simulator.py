@@ -0,0 +1,455 @@
+"""
+Call Simulator - Local stand-in for the ElevenLabs outbound-call and conversations API.
+
+Implements the endpoints PhoneCaller and ConversationManager use:
+
+- POST /v1/convai/twilio/outbound-call
+- GET  /v1/convai/conversations/{conversation_id}
+- GET  /v1/convai/conversations
+
+Every call moves through initiated -> in-progress -> processing -> done (or
+failed) based on wall-clock time, with durations sampled from configurable
+distributions. Status is derived lazily on each poll, so no thread or timer is
+held per call and hundreds of concurrent calls cost only a dict entry each.
+
+Usage (in-process, no sockets):
+
+    simulator = CallSimulator(CallSimulatorConfig(time_scale=0.01))
+    caller = PhoneCaller(api_key="sim", phone_number_id="sim", transport=simulator.transport())
+
+Usage (local HTTP service):
+
+    python -m elevenlabs_wrapper.call_simulator --port 8100 --time-scale 0.05
+    ELEVENLABS_BASE_URL=http://127.0.0.1:8100 uvicorn main:app
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+import httpx
+
+
+@dataclass
+class Duration:
+    """Random duration distribution in (simulated) seconds."""
+
+    kind: Literal["fixed", "uniform", "normal", "lognormal"] = "fixed"
+    a: float = 0.0
+    """Value (fixed), lower bound (uniform), mean (normal) or mu (lognormal)."""
+
+    b: float = 0.0
+    """Upper bound (uniform), stddev (normal) or sigma (lognormal)."""
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one non-negative duration."""
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(self.a, self.b)
+        else:
+            value = self.a
+        return max(value, 0.0)
+
+
+@dataclass
+class TranscriptTemplate:
+    """
+    Scripted call transcript.
+
+    Messages are (role, text) pairs; text may reference dynamic variables
+    such as {first_name} or {product_name}. Messages are spread evenly over
+    the sampled talk time.
+    """
+
+    name: str
+    messages: list[tuple[str, str]]
+    weight: float = 1.0
+
+
+DEFAULT_TEMPLATES = [
+    TranscriptTemplate(
+        name="renewed",
+        weight=3.0,
+        messages=[
+            ("agent", "Hello. I'm Ethan, calling about your recent chargeback request for the subscription of {product_name}."),
+            ("user", "Hello."),
+            ("agent", "I need to inform you that a chargeback is not a valid method for canceling your {product_name} subscription. That action will not be accepted."),
+            ("user", "Oh no, really? How do I fix it?"),
+            ("agent", "We can proceed with an official cancellation, renew your subscription, or I can offer you a 30% discount on your next bill. Which option would you prefer?"),
+            ("user", "I want to renew my subscription."),
+            ("agent", "Thank you for confirming. Your {product_name} subscription will be renewed."),
+        ],
+    ),
+    TranscriptTemplate(
+        name="canceled",
+        weight=2.0,
+        messages=[
+            ("agent", "Hello {first_name}. I'm Ethan, calling about your chargeback for {product_name}."),
+            ("user", "Yes, I didn't want that subscription anymore."),
+            ("agent", "I understand. A chargeback is not accepted as a cancellation method. We can cancel officially according to the terms, renew, or apply a 30% discount."),
+            ("user", "Please just cancel it officially."),
+            ("agent", "Understood. Your {product_name} subscription will be canceled according to the terms."),
+        ],
+    ),
+    TranscriptTemplate(
+        name="unresolved",
+        weight=1.0,
+        messages=[
+            ("agent", "Hello {first_name}. I'm Ethan, calling about your chargeback for {product_name}."),
+            ("user", "I don't want to talk about this."),
+            ("agent", "I understand. The chargeback will not be accepted. Would you prefer an official cancellation or a renewal?"),
+            ("user", "I'll keep the chargeback. Goodbye."),
+        ],
+    ),
+]
+
+
+@dataclass
+class CallSimulatorConfig:
+    """Timing, failure and transcript settings for the simulator."""
+
+    ring: Duration = field(default_factory=lambda: Duration("uniform", 3.0, 10.0))
+    """Time spent in 'initiated' before the customer picks up."""
+
+    talk: Duration = field(default_factory=lambda: Duration("lognormal", 4.0, 0.4))
+    """Time spent in 'in-progress' (e^4 ~= 55s median)."""
+
+    processing: Duration = field(default_factory=lambda: Duration("uniform", 1.0, 4.0))
+    """Time spent in 'processing' after hang-up."""
+
+    dial_latency_ms: float = 0.0
+    """Latency of the outbound-call request itself."""
+
+    poll_latency_ms: float = 0.0
+    """Latency of each conversation GET."""
+
+    failure_rate: float = 0.0
+    """Probability that a call ends with status 'failed' mid-call."""
+
+    no_answer_rate: float = 0.0
+    """Probability that the customer never picks up (status 'failed', termination_reason 'no_answer')."""
+
+    dial_error_rate: float = 0.0
+    """Probability that the outbound-call request itself returns HTTP 500."""
+
+    cost_per_minute: int = 100
+    """Credits charged per started minute of talk time."""
+
+    time_scale: float = 1.0
+    """Multiplier applied to all sampled durations (0.01 turns a minute into 0.6s)."""
+
+    templates: list[TranscriptTemplate] = field(default_factory=lambda: list(DEFAULT_TEMPLATES))
+
+    seed: int | None = None
+
+
+@dataclass
+class _SimulatedCall:
+    conversation_id: str
+    agent_id: str
+    to_number: str
+    dynamic_variables: dict[str, Any]
+    created_at: float
+    start_time_unix_secs: int
+    ring_secs: float
+    talk_secs: float
+    processing_secs: float
+    outcome: Literal["completed", "failed", "no_answer"]
+    template: TranscriptTemplate
+
+
+class _SafeDict(dict):
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+class CallSimulator:
+    """In-memory simulation of ElevenLabs Twilio calls."""
+
+    def __init__(self, config: CallSimulatorConfig | None = None):
+        """
+        Initialize the simulator.
+
+        Args:
+            config: Simulation settings (defaults to realistic minute-long calls)
+        """
+        self.config = config or CallSimulatorConfig()
+        self._rng = random.Random(self.config.seed)
+        self._calls: dict[str, _SimulatedCall] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # API operations
+    # ------------------------------------------------------------------
+
+    def outbound_call(self, body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """Handle POST /v1/convai/twilio/outbound-call."""
+        self._sleep_ms(self.config.dial_latency_ms)
+
+        for required in ("agent_id", "agent_phone_number_id", "to_number"):
+            if not body.get(required):
+                return 422, {"detail": [{"loc": ["body", required], "msg": "field required"}]}
+
+        scale = self.config.time_scale
+        with self._lock:
+            if self._rng.random() < self.config.dial_error_rate:
+                return 500, {"detail": "Simulated dial error"}
+
+            roll = self._rng.random()
+            if roll < self.config.no_answer_rate:
+                outcome = "no_answer"
+            elif roll < self.config.no_answer_rate + self.config.failure_rate:
+                outcome = "failed"
+            else:
+                outcome = "completed"
+
+            templates = self.config.templates
+            template = self._rng.choices(templates, weights=[t.weight for t in templates])[0]
+            call = _SimulatedCall(
+                conversation_id=f"sim_{uuid.uuid4().hex[:16]}",
+                agent_id=body["agent_id"],
+                to_number=body["to_number"],
+                dynamic_variables=(body.get("conversation_initiation_client_data") or {}).get(
+                    "dynamic_variables"
+                )
+                or {},
+                created_at=time.monotonic(),
+                start_time_unix_secs=int(time.time()),
+                ring_secs=self.config.ring.sample(self._rng) * scale,
+                talk_secs=self.config.talk.sample(self._rng) * scale,
+                processing_secs=self.config.processing.sample(self._rng) * scale,
+                outcome=outcome,
+                template=template,
+            )
+            self._calls[call.conversation_id] = call
+
+        return 200, {
+            "success": True,
+            "message": "Call initiated",
+            "conversation_id": call.conversation_id,
+            "callSid": f"CA{uuid.uuid4().hex}",
+        }
+
+    def get_conversation(self, conversation_id: str) -> tuple[int, dict[str, Any]]:
+        """Handle GET /v1/convai/conversations/{conversation_id}."""
+        self._sleep_ms(self.config.poll_latency_ms)
+
+        with self._lock:
+            call = self._calls.get(conversation_id)
+        if call is None:
+            return 404, {"detail": f"Conversation {conversation_id} not found"}
+
+        return 200, self._render(call, time.monotonic() - call.created_at)
+
+    def list_conversations(self, params: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """Handle GET /v1/convai/conversations."""
+        page_size = int(params.get("page_size", 30))
+        agent_id = params.get("agent_id")
+        now = time.monotonic()
+
+        with self._lock:
+            calls = [c for c in self._calls.values() if not agent_id or c.agent_id == agent_id]
+
+        conversations = []
+        for call in calls[-page_size:][::-1]:
+            rendered = self._render(call, now - call.created_at)
+            conversations.append(
+                {
+                    "agent_id": call.agent_id,
+                    "conversation_id": call.conversation_id,
+                    "start_time_unix_secs": call.start_time_unix_secs,
+                    "call_duration_secs": rendered["metadata"]["call_duration_secs"],
+                    "message_count": len(rendered["transcript"]),
+                    "status": rendered["status"],
+                }
+            )
+
+        return 200, {"conversations": conversations, "has_more": False, "next_cursor": None}
+
+    def handle(
+        self, method: str, path: str, params: dict[str, Any], body: dict[str, Any] | None
+    ) -> tuple[int, dict[str, Any]]:
+        """
+        Route a request to the matching operation.
+
+        Args:
+            method: HTTP method
+            path: Request path starting with /v1
+            params: Query parameters
+            body: Parsed JSON body (POST only)
+
+        Returns:
+            Tuple of (http_status, response_body)
+        """
+        parts = [p for p in path.split("/") if p]
+        method = method.upper()
+
+        if method == "POST" and parts == ["v1", "convai", "twilio", "outbound-call"]:
+            return self.outbound_call(body or {})
+        if method == "GET" and parts[:3] == ["v1", "convai", "conversations"]:
+            if len(parts) == 3:
+                return self.list_conversations(params)
+            if len(parts) == 4:
+                return self.get_conversation(parts[3])
+
+        return 404, {"detail": "Not Found"}
+
+    def stats(self) -> dict[str, int]:
+        """Count simulated calls by their current status."""
+        now = time.monotonic()
+        with self._lock:
+            calls = list(self._calls.values())
+
+        counts: dict[str, int] = {}
+        for call in calls:
+            status = self._status(call, now - call.created_at)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    # ------------------------------------------------------------------
+    # Transports
+    # ------------------------------------------------------------------
+
+    def transport(self) -> httpx.MockTransport:
+        """
+        httpx transport serving requests from this simulator in-process.
+
+        Works with both httpx.Client and httpx.AsyncClient.
+        """
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = None
+            if request.content:
+                body = json.loads(request.content)
+            status, payload = self.handle(
+                request.method, request.url.path, dict(request.url.params), body
+            )
+            return httpx.Response(status, json=payload)
+
+        return httpx.MockTransport(handler)
+
+    def create_app(self):
+        """Create a FastAPI app exposing the simulator over HTTP."""
+        from fastapi import FastAPI, Request
+        from fastapi.responses import JSONResponse
+
+        app = FastAPI(title="ElevenLabs Call Simulator")
+
+        @app.api_route("/{path:path}", methods=["GET", "POST"])
+        async def simulate(path: str, request: Request) -> JSONResponse:
+            body = await request.json() if request.method == "POST" else None
+            status, payload = self.handle(
+                request.method, f"/{path}", dict(request.query_params), body
+            )
+            return JSONResponse(payload, status_code=status)
+
+        return app
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _status(self, call: _SimulatedCall, elapsed: float) -> str:
+        if elapsed < call.ring_secs:
+            return "initiated"
+        if call.outcome == "no_answer":
+            return "failed"
+        if elapsed < call.ring_secs + call.talk_secs:
+            return "in-progress"
+        if call.outcome == "failed":
+            return "failed"
+        if elapsed < call.ring_secs + call.talk_secs + call.processing_secs:
+            return "processing"
+        return "done"
+
+    def _render(self, call: _SimulatedCall, elapsed: float) -> dict[str, Any]:
+        status = self._status(call, elapsed)
+        talk_elapsed = min(max(elapsed - call.ring_secs, 0.0), call.talk_secs)
+        if call.outcome == "no_answer":
+            talk_elapsed = 0.0
+
+        # Report durations in unscaled seconds, like the real API would
+        scale = self.config.time_scale or 1.0
+        talk_total = call.talk_secs / scale
+        variables = _SafeDict(call.dynamic_variables)
+
+        transcript = []
+        messages = call.template.messages
+        for i, (role, text) in enumerate(messages):
+            offset = talk_total * i / len(messages)
+            if offset * scale > talk_elapsed:
+                break
+            transcript.append(
+                {
+                    "role": role,
+                    "message": text.format_map(variables),
+                    "time_in_call_secs": round(offset, 1),
+                    "tool_calls": None,
+                    "tool_results": None,
+                }
+            )
+
+        call_duration = int(talk_elapsed / scale)
+        termination_reason = None
+        if status == "failed":
+            termination_reason = "no_answer" if call.outcome == "no_answer" else "error"
+        elif status in ("processing", "done"):
+            termination_reason = "user_ended_call"
+
+        return {
+            "conversation_id": call.conversation_id,
+            "agent_id": call.agent_id,
+            "status": status,
+            "user_id": None,
+            "transcript": transcript,
+            "metadata": {
+                "start_time_unix_secs": call.start_time_unix_secs,
+                "call_duration_secs": call_duration,
+                "cost": -(-call_duration // 60) * self.config.cost_per_minute,
+                "termination_reason": termination_reason,
+            },
+            "analysis": None,
+        }
+
+    @staticmethod
+    def _sleep_ms(ms: float) -> None:
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local ElevenLabs call simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--no-answer-rate", type=float, default=0.0)
+    parser.add_argument("--dial-latency-ms", type=float, default=0.0)
+    parser.add_argument("--poll-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = CallSimulator(
+        CallSimulatorConfig(
+            time_scale=args.time_scale,
+            failure_rate=args.failure_rate,
+            no_answer_rate=args.no_answer_rate,
+            dial_latency_ms=args.dial_latency_ms,
+            poll_latency_ms=args.poll_latency_ms,
+            seed=args.seed,
+        )
+    )
+    print(f"📞 ElevenLabs call simulator on http://{args.host}:{args.port}")
+    print(f"   Set ELEVENLABS_BASE_URL=http://{args.host}:{args.port}")
+    uvicorn.run(simulator.create_app(), host=args.host, port=args.port, log_level="warning")
@@ -1,25 +1,29 @@
 import os
-import signal
 from typing import Optional
-from dotenv import load_dotenv
 from elevenlabs.client import ElevenLabs
 from elevenlabs.conversational_ai.conversation import (
+    AudioInterface,
     Conversation,
 )
-from elevenlabs.conversational_ai.default_audio_interface import DefaultAudioInterface
+from config import load_config
+from elevenlabs_wrapper.transcript_bus import TranscriptBus
 from elevenlabs_wrapper.transcript_manager import TranscriptManager
 from elevenlabs_wrapper.agent import Agent
 
-load_dotenv()
-
 
 class ElevenLabsClient:
-    """Client for local conversational AI using agent configuration."""
+    """
+    Client for local conversational AI using agent configuration.
+
+    One client runs one session at a time. For concurrent sessions in one
+    process, use one client per session and share a TranscriptBus between them.
+    """
 
     def __init__(
         self,
         api_key: str | None = None,
         transcript_manager: TranscriptManager | None = None,
+        bus: TranscriptBus | None = None,
     ):
         """
         Initialize the ElevenLabsClient.
@@ -27,7 +31,9 @@ class ElevenLabsClient:
         Args:
             api_key: ElevenLabs API key (defaults to ELEVENLABS_API_KEY env var)
             transcript_manager: Optional transcript manager for tracking conversation
+            bus: Optional transcript bus; a new transcript manager publishes to it
         """
+        load_config()
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
 
         if not self.api_key:
@@ -36,12 +42,13 @@ class ElevenLabsClient:
             )
 
         self.elevenlabs = ElevenLabs(api_key=self.api_key)
-        self.transcript_manager = transcript_manager or TranscriptManager()
+        self.transcript_manager = transcript_manager or TranscriptManager(bus=bus)
         self.conversation: Conversation | None = None
 
     def start_conversation(
         self,
         agent: Agent,
+        audio_interface: AudioInterface | None = None,
     ) -> str | None:
         """
         Start a local conversation with the agent.
@@ -51,18 +58,26 @@ class ElevenLabsClient:
             audio_interface: Optional audio interface (defaults to DefaultAudioInterface)
 
         Returns:
-            Conversation ID after session ends
+            Conversation ID after session ends. Ctrl+C (or end_session() from
+            another thread) ends this session only; no process-wide signal
+            handler is installed.
         """
         # Use agent callbacks if provided, otherwise use default transcript callbacks
         # Get conversation config from agent
         config = agent.to_conversation_config()
 
+        if audio_interface is None:
+            # Imported here: it pulls in local audio device dependencies
+            from elevenlabs.conversational_ai.default_audio_interface import DefaultAudioInterface
+
+            audio_interface = DefaultAudioInterface()
+
         self.conversation = Conversation(
             self.elevenlabs,
             agent.agent_id,
             user_id=agent.user_id,
             requires_auth=bool(self.api_key),
-            audio_interface=DefaultAudioInterface(),
+            audio_interface=audio_interface,
             callback_agent_response=self._on_agent_response,
             callback_agent_response_correction=self._on_agent_response_correction,
             callback_user_transcript=self._on_user_transcript,
@@ -71,9 +86,13 @@ class ElevenLabsClient:
 
         self.conversation.start_session()
 
-        signal.signal(signal.SIGINT, lambda sig, frame: self._end_session())
-
-        conversation_id = self.conversation.wait_for_session_end()
+        try:
+            conversation_id = self.conversation.wait_for_session_end()
+        except KeyboardInterrupt:
+            self.end_session()
+            conversation_id = self.conversation.wait_for_session_end()
+        finally:
+            self.transcript_manager.close()
 
         return conversation_id
 
@@ -95,7 +114,7 @@ class ElevenLabsClient:
         self.transcript_manager.add_user_message(transcript)
         print(f"👤 User: {transcript}")
 
-    def _end_session(self) -> None:
-        """End the conversation session."""
+    def end_session(self) -> None:
+        """End the conversation session (safe to call from any thread)."""
         if self.conversation:
             self.conversation.end_session()
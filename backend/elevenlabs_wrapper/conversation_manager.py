@@ -2,11 +2,13 @@
 Conversation Manager - Retrieve and monitor ElevenLabs conversations.
 """
 
+import os
 import time
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 from dataclasses import dataclass
 import httpx
 from elevenlabs.client import ElevenLabs
+from observability import span
 
 
 ConversationStatus = Literal["initiated", "in-progress", "processing", "done", "failed"]
@@ -46,18 +48,36 @@ class ConversationData:
     transcript_summary: str | None = None
 
 
+class CallFailedError(Exception):
+    """A call ended with status 'failed': not answered, or dropped mid-call."""
+
+    def __init__(self, conversation: ConversationData):
+        self.conversation = conversation
+        self.termination_reason = conversation.metadata.termination_reason
+        super().__init__(f"Conversation failed: {conversation}")
+
+
 class ConversationManager:
     """Manager for retrieving and monitoring ElevenLabs conversations."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ):
         """
         Initialize the ConversationManager.
 
         Args:
             api_key: ElevenLabs API key
+            base_url: API host (defaults to ELEVENLABS_BASE_URL env var or the public API)
+            transport: Optional httpx transport, e.g. CallSimulator.transport() for offline runs
         """
         self.api_key = api_key
-        self.base_url = "https://api.elevenlabs.io/v1"
+        host = base_url or os.getenv("ELEVENLABS_BASE_URL") or "https://api.elevenlabs.io"
+        self.base_url = f"{host.rstrip('/')}/v1"
+        self.transport = transport
 
     def get_conversation(self, conversation_id: str) -> ConversationData:
         """
@@ -75,7 +95,7 @@ class ConversationManager:
         url = f"{self.base_url}/convai/conversations/{conversation_id}"
         headers = {"xi-api-key": self.api_key}
 
-        with httpx.Client() as client:
+        with span("elevenlabs.poll"), httpx.Client(transport=self.transport) as client:
             response = client.get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
@@ -95,10 +115,11 @@ class ConversationManager:
         url = f"{self.base_url}/convai/conversations/{conversation_id}"
         headers = {"xi-api-key": self.api_key}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        with span("elevenlabs.poll"):
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                data = response.json()
 
         return self._parse_conversation_data(data)
 
@@ -108,6 +129,7 @@ class ConversationManager:
         poll_interval: int = 2,
         timeout: int | None = None,
         verbose: bool = True,
+        on_update: Callable[["ConversationData"], None] | None = None,
     ) -> ConversationData:
         """
         Wait for a conversation to complete by polling.
@@ -117,13 +139,15 @@ class ConversationManager:
             poll_interval: Seconds between status checks (default: 2)
             timeout: Maximum seconds to wait (default: None = no timeout)
             verbose: Print status updates (default: True)
+            on_update: Called with each polled ConversationData, including the
+                partial transcript of a call in progress and the final one
 
         Returns:
             ConversationData when conversation is complete
 
         Raises:
             TimeoutError: If timeout is reached before completion
-            Exception: If conversation fails
+            CallFailedError: If the conversation fails (with its termination_reason)
         """
         start_time = time.time()
 
@@ -153,13 +177,19 @@ class ConversationManager:
             if verbose:
                 print(f"   Status: {status} (elapsed: {elapsed:.1f}s)")
 
+            if on_update is not None:
+                try:
+                    on_update(data)
+                except Exception as e:
+                    print(f"⚠️  Conversation update callback failed: {e}")
+
             if status == "done":
                 if verbose:
                     print(f"✅ Conversation completed!")
                 return data
 
             if status == "failed":
-                raise Exception(f"Conversation failed: {data}")
+                raise CallFailedError(data)
 
             # Still processing - wait and try again
             time.sleep(poll_interval)
@@ -190,7 +220,7 @@ class ConversationManager:
         if cursor:
             params["cursor"] = cursor
 
-        with httpx.Client() as client:
+        with httpx.Client(transport=self.transport) as client:
             response = client.get(url, headers=headers, params=params)
             response.raise_for_status()
             return response.json()
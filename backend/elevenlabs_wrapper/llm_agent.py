@@ -6,6 +6,7 @@ import logging
 from typing import Any, Optional
 from anthropic import AsyncAnthropic
 from anthropic.types import MessageParam
+from observability import span
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,9 @@ class LLMAgent:
         )
     """
 
+    # Name of the timing span around each Claude call
+    span_name = "claude.llm_agent"
+
     def __init__(
         self,
         role_description: str,
@@ -112,13 +116,15 @@ class LLMAgent:
 
         try:
             # Call Claude API
-            response = await client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}],
-            )
+            with span(self.span_name) as active:
+                response = await client.messages.create(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_prompt,
+                    messages=[{"role": "user", "content": user_message}],
+                )
+                active.record_usage(response)
 
             # Extract text from response
             result = response.content[0].text
@@ -180,13 +186,15 @@ class LLMAgent:
         logger.info(f"🤖 Running LLM agent with {len(messages)} messages")
 
         try:
-            response = await client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=messages,
-            )
+            with span(self.span_name) as active:
+                response = await client.messages.create(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_prompt,
+                    messages=messages,
+                )
+                active.record_usage(response)
 
             result = response.content[0].text
             logger.info(f"✅ Agent completed successfully")
@@ -197,6 +205,72 @@ class LLMAgent:
             logger.error(f"❌ Agent execution failed: {e}")
             raise
 
+    async def run_structured(
+        self,
+        client: AsyncAnthropic,
+        task: str,
+        tool_name: str,
+        tool_description: str,
+        input_schema: dict[str, Any],
+        user_input: Optional[str] = None,
+        additional_context: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Run the agent and force a schema-constrained answer through tool use.
+
+        The model must call `tool_name`, so the result is the tool input,
+        already parsed and shaped by `input_schema`; no free-text JSON parsing.
+
+        Args:
+            client: Initialized Anthropic client
+            task: Specific task the agent should perform
+            tool_name: Name of the tool carrying the answer
+            tool_description: What the tool records (guides the model)
+            input_schema: JSON schema of the answer
+            user_input: Optional user input/query for the agent
+            additional_context: Optional additional context to inject
+
+        Returns:
+            The tool input as a dictionary
+
+        Raises:
+            ValueError: If the response contains no call to `tool_name`
+        """
+        system_prompt = self._build_system_prompt(task)
+        user_message = self._build_user_message(user_input, additional_context)
+
+        logger.info(f"🤖 Running structured LLM agent: {tool_name}")
+
+        try:
+            with span(self.span_name) as active:
+                response = await client.messages.create(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_prompt,
+                    messages=[{"role": "user", "content": user_message}],
+                    tools=[
+                        {
+                            "name": tool_name,
+                            "description": tool_description,
+                            "input_schema": input_schema,
+                        }
+                    ],
+                    tool_choice={"type": "tool", "name": tool_name},
+                )
+                active.record_usage(response)
+
+        except Exception as e:
+            logger.error(f"❌ Agent execution failed: {e}")
+            raise
+
+        for block in response.content:
+            if block.type == "tool_use" and block.name == tool_name:
+                logger.info(f"✅ Agent completed successfully")
+                return dict(block.input)
+
+        raise ValueError(f"Claude did not call the {tool_name} tool")
+
     def update_context(self, new_context: str) -> None:
         """Update the context."""
         self.context = new_context
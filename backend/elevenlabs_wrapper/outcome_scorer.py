@@ -0,0 +1,252 @@
+"""
+Outcome Scorer - Running estimate of a call's resolution while the call is in progress.
+
+Every new customer turn goes through a cheap keyword pass that detects the
+customer's decision (renew, cancel, discount, ...) with the fast-path outcome
+patterns, plus a confidence boost when the agent confirms it. An LLM
+checkpoint (a PostCallAnalyzer run on the transcript so far) runs in the
+background only when the customer changes their decision or after several
+customer turns without a clear one, and once more as soon as the call ends.
+If that last checkpoint covers the final transcript, the post-call analysis
+reuses it instead of starting a new Claude request.
+"""
+
+import contextvars
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable
+
+from elevenlabs_wrapper.conversation_manager import ConversationData, TranscriptMessage
+from elevenlabs_wrapper.post_call_analyzer import PostCallAnalysis
+from stripe_integration.outcome_classifier import RESOLVED_TYPES, FastPathClassifier
+
+# Agent phrases confirming a decision, by resolution type
+CONFIRMATION_PATTERNS: dict[str, str] = {
+    "renewed": r"\b(?:will be|has been|is) renewed|\brenewal is confirmed",
+    "canceled": r"\b(?:will be|has been|is) (?:canceled|cancelled)|\bcancellation is confirmed",
+    "discount": r"\bdiscount (?:will be|has been|is) applied",
+    "partial_refund": r"\brefund (?:will be|has been) (?:issued|processed)",
+}
+
+# Agent phrases offering a single option the customer can agree to with "yes"
+OFFER_PATTERNS: dict[str, str] = {
+    "renewed": r"\brenew",
+    "canceled": r"\bcancel",
+    "discount": r"\bdiscount|\b30 ?%",
+}
+
+_CLASSIFIER = FastPathClassifier()
+_AFFIRMATIVE = re.compile(
+    r"^\W*(?:yes|yeah|yep|sure|ok(?:ay)?|fine|alright|let's do (?:it|that)|sounds good|go ahead)\b"
+)
+_CONFIRMATIONS = {kind: re.compile(p) for kind, p in CONFIRMATION_PATTERNS.items()}
+_OFFERS = {kind: re.compile(p) for kind, p in OFFER_PATTERNS.items()}
+
+
+@dataclass(frozen=True)
+class OutcomeEstimate:
+    """The current best guess of a call's outcome."""
+
+    resolution_type: str = "pending"
+    resolved: bool = False
+    confidence: float = 0.0
+    customer_decision: str | None = None  # The customer turn the estimate rests on
+    source: str = "rules"  # "rules" or "llm"
+    turns: int = 0  # Transcript messages seen
+    updated_at: float = 0.0
+
+
+def detect_decision(text: str) -> str | None:
+    """Resolution type stated in one customer turn, or None (negated mentions and questions don't count)."""
+    pattern = _CLASSIFIER.match_turn(text)
+    return pattern.resolution_type if pattern else None
+
+
+class IncrementalOutcomeScorer:
+    """Updates an OutcomeEstimate as transcript deltas arrive during a call."""
+
+    def __init__(
+        self,
+        checkpoint: Callable[[list[TranscriptMessage]], PostCallAnalysis | None] | None = None,
+        checkpoint_every: int = 4,
+        min_checkpoint_interval: float = 15.0,
+        on_update: Callable[[OutcomeEstimate], None] | None = None,
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            checkpoint: Optional LLM analysis of a partial transcript (run in a
+                background thread), which may return None when no analysis is
+                needed; without it only the keyword pass runs
+            checkpoint_every: Customer turns after which an LLM checkpoint runs
+                even though the keyword pass saw no change of decision
+            min_checkpoint_interval: Minimum seconds between in-call checkpoints
+            on_update: Called when the estimate changes (e.g. to publish it live);
+                polls that bring no new messages do not call it
+        """
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.min_checkpoint_interval = min_checkpoint_interval
+        self.on_update = on_update
+
+        self._messages: list[TranscriptMessage] = []
+        self._estimate = OutcomeEstimate()
+        self._rule_estimate = OutcomeEstimate()
+        self._offer: str | None = None  # Single option the agent just offered
+        self._user_turns_since_checkpoint = 0
+        self._last_checkpoint_at = 0.0
+        self._decision_changed = False  # Customer reversed a decision since the last checkpoint
+        self._checkpoints: dict[int, Future] = {}  # Transcript length -> analysis
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def estimate(self) -> OutcomeEstimate:
+        with self._lock:
+            return self._estimate
+
+    @property
+    def transcript(self) -> list[TranscriptMessage]:
+        """The messages observed so far."""
+        with self._lock:
+            return list(self._messages)
+
+    def observe(self, conversation: ConversationData) -> OutcomeEstimate:
+        """
+        Score the transcript messages not seen yet; suitable as a poll callback.
+
+        When the call has ended (status "processing" or "done"), a final
+        checkpoint is started on the complete transcript.
+        """
+        estimate = self.add_messages(conversation.transcript[len(self._messages):])
+        if conversation.status in ("processing", "done", "failed"):
+            self._start_checkpoint(force=True)
+        return estimate
+
+    def add_messages(self, messages: Iterable[TranscriptMessage]) -> OutcomeEstimate:
+        """Score new transcript messages with the keyword pass."""
+        with self._lock:
+            seen = len(self._messages)
+            for message in messages:
+                self._messages.append(message)
+                self._score(message)
+            if len(self._messages) != seen:
+                self._estimate = self._merge()
+            estimate = self._estimate
+
+        if len(self._messages) != seen:
+            self._start_checkpoint(force=False)
+            if self.on_update is not None:
+                self.on_update(estimate)
+        return estimate
+
+    def analysis_for(self, transcript: list[TranscriptMessage]) -> Future | None:
+        """The checkpoint analysis of exactly this transcript, if one was started."""
+        with self._lock:
+            return self._checkpoints.get(len(transcript))
+
+    def close(self) -> None:
+        """Stop the checkpoint thread once running checkpoints finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _score(self, message: TranscriptMessage) -> bool:
+        """Apply one message to the rule estimate; True if the decision changed."""
+        text = message.message.lower()
+        rule = self._rule_estimate
+        index = len(self._messages)
+
+        if message.role == "agent":
+            kind = rule.resolution_type
+            if rule.customer_decision and kind in _CONFIRMATIONS and _CONFIRMATIONS[kind].search(text):
+                confidence = max(rule.confidence, min(0.95, rule.confidence + 0.2))
+                self._rule_estimate = replace(rule, confidence=confidence, turns=index)
+                return True
+            offers = [kind for kind, pattern in _OFFERS.items() if pattern.search(text)]
+            self._offer = offers[0] if len(offers) == 1 else None
+            return False
+
+        self._user_turns_since_checkpoint += 1
+        pattern = _CLASSIFIER.match_turn(text)
+        kind, confidence = (
+            (pattern.resolution_type, _CLASSIFIER.turn_confidence(pattern, text)) if pattern else (None, 0.0)
+        )
+        if kind is None and self._offer and _AFFIRMATIVE.search(text):
+            kind, confidence = self._offer, 0.45  # "Yes" to a single offered option
+        if kind is None:
+            return False
+
+        if rule.customer_decision and kind != rule.resolution_type:
+            self._decision_changed = True
+        self._rule_estimate = OutcomeEstimate(
+            resolution_type=kind,
+            resolved=kind in RESOLVED_TYPES,
+            confidence=confidence,
+            customer_decision=message.message.strip(),
+            source="rules",
+            turns=index,
+            updated_at=time.time(),
+        )
+        return True
+
+    def _merge(self) -> OutcomeEstimate:
+        """Newest evidence wins: a checkpoint unless the rules saw a decision after it."""
+        best = self._rule_estimate
+        for length, future in sorted(self._checkpoints.items(), reverse=True):
+            if not future.done() or future.exception() is not None or future.result() is None:
+                continue
+            if length >= best.turns:
+                analysis: PostCallAnalysis = future.result()
+                best = OutcomeEstimate(
+                    resolution_type=analysis.resolution_type,
+                    resolved=analysis.resolved,
+                    confidence=analysis.confidence or 0.0,
+                    customer_decision=self._rule_estimate.customer_decision,
+                    source="llm",
+                    turns=length,
+                    updated_at=time.time(),
+                )
+            break
+        return replace(best, turns=len(self._messages))
+
+    def _start_checkpoint(self, force: bool) -> None:
+        if self.checkpoint is None:
+            return
+        with self._lock:
+            length = len(self._messages)
+            if not length or length in self._checkpoints:
+                return
+            if not force:
+                due = self._decision_changed or (
+                    self._user_turns_since_checkpoint >= self.checkpoint_every
+                )
+                recent = time.time() - self._last_checkpoint_at < self.min_checkpoint_interval
+                if not due or recent:
+                    return
+
+            self._user_turns_since_checkpoint = 0
+            self._last_checkpoint_at = time.time()
+            self._decision_changed = False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outcome-checkpoint")
+            transcript = list(self._messages)
+            # Run in the caller's context so the checkpoint is traced to this conversation
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, self.checkpoint, transcript)
+            self._checkpoints[length] = future
+
+        future.add_done_callback(self._checkpoint_done)
+
+    def _checkpoint_done(self, future: Future) -> None:
+        if future.exception() is not None:
+            print(f"⚠️  Outcome checkpoint failed: {future.exception()}")
+            return
+        with self._lock:
+            previous, self._estimate = self._estimate, self._merge()
+            estimate = self._estimate
+        if self.on_update is not None and estimate != previous:
+            self.on_update(estimate)
@@ -3,27 +3,41 @@ ElevenLabs Phone Caller - Initiate outbound calls to conversational AI agents.
 """
 
 import os
-from dotenv import load_dotenv
+from typing import Callable
+
+import httpx
 from elevenlabs.client import ElevenLabs
+from config import load_config
+from observability import span
 from .agent import Agent
-from .conversation_manager import ConversationManager
-
-load_dotenv()
+from .conversation_manager import ConversationData, ConversationManager
 
 
 class PhoneCaller:
     """Client for making outbound phone calls using ElevenLabs Twilio integration."""
 
-    def __init__(self, api_key: str | None = None, phone_number_id: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        phone_number_id: str | None = None,
+        base_url: str | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ):
         """
         Initialize the PhoneCaller.
 
         Args:
             api_key: ElevenLabs API key (defaults to ELEVENLABS_API_KEY env var)
             phone_number_id: Phone number ID (defaults to AGENT_PHONE_NUMBER_ID env var)
+            base_url: API host (defaults to ELEVENLABS_BASE_URL env var or the public API),
+                e.g. http://127.0.0.1:8100 for the local call simulator
+            transport: Optional httpx transport, e.g. CallSimulator.transport() for offline runs
         """
+        load_config()
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         self.phone_number_id = phone_number_id or os.getenv("AGENT_PHONE_NUMBER_ID")
+        self.base_url = base_url or os.getenv("ELEVENLABS_BASE_URL")
+        self.transport = transport
 
         if not self.api_key:
             raise ValueError(
@@ -34,8 +48,14 @@ class PhoneCaller:
                 "AGENT_PHONE_NUMBER_ID must be set in environment variables or passed to constructor."
             )
 
-        self.client = ElevenLabs(api_key=self.api_key)
-        self.conversation_manager = ConversationManager(api_key=self.api_key)
+        self.client = ElevenLabs(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            httpx_client=httpx.Client(transport=transport) if transport else None,
+        )
+        self.conversation_manager = ConversationManager(
+            api_key=self.api_key, base_url=self.base_url, transport=transport
+        )
 
     def make_call(self, agent: Agent, to_number: str):
         """
@@ -71,12 +91,13 @@ class PhoneCaller:
 
         try:
             # Make the outbound call via Twilio
-            response = self.client.conversational_ai.twilio.outbound_call(
-                agent_id=agent.agent_id,
-                agent_phone_number_id=phone_number_id,
-                to_number=to_number,
-                conversation_initiation_client_data=conversation_data,  # type: ignore
-            )
+            with span("elevenlabs.dial"):
+                response = self.client.conversational_ai.twilio.outbound_call(
+                    agent_id=agent.agent_id,
+                    agent_phone_number_id=phone_number_id,
+                    to_number=to_number,
+                    conversation_initiation_client_data=conversation_data,  # type: ignore
+                )
 
             print(f"✅ Call initiated successfully!")
             if hasattr(response, "conversation_id"):
@@ -110,7 +131,11 @@ class PhoneCaller:
 
         from elevenlabs.client import AsyncElevenLabs
 
-        async_client = AsyncElevenLabs(api_key=self.api_key)
+        async_client = AsyncElevenLabs(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            httpx_client=httpx.AsyncClient(transport=self.transport) if self.transport else None,
+        )
 
         conversation_data = agent.to_phone_call_config()
 
@@ -129,6 +154,7 @@ class PhoneCaller:
         timeout: int | None = None,
         print_transcript: bool = True,
         verbose: bool = False,
+        on_update: Callable[[ConversationData], None] | None = None,
     ):
         """
         Make a call and wait for it to complete, then return the transcript.
@@ -139,6 +165,7 @@ class PhoneCaller:
             poll_interval: Seconds between status checks (default: 2)
             timeout: Maximum seconds to wait (default: None = no timeout)
             print_transcript: Whether to print the transcript when done (default: True)
+            on_update: Called with the conversation on every status poll
 
         Returns:
             ConversationData with complete transcript
@@ -168,6 +195,7 @@ class PhoneCaller:
             poll_interval=poll_interval,
             timeout=timeout,
             verbose=verbose,
+            on_update=on_update,
         )
 
         # Print transcript if requested
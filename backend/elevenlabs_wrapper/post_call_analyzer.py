@@ -0,0 +1,188 @@
+"""
+Post-Call Analyzer - Single-pass summary and dispute evaluation of a finished call.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from anthropic import AsyncAnthropic
+from elevenlabs_wrapper.conversation_manager import TranscriptMessage
+from .llm_agent import LLMAgent
+
+RESOLUTION_TYPES = ["renewed", "canceled", "discount", "partial_refund", "pending", "unresolved"]
+SENTIMENTS = ["satisfied", "neutral", "frustrated", "angry"]
+
+ANALYSIS_TOOL_NAME = "record_call_analysis"
+
+ANALYSIS_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "string",
+            "description": (
+                "Customer decisions and actions only, as 'user [action]; user [decision]'. "
+                "Ignore everything the agent said and omit the chargeback itself "
+                "unless the customer says it was a mistake."
+            ),
+        },
+        "resolved": {
+            "type": "boolean",
+            "description": (
+                "True if the customer agreed to keep the subscription, accepted an offer "
+                "or refund, or the issue was otherwise fully resolved"
+            ),
+        },
+        "resolution_type": {"type": "string", "enum": RESOLUTION_TYPES},
+        "customer_sentiment": {"type": "string", "enum": SENTIMENTS},
+        "key_points": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Important facts from the call, useful as dispute evidence",
+        },
+        "recommendation": {"type": "string", "description": "Recommended next action"},
+        "confidence": {
+            "type": "number",
+            "minimum": 0,
+            "maximum": 1,
+            "description": "Confidence in the resolution assessment",
+        },
+        "reasoning": {
+            "type": "string",
+            "description": "One or two sentences justifying the resolution assessment",
+        },
+    },
+    "required": [
+        "summary",
+        "resolved",
+        "resolution_type",
+        "customer_sentiment",
+        "key_points",
+        "recommendation",
+        "confidence",
+        "reasoning",
+    ],
+}
+
+
+@dataclass
+class PostCallAnalysis:
+    """Summary and dispute evaluation produced by one PostCallAnalyzer call."""
+
+    summary: str | None  # None when only the evaluation is known
+    resolved: bool
+    resolution_type: str
+    customer_sentiment: str
+    key_points: list[str] = field(default_factory=list)
+    recommendation: str = ""
+    confidence: float | None = None
+    reasoning: str | None = None
+
+    def to_evaluation(self) -> dict[str, Any]:
+        """Evaluation dict in the shape DisputeEvaluator.evaluate_transcript() returns."""
+        evaluation = asdict(self)
+        evaluation.pop("summary")
+        return evaluation
+
+
+class PostCallAnalyzer(LLMAgent):
+    """
+    Specialized agent that analyzes a finished call in a single Claude request.
+
+    Replaces running TranscriptSummarizer and DisputeEvaluator.evaluate_transcript
+    separately: the summary, resolution, sentiment and key points come back
+    together through a forced tool call, so the output is always valid.
+    """
+
+    span_name = "claude.post_call_analysis"
+
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        max_tokens: int = 1024,
+        temperature: float = 0.3,
+    ):
+        """
+        Initialize the PostCallAnalyzer.
+
+        Args:
+            model: Claude model to use (default: claude-sonnet-4-20250514)
+            max_tokens: Maximum tokens in response (default: 1024)
+            temperature: Sampling temperature (default: 0.3 for more focused output)
+        """
+        role_description = (
+            "You are an expert at analyzing customer service calls about disputed charges. "
+            "You extract customer decisions and judge whether the dispute was resolved."
+        )
+
+        context = (
+            "You will receive a transcript of a call between an agent and a customer (user) "
+            "who filed a chargeback for a subscription. The agent explained that a chargeback "
+            "is not a valid cancellation method and offered cancellation, renewal or a discount.\n\n"
+            "Resolution types:\n"
+            "- renewed: Customer agreed to keep the subscription\n"
+            "- canceled: Customer agreed to cancel (avoiding chargeback)\n"
+            "- discount: Customer accepted the discount offer\n"
+            "- partial_refund: Compromise reached with partial refund\n"
+            "- pending: Needs follow-up action\n"
+            "- unresolved: No agreement, customer still disputing"
+        )
+
+        output_format = f"Record your analysis by calling the {ANALYSIS_TOOL_NAME} tool."
+
+        super().__init__(
+            role_description=role_description,
+            context=context,
+            output_format=output_format,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+
+    async def analyze(
+        self,
+        client: AsyncAnthropic,
+        transcript: list[TranscriptMessage],
+    ) -> PostCallAnalysis:
+        """
+        Summarize a call transcript and evaluate the dispute outcome.
+
+        Args:
+            client: Initialized Anthropic client
+            transcript: List of transcript messages from the conversation
+
+        Returns:
+            PostCallAnalysis with the summary and evaluation fields
+        """
+        task = (
+            "Analyze the transcript below. Summarize only the customer's decisions and "
+            "actions, then evaluate whether the dispute was resolved."
+        )
+
+        result = await self.run_structured(
+            client=client,
+            task=task,
+            tool_name=ANALYSIS_TOOL_NAME,
+            tool_description="Record the summary and dispute evaluation of a finished call.",
+            input_schema=ANALYSIS_SCHEMA,
+            user_input=self._format_transcript(transcript),
+        )
+
+        return PostCallAnalysis(
+            summary=str(result.get("summary", "")).strip(),
+            resolved=bool(result.get("resolved", False)),
+            resolution_type=result.get("resolution_type", "unresolved"),
+            customer_sentiment=result.get("customer_sentiment", "neutral"),
+            key_points=list(result.get("key_points") or []),
+            recommendation=result.get("recommendation", ""),
+            confidence=result.get("confidence"),
+            reasoning=result.get("reasoning"),
+        )
+
+    def _format_transcript(self, transcript: list[TranscriptMessage]) -> str:
+        """Format transcript messages as 'ROLE [12.3s]: text' lines."""
+        lines = []
+        for msg in transcript:
+            text = msg.message.strip()
+            if text:  # Skip empty messages
+                lines.append(f"{msg.role.upper()} [{msg.time_in_call_secs:.1f}s]: {text}")
+        return "\n".join(lines)
@@ -0,0 +1,265 @@
+"""
+Transcript bus - Live transcript events for local conversation sessions.
+
+Each session appends messages to a compact, append-only TranscriptBuffer and
+publishes a TranscriptEvent per message, correction and session end. Events
+are immutable and shared: every subscriber (storage, a live UI, an evaluator)
+receives the same object, never a copy of the transcript.
+
+Subscribers either register a callback (called in the publishing thread,
+which for ElevenLabs sessions is the SDK's websocket thread) or iterate
+events asynchronously on their own event loop:
+
+    bus = TranscriptBus()
+    async with bus.subscribe_async(session_id) as events:
+        async for event in events:
+            ...
+
+Any number of sessions can publish to one bus concurrently.
+"""
+
+import asyncio
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterator, Literal
+
+from conversation.models import TranscriptEntry
+
+Speaker = Literal["agent", "user"]
+EventKind = Literal["message", "correction", "end"]
+
+_SPEAKERS: tuple[Speaker, Speaker] = ("agent", "user")
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptEvent:
+    """A transcript change in one session."""
+
+    kind: EventKind
+    session_id: str
+    index: int = -1  # Message index for "message" and "correction"
+    speaker: Speaker | None = None
+    text: str = ""
+    timestamp: float = 0.0
+
+
+class TranscriptSnapshot:
+    """
+    Immutable view of a transcript at one point in time.
+
+    Taking a snapshot is O(1): it keeps a reference to the buffer's storage and
+    the message count. Appends never touch messages below that count, and a
+    correction replaces the text list instead of editing it, so the view never
+    changes after it is taken.
+    """
+
+    __slots__ = ("_speakers", "_texts", "_timestamps", "_length")
+
+    def __init__(self, speakers: bytearray, texts: list[str], timestamps: array, length: int):
+        self._speakers = speakers
+        self._texts = texts
+        self._timestamps = timestamps
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> tuple[Speaker, str, float]:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("transcript index out of range")
+        return _SPEAKERS[self._speakers[index]], self._texts[index], self._timestamps[index]
+
+    def __iter__(self) -> Iterator[tuple[Speaker, str, float]]:
+        for index in range(self._length):
+            yield _SPEAKERS[self._speakers[index]], self._texts[index], self._timestamps[index]
+
+    def to_entries(self) -> list[TranscriptEntry]:
+        """Materialize the messages as TranscriptEntry models."""
+        return [
+            TranscriptEntry(speaker=speaker, text=text, timestamp=timestamp)
+            for speaker, text, timestamp in self
+        ]
+
+
+class TranscriptBuffer:
+    """
+    Append-only message storage with indexed agent-message corrections.
+
+    Messages are stored column-wise (speaker codes in a bytearray, timestamps
+    in a float array, texts in a list) instead of one model object each. An
+    index from agent text to message positions finds the message to correct
+    without a scan, but the correction itself copies the text list (O(n)
+    copy-on-write, so snapshots never change); corrections are rare.
+    """
+
+    def __init__(self):
+        self._speakers = bytearray()
+        self._texts: list[str] = []
+        self._timestamps = array("d")
+        self._agent_positions: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def append(self, speaker: Speaker, text: str, timestamp: float) -> int:
+        """Append a message; returns its index."""
+        with self._lock:
+            index = len(self._texts)
+            self._speakers.append(_SPEAKERS.index(speaker))
+            self._texts.append(text)
+            self._timestamps.append(timestamp)
+            if speaker == "agent":
+                self._agent_positions.setdefault(text, []).append(index)
+            return index
+
+    def correct_agent_message(self, original_text: str, corrected_text: str) -> int:
+        """
+        Replace the text of the latest agent message equal to original_text.
+
+        O(n) in the number of messages: the text list is copied, not edited.
+
+        Returns:
+            Index of the corrected message
+
+        Raises:
+            ValueError: If no agent message has that text
+        """
+        with self._lock:
+            positions = self._agent_positions.get(original_text)
+            if not positions:
+                raise ValueError(f"Could not find agent message with text: {original_text}")
+            index = positions.pop()
+            if not positions:
+                del self._agent_positions[original_text]
+
+            # Copy-on-write keeps earlier snapshots unchanged; corrections are rare
+            texts = list(self._texts)
+            texts[index] = corrected_text
+            self._texts = texts
+            self._agent_positions.setdefault(corrected_text, []).append(index)
+            return index
+
+    def snapshot(self) -> TranscriptSnapshot:
+        """The transcript as of now, without copying messages."""
+        with self._lock:
+            return TranscriptSnapshot(
+                self._speakers, self._texts, self._timestamps, len(self._texts)
+            )
+
+
+class AsyncSubscription:
+    """Async iterator over the events a bus delivers to one subscriber."""
+
+    def __init__(self, bus: "TranscriptBus", session_id: str | None, maxsize: int = 0):
+        self._bus = bus
+        self.session_id = session_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[TranscriptEvent | None] = asyncio.Queue(maxsize)
+        self._closed = False
+
+    def _deliver(self, event: TranscriptEvent) -> None:
+        # Called from any thread; hand the event to the subscriber's loop
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # Subscriber's loop is closed
+
+    def _put(self, event: TranscriptEvent | None) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            print(f"⚠️  Transcript subscriber is falling behind; dropped event {event}")
+
+    def close(self) -> None:
+        """Stop receiving events; the iterator ends after events already queued."""
+        if not self._closed:
+            self._closed = True
+            self._bus._unsubscribe(self)
+            self._loop.call_soon_threadsafe(self._put, None)
+
+    async def __aenter__(self) -> "AsyncSubscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def __aiter__(self) -> "AsyncSubscription":
+        return self
+
+    async def __anext__(self) -> TranscriptEvent:
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        if self.session_id is not None and event.kind == "end":
+            self.close()  # The one session this subscriber follows is over
+        return event
+
+
+class TranscriptBus:
+    """Publishes transcript events from any number of sessions to subscribers."""
+
+    def __init__(self):
+        self._callbacks: list[tuple[str | None, Callable[[TranscriptEvent], None]]] = []
+        self._subscriptions: list[AsyncSubscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self, callback: Callable[[TranscriptEvent], None], session_id: str | None = None
+    ) -> Callable[[], None]:
+        """
+        Call `callback` with each event, in the publishing thread.
+
+        Args:
+            callback: Function receiving each TranscriptEvent; it should return quickly
+            session_id: Only deliver this session's events (all sessions if None)
+
+        Returns:
+            Function that unsubscribes the callback
+        """
+        entry = (session_id, callback)
+        with self._lock:
+            self._callbacks = self._callbacks + [entry]
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._callbacks = [c for c in self._callbacks if c is not entry]
+
+        return unsubscribe
+
+    def subscribe_async(self, session_id: str | None = None, maxsize: int = 0) -> AsyncSubscription:
+        """
+        Receive events on the current event loop.
+
+        Args:
+            session_id: Only deliver this session's events (all sessions if None);
+                a single-session subscription ends with the session's "end" event
+            maxsize: Queue bound (0 for unbounded); events beyond it are dropped
+
+        Returns:
+            AsyncSubscription to iterate with `async for`
+        """
+        subscription = AsyncSubscription(self, session_id, maxsize)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def _unsubscribe(self, subscription: AsyncSubscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def publish(self, event: TranscriptEvent) -> None:
+        """Deliver an event to every matching subscriber."""
+        # Subscriber lists are replaced, never mutated, so they can be read without the lock
+        for session_id, callback in self._callbacks:
+            if session_id is None or session_id == event.session_id:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"⚠️  Transcript subscriber failed: {e}")
+        for subscription in self._subscriptions:
+            if subscription.session_id is None or subscription.session_id == event.session_id:
+                subscription._deliver(event)
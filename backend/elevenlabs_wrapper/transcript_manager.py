@@ -1,14 +1,38 @@
-import time
 import threading
-from typing import List, Literal
+import time
+import uuid
+from typing import List
+
 from conversation.models import TranscriptEntry
+from elevenlabs_wrapper.transcript_bus import (
+    TranscriptBuffer,
+    TranscriptBus,
+    TranscriptEvent,
+    TranscriptSnapshot,
+)
 
 
 class TranscriptManager:
-    def __init__(self):
-        self._transcript: List[TranscriptEntry] = []
-        self._lock = threading.Lock()
+    """
+    Transcript of one conversation session.
+
+    Messages go into a TranscriptBuffer and, if a bus is given, are published
+    as TranscriptEvents tagged with this session's ID.
+    """
+
+    def __init__(self, bus: TranscriptBus | None = None, session_id: str | None = None):
+        """
+        Initialize the transcript.
+
+        Args:
+            bus: Optional bus to publish message, correction and end events to
+            session_id: ID the events are tagged with (generated if not provided)
+        """
+        self.bus = bus
+        self.session_id = session_id or f"session_{uuid.uuid4().hex[:12]}"
+        self._buffer = TranscriptBuffer()
         self._start_time: float | None = None
+        self._lock = threading.Lock()  # Keeps timestamps in message order
 
     def _get_timestamp(self) -> float:
         if self._start_time is None:
@@ -16,43 +40,39 @@ class TranscriptManager:
             return 0.0
         return time.time() - self._start_time
 
-    def add_user_message(self, text: str) -> None:
+    def _publish(self, event: TranscriptEvent) -> None:
+        if self.bus is not None:
+            self.bus.publish(event)
+
+    def _add(self, speaker, text: str) -> None:
         with self._lock:
             timestamp = self._get_timestamp()
-            entry = TranscriptEntry(
-                speaker="user",
-                text=text,
-                timestamp=timestamp
-            )
-            self._transcript.append(entry)
+            index = self._buffer.append(speaker, text, timestamp)
+        self._publish(TranscriptEvent("message", self.session_id, index, speaker, text, timestamp))
+
+    def add_user_message(self, text: str) -> None:
+        self._add("user", text)
 
     def add_agent_message(self, text: str) -> None:
-        with self._lock:
-            timestamp = self._get_timestamp()
-            entry = TranscriptEntry(
-                speaker="agent",
-                text=text,
-                timestamp=timestamp
-            )
-            self._transcript.append(entry)
+        self._add("agent", text)
 
     def correct_last_agent_message(self, original_text: str, corrected_text: str) -> None:
-        with self._lock:
-            for i in range(len(self._transcript) - 1, -1, -1):
-                if self._transcript[i].speaker == "agent" and self._transcript[i].text == original_text:
-                    self._transcript[i] = TranscriptEntry(
-                        speaker="agent",
-                        text=corrected_text,
-                        timestamp=self._transcript[i].timestamp
-                    )
-                    return
-            raise ValueError(f"Could not find agent message with text: {original_text}")
+        index = self._buffer.correct_agent_message(original_text, corrected_text)
+        speaker, text, timestamp = self._buffer.snapshot()[index]
+        self._publish(TranscriptEvent("correction", self.session_id, index, speaker, text, timestamp))
+
+    def close(self) -> None:
+        """Publish the end of the session."""
+        self._publish(TranscriptEvent("end", self.session_id, len(self._buffer)))
+
+    def snapshot(self) -> TranscriptSnapshot:
+        """The transcript as of now, without copying messages."""
+        return self._buffer.snapshot()
 
     def get_transcript(self) -> List[TranscriptEntry]:
-        with self._lock:
-            return self._transcript.copy()
+        return self._buffer.snapshot().to_entries()
 
     def reset(self) -> None:
         with self._lock:
-            self._transcript.clear()
-            self._start_time = None
\ No newline at end of file
+            self._buffer = TranscriptBuffer()
+            self._start_time = None
@@ -7,6 +7,7 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from observability import span
 from .conversation_manager import ConversationData, TranscriptMessage, ConversationMetadata
 
 
@@ -74,7 +75,7 @@ class TranscriptStorage:
         }
 
         # Write to file
-        with open(filepath, "w", encoding="utf-8") as f:
+        with span("disk.save_transcript"), open(filepath, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
         print(f"💾 Transcript saved to: {filepath}")
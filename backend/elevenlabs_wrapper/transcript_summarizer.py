@@ -16,6 +16,8 @@ class TranscriptSummarizer(LLMAgent):
     Example: "user forgotten to cancel subscription; user decided to renew"
     """
 
+    span_name = "claude.summary"
+
     def __init__(
         self,
         model: str = "claude-sonnet-4-20250514",
@@ -1,12 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Literal
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from conversation.controller import router as conversation_router
+from config import load_config
+from conversation.controller import (
+    peek_conversation_service,
+    reset_conversation_service,
+    router as conversation_router,
+)
+from observability import METRICS_CONTENT_TYPE, render_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load configuration at startup. Services are built on first use (see
+    conversation.controller.get_conversation_service), so startup stays fast.
+    """
+    load_config()
+    yield
+    reset_conversation_service()
+
 
 app = FastAPI(
     title="Shrek ElevenLabs Hackathon API",
     description="API for AI-powered chargeback conversation agent using ElevenLabs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -21,9 +42,20 @@ app.add_middleware(
 app.include_router(conversation_router)
 
 
+class KnowledgeBaseStatus(BaseModel):
+    source: Literal["local", "pinecone"]
+    version: int | str | None = None  # Reload count (local) or published version (Pinecone)
+    records: int | None = None
+    model: str
+    loaded_at: str | None = None
+    hot_reload: bool = False
+    last_error: str | None = None
+
+
 class HealthResponse(BaseModel):
     status: str
     message: str
+    knowledge_base: KnowledgeBaseStatus | None = None  # None until the service is first used
 
 
 @app.get("/")
@@ -35,6 +67,7 @@ async def root():
         "message": "Welcome to Shrek ElevenLabs Hackathon API",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
         "endpoints": {
             "start_conversation": "POST /api/conversation/start",
             "get_conversation_result": "GET /api/conversation/{conversation_id}"
@@ -43,16 +76,26 @@ async def root():
 
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(service=Depends(peek_conversation_service)):
     """
     Health check endpoint to verify the API is running.
+    Includes the knowledge base version once the conversation service is running.
     """
     return HealthResponse(
         status="healthy",
-        message="API is running successfully"
+        message="API is running successfully",
+        knowledge_base=service.rag_service.knowledge_base_status() if service else None,
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics: span latency histograms and call/conversation counters.
+    """
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
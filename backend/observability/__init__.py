@@ -0,0 +1,31 @@
+"""
+Observability - Timing spans, per-conversation timelines, usage ledger and Prometheus metrics.
+"""
+
+from .tracing import (
+    ActiveSpan,
+    SpanRecord,
+    Timeline,
+    current_timeline,
+    render_metrics,
+    span,
+    track_timeline,
+    METRICS_CONTENT_TYPE,
+)
+from .usage import UsageLedger, UsageRecord, estimate_cost_usd, get_ledger, set_ledger
+
+__all__ = [
+    "ActiveSpan",
+    "SpanRecord",
+    "Timeline",
+    "current_timeline",
+    "render_metrics",
+    "span",
+    "track_timeline",
+    "METRICS_CONTENT_TYPE",
+    "UsageLedger",
+    "UsageRecord",
+    "estimate_cost_usd",
+    "get_ledger",
+    "set_ledger",
+]
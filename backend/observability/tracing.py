@@ -0,0 +1,160 @@
+"""
+Timing spans around pipeline stages and external calls.
+
+Every span is exported as a Prometheus histogram (duration) and counter
+(calls by outcome). When a conversation timeline is active in the current
+context, spans are also appended to it so each ConversationResult can carry
+its own stage breakdown.
+
+Span names are dotted `<system>.<operation>`, e.g. `stripe.get_charge`,
+`claude.summary`, `pinecone.query` or `pipeline.rag`.
+
+LLM call sites hand their SDK response to the span so token usage is written
+to the usage ledger with the span's name and latency:
+
+    with span("claude.evaluation") as active:
+        response = client.messages.create(...)
+        active.record_usage(response)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from .usage import UsageRecord, get_ledger
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# External calls range from ~10ms (disk, Pinecone) to minutes (a phone call)
+_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+SPAN_DURATION = Histogram(
+    "chargeback_span_duration_seconds",
+    "Duration of pipeline stages and external calls",
+    ["span"],
+    buckets=_BUCKETS,
+)
+SPAN_CALLS = Counter(
+    "chargeback_span_calls_total",
+    "Pipeline stages and external calls by outcome",
+    ["span", "outcome"],
+)
+CONVERSATIONS = Counter(
+    "chargeback_conversations_total",
+    "Finished conversations by final status",
+    ["status"],
+)
+CONVERSATIONS_IN_PROGRESS = Gauge(
+    "chargeback_conversations_in_progress",
+    "Conversations currently running",
+)
+
+
+@dataclass
+class SpanRecord:
+    """One finished span, relative to the start of its timeline."""
+
+    name: str
+    start_offset: float
+    duration: float
+    outcome: str
+
+
+class Timeline:
+    """Ordered spans recorded while one conversation runs."""
+
+    def __init__(self, conversation_id: Optional[str] = None):
+        self.conversation_id = conversation_id
+        self.started = time.perf_counter()
+        self.spans: list[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, duration: float, outcome: str) -> None:
+        with self._lock:
+            self.spans.append(SpanRecord(name, start - self.started, duration, outcome))
+
+    def snapshot(self) -> list[SpanRecord]:
+        """Spans ordered by start time."""
+        with self._lock:
+            return sorted(self.spans, key=lambda s: s.start_offset)
+
+
+_current_timeline: ContextVar[Optional[Timeline]] = ContextVar("timeline", default=None)
+
+
+def current_timeline() -> Optional[Timeline]:
+    """The timeline spans are currently recorded into, if any."""
+    return _current_timeline.get()
+
+
+@contextmanager
+def track_timeline(conversation_id: Optional[str] = None) -> Iterator[Timeline]:
+    """
+    Record every span in the current context into a new Timeline.
+
+    Usage recorded while the timeline is active is attributed to conversation_id.
+
+    Example:
+        with track_timeline() as timeline:
+            run_pipeline()
+        print(timeline.snapshot())
+    """
+    timeline = Timeline(conversation_id)
+    token = _current_timeline.set(timeline)
+    try:
+        yield timeline
+    finally:
+        _current_timeline.reset(token)
+
+
+class ActiveSpan:
+    """Handle yielded by span() while the block runs."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.responses: list[Any] = []
+
+    def record_usage(self, response: Any) -> None:
+        """Attach an SDK response whose token usage is ledgered when the span ends."""
+        self.responses.append(response)
+
+
+@contextmanager
+def span(name: str) -> Iterator[ActiveSpan]:
+    """
+    Time a block as a named span.
+
+    Works in both sync and async code; the outcome is "error" when the block
+    raises, "ok" otherwise.
+    """
+    active = ActiveSpan(name)
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield active
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        SPAN_DURATION.labels(name).observe(duration)
+        SPAN_CALLS.labels(name, outcome).inc()
+        timeline = _current_timeline.get()
+        if timeline is not None:
+            timeline.record(name, start, duration, outcome)
+        for response in active.responses:
+            record = UsageRecord.from_response(
+                name, response, duration, timeline.conversation_id if timeline else None
+            )
+            if record is not None:
+                get_ledger().record(record)
+
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition of every registered metric."""
+    return generate_latest()
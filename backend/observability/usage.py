@@ -0,0 +1,343 @@
+"""
+Usage ledger - Token, latency and cost accounting for LLM and telephony calls.
+
+Every Claude and OpenAI call records its token usage (input, output, cache
+reads/writes), model and latency; every finished phone call records its
+ElevenLabs cost and duration. Records are attributed to the conversation whose
+timeline is active and to the span (stage) they were made in, so totals can
+be rolled up per conversation, stage, provider or model.
+
+Set USAGE_LEDGER_PATH (read through config.get_settings() when the ledger is
+first used) to persist records as JSON lines across restarts.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Optional
+
+from prometheus_client import Counter
+
+from config import get_settings
+
+LLM_TOKENS = Counter(
+    "chargeback_llm_tokens_total",
+    "LLM tokens by span, model and kind (input, output, cache_read, cache_creation)",
+    ["span", "model", "kind"],
+)
+LLM_COST = Counter(
+    "chargeback_llm_cost_usd_total",
+    "Estimated LLM cost in USD by span and model",
+    ["span", "model"],
+)
+CALL_CREDITS = Counter(
+    "chargeback_call_credits_total",
+    "ElevenLabs credits spent on phone calls",
+)
+
+# USD per million tokens: (input, output, cache read, cache write).
+# Matched by prefix so dated model IDs resolve to their family.
+MODEL_PRICES_PER_MTOK: dict[str, tuple[float, float, float, float]] = {
+    "claude-opus-4": (15.00, 75.00, 1.50, 18.75),
+    "claude-sonnet-4": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-7-sonnet": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-5-sonnet": (3.00, 15.00, 0.30, 3.75),
+    "claude-haiku-4": (1.00, 5.00, 0.10, 1.25),
+    "claude-3-5-haiku": (0.80, 4.00, 0.08, 1.00),
+    "text-embedding-3-small": (0.02, 0.0, 0.0, 0.0),
+    "text-embedding-3-large": (0.13, 0.0, 0.0, 0.0),
+}
+
+ROLLUP_FIELDS = ("conversation_id", "stage", "provider", "model")
+
+
+def estimate_cost_usd(
+    model: Optional[str],
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_creation_tokens: int = 0,
+) -> Optional[float]:
+    """Estimated USD cost of one call, or None for models without a known price."""
+    if not model:
+        return None
+    for prefix, prices in MODEL_PRICES_PER_MTOK.items():
+        if model.startswith(prefix):
+            input_price, output_price, read_price, write_price = prices
+            return (
+                input_tokens * input_price
+                + output_tokens * output_price
+                + cache_read_tokens * read_price
+                + cache_creation_tokens * write_price
+            ) / 1_000_000
+    return None
+
+
+@dataclass
+class UsageRecord:
+    """Usage of a single LLM call or phone call."""
+
+    stage: str
+    provider: str
+    conversation_id: Optional[str] = None
+    model: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    latency_ms: float = 0.0
+    cost_usd: Optional[float] = None
+    call_credits: float = 0.0
+    call_seconds: float = 0.0
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_response(
+        cls, stage: str, response: Any, latency: float, conversation_id: Optional[str] = None
+    ) -> Optional["UsageRecord"]:
+        """
+        Build a record from an Anthropic message or OpenAI response.
+
+        Args:
+            stage: Span name the call was made in (e.g. "claude.evaluation")
+            response: SDK response object carrying `.usage` and `.model`
+            latency: Call latency in seconds
+            conversation_id: Conversation to attribute the call to
+
+        Returns:
+            UsageRecord, or None if the response has no usage
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return None
+
+        model = getattr(response, "model", None)
+        if hasattr(usage, "input_tokens"):
+            provider = "anthropic"
+            input_tokens = usage.input_tokens or 0
+            output_tokens = usage.output_tokens or 0
+            cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+            cache_creation = getattr(usage, "cache_creation_input_tokens", None) or 0
+        else:
+            provider = "openai"
+            input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            output_tokens = getattr(usage, "completion_tokens", 0) or 0
+            cache_read = cache_creation = 0
+
+        return cls(
+            stage=stage,
+            provider=provider,
+            conversation_id=conversation_id,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_read_tokens=cache_read,
+            cache_creation_tokens=cache_creation,
+            latency_ms=round(latency * 1000, 3),
+            cost_usd=estimate_cost_usd(model, input_tokens, output_tokens, cache_read, cache_creation),
+        )
+
+
+def summarize(records: Iterable[UsageRecord]) -> dict[str, Any]:
+    """Aggregate records into token, cost and latency totals."""
+    totals: dict[str, Any] = {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
+        "cost_usd": 0.0,
+        "call_credits": 0.0,
+        "call_seconds": 0.0,
+        "latency_ms_total": 0.0,
+    }
+    latencies = []
+    for record in records:
+        totals["calls"] += 1
+        totals["input_tokens"] += record.input_tokens
+        totals["output_tokens"] += record.output_tokens
+        totals["cache_read_tokens"] += record.cache_read_tokens
+        totals["cache_creation_tokens"] += record.cache_creation_tokens
+        totals["cost_usd"] += record.cost_usd or 0.0
+        totals["call_credits"] += record.call_credits
+        totals["call_seconds"] += record.call_seconds
+        totals["latency_ms_total"] += record.latency_ms
+        latencies.append(record.latency_ms)
+
+    latencies.sort()
+    totals["cost_usd"] = round(totals["cost_usd"], 6)
+    totals["latency_ms_total"] = round(totals["latency_ms_total"], 3)
+    totals["latency_ms_mean"] = round(totals["latency_ms_total"] / len(latencies), 3) if latencies else 0.0
+    totals["latency_ms_p95"] = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0
+    return totals
+
+
+class UsageLedger:
+    """Thread-safe, append-only ledger of UsageRecords.
+
+    Only the most recent max_records are kept in memory (and answer queries),
+    indexed by conversation; the Prometheus counters stay cumulative. With a
+    path, the JSON-lines file is rotated to "<path>.1" once it holds
+    max_records lines, so a restart reads at most two files of that size.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_records: int = 100_000):
+        """
+        Initialize the ledger.
+
+        Args:
+            path: Optional JSON-lines file; recent records are loaded and new ones appended
+            max_records: Size of the in-memory window and of each rotated file
+        """
+        self.path = path
+        self.max_records = max_records
+        self._records: deque[UsageRecord] = deque()
+        self._by_conversation: dict[str, deque[UsageRecord]] = {}
+        self._file_records = 0
+        self._lock = threading.Lock()
+
+        if path:
+            for source in (path + ".1", path):
+                if not os.path.exists(source):
+                    continue
+                with open(source, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            self._append(UsageRecord(**json.loads(line)))
+                            if source == path:
+                                self._file_records += 1
+
+    def _append(self, record: UsageRecord) -> None:
+        """Add a record to the window and index, evicting the oldest beyond max_records."""
+        self._records.append(record)
+        if record.conversation_id is not None:
+            self._by_conversation.setdefault(record.conversation_id, deque()).append(record)
+
+        while len(self._records) > self.max_records:
+            evicted = self._records.popleft()
+            if evicted.conversation_id is None:
+                continue
+            conversation = self._by_conversation[evicted.conversation_id]
+            conversation.popleft()
+            if not conversation:
+                del self._by_conversation[evicted.conversation_id]
+
+    def record(self, record: UsageRecord) -> None:
+        """Append a record and update the Prometheus counters."""
+        with self._lock:
+            self._append(record)
+            if self.path:
+                if self._file_records >= self.max_records:
+                    os.replace(self.path, self.path + ".1")
+                    self._file_records = 0
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(record)) + "\n")
+                self._file_records += 1
+
+        if record.provider == "elevenlabs":
+            CALL_CREDITS.inc(record.call_credits)
+            return
+
+        model = record.model or "unknown"
+        for kind, count in (
+            ("input", record.input_tokens),
+            ("output", record.output_tokens),
+            ("cache_read", record.cache_read_tokens),
+            ("cache_creation", record.cache_creation_tokens),
+        ):
+            if count:
+                LLM_TOKENS.labels(record.stage, model, kind).inc(count)
+        if record.cost_usd:
+            LLM_COST.labels(record.stage, model).inc(record.cost_usd)
+
+    def records(
+        self, conversation_id: Optional[str] = None, since: Optional[float] = None
+    ) -> list[UsageRecord]:
+        """In-window records, optionally filtered by conversation and creation time (unix seconds)."""
+        with self._lock:
+            if conversation_id is not None:
+                records = list(self._by_conversation.get(conversation_id, ()))
+            else:
+                records = list(self._records)
+        if since is not None:
+            records = [r for r in records if r.created_at >= since]
+        return records
+
+    def conversation_usage(self, conversation_id: str) -> dict[str, Any]:
+        """Totals for one conversation, overall and per stage."""
+        records = self.records(conversation_id=conversation_id)
+        by_stage: dict[str, list[UsageRecord]] = {}
+        for record in records:
+            by_stage.setdefault(record.stage, []).append(record)
+        return {
+            "totals": summarize(records),
+            "by_stage": {stage: summarize(rs) for stage, rs in sorted(by_stage.items())},
+        }
+
+    def rollup(
+        self, group_by: Iterable[str] = ("stage", "model"), since: Optional[float] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Aggregate usage grouped by any of conversation_id, stage, provider and model.
+
+        Args:
+            group_by: Fields to group by
+            since: Only include records created at or after this unix time
+
+        Returns:
+            One dict per group with the group keys and summarize() totals,
+            most expensive first
+
+        Raises:
+            ValueError: If a group_by field is not supported
+        """
+        group_by = list(group_by)
+        unknown = [name for name in group_by if name not in ROLLUP_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unsupported group_by field(s): {', '.join(unknown)}. "
+                f"Use any of: {', '.join(ROLLUP_FIELDS)}"
+            )
+
+        groups: dict[tuple, list[UsageRecord]] = {}
+        for record in self.records(since=since):
+            key = tuple(getattr(record, name) for name in group_by)
+            groups.setdefault(key, []).append(record)
+
+        rows = [
+            {**dict(zip(group_by, key)), **summarize(records)}
+            for key, records in groups.items()
+        ]
+        rows.sort(key=lambda row: (row["cost_usd"], row["call_credits"]), reverse=True)
+        return rows
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> UsageLedger:
+    """The process-wide usage ledger, built on first use from the loaded settings."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                settings = get_settings()
+                _ledger = UsageLedger(
+                    path=settings.usage_ledger_path, max_records=settings.usage_ledger_max_records
+                )
+    return _ledger
+
+
+def set_ledger(ledger: Optional[UsageLedger]) -> Optional[UsageLedger]:
+    """Replace the process-wide ledger (e.g. a fresh one in tests); returns the previous one.
+
+    Passing None makes the next get_ledger() build it from the settings again.
+    """
+    global _ledger
+    with _ledger_lock:
+        previous, _ledger = _ledger, ledger
+    return previous
@@ -1,63 +1,488 @@
 """
 RAG (Retrieval-Augmented Generation) service for querying Pinecone
 to get relevant context before making phone calls.
+
+Queries are embedded by a pluggable EmbeddingProvider (see retrieval/). With
+a local provider (EMBEDDING_PROVIDER=hashing, or no OpenAI key) the knowledge
+base is served from an in-process LocalVectorIndex instead of Pinecone. When
+the OpenAI embedding fails or takes longer than the embedding timeout, the
+query falls back to the local provider and index rather than failing the call.
+
+Local indexes built from the data directory are hot-reloaded: edits to the
+data files are picked up by a watcher thread, which refits the provider and
+builds a new index in the background, then swaps the (provider, index) pair
+in with one assignment. Queries in flight finish on the pair they started with.
 """
 
+import contextvars
+import copy
 import os
-from typing import Dict, List, Any
-from dotenv import load_dotenv
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Dict, List, Any, Tuple
 from pinecone import Pinecone
 from openai import OpenAI
+from prometheus_client import Counter
+from config import load_config
+from observability import span
+from retrieval import (
+    EmbeddingProvider,
+    HashingEmbeddingProvider,
+    DATA_DIR,
+    LocalVectorIndex,
+    RetrievalCache,
+    build_embedding_provider,
+    load_records,
+    read_kb_version,
+)
+from retrieval.hot_reload import DataDirectoryWatcher
+from retrieval.result_cache import retrieval_cache_key
+
+RAG_SKIPPED_TYPES = Counter(
+    "chargeback_rag_skipped_types_total",
+    "Per-type RAG queries left out of the context, by record type and reason (budget, queued, error)",
+    ["type", "reason"],
+)
 
-load_dotenv()
+# Matches retrieved per knowledge base record type (metadata "type")
+DEFAULT_TYPE_QUOTAS = {
+    "dispute_script": 2,
+    "policy": 3,
+    "resolution_authority": 2,
+    "order": 3,
+    "common_confusion": 2,
+}
 
 
 class RAGService:
     """Service for retrieving relevant context from Pinecone."""
 
-    def __init__(self):
-        """Initialize Pinecone and OpenAI clients."""
-        self.pinecone_client = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.index = self.pinecone_client.Index("chargeback-rag")
-
-    def _get_embedding(self, text: str) -> List[float]:
-        """Generate embedding for a text query using OpenAI."""
-        response = self.openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text
+    def __init__(
+        self,
+        index: Any = None,
+        openai_client: OpenAI | None = None,
+        type_quotas: Dict[str, int] | None = None,
+        latency_budget: float = 2.0,
+        concurrent_queries: int | None = None,
+        embedding_provider: EmbeddingProvider | None = None,
+        embedding_timeout: float | None = None,
+        fallback_cooldown: float = 30.0,
+        result_cache: RetrievalCache | None = None,
+        data_dir: Path | str = DATA_DIR,
+        hot_reload: bool | None = None,
+    ):
+        """
+        Initialize the embedding provider; the index is connected (or built) on first query.
+
+        Args:
+            index: Optional Pinecone index (or compatible stand-in); defaults to "chargeback-rag",
+                or to a LocalVectorIndex of backend/data when the provider is local
+            openai_client: Optional OpenAI client for the OpenAI embedding provider
+            type_quotas: Matches to retrieve per record type (defaults to DEFAULT_TYPE_QUOTAS)
+            latency_budget: Seconds each per-type query may run once a worker picks it up;
+                types that have not answered by then, or are still queued after that long,
+                are left empty
+            concurrent_queries: Calls the query pool serves at once without queueing, i.e.
+                conversations retrieving concurrently (defaults to RAG_CONCURRENT_QUERIES or 4)
+            embedding_provider: Query embedding provider; defaults to build_embedding_provider()
+                (EMBEDDING_PROVIDER, or OpenAI when a client or OPENAI_API_KEY is available)
+            embedding_timeout: Seconds to wait for a remote query embedding before falling
+                back to the local provider (defaults to RAG_EMBEDDING_TIMEOUT or 1.5)
+            fallback_cooldown: Seconds queries go straight to the local fallback after a
+                remote embedding failed or timed out
+            result_cache: Cache of the reason/product part of query results; defaults to
+                RAG_CACHE_SIZE entries (256) kept RAG_CACHE_TTL seconds (300), invalidated
+                when the knowledge base version changes
+            data_dir: Knowledge base files the local indexes are built from
+            hot_reload: Rebuild local indexes built from data_dir when its files change
+                (defaults to KB_HOT_RELOAD, on unless "0"; polled every KB_RELOAD_INTERVAL seconds)
+        """
+        load_config()
+        self.embedding_provider = embedding_provider or build_embedding_provider(openai_client=openai_client)
+        self.embedding_timeout = (
+            embedding_timeout
+            if embedding_timeout is not None
+            else float(os.getenv("RAG_EMBEDDING_TIMEOUT", "1.5"))
+        )
+        self._index = index
+        self.type_quotas = dict(type_quotas or DEFAULT_TYPE_QUOTAS)
+        self.latency_budget = latency_budget
+        if concurrent_queries is None:
+            concurrent_queries = int(os.getenv("RAG_CONCURRENT_QUERIES", "4"))
+        # One worker per type query plus one for the query embedding, per concurrent call
+        self._executor = ThreadPoolExecutor(
+            max_workers=(len(self.type_quotas) + 1) * concurrent_queries, thread_name_prefix="rag-query"
+        )
+        self.fallback_cooldown = fallback_cooldown
+        self._remote_retry_at = 0.0
+        self.data_dir = Path(data_dir)
+        self.hot_reload = os.getenv("KB_HOT_RELOAD", "1") != "0" if hot_reload is None else hot_reload
+        # Local (provider, index) pairs built from data_dir; each is swapped as a whole
+        self._local: Tuple[EmbeddingProvider, LocalVectorIndex] | None = None
+        self._fallback: Tuple[EmbeddingProvider, LocalVectorIndex] | None = None
+        self._local_lock = threading.Lock()
+        self._generation = 0
+        self._loaded_at: datetime | None = None
+        self._reload_error: str | None = None
+        self._watcher: DataDirectoryWatcher | None = None
+        # A local index's version is free to read; Pinecone's is a fetch
+        local_index = isinstance(index, LocalVectorIndex) or self.embedding_provider.local
+        self.result_cache = result_cache or RetrievalCache(
+            max_entries=int(os.getenv("RAG_CACHE_SIZE", "256")),
+            ttl=float(os.getenv("RAG_CACHE_TTL", "300")),
+            version_source=self._knowledge_base_version,
+            version_check_interval=0.0 if local_index else 10.0,
         )
-        return response.data[0].embedding
+
+    @property
+    def _serves_local(self) -> bool:
+        """Whether the primary index is a LocalVectorIndex this service builds from data_dir."""
+        return self._index is None and self.embedding_provider.local
+
+    @property
+    def index(self) -> Any:
+        """The Pinecone index, connected on first use (resolving its host is a network call)."""
+        if self._serves_local:
+            return self._local_retrieval()[1]
+        if self._index is None:
+            self.pinecone_client = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+            self._index = self.pinecone_client.Index("chargeback-rag")
+        return self._index
+
+    def _build_local(self, provider: EmbeddingProvider) -> Tuple[EmbeddingProvider, LocalVectorIndex]:
+        """Fit a copy of the provider on the data files (if it learns from a corpus) and index them."""
+        records = load_records(self.data_dir)
+        if hasattr(provider, "fit"):
+            # A copy, so queries still embedding with the current provider are unaffected
+            provider = copy.copy(provider).fit([record.text for record in records])
+        return provider, LocalVectorIndex.from_records(records, provider)
+
+    def _local_retrieval(self) -> Tuple[EmbeddingProvider, LocalVectorIndex]:
+        """Primary local provider and index, built on first use."""
+        if self._local is None:
+            with self._local_lock:
+                if self._local is None:
+                    self._local = self._build_local(self.embedding_provider)
+                    self._loaded(started=True)
+        return self._local
+
+    def _fallback_retrieval(self) -> Tuple[EmbeddingProvider, LocalVectorIndex]:
+        """Local hashing provider and index used when remote embeddings fail, built on first use."""
+        if self._fallback is None:
+            with self._local_lock:
+                if self._fallback is None:
+                    self._fallback = self._build_local(HashingEmbeddingProvider())
+                    self._loaded(started=True)
+        return self._fallback
+
+    def _loaded(self, started: bool = False) -> None:
+        self._generation += 1
+        self._loaded_at = datetime.now()
+        if started and self.hot_reload and self._watcher is None:
+            self._watcher = DataDirectoryWatcher(
+                self.data_dir,
+                self.reload_knowledge_base,
+                interval=float(os.getenv("KB_RELOAD_INTERVAL", "2.0")),
+            )
+            self._watcher.start()
+
+    def reload_knowledge_base(self) -> bool:
+        """
+        Rebuild the local indexes from the data files and swap them in.
+
+        Building happens outside the lock queries use, so they are never blocked;
+        a failed rebuild (e.g. a file saved with invalid JSON) keeps the current
+        indexes.
+
+        Returns:
+            True if the indexes were replaced
+        """
+        local, fallback = self._local, self._fallback
+        if local is None and fallback is None:
+            return False
+        try:
+            new_local = self._build_local(local[0]) if local is not None else None
+            new_fallback = self._build_local(fallback[0]) if fallback is not None else None
+        except Exception as e:
+            self._reload_error = f"{type(e).__name__}: {e}"
+            print(f"⚠️  Knowledge base reload failed, keeping version {self._generation}: {e}")
+            return False
+
+        with self._local_lock:
+            if new_local is not None:
+                self._local = new_local
+            if new_fallback is not None:
+                self._fallback = new_fallback
+            self._reload_error = None
+            self._loaded()
+        print(f"🔄 Knowledge base reloaded (version {self._generation}, {len((new_local or new_fallback)[1])} records)")
+        return True
+
+    def knowledge_base_status(self) -> Dict[str, Any]:
+        """Source, version and size of the knowledge base, for the health endpoint."""
+        provider, index = self.embedding_provider, self._index
+        if self._serves_local:
+            source, version = "local", self._generation
+            provider, index = self._local or (provider, None)
+        elif isinstance(index, LocalVectorIndex):
+            source, version = "local", index.version
+        else:
+            source, version, index = "pinecone", self.result_cache.version, None
+        return {
+            "source": source,
+            "version": version,
+            "records": len(index) if index is not None else None,
+            "model": provider.model,
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "hot_reload": self._watcher is not None and self._watcher.running,
+            "last_error": self._reload_error,
+        }
+
+    def close(self) -> None:
+        """Stop watching the data files."""
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def _get_embeddings(self, texts: List[str]) -> Tuple[List[Any], Any, float, bool]:
+        """
+        Embed queries, falling back to the local provider when a remote one fails or is slow.
+
+        Returns:
+            The query vectors, the index to search with them, the score floor of the
+            provider that embedded them, and whether it is the fallback
+        """
+        if self._serves_local:
+            # One read of the pair, so a reload cannot mix providers and indexes
+            provider, index = self._local_retrieval()
+            return list(provider.embed(texts)), index, provider.score_floor, False
+        provider = self.embedding_provider
+        if provider.local:
+            return list(provider.embed(texts)), self.index, provider.score_floor, False
+
+        if time.monotonic() >= self._remote_retry_at:
+            future = self._executor.submit(
+                contextvars.copy_context().run, self.embedding_provider.embed, texts
+            )
+            try:
+                vectors = [v.tolist() for v in future.result(timeout=self.embedding_timeout)]
+                return vectors, self.index, provider.score_floor, False
+            except FutureTimeout:
+                print(f"⚠️  Query embedding exceeded {self.embedding_timeout:.1f}s; using the local index")
+            except Exception as e:
+                print(f"⚠️  Query embedding failed ({e}); using the local index")
+            self._remote_retry_at = time.monotonic() + self.fallback_cooldown
+
+        provider, index = self._fallback_retrieval()
+        return list(provider.embed(texts)), index, provider.score_floor, True
+
+    def _knowledge_base_version(self) -> Any:
+        """Version of the primary index, for invalidating the result cache."""
+        index = self.index
+        if isinstance(index, LocalVectorIndex):
+            # Reloads replace the index, whose own write counter restarts
+            return self._generation, index.version
+        if not hasattr(index, "fetch"):
+            return None
+        return read_kb_version(index)
+
+    def _query_type(
+        self, vector: List[float], record_type: str, top_k: int, index: Any, score_floor: float
+    ) -> List[Dict[str, Any]]:
+        """Query a single record type using a metadata filter; matches carry the score floor."""
+        with span("local_index.query" if isinstance(index, LocalVectorIndex) else "pinecone.query"):
+            results = index.query(
+                vector=vector,
+                top_k=top_k,
+                include_metadata=True,
+                filter={"type": {"$eq": record_type}},
+            )
+        return [
+            {"id": match["id"], "score": match["score"], "metadata": match["metadata"], "score_floor": score_floor}
+            for match in results["matches"]
+        ]
+
+    def _fan_out(
+        self, queries: Dict[str, Tuple[Any, int]], index: Any, score_floor: float, budget: float
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+        """
+        Run one filtered query per record type concurrently.
+
+        Each query runs in a copy of the current context so its span lands in
+        the conversation timeline. The budget is counted from when a query
+        starts running, so time spent queued behind other conversations'
+        queries does not eat into it; a query still queued after one budget
+        is skipped as well. Skipped types are counted in RAG_SKIPPED_TYPES.
+
+        Args:
+            queries: Record type -> (query vector, number of matches)
+            index: Index to query
+            score_floor: Score floor of the provider that embedded the query vectors
+            budget: Seconds each query may run (and wait for a worker)
+
+        Returns:
+            Matches by record type, and whether every type answered
+        """
+        started: Dict[str, float] = {}
+
+        def run(record_type: str, vector: Any, k: int) -> List[Dict[str, Any]]:
+            started[record_type] = time.monotonic()
+            return self._query_type(vector, record_type, k, index, score_floor)
+
+        submitted = time.monotonic()
+        futures = {
+            self._executor.submit(contextvars.copy_context().run, run, record_type, vector, k): record_type
+            for record_type, (vector, k) in queries.items()
+        }
+
+        def deadline(future: Any) -> float:
+            return started.get(futures[future], submitted) + budget
+
+        pending = set(futures)
+        late: Dict[str, str] = {}
+        while pending:
+            now = time.monotonic()
+            for future in [f for f in pending if not f.done() and deadline(f) <= now]:
+                pending.discard(future)
+                late[futures[future]] = "budget" if futures[future] in started else "queued"
+            if not pending:
+                break
+            _, pending = wait(pending, timeout=min(map(deadline, pending)) - now, return_when=FIRST_COMPLETED)
+
+        if late:
+            for record_type, reason in late.items():
+                RAG_SKIPPED_TYPES.labels(record_type, reason).inc()
+            print(f"⚠️  RAG latency budget ({budget:.1f}s) exceeded; skipping: {', '.join(sorted(late))}")
+
+        results = {}
+        for future, record_type in futures.items():
+            if record_type in late:
+                continue
+            try:
+                results[record_type] = future.result()
+            except Exception as e:
+                RAG_SKIPPED_TYPES.labels(record_type, "error").inc()
+                print(f"⚠️  RAG query for '{record_type}' failed: {e}")
+        return results, len(results) == len(futures)
+
+    def shared_context(
+        self,
+        chargeback_reason: str,
+        product_name: str,
+        top_k: int = 5,
+        type_quotas: Dict[str, int] | None = None,
+        latency_budget: float | None = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve the reason/product part of query_context() once, for many customers.
+
+        Goes through the result cache like query_context(). The matches are plain
+        dicts (id, score, metadata, score_floor), so they can be stored in a job payload and
+        passed to query_context(shared_results=...) in another process.
+
+        Args:
+            chargeback_reason: The reason for the chargeback
+            product_name: The product involved in the dispute
+            top_k: Maximum number of results for any single record type
+            type_quotas: Per-type result counts (defaults to the service's quotas)
+            latency_budget: Seconds per type query (defaults to the service's budget)
+
+        Returns:
+            Matches by record type (every type but orders)
+        """
+        quotas = type_quotas or self.type_quotas
+        budget = self.latency_budget if latency_budget is None else latency_budget
+        shared_quotas = {t: min(q, top_k) for t, q in quotas.items() if q > 0 and t != "order"}
+
+        def retrieve_shared() -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+            vectors, index, score_floor, fallback = self._get_embeddings([f"{chargeback_reason} {product_name}"])
+            queries = {t: (vectors[0], k) for t, k in shared_quotas.items()}
+            results, complete = self._fan_out(queries, index, score_floor, budget)
+            return results, complete and not fallback
+
+        shared = self.result_cache.get_or_compute(
+            retrieval_cache_key(chargeback_reason, product_name, shared_quotas), retrieve_shared
+        )
+        return {
+            record_type: [
+                {**match, "metadata": dict(match["metadata"])}
+                for match in matches
+            ]
+            for record_type, matches in shared.items()
+        }
 
     def query_context(
         self,
         chargeback_reason: str,
         product_name: str,
         customer_name: str = "",
-        top_k: int = 5
+        top_k: int = 5,
+        type_quotas: Dict[str, int] | None = None,
+        latency_budget: float | None = None,
+        shared_results: Dict[str, List[Dict[str, Any]]] | None = None,
     ) -> Dict[str, Any]:
         """
         Query Pinecone for relevant context based on chargeback details.
 
+        Record types are queried concurrently with a metadata filter each, so
+        every type gets its own quota and frequent types (e.g. orders) cannot
+        crowd out policies or scripts. Policies, scripts, authority and
+        confusions only depend on the reason and product and are served from
+        the result cache; orders are looked up per customer. On a cache miss
+        both queries are embedded in one request.
+
         Args:
             chargeback_reason: The reason for the chargeback
             product_name: The product involved in the dispute
             customer_name: Optional customer name for order lookup
-            top_k: Number of results to retrieve
+            top_k: Maximum number of results for any single record type
+            type_quotas: Per-type result counts (defaults to the service's quotas)
+            latency_budget: Seconds per type query (defaults to the service's budget)
+            shared_results: Reason/product matches already retrieved with shared_context()
+                for the same reason, product, top_k and quotas (e.g. once per batch);
+                only orders are then queried
 
         Returns:
             Dictionary containing relevant policies, scripts, orders, and authority info
         """
-        # Create a comprehensive query
-        query_text = f"{chargeback_reason} {product_name} {customer_name}"
-        query_embedding = self._get_embedding(query_text)
-
-        # Search Pinecone
-        results = self.index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True
-        )
+        quotas = type_quotas or self.type_quotas
+        budget = self.latency_budget if latency_budget is None else latency_budget
+        shared_quotas = {t: min(q, top_k) for t, q in quotas.items() if q > 0 and t != "order"}
+        order_k = min(quotas.get("order", 0), top_k)
+
+        shared_text = f"{chargeback_reason} {product_name}"
+        order_text = f"{chargeback_reason} {product_name} {customer_name}"
+        orders: List[Dict[str, Any]] | None = None
+
+        def retrieve_shared() -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+            nonlocal orders
+            texts = [shared_text, order_text] if order_k else [shared_text]
+            vectors, index, score_floor, fallback = self._get_embeddings(texts)
+            queries = {t: (vectors[0], k) for t, k in shared_quotas.items()}
+            if order_k:
+                queries["order"] = (vectors[1], order_k)
+            results = self._fan_out(queries, index, score_floor, budget)[0]
+            if order_k:
+                orders = results.pop("order", [])
+            # Incomplete results and those of the fallback index are not cached
+            complete = set(results) == set(shared_quotas)
+            return results, complete and not fallback
+
+        shared = shared_results
+        if shared is None:
+            shared = self.result_cache.get_or_compute(
+                retrieval_cache_key(chargeback_reason, product_name, shared_quotas), retrieve_shared
+            )
+        if orders is None and order_k:
+            # Shared part given or cached, or retrieved by another call
+            vectors, index, score_floor, _ = self._get_embeddings([order_text])
+            queries = {"order": (vectors[0], order_k)}
+            orders = self._fan_out(queries, index, score_floor, budget)[0].get("order", [])
+
+        matches = [match for results in shared.values() for match in results] + (orders or [])
+        matches.sort(key=lambda match: match["score"], reverse=True)
 
         # Organize results by type
         context = {
@@ -68,25 +493,28 @@ class RAGService:
             "common_confusions": []
         }
 
-        for match in results['matches']:
+        for match in matches:
             metadata = match['metadata']
             result_type = metadata.get('type')
 
             if result_type == "policy":
                 context["policies"].append({
                     "score": match['score'],
+                    "score_floor": match.get('score_floor'),
                     "policy_type": metadata.get('policy_type'),
                     "content": metadata.get('content')
                 })
             elif result_type == "dispute_script":
                 context["dispute_scripts"].append({
                     "score": match['score'],
+                    "score_floor": match.get('score_floor'),
                     "dispute_reason": metadata.get('dispute_reason'),
                     "content": metadata.get('content')
                 })
             elif result_type == "order":
                 context["orders"].append({
                     "score": match['score'],
+                    "score_floor": match.get('score_floor'),
                     "charge_id": metadata.get('charge_id'),
                     "customer": metadata.get('customer'),
                     "product": metadata.get('product'),
@@ -97,12 +525,14 @@ class RAGService:
             elif result_type == "resolution_authority":
                 context["resolution_authority"].append({
                     "score": match['score'],
+                    "score_floor": match.get('score_floor'),
                     "authority_type": metadata.get('authority_type'),
                     "content": metadata.get('content')
                 })
             elif result_type == "common_confusion":
                 context["common_confusions"].append({
                     "score": match['score'],
+                    "score_floor": match.get('score_floor'),
                     "confusion_type": metadata.get('confusion_type'),
                     "content": metadata.get('content')
                 })
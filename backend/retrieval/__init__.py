@@ -0,0 +1,35 @@
+"""
+Retrieval - Knowledge base records, embedding providers, the local vector index,
+the retrieval result cache and the incremental knowledge base sync.
+"""
+
+from .embeddings import (
+    EmbeddingProvider,
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    build_embedding_provider,
+)
+from .local_index import LocalVectorIndex, matches_filter
+from .records import DATA_DIR, KnowledgeRecord, load_records
+from .result_cache import RetrievalCache, publish_kb_version, read_kb_version
+from .sync import SyncPlan, apply_sync, load_manifest, plan_sync, save_manifest
+
+__all__ = [
+    "EmbeddingProvider",
+    "HashingEmbeddingProvider",
+    "OpenAIEmbeddingProvider",
+    "build_embedding_provider",
+    "LocalVectorIndex",
+    "matches_filter",
+    "DATA_DIR",
+    "KnowledgeRecord",
+    "load_records",
+    "RetrievalCache",
+    "publish_kb_version",
+    "read_kb_version",
+    "SyncPlan",
+    "apply_sync",
+    "load_manifest",
+    "plan_sync",
+    "save_manifest",
+]
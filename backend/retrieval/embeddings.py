@@ -0,0 +1,266 @@
+"""
+Embedding providers - Turn knowledge base texts and RAG queries into vectors.
+
+RAGService and upload_to_pinecone.py embed through an EmbeddingProvider:
+
+- OpenAIEmbeddingProvider: text-embedding-3-small through the OpenAI API
+  (the vectors stored in the Pinecone index)
+- HashingEmbeddingProvider: local hashed TF-IDF over word and character
+  n-grams, built with NumPy/SciPy. No network, no model download and no
+  vocabulary to store, so it works offline, in tests and as the fallback
+  when OpenAI is slow or unavailable.
+
+build_embedding_provider() picks one from EMBEDDING_PROVIDER ("openai",
+"hashing" or "auto": OpenAI when an API key is configured).
+"""
+
+import hashlib
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Any, Iterable, List, Protocol, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from config import load_config
+from observability import span
+
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+OPENAI_EMBEDDING_DIMENSIONS = 1536
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Function words that only add noise to short queries
+STOP_WORDS = frozenset(
+    "a an and are as at be by can for from has have if in is it its of on or our "
+    "the their them then they this to was we were will with you your".split()
+)
+
+
+class EmbeddingProvider(Protocol):
+    """Anything that embeds a batch of texts into rows of a matrix."""
+
+    model: str
+    dimensions: int
+    local: bool  # True when embedding needs no network call
+    score_floor: float  # Cosine score below which a match is treated as noise
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts as a (len(texts), dimensions) float32 array."""
+        ...
+
+
+class OpenAIEmbeddingProvider:
+    """Embeddings from the OpenAI API."""
+
+    local = False
+    score_floor = 0.3
+
+    def __init__(
+        self,
+        client: Any = None,
+        model: str = OPENAI_EMBEDDING_MODEL,
+        dimensions: int = OPENAI_EMBEDDING_DIMENSIONS,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            client: Optional OpenAI client; defaults to one built from OPENAI_API_KEY
+            model: Embedding model name
+            dimensions: Vector size the model returns
+        """
+        if client is None:
+            from openai import OpenAI
+
+            load_config()
+            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = client
+        self.model = model
+        self.dimensions = dimensions
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts with one API request."""
+        with span("openai.embeddings") as active:
+            response = self.client.embeddings.create(model=self.model, input=list(texts))
+            active.record_usage(response)
+        rows = sorted(response.data, key=lambda item: item.index)
+        return np.asarray([row.embedding for row in rows], dtype=np.float32)
+
+
+class HashingEmbeddingProvider:
+    """
+    Hashed TF-IDF vectors over word and character n-grams.
+
+    Features are hashed into a fixed number of columns with a stable hash
+    (crc32), so the vectors of a text never change between processes. Word
+    n-grams carry topical matches ("subscription cancellation"); character
+    n-grams inside words catch inflections and near-misses ("canceled" vs
+    "cancellation"). Both blocks are L2-normalized separately and mixed with
+    `char_weight`, so long texts with many character grams do not drown the
+    word matches.
+
+    fit() learns IDF weights from a corpus (the knowledge base); unfitted,
+    every feature weighs the same. The model name carries a fingerprint of
+    the IDF weights, since refitting on a changed corpus changes every vector.
+    """
+
+    local = True
+    # Hashed word and character grams overlap little; relevant matches score 0.1-0.3
+    score_floor = 0.1
+
+    def __init__(
+        self,
+        dimensions: int = 1536,
+        word_ngrams: tuple[int, int] = (1, 2),
+        char_ngrams: tuple[int, int] = (3, 5),
+        char_weight: float = 0.5,
+        stop_words: frozenset[str] = STOP_WORDS,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            dimensions: Number of hashed columns
+            word_ngrams: Smallest and largest word n-gram
+            char_ngrams: Smallest and largest character n-gram (within words)
+            char_weight: Weight of the character block relative to the word block
+                (0 disables character n-grams)
+            stop_words: Words left out of word n-grams
+        """
+        self.dimensions = dimensions
+        self.word_ngrams = word_ngrams
+        self.char_ngrams = char_ngrams
+        self.char_weight = char_weight
+        self.stop_words = stop_words
+        self.model = f"hashing-tfidf-{dimensions}"
+        self._idf: np.ndarray | None = None
+
+    @property
+    def fitted(self) -> bool:
+        return self._idf is not None
+
+    def _column(self, feature: str) -> int:
+        return zlib.crc32(feature.encode("utf-8")) % self.dimensions
+
+    def _word_features(self, tokens: List[str]) -> Counter:
+        words = [t for t in tokens if t not in self.stop_words]
+        counts: Counter = Counter()
+        low, high = self.word_ngrams
+        for n in range(low, high + 1):
+            for i in range(len(words) - n + 1):
+                counts[self._column("w:" + " ".join(words[i:i + n]))] += 1
+        return counts
+
+    def _char_features(self, tokens: List[str]) -> Counter:
+        counts: Counter = Counter()
+        low, high = self.char_ngrams
+        for token in tokens:
+            padded = f" {token} "
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    counts[self._column("c:" + padded[i:i + n])] += 1
+        return counts
+
+    def _block(self, rows: List[Counter]) -> sparse.csr_matrix:
+        """Sublinear-tf, IDF-weighted, L2-normalized rows."""
+        indptr, indices, data = [0], [], []
+        for counts in rows:
+            for column, count in counts.items():
+                indices.append(column)
+                data.append(1.0 + math.log(count))
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), indices, indptr),
+            shape=(len(rows), self.dimensions),
+        )
+        if self._idf is not None:
+            matrix = matrix.multiply(self._idf).tocsr()
+        return _normalize_rows(matrix)
+
+    def _features(self, texts: Iterable[str]) -> tuple[List[Counter], List[Counter]]:
+        words, chars = [], []
+        for text in texts:
+            tokens = _TOKEN.findall(text.lower())
+            words.append(self._word_features(tokens))
+            chars.append(self._char_features(tokens) if self.char_weight else Counter())
+        return words, chars
+
+    def fit(self, texts: Sequence[str]) -> "HashingEmbeddingProvider":
+        """
+        Learn IDF weights from a corpus.
+
+        Args:
+            texts: Corpus documents (e.g. the knowledge base record texts)
+
+        Returns:
+            The provider itself
+        """
+        words, chars = self._features(texts)
+        document_frequency = np.zeros(self.dimensions, dtype=np.float64)
+        for word_counts, char_counts in zip(words, chars):
+            document_frequency[list(set(word_counts) | set(char_counts))] += 1
+        # Smoothed IDF: unseen columns get the highest weight
+        self._idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        fingerprint = hashlib.sha256(self._idf.tobytes()).hexdigest()[:8]
+        self.model = f"hashing-tfidf-{self.dimensions}-{fingerprint}"
+        return self
+
+    def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """Embed texts as L2-normalized rows of a sparse matrix."""
+        words, chars = self._features(texts)
+        matrix = self._block(words)
+        if self.char_weight:
+            matrix = matrix + self.char_weight * self._block(chars)
+        return _normalize_rows(matrix.tocsr())
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts as dense float32 rows."""
+        with span("local.embeddings"):
+            return self.transform(texts).toarray().astype(np.float32, copy=False)
+
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+def build_embedding_provider(
+    name: str | None = None,
+    openai_client: Any = None,
+    corpus: Sequence[str] | None = None,
+) -> EmbeddingProvider:
+    """
+    Build the configured embedding provider.
+
+    Args:
+        name: "openai", "hashing" or "auto"; defaults to EMBEDDING_PROVIDER (or "auto").
+            "auto" uses OpenAI when a client is given or OPENAI_API_KEY is set.
+        openai_client: Optional OpenAI client for the OpenAI provider
+        corpus: Texts to fit the hashing provider's IDF on; defaults to the knowledge base
+
+    Returns:
+        The embedding provider
+
+    Raises:
+        ValueError: For an unknown provider name
+    """
+    load_config()
+    name = (name or os.getenv("EMBEDDING_PROVIDER") or "auto").lower()
+    if name == "auto":
+        name = "openai" if openai_client is not None or os.getenv("OPENAI_API_KEY") else "hashing"
+
+    if name == "openai":
+        return OpenAIEmbeddingProvider(openai_client)
+    if name in ("hashing", "local"):
+        if corpus is None:
+            from .records import load_records
+
+            corpus = [record.text for record in load_records()]
+        return HashingEmbeddingProvider().fit(corpus)
+    raise ValueError(f"Unknown embedding provider: {name}")
+
@@ -0,0 +1,81 @@
+"""
+Data directory watcher - Notice edits to the knowledge base files.
+
+DataDirectoryWatcher polls the modification time and size of the data files
+on a daemon thread and calls back once a change has settled (unchanged for
+one more poll), so a file that is still being written is not loaded half
+way. The callback runs on the watcher thread; RAGService uses it to rebuild
+its local index off the query path and swap it in.
+"""
+
+import threading
+from pathlib import Path
+from typing import Callable, Tuple
+
+from .records import DATA_FILES
+
+Snapshot = Tuple[Tuple[str, int, int], ...]
+
+
+class DataDirectoryWatcher:
+    """Polls the knowledge base files and reports settled changes."""
+
+    def __init__(self, data_dir: Path | str, on_change: Callable[[], None], interval: float = 2.0):
+        """
+        Initialize the watcher (not started).
+
+        Args:
+            data_dir: Directory with the data files
+            on_change: Called on the watcher thread after the files changed
+            interval: Seconds between polls
+        """
+        self.data_dir = Path(data_dir)
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last = self.snapshot()
+
+    def snapshot(self) -> Snapshot:
+        """(file name, mtime in ns, size) of every data file; missing files are left out."""
+        entries = []
+        for name in DATA_FILES:
+            try:
+                stat = (self.data_dir / name).stat()
+            except FileNotFoundError:
+                continue
+            entries.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kb-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        pending: Snapshot | None = None
+        while not self._stop.wait(self.interval):
+            current = self.snapshot()
+            if current == self._last:
+                pending = None
+            elif current != pending:
+                # Changed since the last poll: wait until it settles
+                pending = current
+            else:
+                self._last = current
+                pending = None
+                try:
+                    self.on_change()
+                except Exception as e:
+                    print(f"⚠️  Knowledge base reload failed: {e}")
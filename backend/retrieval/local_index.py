@@ -0,0 +1,220 @@
+"""
+Local vector index - Pinecone-compatible query/upsert/delete over a NumPy matrix.
+
+Serves RAGService without Pinecone: offline, in tests, and as the fallback
+when the OpenAI embeddings are unavailable (its vectors come from a local
+provider, so they cannot be searched in the Pinecone index).
+
+The index state (ids, normalized matrix, metadata, per-type rows) is an
+immutable snapshot. Writers build a new snapshot and swap it in under a
+lock; readers take the current snapshot without locking, so a query never
+sees a half-applied upsert.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .embeddings import EmbeddingProvider
+from .records import KnowledgeRecord
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """Whether metadata satisfies a Pinecone metadata filter ($eq / $in / plain values)."""
+    for key, condition in filter.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+@dataclass(frozen=True)
+class _IndexState:
+    ids: Tuple[str, ...] = ()
+    matrix: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+    metadata: Tuple[Dict[str, Any], ...] = ()
+    # Record type -> (row numbers, their matrix rows), for the per-type RAG queries
+    by_type: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    version: int = 0
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class LocalVectorIndex:
+    """In-memory cosine-similarity index with the subset of the Pinecone index API RAGService uses."""
+
+    def __init__(self, dimensions: int):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Vector size
+        """
+        self.dimensions = dimensions
+        self._state = _IndexState(matrix=np.zeros((0, dimensions), dtype=np.float32))
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def from_records(
+        cls, records: Sequence[KnowledgeRecord], provider: EmbeddingProvider
+    ) -> "LocalVectorIndex":
+        """Index knowledge base records embedded with a provider."""
+        index = cls(provider.dimensions)
+        if records:
+            vectors = provider.embed([record.text for record in records])
+            index.upsert(
+                vectors=[
+                    {"id": record.id, "values": vector, "metadata": record.metadata}
+                    for record, vector in zip(records, vectors)
+                ]
+            )
+        return index
+
+    @property
+    def version(self) -> int:
+        """Incremented by every write."""
+        return self._state.version
+
+    def __len__(self) -> int:
+        return len(self._state.ids)
+
+    def _swap(self, ids: List[str], vectors: List[np.ndarray], metadata: List[Dict[str, Any]]) -> None:
+        rows_by_type: Dict[str, List[int]] = {}
+        for row, meta in enumerate(metadata):
+            rows_by_type.setdefault(meta.get("type"), []).append(row)
+        matrix = (
+            np.vstack(vectors).astype(np.float32, copy=False)
+            if vectors
+            else np.zeros((0, self.dimensions), dtype=np.float32)
+        )
+        self._state = _IndexState(
+            ids=tuple(ids),
+            matrix=matrix,
+            metadata=tuple(metadata),
+            by_type={
+                t: (np.asarray(rows, dtype=np.intp), matrix[rows]) for t, rows in rows_by_type.items()
+            },
+            version=self._state.version + 1,
+        )
+
+    def upsert(self, vectors: Iterable[Dict[str, Any]], **kwargs: Any) -> Dict[str, int]:
+        """
+        Insert or replace vectors.
+
+        Args:
+            vectors: Dicts with id, values and optional metadata (as for Pinecone)
+
+        Returns:
+            {"upserted_count": n}
+        """
+        vectors = list(vectors)
+        if not vectors:
+            return {"upserted_count": 0}
+        values = _normalized(np.asarray([v["values"] for v in vectors], dtype=np.float32))
+        if values.shape[1] != self.dimensions:
+            raise ValueError(f"Vector dimension {values.shape[1]} does not match index dimension {self.dimensions}")
+
+        with self._write_lock:
+            state = self._state
+            position = {record_id: row for row, record_id in enumerate(state.ids)}
+            ids = list(state.ids)
+            rows = list(state.matrix)
+            metadata = list(state.metadata)
+            for vector, row_values in zip(vectors, values):
+                meta = dict(vector.get("metadata") or {})
+                row = position.get(vector["id"])
+                if row is None:
+                    position[vector["id"]] = len(ids)
+                    ids.append(vector["id"])
+                    rows.append(row_values)
+                    metadata.append(meta)
+                else:
+                    rows[row] = row_values
+                    metadata[row] = meta
+            self._swap(ids, rows, metadata)
+        return {"upserted_count": len(vectors)}
+
+    def delete(self, ids: Iterable[str] | None = None, delete_all: bool = False, **kwargs: Any) -> Dict[str, Any]:
+        """Delete vectors by ID (or all of them)."""
+        with self._write_lock:
+            state = self._state
+            doomed = set(state.ids) if delete_all else set(ids or ())
+            keep = [row for row, record_id in enumerate(state.ids) if record_id not in doomed]
+            self._swap(
+                [state.ids[row] for row in keep],
+                [state.matrix[row] for row in keep],
+                [state.metadata[row] for row in keep],
+            )
+        return {}
+
+    def query(
+        self,
+        vector: Sequence[float] | np.ndarray,
+        top_k: int = 10,
+        include_metadata: bool = True,
+        filter: Dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Cosine-similarity search.
+
+        Args:
+            vector: Query vector
+            top_k: Maximum number of matches
+            include_metadata: Whether matches carry their metadata
+            filter: Pinecone metadata filter; {"type": {"$eq": ...}} uses the precomputed type rows
+
+        Returns:
+            {"matches": [{"id", "score", "metadata"}], "namespace": ""} like Pinecone
+        """
+        state = self._state
+        type_filter = (filter or {}).get("type")
+        if filter is None:
+            rows, matrix = np.arange(len(state.ids)), state.matrix
+        elif list(filter) == ["type"] and isinstance(type_filter, dict) and list(type_filter) == ["$eq"]:
+            rows, matrix = state.by_type.get(type_filter["$eq"], (np.zeros(0, dtype=np.intp), None))
+        else:
+            rows = np.asarray(
+                [row for row, meta in enumerate(state.metadata) if matches_filter(meta, filter)],
+                dtype=np.intp,
+            )
+            matrix = state.matrix[rows]
+        if not len(rows) or top_k <= 0:
+            return {"matches": [], "namespace": ""}
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = matrix @ (query / norm if norm else query)
+        k = min(top_k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        matches = [
+            {
+                "id": state.ids[rows[i]],
+                "score": float(scores[i]),
+                "metadata": state.metadata[rows[i]] if include_metadata else None,
+            }
+            for i in best
+        ]
+        return {"matches": matches, "namespace": ""}
+
+    def describe_index_stats(self, **kwargs: Any) -> Dict[str, Any]:
+        """Vector count and dimension (as Pinecone), plus the snapshot version."""
+        state = self._state
+        return {
+            "dimension": self.dimensions,
+            "total_vector_count": len(state.ids),
+            "version": state.version,
+        }
@@ -0,0 +1,81 @@
+"""
+Knowledge base records - The backend/data files as (id, text, metadata) records.
+
+Every consumer of the knowledge base (the Pinecone upload, the local index,
+the offline stand-ins) reads the records from here, so they all embed the
+same text and store the same metadata.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Data file -> record type (metadata "type")
+DATA_FILES = {
+    "orders.json": "order",
+    "policies.json": "policy",
+    "dispute_scripts.json": "dispute_script",
+    "resolution_authority.json": "resolution_authority",
+    "common_confusions.json": "common_confusion",
+}
+
+
+@dataclass(frozen=True)
+class KnowledgeRecord:
+    """One knowledge base entry: the text that is embedded and the metadata stored with it."""
+
+    id: str
+    text: str
+    metadata: Dict[str, Any]
+
+    @property
+    def type(self) -> str:
+        return self.metadata["type"]
+
+
+def record_from_entry(record_type: str, entry: Dict[str, Any]) -> KnowledgeRecord:
+    """Build the record of one data file entry."""
+    if record_type == "order":
+        # Orders embed their natural-language description
+        return KnowledgeRecord(
+            id=entry["id"],
+            text=entry["description"],
+            metadata={
+                "type": "order",
+                "charge_id": entry["charge_id"],
+                "customer": entry["customer"],
+                "product": entry["product"],
+                "amount": entry["amount"],
+                "date": entry["date"],
+                "status": entry["status"],
+            },
+        )
+
+    metadata: Dict[str, Any] = {"type": record_type}
+    if record_type == "dispute_script":
+        metadata["dispute_reason"] = entry["dispute_reason"]
+    else:
+        # policy_type, authority_type, confusion_type
+        metadata[f"{record_type.split('_')[-1]}_type"] = entry["type"]
+    metadata["content"] = entry["content"]
+    return KnowledgeRecord(id=entry["id"], text=entry["content"], metadata=metadata)
+
+
+def load_records(data_dir: Path | str = DATA_DIR) -> List[KnowledgeRecord]:
+    """
+    Load every knowledge base record.
+
+    Args:
+        data_dir: Directory with the data files (defaults to backend/data)
+
+    Returns:
+        Records of all data files, in file order
+    """
+    records = []
+    for filename, record_type in DATA_FILES.items():
+        with open(Path(data_dir) / filename, "r") as f:
+            records.extend(record_from_entry(record_type, entry) for entry in json.load(f))
+    return records
@@ -0,0 +1,248 @@
+"""
+Retrieval cache - Reuse RAG results across calls with the same dispute reason and product.
+
+Most calls in a campaign share their chargeback reason and product, so the
+policies, scripts, authority and confusion matches they retrieve are the
+same. RAGService caches those under a normalized (reason, product, quotas)
+key; only the customer-specific order lookup is queried per call.
+
+Entries expire after a TTL and the least recently used are evicted beyond
+max_entries. Concurrent misses on one key are coalesced: the first caller
+retrieves, the others wait for its result.
+
+Every entry belongs to a knowledge base version. The cache asks its version
+source (at most every version_check_interval seconds) and drops everything
+when the version changed, so an upsert by the ingestion pipeline is never
+hidden by stale entries. For a LocalVectorIndex the version is its write
+counter; for Pinecone it is a marker record upload_to_pinecone.py writes
+after each upload (publish_kb_version()).
+"""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from prometheus_client import Counter
+
+# Marker record holding the knowledge base version in the Pinecone index; its
+# type matches none of the per-type RAG filters, so queries never return it
+KB_VERSION_ID = "kb-version"
+KB_VERSION_TYPE = "kb_version"
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_CURRENT = object()
+
+RETRIEVAL_CACHE_LOOKUPS = Counter(
+    "chargeback_retrieval_cache_lookups_total",
+    "Retrieval cache lookups by result (hit, miss, coalesced)",
+    ["result"],
+)
+
+
+def normalize_query_part(text: str) -> str:
+    """Lowercase, with underscores and punctuation collapsed to single spaces."""
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def retrieval_cache_key(chargeback_reason: str, product_name: str, quotas: Dict[str, int]) -> Tuple:
+    """Cache key of the shared (non-customer) part of a RAG query."""
+    return (
+        normalize_query_part(chargeback_reason),
+        normalize_query_part(product_name),
+        tuple(sorted(quotas.items())),
+    )
+
+
+def publish_kb_version(index: Any, dimensions: int) -> str:
+    """
+    Write a new knowledge base version marker to a Pinecone index.
+
+    Call after upserting records, so RAG result caches reading the index drop
+    their entries.
+
+    Returns:
+        The new version
+    """
+    version = uuid.uuid4().hex
+    marker = [0.0] * dimensions
+    marker[0] = 1.0  # Pinecone rejects all-zero dense vectors
+    index.upsert(
+        vectors=[{"id": KB_VERSION_ID, "values": marker, "metadata": {"type": KB_VERSION_TYPE, "version": version}}]
+    )
+    return version
+
+
+def read_kb_version(index: Any) -> Optional[str]:
+    """The version marker of a Pinecone index, or None if it has none."""
+    response = index.fetch(ids=[KB_VERSION_ID])
+    vectors = response["vectors"] if isinstance(response, dict) else response.vectors
+    record = vectors.get(KB_VERSION_ID)
+    if record is None:
+        return None
+    metadata = record["metadata"] if isinstance(record, dict) else record.metadata
+    return (metadata or {}).get("version")
+
+
+class RetrievalCache:
+    """Thread-safe TTL + LRU cache of retrieval results with single-flight misses."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 300.0,
+        version_source: Callable[[], Hashable] | None = None,
+        version_check_interval: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is dropped (0 disables caching)
+            ttl: Seconds an entry is served
+            version_source: Returns the current knowledge base version
+            version_check_interval: Minimum seconds between version_source calls
+            clock: Time source (monotonic seconds)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_source = version_source
+        self.version_check_interval = version_check_interval
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._version: Hashable = None
+        self._version_checked_at: float | None = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    @property
+    def version(self) -> Hashable:
+        """Knowledge base version the current entries belong to."""
+        return self._version
+
+    def check_version(self) -> Hashable:
+        """Ask the version source (if due) and drop every entry when the version changed."""
+        if self.version_source is None:
+            return self._version
+        now = self._clock()
+        with self._lock:
+            due = (
+                self._version_checked_at is None
+                or now - self._version_checked_at >= self.version_check_interval
+            )
+            if due:
+                self._version_checked_at = now
+        if due:
+            try:
+                version = self.version_source()
+            except Exception as e:
+                # Keep serving the last known version rather than flushing on a blip
+                print(f"⚠️  Could not read the knowledge base version: {e}")
+            else:
+                if version != self._version:
+                    self.invalidate(version)
+        return self._version
+
+    def invalidate(self, version: Hashable = None) -> None:
+        """Drop every entry; later entries belong to `version`."""
+        with self._lock:
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value for a key, or None if missing or expired."""
+        self.check_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, version: Hashable = _CURRENT) -> None:
+        """Store a value computed against `version` (dropped if the version has moved on since)."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version is not _CURRENT and version != self._version:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Tuple[Any, bool]]) -> Any:
+        """
+        Return the cached value for a key, computing it once for concurrent misses.
+
+        Args:
+            key: Cache key (see retrieval_cache_key())
+            compute: Returns (value, cacheable); incomplete results (e.g. a type
+                skipped by the latency budget) are handed to waiting callers but not stored
+
+        Returns:
+            The value
+        """
+        value = self.get(key)
+        if value is not None:
+            self._count("hit")
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            self._count("coalesced")
+            return future.result()
+
+        self._count("miss")
+        version = self._version
+        try:
+            value, cacheable = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if cacheable:
+                self.put(key, value, version)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+                "version": self._version,
+            }
+
+    def _count(self, result: str) -> None:
+        with self._lock:
+            if result == "hit":
+                self.hits += 1
+            elif result == "miss":
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        RETRIEVAL_CACHE_LOOKUPS.labels(result).inc()
@@ -0,0 +1,173 @@
+"""
+Knowledge base sync - Upsert only new or changed records, delete removed ones.
+
+A manifest records, for every record in the index, the hash of its content
+(embedded text + metadata) and the embedding model that produced its vector:
+
+    {"records": {"policy-1": {"hash": "<sha256>", "model": "text-embedding-3-small"}}}
+
+plan_sync() diffs the records in backend/data against the manifest:
+
+- added: not in the manifest
+- changed: different content hash, or embedded with a different model
+- removed: in the manifest but no longer in the data files
+
+apply_sync() embeds and upserts added + changed records in batches, deletes
+removed ones, and saves the manifest after every batch, so an interrupted
+sync resumes where it stopped. Its cost is proportional to the diff, not to
+the corpus.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from .embeddings import EmbeddingProvider
+from .records import KnowledgeRecord
+
+DEFAULT_MANIFEST = Path(__file__).resolve().parent.parent / "kb_manifest.json"
+
+
+def record_hash(record: KnowledgeRecord) -> str:
+    """SHA-256 over a record's embedded text and metadata."""
+    payload = json.dumps(
+        {"text": record.text, "metadata": record.metadata}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path: Path | str = DEFAULT_MANIFEST) -> Dict[str, Dict[str, str]]:
+    """Manifest entries by record ID (empty if the file does not exist)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["records"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(records: Dict[str, Dict[str, str]], path: Path | str = DEFAULT_MANIFEST) -> None:
+    """Write the manifest atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"records": dict(sorted(records.items()))}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class SyncPlan:
+    """Difference between the data files and the manifest."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
+
+    def diff_lines(self) -> List[str]:
+        """One "+ id" / "~ id" / "- id" line per record to upsert or delete."""
+        return (
+            [f"+ {record_id}" for record_id in self.added]
+            + [f"~ {record_id}" for record_id in self.changed]
+            + [f"- {record_id}" for record_id in self.removed]
+        )
+
+
+def plan_sync(
+    records: Sequence[KnowledgeRecord],
+    manifest: Dict[str, Dict[str, str]],
+    model: str,
+    full: bool = False,
+) -> SyncPlan:
+    """
+    Diff records against the manifest.
+
+    Args:
+        records: Current knowledge base records
+        manifest: Manifest entries by record ID
+        model: Embedding model the records would be embedded with
+        full: Treat every current record as changed (re-embed everything)
+
+    Returns:
+        SyncPlan
+    """
+    plan = SyncPlan()
+    current = set()
+    for record in records:
+        current.add(record.id)
+        entry = manifest.get(record.id)
+        if entry is None:
+            plan.added.append(record.id)
+        elif full or entry["hash"] != record_hash(record) or entry["model"] != model:
+            plan.changed.append(record.id)
+        else:
+            plan.unchanged += 1
+    plan.removed = sorted(set(manifest) - current)
+    return plan
+
+
+def apply_sync(
+    plan: SyncPlan,
+    records: Sequence[KnowledgeRecord],
+    provider: EmbeddingProvider,
+    index: Any,
+    manifest: Dict[str, Dict[str, str]],
+    manifest_path: Path | str | None = DEFAULT_MANIFEST,
+    batch_size: int = 64,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Apply a plan to an index (Pinecone or LocalVectorIndex).
+
+    Args:
+        plan: Result of plan_sync()
+        records: The records the plan was made from
+        provider: Embedding provider
+        index: Index with upsert(vectors=...) and delete(ids=...)
+        manifest: Manifest entries by record ID (updated in place)
+        manifest_path: Where to save the manifest after every batch (None to not save)
+        batch_size: Records per embedding request / upsert
+
+    Returns:
+        The updated manifest entries
+    """
+    by_id = {record.id: record for record in records}
+    pending = [by_id[record_id] for record_id in plan.added + plan.changed]
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        embeddings = provider.embed([record.text for record in batch])
+        index.upsert(
+            vectors=[
+                {"id": record.id, "values": embedding.tolist(), "metadata": record.metadata}
+                for record, embedding in zip(batch, embeddings)
+            ]
+        )
+        for record in batch:
+            manifest[record.id] = {"hash": record_hash(record), "model": provider.model}
+        if manifest_path is not None:
+            save_manifest(manifest, manifest_path)
+
+    for start in range(0, len(plan.removed), batch_size):
+        batch = plan.removed[start:start + batch_size]
+        index.delete(ids=batch)
+        for record_id in batch:
+            manifest.pop(record_id, None)
+        if manifest_path is not None:
+            save_manifest(manifest, manifest_path)
+
+    return manifest
@@ -3,6 +3,9 @@ from .dispute_analyzer import DisputeAnalyzer
 from .test_data_generator import TestDataGenerator
 from .dispute_response_generator import DisputeResponseGenerator
 from .dispute_evaluator import DisputeEvaluator
+from .evidence_cache import EvidenceCache
+from .outcome_classifier import FastPathClassifier, FastPathResult
+from .fake_backend import FakeStripeBackend, FakeStripeConfig, install_fake_backend
 from .models import (
     DisputeReason,
     DisputeValidity,
@@ -17,6 +20,12 @@ __all__ = [
     "TestDataGenerator",
     "DisputeResponseGenerator",
     "DisputeEvaluator",
+    "EvidenceCache",
+    "FastPathClassifier",
+    "FastPathResult",
+    "FakeStripeBackend",
+    "FakeStripeConfig",
+    "install_fake_backend",
     "DisputeReason",
     "DisputeValidity",
     "TestCardType",
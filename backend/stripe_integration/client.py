@@ -1,26 +1,39 @@
 import os
 import stripe
 from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
-
-load_dotenv()
+from config import load_config
+from observability import span
+from .fake_backend import FakeStripeBackend, fake_backend_installed, install_fake_backend
 
 
 class StripeClient:
     """Client for interacting with Stripe API"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, backend: Optional[FakeStripeBackend] = None):
         """
         Initialize Stripe client with API key.
 
         Args:
             api_key: Stripe API key. If not provided, reads from STRIPE_SECRET_KEY env variable.
+            backend: Optional FakeStripeBackend to serve all requests in-process (offline mode).
+                No API key is needed while a fake backend is installed. If not provided,
+                STRIPE_API_BASE env variable can point to a local fake server.
         """
+        load_config()
         self.api_key = api_key or os.getenv("STRIPE_SECRET_KEY")
+        if not self.api_key and (backend is not None or fake_backend_installed()):
+            self.api_key = "sk_test_fake"
         if not self.api_key:
             raise ValueError("Stripe API key is required")
         stripe.api_key = self.api_key
 
+        api_base = os.getenv("STRIPE_API_BASE")
+        if api_base:
+            stripe.api_base = api_base
+
+        if backend is not None:
+            install_fake_backend(backend)
+
     def create_customer(self, email: str, name: Optional[str] = None) -> stripe.Customer:
         """
         Create a new Stripe customer.
@@ -158,7 +171,50 @@ class StripeClient:
         Returns:
             Charge object
         """
-        return stripe.Charge.retrieve(charge_id)
+        with span("stripe.get_charge"):
+            return stripe.Charge.retrieve(charge_id)
+
+    def get_charges(self, charge_ids: List[str]) -> Dict[str, stripe.Charge]:
+        """
+        Retrieve many charges with as few requests as possible.
+
+        Disputed charges come 100 per request from the dispute list, with the
+        charge expanded. Listing stops once it has cost as many requests as
+        retrieving the remaining charges one by one would; those are then
+        retrieved individually.
+
+        Args:
+            charge_ids: Stripe charge IDs
+
+        Returns:
+            Charge objects by ID (charges that do not exist are left out)
+        """
+        charges: Dict[str, stripe.Charge] = {}
+        wanted = set(charge_ids)
+        pages = 0
+        starting_after = None
+        while len(wanted - charges.keys()) > pages:
+            with span("stripe.list_disputes"):
+                page = stripe.Dispute.list(
+                    limit=100, expand=["data.charge"], starting_after=starting_after
+                )
+            pages += 1
+            for dispute in page.data:
+                charge = dispute.charge
+                if not isinstance(charge, str) and charge.id in wanted:
+                    charges[charge.id] = charge
+            if not page.has_more or not page.data:
+                break
+            starting_after = page.data[-1].id
+
+        for charge_id in charge_ids:
+            if charge_id in charges:
+                continue
+            try:
+                charges[charge_id] = self.get_charge(charge_id)
+            except stripe.InvalidRequestError:
+                pass
+        return charges
 
     def list_charges(self, limit: int = 100) -> List[stripe.Charge]:
         """
@@ -194,7 +250,8 @@ class StripeClient:
         Returns:
             Dispute object
         """
-        return stripe.Dispute.retrieve(dispute_id)
+        with span("stripe.get_dispute"):
+            return stripe.Dispute.retrieve(dispute_id)
 
     def get_charge_disputes(self, charge_id: str) -> List[stripe.Dispute]:
         """
@@ -206,7 +263,8 @@ class StripeClient:
         Returns:
             List of disputes for the charge
         """
-        disputes = stripe.Dispute.list(charge=charge_id)
+        with span("stripe.list_disputes"):
+            disputes = stripe.Dispute.list(charge=charge_id)
         return disputes.data
 
     def submit_dispute_evidence(
@@ -224,7 +282,8 @@ class StripeClient:
         Returns:
             Updated Dispute object
         """
-        return stripe.Dispute.modify(dispute_id, evidence=evidence)
+        with span("stripe.update_dispute"):
+            return stripe.Dispute.modify(dispute_id, evidence=evidence)
 
     def close_dispute(self, dispute_id: str) -> stripe.Dispute:
         """
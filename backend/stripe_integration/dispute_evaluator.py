@@ -11,7 +11,15 @@ import os
 from typing import Dict, Any, List, Optional, Tuple
 import stripe
 from anthropic import Anthropic
+from observability import span
 from .client import StripeClient
+from .outcome_classifier import FastPathClassifier
+from .evidence_cache import (
+    CALL_INDEPENDENT_FIELDS,
+    EvidenceCache,
+    evidence_cache_key,
+    evidence_metadata_subset,
+)
 
 
 class DisputeEvaluator:
@@ -25,6 +33,9 @@ class DisputeEvaluator:
         self,
         stripe_api_key: Optional[str] = None,
         anthropic_api_key: Optional[str] = None,
+        anthropic_client: Optional[Anthropic] = None,
+        evidence_cache: Optional[EvidenceCache] = None,
+        outcome_classifier: Optional[FastPathClassifier] = None,
     ):
         """
         Initialize the Dispute Evaluator.
@@ -32,16 +43,27 @@ class DisputeEvaluator:
         Args:
             stripe_api_key: Stripe API key (optional, reads from env if not provided)
             anthropic_api_key: Anthropic API key (optional, reads from env if not provided)
+            anthropic_client: Pre-configured Anthropic client (optional, skips the API key lookup)
+            evidence_cache: Cache for call-independent evidence fields (optional; defaults
+                to an in-memory cache, persisted in EVIDENCE_CACHE_DIR if set)
+            outcome_classifier: Rule-based fast path tried before the Claude evaluation
+                (optional; every transcript is evaluated by Claude if not provided)
         """
         self.stripe_client = StripeClient(api_key=stripe_api_key)
         self.anthropic_api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
 
-        if not self.anthropic_api_key:
-            raise ValueError(
-                "Anthropic API key is required. Set ANTHROPIC_API_KEY env variable."
-            )
+        if anthropic_client is None:
+            if not self.anthropic_api_key:
+                raise ValueError(
+                    "Anthropic API key is required. Set ANTHROPIC_API_KEY env variable."
+                )
+            anthropic_client = Anthropic(api_key=self.anthropic_api_key)
 
-        self.anthropic_client = Anthropic(api_key=self.anthropic_api_key)
+        self.anthropic_client = anthropic_client
+        self.evidence_cache = evidence_cache or EvidenceCache(
+            directory=os.getenv("EVIDENCE_CACHE_DIR")
+        )
+        self.outcome_classifier = outcome_classifier
 
     def evaluate_transcript(
         self, transcript: List[Dict[str, Any]], charge_id: str
@@ -49,6 +71,9 @@ class DisputeEvaluator:
         """
         Evaluate conversation transcript to determine dispute resolution outcome.
 
+        Outcomes the fast-path classifier is confident about are returned
+        without a Claude request.
+
         Args:
             transcript: List of conversation messages with role, text, timestamp
             charge_id: Stripe charge ID
@@ -61,6 +86,12 @@ class DisputeEvaluator:
             - key_points: list of important points from conversation
             - recommendation: str (recommended action)
         """
+        # Unambiguous outcomes don't need Claude
+        if self.outcome_classifier is not None:
+            fast_path = self.outcome_classifier.decide(transcript)
+            if fast_path is not None:
+                return fast_path.to_evaluation()
+
         # Format transcript for Claude
         transcript_text = self._format_transcript_for_analysis(transcript)
 
@@ -90,11 +121,13 @@ Evaluation criteria:
 
 Return ONLY the JSON, no other text."""
 
-        response = self.anthropic_client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        with span("claude.evaluation") as active:
+            response = self.anthropic_client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=1000,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            active.record_usage(response)
 
         # Parse JSON response
         import json
@@ -129,6 +162,10 @@ Return ONLY the JSON, no other text."""
         """
         Generate professional evidence text for a specific field using Claude AI.
 
+        Call-independent fields (see CALL_INDEPENDENT_FIELDS) are generated from
+        the product and policy metadata only and cached, so disputes on the same
+        product and policy share one generation.
+
         Args:
             field_name: Name of the evidence field (e.g., "cancellation_rebuttal")
             charge_metadata: Metadata from Stripe charge
@@ -138,10 +175,6 @@ Return ONLY the JSON, no other text."""
         Returns:
             Professional evidence text for the field
         """
-        transcript_summary = self._format_transcript_for_analysis(
-            transcript, max_messages=10
-        )
-
         # Field-specific prompts
         field_prompts = {
             "access_activity_log": "Generate a detailed access activity log showing service usage. Include dates, actions, and proof of engagement.",
@@ -158,6 +191,34 @@ Return ONLY the JSON, no other text."""
             f"Generate professional evidence text for the '{field_name}' field.",
         )
 
+        if field_name in CALL_INDEPENDENT_FIELDS:
+            metadata_subset = evidence_metadata_subset(field_name, charge_metadata)
+            prompt = f"""You are a dispute evidence specialist. Generate professional, factual evidence text for Stripe dispute submission.
+
+FIELD: {field_name}
+TASK: {field_prompt}
+
+PRODUCT AND POLICY METADATA:
+{self._format_metadata_for_prompt(metadata_subset)}
+
+REQUIREMENTS:
+- Be factual and professional
+- Describe the product and policies only; do not mention any individual customer or call
+- Maximum 20,000 characters
+- Include concrete evidence only
+- Organize with clear sections if needed
+
+Generate the evidence text now:"""
+            return self.evidence_cache.get_or_generate(
+                evidence_cache_key(field_name, metadata_subset),
+                lambda: self._create_evidence_text(prompt),
+                field_name=field_name,
+            )
+
+        transcript_summary = self._format_transcript_for_analysis(
+            transcript, max_messages=10
+        )
+
         prompt = f"""You are a dispute evidence specialist. Generate professional, factual evidence text for Stripe dispute submission.
 
 FIELD: {field_name}
@@ -185,20 +246,51 @@ REQUIREMENTS:
 
 Generate the evidence text now:"""
 
-        response = self.anthropic_client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        return self._create_evidence_text(prompt)
+
+    def _create_evidence_text(self, prompt: str) -> str:
+        """Run one evidence text generation request."""
+        with span("claude.evidence_text") as active:
+            response = self.anthropic_client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=4000,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            active.record_usage(response)
 
         return response.content[0].text
 
+    def fetch_dispute_context(self, charge_id: str) -> Tuple[Dict[str, Any], Any]:
+        """
+        Fetch the charge metadata and the open dispute for a charge.
+
+        Args:
+            charge_id: Stripe charge ID
+
+        Returns:
+            Tuple of (charge metadata, first dispute for the charge)
+
+        Raises:
+            ValueError: If the charge has no disputes
+        """
+        charge = self.stripe_client.get_charge(charge_id)
+        metadata = charge.metadata or {}
+
+        disputes = self.stripe_client.get_charge_disputes(charge_id)
+
+        if not disputes:
+            raise ValueError(f"No disputes found for charge {charge_id}")
+
+        return metadata, disputes[0]
+
     def submit_evidence_to_stripe(
         self,
         charge_id: str,
         transcript: List[Dict[str, Any]],
         submit_immediately: bool = False,
         send_to_stripe: bool = True,
+        evaluation: Optional[Dict[str, Any]] = None,
+        dispute_context: Optional[Tuple[Dict[str, Any], Any]] = None,
     ) -> Dict[str, Any]:
         """
         Complete workflow: Evaluate transcript and submit evidence to Stripe.
@@ -207,6 +299,10 @@ Generate the evidence text now:"""
             charge_id: Stripe charge ID
             transcript: Conversation transcript
             submit_immediately: If True, immediately submits to bank. If False, stages evidence.
+            send_to_stripe: If False, evidence is generated but not sent to Stripe.
+            evaluation: Existing evaluation (e.g. PostCallAnalysis.to_evaluation()); when
+                provided, evaluate_transcript() is skipped.
+            dispute_context: Result of fetch_dispute_context(), if already fetched.
 
         Returns:
             Dictionary with:
@@ -214,23 +310,15 @@ Generate the evidence text now:"""
             - dispute: Updated Stripe dispute object
             - evidence_generated: List of evidence fields generated
         """
-        # Get charge and metadata
-        charge = self.stripe_client.get_charge(charge_id)
-        metadata = charge.metadata or {}
-
-        # Get dispute for this charge
-        disputes = self.stripe_client.get_charge_disputes(charge_id)
-
-        if not disputes:
-            raise ValueError(f"No disputes found for charge {charge_id}")
-
-        dispute = disputes[0]  # Get the first dispute
+        # Get charge metadata and the dispute for this charge
+        if dispute_context is None:
+            dispute_context = self.fetch_dispute_context(charge_id)
+        metadata, dispute = dispute_context
         dispute_id = dispute.id
 
-        print(f"📊 Evaluating transcript for dispute {dispute_id}...")
-
-        # Evaluate transcript
-        evaluation = self.evaluate_transcript(transcript, charge_id)
+        if evaluation is None:
+            print(f"📊 Evaluating transcript for dispute {dispute_id}...")
+            evaluation = self.evaluate_transcript(transcript, charge_id)
 
         print(f"✅ Evaluation complete:")
         print(f"   - Resolved: {evaluation['resolved']}")
@@ -259,8 +347,6 @@ Generate the evidence text now:"""
                 field, metadata, transcript, evaluation
             )
             evidence_generated.append(field)
-            # TODO: Remove break
-            break
 
         evidence_generated = evidence_generated[:]
 
@@ -278,9 +364,10 @@ Generate the evidence text now:"""
             print(f"\n📤 Submitting evidence to Stripe...")
 
             # Submit evidence to Stripe
-            updated_dispute = stripe.Dispute.modify(
-                dispute_id, evidence=evidence, submit=submit_immediately
-            )
+            with span("stripe.update_dispute"):
+                updated_dispute = stripe.Dispute.modify(
+                    dispute_id, evidence=evidence, submit=submit_immediately
+                )
 
             print(
                 f"✅ Evidence {'submitted' if submit_immediately else 'staged'} successfully!"
@@ -4,8 +4,9 @@ Uses Anthropic Claude to analyze charge metadata and create compelling response
 """
 
 import os
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from anthropic import Anthropic
+from observability import span
 from .client import StripeClient
 
 
@@ -17,21 +18,29 @@ class DisputeResponseGenerator:
     human-readable text that can be used when communicating with disputing customers.
     """
 
-    def __init__(self, stripe_api_key: Optional[str] = None, anthropic_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        stripe_api_key: Optional[str] = None,
+        anthropic_api_key: Optional[str] = None,
+        anthropic_client: Optional[Anthropic] = None,
+    ):
         """
         Initialize the Dispute Response Generator.
 
         Args:
             stripe_api_key: Stripe API key (optional, reads from env if not provided)
             anthropic_api_key: Anthropic API key (optional, reads from env if not provided)
+            anthropic_client: Pre-configured Anthropic client (optional, skips the API key lookup)
         """
         self.stripe_client = StripeClient(api_key=stripe_api_key)
         self.anthropic_api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
 
-        if not self.anthropic_api_key:
-            raise ValueError("Anthropic API key is required. Set ANTHROPIC_API_KEY env variable or pass it directly.")
+        if anthropic_client is None:
+            if not self.anthropic_api_key:
+                raise ValueError("Anthropic API key is required. Set ANTHROPIC_API_KEY env variable or pass it directly.")
+            anthropic_client = Anthropic(api_key=self.anthropic_api_key)
 
-        self.anthropic_client = Anthropic(api_key=self.anthropic_api_key)
+        self.anthropic_client = anthropic_client
 
     def fetch_charge_metadata(self, charge_id: str) -> Dict[str, Any]:
         """
@@ -70,13 +79,15 @@ Output ONLY a numbered list of arguments/evidence points. Each point should be:
 Format: Simple numbered list, nothing more, nothing less. No introduction, no conclusion, just the arguments."""
 
         # Call Claude API
-        message = self.anthropic_client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        with span("claude.arguments") as active:
+            message = self.anthropic_client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=2000,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            active.record_usage(message)
 
         # Extract the text response
         response_text = message.content[0].text
@@ -89,18 +100,22 @@ Format: Simple numbered list, nothing more, nothing less. No introduction, no co
             lines.append(f"  {key}: {value}")
         return "\n".join(lines)
 
-    def generate_dispute_response(self, charge_id: str) -> Tuple[str, str, str]:
+    def generate_dispute_response(
+        self, charge_id: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str, str]:
         """
         Complete workflow: Fetch metadata and generate response.
 
         Args:
             charge_id: Stripe charge ID
+            metadata: Charge metadata if already fetched (skips the Stripe request)
 
         Returns:
             Tuple of (prepared_text, phone_number, customer_name)
         """
         # Fetch metadata
-        metadata = self.fetch_charge_metadata(charge_id)
+        if metadata is None:
+            metadata = self.fetch_charge_metadata(charge_id)
 
         if not metadata:
             raise ValueError(f"No metadata found for charge {charge_id}")
@@ -147,8 +162,27 @@ Format: Simple numbered list, nothing more, nothing less. No introduction, no co
             - charge_info: amount, currency, date, status
             - metadata: all metadata fields
         """
-        charge = self.stripe_client.get_charge(charge_id)
-        metadata = charge.metadata or {}
+        return self.charge_details_from(self.stripe_client.get_charge(charge_id))
+
+    def get_charge_details_bulk(self, charge_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the charge details of many charges with bulk Stripe requests.
+
+        Args:
+            charge_ids: Stripe charge IDs
+
+        Returns:
+            Charge details (see get_charge_details) by charge ID; charges that
+            do not exist are left out
+        """
+        charges = self.stripe_client.get_charges(charge_ids)
+        return {charge_id: self.charge_details_from(charge) for charge_id, charge in charges.items()}
+
+    @staticmethod
+    def charge_details_from(charge: Any) -> Dict[str, Any]:
+        """Charge details (see get_charge_details) of a retrieved Stripe charge."""
+        charge_id = charge.id
+        metadata = dict(charge.metadata or {})
 
         # Extract customer information
         customer_info = {
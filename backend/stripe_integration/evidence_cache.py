@@ -0,0 +1,190 @@
+"""
+Evidence Cache - Content-addressed cache for call-independent evidence text.
+
+Some dispute evidence fields (product description, cancellation and refund
+policy disclosures) only depend on the product and policy metadata of a
+charge, not on the call. Their generated text is cached under a hash of the
+field name, the relevant metadata subset and the prompt version, so every
+dispute on the same product and policy reuses one generation. Changing the
+product metadata or bumping EVIDENCE_PROMPT_VERSION yields a new key.
+
+Entries are kept in memory (LRU) and, when a directory is given, written to
+`<key>.txt` files so they survive restarts and are shared between workers.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+# Bump when the prompts of call-independent fields change
+EVIDENCE_PROMPT_VERSION = "1"
+
+# Call-independent evidence fields -> charge metadata keys their text depends on
+CALL_INDEPENDENT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "product_description": (
+        "product_name",
+        "product_type",
+        "product_description",
+        "product_code",
+        "product_category",
+        "billing_interval",
+    ),
+    "cancellation_policy_disclosure": (
+        "product_name",
+        "product_type",
+        "cancellation_policy",
+        "terms_agreed",
+        "terms_version",
+    ),
+    "refund_policy_disclosure": (
+        "product_name",
+        "product_type",
+        "refund_policy",
+        "terms_agreed",
+        "terms_version",
+    ),
+}
+
+EVIDENCE_CACHE_LOOKUPS = Counter(
+    "chargeback_evidence_cache_lookups_total",
+    "Evidence cache lookups by field and result (hit, miss)",
+    ["field", "result"],
+)
+
+
+def evidence_metadata_subset(field_name: str, metadata: Dict[str, Any]) -> Dict[str, str]:
+    """The part of the charge metadata a call-independent field depends on."""
+    keys = CALL_INDEPENDENT_FIELDS[field_name]
+    return {key: str(metadata[key]) for key in keys if metadata.get(key) is not None}
+
+
+def evidence_cache_key(
+    field_name: str,
+    metadata_subset: Dict[str, str],
+    prompt_version: str = EVIDENCE_PROMPT_VERSION,
+) -> str:
+    """SHA-256 over the field name, metadata subset and prompt version."""
+    payload = json.dumps(
+        {"field": field_name, "metadata": metadata_subset, "prompt_version": prompt_version},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvidenceCache:
+    """
+    Thread-safe cache of generated evidence text keyed by content hash.
+
+    Concurrent requests for the same key generate the text once; the others
+    wait for it.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Optional directory to persist entries in (created if missing)
+            max_entries: Entries kept in memory before the least recently used is dropped
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached text for a key, from memory or disk."""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                return text
+
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store text under a key."""
+        self._remember(key, text)
+        if self.directory:
+            # Write then rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._path(key))
+
+    def get_or_generate(self, key: str, generate: Callable[[], str], field_name: str = "") -> str:
+        """
+        Return the cached text for a key, generating and storing it on a miss.
+
+        Args:
+            key: Cache key (see evidence_cache_key())
+            generate: Produces the text on a miss
+            field_name: Evidence field, for metrics
+
+        Returns:
+            The evidence text
+        """
+        text = self.get(key)
+        if text is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            try:
+                with key_lock:
+                    # Another thread may have generated it while we waited
+                    text = self.get(key)
+                    if text is None:
+                        self._count(field_name, "miss")
+                        text = generate()
+                        self.put(key, text)
+                        return text
+            finally:
+                # Also when generate() raised, or the lock would stay forever
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+
+        self._count(field_name, "hit")
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _count(self, field_name: str, result: str) -> None:
+        with self._lock:
+            if result == "hit":
+                self.hits += 1
+            else:
+                self.misses += 1
+        EVIDENCE_CACHE_LOOKUPS.labels(field_name, result).inc()
+
+    def _remember(self, key: str, text: str) -> None:
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
@@ -0,0 +1,559 @@
+"""
+Fake Stripe Backend - Offline stand-in for the Stripe API.
+
+Implements the subset of the Stripe REST API this project uses (customers,
+tokens, charges, payment intents, disputes and dispute evidence) so that
+StripeClient, DisputeResponseGenerator, DisputeEvaluator and the scripts can
+run without network access, e.g. for benchmarks and load tests on CI.
+
+Two ways to use it:
+
+1. In-process - route the global stripe client through the fake:
+
+    backend = FakeStripeBackend(FakeStripeConfig(latency_ms=80, error_rate=0.01))
+    charge_ids = backend.seed_from_scenarios(copies=10)
+    install_fake_backend(backend)
+    StripeClient(api_key="sk_test_fake").get_charge(charge_ids[0])
+
+2. Local HTTP - run `python -m stripe_integration.fake_backend --port 12111`
+   and set STRIPE_API_BASE=http://localhost:12111 for the process under test.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import stripe
+
+from .models import TRANSACTION_SCENARIOS, TestCardType, TransactionScenario
+
+# Test cards that make real Stripe open a dispute right after the charge
+DISPUTE_CARDS = {
+    TestCardType.DISPUTE_FRAUDULENT.value: "fraudulent",
+    TestCardType.DISPUTE_PRODUCT_NOT_RECEIVED.value: "product_not_received",
+}
+
+# Resource path segment -> (object name, id prefix)
+RESOURCES = {
+    "customers": ("customer", "cus"),
+    "tokens": ("token", "tok"),
+    "charges": ("charge", "ch"),
+    "payment_intents": ("payment_intent", "pi"),
+    "disputes": ("dispute", "du"),
+}
+
+
+@dataclass
+class FakeStripeConfig:
+    """Latency and error injection settings for the fake backend."""
+
+    latency_ms: float = 0.0
+    """Base latency added to every request."""
+
+    latency_jitter_ms: float = 0.0
+    """Uniform random jitter added on top of latency_ms."""
+
+    error_rate: float = 0.0
+    """Probability (0-1) that a request fails with error_status."""
+
+    error_status: int = 500
+    """HTTP status returned for injected errors (500, 429, ...)."""
+
+    seed: Optional[int] = None
+    """Random seed for reproducible latency/error sequences."""
+
+
+class FakeStripeError(Exception):
+    """Error raised inside the fake backend, rendered as a Stripe error body."""
+
+    def __init__(
+        self,
+        status: int,
+        message: str,
+        error_type: str = "invalid_request_error",
+        code: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.error_type = error_type
+        self.code = code
+
+    def to_body(self) -> Dict[str, Any]:
+        error: Dict[str, Any] = {"type": self.error_type, "message": self.message}
+        if self.code:
+            error["code"] = self.code
+        return {"error": error}
+
+
+class FakeStripeBackend:
+    """
+    Thread-safe in-memory Stripe state with configurable latency and errors.
+
+    All objects are stored as plain dicts shaped like Stripe API responses.
+    """
+
+    def __init__(self, config: Optional[FakeStripeConfig] = None):
+        """
+        Initialize the fake backend.
+
+        Args:
+            config: Latency/error injection settings (defaults to no latency, no errors)
+        """
+        self.config = config or FakeStripeConfig()
+        self._random = random.Random(self.config.seed)
+        self._objects: Dict[str, Dict[str, Dict[str, Any]]] = {
+            resource: {} for resource in RESOURCES
+        }
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+    # ------------------------------------------------------------------
+    # Seeding
+    # ------------------------------------------------------------------
+
+    def seed_from_scenarios(
+        self,
+        scenarios: Optional[List[TransactionScenario]] = None,
+        copies: int = 1,
+        phone_number: str = "+15555550100",
+    ) -> List[str]:
+        """
+        Create customers, charges and disputes from transaction scenarios.
+
+        Charges get the metadata fields the pipeline reads (customer_name,
+        customer_phone, product_name, subscription_start, ...) merged with the
+        scenario metadata.
+
+        Args:
+            scenarios: Scenarios to generate (defaults to TRANSACTION_SCENARIOS)
+            copies: How many copies of each scenario to create
+            phone_number: Phone number stored as customer_phone on every charge
+
+        Returns:
+            IDs of the created charges that have a dispute
+        """
+        scenarios = scenarios if scenarios is not None else TRANSACTION_SCENARIOS
+        disputed_charge_ids = []
+
+        with self._lock:
+            for copy_index in range(copies):
+                for scenario in scenarios:
+                    customer = self._create(
+                        "customers",
+                        {"email": scenario.customer_email, "name": scenario.customer_name},
+                    )
+                    metadata = {
+                        "customer_id": customer["id"],
+                        "customer_name": scenario.customer_name,
+                        "customer_email": scenario.customer_email,
+                        "customer_phone": phone_number,
+                        "product_name": scenario.description,
+                        "product_type": "subscription",
+                        "subscription_start": "2024-11-01",
+                        "purchase_ip": "192.0.2.10",
+                        "dispute_validity": scenario.dispute_validity.value,
+                        "notes": scenario.notes,
+                        "copy": str(copy_index),
+                    }
+                    metadata.update({k: str(v) for k, v in scenario.metadata.items()})
+
+                    charge = self._create_charge(
+                        {
+                            "amount": str(scenario.amount),
+                            "currency": "usd",
+                            "customer": customer["id"],
+                            "description": scenario.description,
+                            "metadata": metadata,
+                        },
+                        open_dispute=False,
+                    )
+
+                    if scenario.will_dispute:
+                        reason = (
+                            scenario.dispute_reason.value
+                            if scenario.dispute_reason
+                            else "general"
+                        )
+                        self._open_dispute(charge, reason)
+                        disputed_charge_ids.append(charge["id"])
+
+        return disputed_charge_ids
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def handle(
+        self, method: str, path: str, params: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle a single API request.
+
+        Args:
+            method: HTTP method (any case)
+            path: Request path, e.g. /v1/charges/ch_123
+            params: Decoded query/form parameters (nested dicts for a[b]=c keys)
+
+        Returns:
+            Tuple of (http_status, response_body)
+        """
+        self._simulate_latency()
+
+        with self._lock:
+            self.request_count += 1
+            injected_error = self._random.random() < self.config.error_rate
+            if injected_error:
+                self.error_count += 1
+
+        if injected_error:
+            return self.config.error_status, FakeStripeError(
+                self.config.error_status, "Injected fake backend error", "api_error"
+            ).to_body()
+
+        try:
+            body = self._route(method.lower(), path, params)
+            return 200, {k: v for k, v in body.items() if not k.startswith("_")}
+        except FakeStripeError as e:
+            return e.status, e.to_body()
+
+    def _simulate_latency(self) -> None:
+        delay_ms = self.config.latency_ms
+        if self.config.latency_jitter_ms:
+            with self._lock:
+                delay_ms += self._random.uniform(0, self.config.latency_jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _route(self, method: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        parts = [p for p in path.split("/") if p]
+        if not parts or parts[0] != "v1" or len(parts) < 2 or parts[1] not in RESOURCES:
+            raise FakeStripeError(404, f"Unrecognized request URL ({method.upper()}: {path})")
+
+        resource = parts[1]
+        object_id = parts[2] if len(parts) > 2 else None
+        action = parts[3] if len(parts) > 3 else None
+
+        with self._lock:
+            if object_id is None:
+                if method == "get":
+                    return self._list(resource, params)
+                if method == "post":
+                    if resource == "charges":
+                        return self._create_charge(params)
+                    if resource == "tokens":
+                        return self._create_token(params)
+                    return self._create(resource, params)
+            elif action is None:
+                if method == "get":
+                    return self._expand(self._get(resource, object_id), params)
+                if method == "post":
+                    return self._update(resource, object_id, params)
+                if method == "delete":
+                    self._get(resource, object_id)
+                    del self._objects[resource][object_id]
+                    return {"id": object_id, "object": RESOURCES[resource][0], "deleted": True}
+            elif resource == "disputes" and action == "close" and method == "post":
+                dispute = self._get(resource, object_id)
+                dispute["status"] = "lost"
+                return dispute
+
+        raise FakeStripeError(404, f"Unrecognized request URL ({method.upper()}: {path})")
+
+    # ------------------------------------------------------------------
+    # Object operations (callers hold self._lock, except during seeding)
+    # ------------------------------------------------------------------
+
+    def _new_id(self, resource: str) -> str:
+        return f"{RESOURCES[resource][1]}_{uuid.uuid4().hex[:24]}"
+
+    def _get(self, resource: str, object_id: str) -> Dict[str, Any]:
+        obj = self._objects[resource].get(object_id)
+        if obj is None:
+            raise FakeStripeError(
+                404,
+                f"No such {RESOURCES[resource][0]}: '{object_id}'",
+                code="resource_missing",
+            )
+        return obj
+
+    def _create(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        obj: Dict[str, Any] = {
+            "id": self._new_id(resource),
+            "object": RESOURCES[resource][0],
+            "created": int(time.time()),
+            "livemode": False,
+            "metadata": {},
+        }
+        for key, value in params.items():
+            if key != "expand":
+                obj[key] = _coerce(value)
+        if resource == "payment_intents":
+            obj.setdefault("status", "requires_payment_method")
+        self._objects[resource][obj["id"]] = obj
+        return obj
+
+    def _create_token(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        card = params.get("card") or {}
+        number = str(card.get("number", ""))
+        token = self._create("tokens", {"type": "card", "used": False})
+        token["card"] = {
+            "object": "card",
+            "last4": number[-4:],
+            "exp_month": _coerce(card.get("exp_month", 12)),
+            "exp_year": _coerce(card.get("exp_year", 2025)),
+        }
+        # Kept private to decide later whether a charge opens a dispute
+        token["_card_number"] = number
+        return token
+
+    def _create_charge(
+        self, params: Dict[str, Any], open_dispute: bool = True
+    ) -> Dict[str, Any]:
+        source = str(params.get("source", ""))
+        card_number = source
+        if source.startswith("tok_"):
+            card_number = self._get("tokens", source).get("_card_number", "")
+        if card_number == TestCardType.DECLINE.value:
+            raise FakeStripeError(402, "Your card was declined.", "card_error", "card_declined")
+
+        charge = self._create(
+            "charges",
+            {k: v for k, v in params.items() if k != "source"},
+        )
+        charge.setdefault("currency", "usd")
+        charge.update({"status": "succeeded", "paid": True, "disputed": False, "refunded": False})
+
+        if open_dispute and card_number in DISPUTE_CARDS:
+            self._open_dispute(charge, DISPUTE_CARDS[card_number])
+        return charge
+
+    def _open_dispute(self, charge: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        charge["disputed"] = True
+        return self._create(
+            "disputes",
+            {
+                "charge": charge["id"],
+                "amount": charge["amount"],
+                "currency": charge["currency"],
+                "reason": reason,
+                "status": "needs_response",
+                "evidence": {},
+                "evidence_details": {"submission_count": 0},
+            },
+        )
+
+    def _update(self, resource: str, object_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        obj = self._get(resource, object_id)
+        for key, value in params.items():
+            if key in ("metadata", "evidence") and isinstance(value, dict):
+                obj.setdefault(key, {}).update(value)
+            elif key not in ("submit", "expand"):
+                obj[key] = _coerce(value)
+
+        if resource == "disputes" and _coerce(params.get("submit")) is True:
+            obj["status"] = "under_review"
+            obj["evidence_details"]["submission_count"] += 1
+        return obj
+
+    def _list(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        limit = int(params.get("limit", 10))
+        filters = {
+            key: value
+            for key, value in params.items()
+            if key in ("charge", "customer")
+        }
+        data = [
+            self._expand(obj, params, prefix="data.")
+            for obj in reversed(list(self._objects[resource].values()))
+            if all(obj.get(k) == v for k, v in filters.items())
+        ]
+        starting_after = params.get("starting_after")
+        if starting_after:
+            ids = [obj["id"] for obj in data]
+            data = data[ids.index(starting_after) + 1:] if starting_after in ids else []
+        return {
+            "object": "list",
+            "url": f"/v1/{resource}",
+            "has_more": len(data) > limit,
+            "data": data[:limit],
+        }
+
+    def _expand(
+        self, obj: Dict[str, Any], params: Dict[str, Any], prefix: str = ""
+    ) -> Dict[str, Any]:
+        expand = params.get("expand") or {}
+        fields = expand.values() if isinstance(expand, dict) else [expand]
+        result = {k: v for k, v in obj.items() if not k.startswith("_")}
+        for field in fields:
+            if not field.startswith(prefix):
+                continue
+            name = field[len(prefix):]
+            target = {"charge": "charges", "customer": "customers"}.get(name)
+            if target and isinstance(result.get(name), str):
+                expanded = self._objects[target].get(result[name])
+                if expanded is not None:
+                    result[name] = expanded
+        return result
+
+
+def decode_params(pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Decode Stripe-style form pairs (metadata[key]=value, expand[0]=x) into nested dicts.
+
+    Args:
+        pairs: Decoded (key, value) pairs from a query string or form body
+
+    Returns:
+        Nested parameter dictionary
+    """
+    params: Dict[str, Any] = {}
+    for key, value in pairs:
+        names = re.findall(r"[^\[\]]+", key)
+        if not names:
+            continue
+        target = params
+        for name in names[:-1]:
+            target = target.setdefault(name, {})
+        target[names[-1]] = value
+    return params
+
+
+def _coerce(value: Any) -> Any:
+    """Convert form-encoded scalars back to JSON types."""
+    if not isinstance(value, str):
+        return value
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+    if value.isdigit():
+        return int(value)
+    return value
+
+
+class FakeStripeHTTPClient(stripe.HTTPClient):
+    """stripe-python HTTP client that serves requests from a FakeStripeBackend."""
+
+    name = "fake_stripe"
+
+    def __init__(self, backend: FakeStripeBackend):
+        super().__init__()
+        self.backend = backend
+
+    def request(self, method, url, headers, post_data=None, **kwargs):
+        parts = urlsplit(url)
+        pairs = parse_qsl(parts.query, keep_blank_values=True)
+        if post_data:
+            body = post_data.decode("utf-8") if isinstance(post_data, bytes) else post_data
+            pairs += parse_qsl(body, keep_blank_values=True)
+
+        status, body = self.backend.handle(method, parts.path, decode_params(pairs))
+        return json.dumps(body), status, {"request-id": f"req_{uuid.uuid4().hex[:14]}"}
+
+    async def request_async(self, method, url, headers, post_data=None, **kwargs):
+        return self.request(method, url, headers, post_data)
+
+    def close(self):
+        pass
+
+
+def install_fake_backend(backend: Optional[FakeStripeBackend] = None) -> FakeStripeBackend:
+    """
+    Route all stripe-python requests in this process to a fake backend.
+
+    Args:
+        backend: Backend to install (a new empty one is created if not provided)
+
+    Returns:
+        The installed backend
+    """
+    backend = backend or FakeStripeBackend()
+    stripe.default_http_client = FakeStripeHTTPClient(backend)
+    return backend
+
+
+def fake_backend_installed() -> bool:
+    """Whether stripe-python is currently routed to a fake backend."""
+    return isinstance(stripe.default_http_client, FakeStripeHTTPClient)
+
+
+def serve(
+    backend: FakeStripeBackend, host: str = "127.0.0.1", port: int = 12111
+) -> ThreadingHTTPServer:
+    """
+    Create a local HTTP server for the fake backend (call serve_forever() on it).
+
+    Args:
+        backend: Backend serving the requests
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        The configured (not yet running) server
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _handle(self) -> None:
+            parts = urlsplit(self.path)
+            pairs = parse_qsl(parts.query, keep_blank_values=True)
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                pairs += parse_qsl(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+
+            status, body = backend.handle(self.command, parts.path, decode_params(pairs))
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Request-Id", f"req_{uuid.uuid4().hex[:14]}")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_DELETE = _handle
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local fake Stripe API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--copies", type=int, default=1, help="Copies of each transaction scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+
+    fake_backend = FakeStripeBackend(
+        FakeStripeConfig(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+        )
+    )
+    disputed = fake_backend.seed_from_scenarios(copies=args.copies)
+    server = serve(fake_backend, args.host, args.port)
+
+    print(f"🧪 Fake Stripe API on http://{args.host}:{server.server_port}")
+    print(f"   Set STRIPE_API_BASE=http://{args.host}:{server.server_port}")
+    print(f"   {len(disputed)} disputed charges, e.g. {disputed[:3]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,332 @@
+"""
+Outcome Classifier - Deterministic fast path ahead of the LLM call evaluation.
+
+Most calls end with an unambiguous customer line ("I want to renew my
+subscription", "Please just cancel it officially"). FastPathClassifier looks
+for such lines in the final customer turns with a lexicon of regex patterns.
+Each pattern carries a calibrated confidence, i.e. the share of its matches
+on which the LLM evaluation agreed. Turns with a condition or a deferral
+("only if I get a refund", "later, not now") lower it. Only when the best match falls below the
+threshold (or nothing matches) is the LLM evaluation needed.
+
+Confidences are re-estimated against LLM labels of saved transcripts with
+calibrate(), see `python -m benchmarks.fast_path_report`, and can be saved
+and loaded as JSON.
+"""
+
+import json
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from prometheus_client import Counter
+
+RESOLVED_TYPES = {"renewed", "canceled", "discount", "partial_refund"}
+
+# First-person statement of intent, optionally followed by up to two filler words
+_INTENT = (
+    r"\b(?:i(?:'ll| will| want to| wanna| would like to|'d like to| choose to| prefer to"
+    r"| decided to| agree to| am going to|'m going to| can| think i(?:'ll| will| can| want to))"
+    r"|let's|please|go ahead and)\s+(?:\w+\s+){0,2}?"
+)
+_NEGATED_SPAN = re.compile(r"\b(?:not|never|no|don't|won't|can't|cannot|wouldn't)\b")
+_NEGATION_BEFORE = re.compile(
+    r"\b(?:don't|do not|not|never|no|won't|wouldn't|can't|couldn't)\b(?:\W+\w+){0,2}\W*$"
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Conditions and deferrals: the decision may not be final
+_HEDGE = re.compile(
+    r"\b(?:but|if|unless|as long as|provided|later|first|not now|not yet|maybe|perhaps|depends)\b"
+)
+# "Cancel the chargeback" withdraws the dispute; it does not cancel the subscription
+_NOT_SUBSCRIPTION = r"(?! (?:the |my |this |that |our )?(?:\w+ )?(?:chargebacks?|disputes?|claims?)\b)"
+
+_RECOMMENDATIONS = {
+    "renewed": "Submit the call as evidence and ask the customer to withdraw the chargeback",
+    "canceled": "Process the cancellation per the terms and contest the chargeback with the call evidence",
+    "discount": "Apply the agreed discount and ask the customer to withdraw the chargeback",
+    "partial_refund": "Issue the agreed partial refund and ask the customer to withdraw the chargeback",
+    "unresolved": "Contest the chargeback with the available evidence",
+}
+
+FAST_PATH_DECISIONS = Counter(
+    "chargeback_outcome_fast_path_total",
+    "Call outcome classifications by path (fast_path, llm)",
+    ["path"],
+)
+
+
+@dataclass(frozen=True)
+class OutcomePattern:
+    """A customer phrase indicating an outcome, with its calibrated confidence."""
+
+    name: str
+    resolution_type: str
+    regex: str
+    confidence: float
+    intent: bool = False  # Negations are checked inside the match instead of before it
+    keyword: bool = False  # A bare mention rather than a stated decision
+
+    def __post_init__(self):
+        object.__setattr__(self, "_compiled", re.compile(self.regex))
+
+    def search(self, sentence: str) -> Optional[re.Match]:
+        for match in self._compiled.finditer(sentence):
+            if self.intent:
+                if not _NEGATED_SPAN.search(match.group()):
+                    return match
+            elif not _NEGATION_BEFORE.search(sentence[: match.start()]):
+                return match
+        return None
+
+
+DEFAULT_PATTERNS: Tuple[OutcomePattern, ...] = (
+    # Explicit decisions
+    OutcomePattern(
+        "renew_intent",
+        "renewed",
+        _INTENT + r"(?:renew|keep (?:my |the )?(?:subscription|plan|membership|account)|stay subscribed)",
+        0.95,
+        intent=True,
+    ),
+    OutcomePattern(
+        "cancel_intent",
+        "canceled",
+        _INTENT + r"(?:cancel" + _NOT_SUBSCRIPTION + r"|unsubscribe|end (?:my|the) subscription)",
+        0.93,
+        intent=True,
+    ),
+    OutcomePattern(
+        "discount_intent",
+        "discount",
+        _INTENT + r"(?:take|accept|go with) (?:the |that |your )?(?:30 ?% )?(?:discount|offer|deal)",
+        0.92,
+        intent=True,
+    ),
+    OutcomePattern(
+        "refund_intent",
+        "partial_refund",
+        _INTENT + r"(?:take|accept|go with) (?:a |the |that )?partial refund",
+        0.9,
+        intent=True,
+    ),
+    OutcomePattern(
+        "keep_chargeback",
+        "unresolved",
+        r"\b(?:keep|continue with|stick with|go ahead with) (?:the|my) (?:chargeback|dispute)",
+        0.9,
+    ),
+    # Bare keywords
+    OutcomePattern("renew_keyword", "renewed", r"\brenew", 0.7, keyword=True),
+    OutcomePattern("cancel_keyword", "canceled", r"\bcancel", 0.55, keyword=True),
+    OutcomePattern("discount_keyword", "discount", r"\bdiscount|\b30 ?%", 0.55, keyword=True),
+    OutcomePattern("refund_keyword", "partial_refund", r"\bpartial refund", 0.6, keyword=True),
+    OutcomePattern(
+        "unresolved_keyword",
+        "unresolved",
+        r"\b(?:talk|speak) to my bank|\blawyer|\bstill (?:want to )?dispute",
+        0.6,
+        keyword=True,
+    ),
+)
+
+
+@dataclass(frozen=True)
+class FastPathResult:
+    """Outcome found by the fast path."""
+
+    resolution_type: str
+    confidence: float
+    pattern: str
+    evidence: str  # The customer turn that decided the outcome
+    confident: bool  # Confidence reached the classifier's threshold
+
+    @property
+    def resolved(self) -> bool:
+        return self.resolution_type in RESOLVED_TYPES
+
+    def to_evaluation(self) -> Dict[str, Any]:
+        """Evaluation dict in the shape DisputeEvaluator.evaluate_transcript() returns."""
+        return {
+            "resolved": self.resolved,
+            "resolution_type": self.resolution_type,
+            "customer_sentiment": "neutral",
+            "key_points": [f'Customer said: "{self.evidence}"'],
+            "recommendation": _RECOMMENDATIONS[self.resolution_type],
+            "confidence": self.confidence,
+            "reasoning": f"Matched the '{self.pattern}' pattern in the customer's final turns",
+        }
+
+
+def _turns(transcript: Iterable[Any]) -> List[Tuple[str, str]]:
+    """(role, text) pairs from evaluator dicts or TranscriptMessage-like objects."""
+    turns = []
+    for message in transcript:
+        if isinstance(message, dict):
+            role = message.get("role", "")
+            text = message.get("message", message.get("text", ""))
+        else:
+            role, text = message.role, message.message
+        turns.append((role, text or ""))
+    return turns
+
+
+class FastPathClassifier:
+    """Rule-based outcome classifier over the customer's final turns."""
+
+    def __init__(
+        self,
+        patterns: Sequence[OutcomePattern] = DEFAULT_PATTERNS,
+        threshold: float = 0.9,
+        window: int = 3,
+        conflict_penalty: float = 0.8,
+        hedge_penalty: float = 0.8,
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            patterns: Outcome patterns with their calibrated confidences
+            threshold: Confidence at which the fast path result is used without the LLM
+            window: Number of final customer turns searched
+            conflict_penalty: Factor applied when an earlier turn in the window,
+                or another sentence of the deciding turn, states a different outcome
+            hedge_penalty: Factor applied when the deciding turn has a condition
+                or deferral ("but", "only if", "later", "first", "not now")
+        """
+        self.patterns = tuple(patterns)
+        self.threshold = threshold
+        self.window = window
+        self.conflict_penalty = conflict_penalty
+        self.hedge_penalty = hedge_penalty
+
+    def _sentence_matches(self, text: str) -> List[OutcomePattern]:
+        """The most confident pattern of each non-question sentence of a turn, in order."""
+        matches = []
+        for sentence in _SENTENCE_END.split(text.lower().strip()):
+            if not sentence or sentence.endswith("?"):
+                continue
+            best = None
+            for pattern in self.patterns:
+                if (best is None or pattern.confidence > best.confidence) and pattern.search(sentence):
+                    best = pattern
+            if best is not None:
+                matches.append(best)
+        return matches
+
+    def match_turn(self, text: str) -> Optional[OutcomePattern]:
+        """
+        The pattern deciding one customer turn.
+
+        The latest stated decision wins, so a customer who changes their mind
+        within a turn is taken at their last word; bare keywords only decide
+        turns without a stated decision.
+        """
+        matches = self._sentence_matches(text)
+        decisions = [pattern for pattern in matches if not pattern.keyword]
+        if decisions:
+            return decisions[-1]
+        return max(matches, key=lambda pattern: pattern.confidence, default=None)
+
+    def turn_confidence(self, pattern: OutcomePattern, text: str) -> float:
+        """
+        Confidence of the pattern deciding one customer turn.
+
+        Lowered if the turn is hedged, and if it also states a different decision.
+        """
+        confidence = pattern.confidence
+        if _HEDGE.search(text.lower()):
+            confidence *= self.hedge_penalty
+        if any(
+            not other.keyword and other.resolution_type != pattern.resolution_type
+            for other in self._sentence_matches(text)
+        ):
+            confidence *= self.conflict_penalty
+        return confidence
+
+    def classify(self, transcript: Iterable[Any]) -> Optional[FastPathResult]:
+        """
+        Classify the outcome of a call from its final customer turns.
+
+        The latest turn with a match decides; its confidence is lowered if it
+        is hedged or an earlier turn in the window states a different outcome.
+
+        Args:
+            transcript: Messages as dicts with role/message or objects with .role/.message
+
+        Returns:
+            FastPathResult, or None if no pattern matches
+        """
+        user_turns = [text for role, text in _turns(transcript) if role == "user"]
+        matches = [(self.match_turn(text), text) for text in user_turns[-self.window:]]
+        matches = [(pattern, text) for pattern, text in matches if pattern is not None]
+        if not matches:
+            return None
+
+        pattern, text = matches[-1]
+        confidence = self.turn_confidence(pattern, text)
+        if any(earlier.resolution_type != pattern.resolution_type for earlier, _ in matches[:-1]):
+            confidence *= self.conflict_penalty
+        confidence = round(confidence, 3)
+        return FastPathResult(
+            resolution_type=pattern.resolution_type,
+            confidence=confidence,
+            pattern=pattern.name,
+            evidence=text.strip(),
+            confident=confidence >= self.threshold,
+        )
+
+    def decide(self, transcript: Iterable[Any]) -> Optional[FastPathResult]:
+        """The fast path result if it is confident enough to skip the LLM, else None."""
+        result = self.classify(transcript)
+        confident = result is not None and result.confident
+        FAST_PATH_DECISIONS.labels("fast_path" if confident else "llm").inc()
+        return result if confident else None
+
+    def calibrate(
+        self, samples: Iterable[Tuple[Iterable[Any], str]], prior_weight: float = 4.0
+    ) -> "FastPathClassifier":
+        """
+        Re-estimate pattern confidences from LLM-labelled transcripts.
+
+        A pattern's confidence becomes the share of its deciding matches on
+        which the LLM agreed, smoothed towards its current confidence with
+        `prior_weight` pseudo-observations so rare patterns move slowly.
+
+        Args:
+            samples: (transcript, resolution type assigned by the LLM) pairs
+            prior_weight: Weight of the current confidence
+
+        Returns:
+            New classifier with calibrated patterns
+        """
+        counts: Dict[str, List[int]] = {}
+        for transcript, label in samples:
+            result = self.classify(transcript)
+            if result is not None:
+                agree, total = counts.setdefault(result.pattern, [0, 0])
+                counts[result.pattern] = [agree + (result.resolution_type == label), total + 1]
+
+        patterns = []
+        for pattern in self.patterns:
+            agree, total = counts.get(pattern.name, (0, 0))
+            confidence = (agree + prior_weight * pattern.confidence) / (total + prior_weight)
+            patterns.append(replace(pattern, confidence=round(confidence, 3)))
+        return FastPathClassifier(
+            patterns, self.threshold, self.window, self.conflict_penalty, self.hedge_penalty
+        )
+
+    def save(self, path: str) -> None:
+        """Write the pattern confidences to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({p.name: p.confidence for p in self.patterns}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "FastPathClassifier":
+        """Default patterns with the confidences saved in a JSON file."""
+        with open(path, encoding="utf-8") as f:
+            confidences = json.load(f)
+        patterns = [
+            replace(p, confidence=confidences.get(p.name, p.confidence)) for p in DEFAULT_PATTERNS
+        ]
+        return cls(patterns, **kwargs)
@@ -0,0 +1,50 @@
+import tempfile
+
+import pytest
+import stripe
+
+from benchmarks.standins import LatencyModel, StandInConfig, build_offline_service
+from elevenlabs_wrapper.call_simulator import Duration
+from stripe_integration.fake_backend import FakeStripeConfig
+
+
+@pytest.fixture
+def offline_config():
+    """Fixture providing stand-in config with no network latency and very short calls"""
+    config = StandInConfig(
+        stripe=FakeStripeConfig(),
+        claude=LatencyModel(),
+        embeddings=LatencyModel(),
+        pinecone=LatencyModel(),
+        scenario_copies=1,
+        poll_interval=0.01,
+    )
+    config.calls.ring = Duration("fixed", 0.01)
+    config.calls.talk = Duration("fixed", 0.05)
+    config.calls.processing = Duration("fixed", 0.01)
+    config.calls.dial_latency_ms = 0
+    config.calls.poll_latency_ms = 0
+    return config
+
+
+@pytest.fixture
+def restore_stripe_globals():
+    """Fixture restoring the global stripe client, API base and key after the test"""
+    http_client, api_base, api_key = stripe.default_http_client, stripe.api_base, stripe.api_key
+    yield
+    stripe.default_http_client, stripe.api_base, stripe.api_key = http_client, api_base, api_key
+
+
+@pytest.fixture
+def offline_env(offline_config, restore_stripe_globals):
+    """Fixture providing a ConversationService wired entirely to local stand-ins"""
+    with tempfile.TemporaryDirectory() as storage_dir:
+        yield build_offline_service(offline_config, storage_dir)
+
+
+@pytest.fixture
+def openai_offline_env(offline_config, restore_stripe_globals):
+    """Fixture providing the offline service with the OpenAI embedding and Pinecone stand-ins"""
+    offline_config.embedding_backend = "openai"
+    with tempfile.TemporaryDirectory() as storage_dir:
+        yield build_offline_service(offline_config, storage_dir)
@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+from benchmarks.import_profile import HEAVY_MODULES
+from conversation.controller import get_conversation_service
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+async def client(offline_env):
+    """Fixture providing an API client whose conversation service runs on stand-ins"""
+    from main import app
+
+    app.dependency_overrides[get_conversation_service] = lambda: offline_env.service
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as api_client:
+        yield api_client
+    app.dependency_overrides.clear()
+
+
+class TestAppStartup:
+    """Test suite for lazy service construction"""
+
+    def test_import_main_is_light(self):
+        """Test that importing the app builds no services and loads no SDKs"""
+        code = (
+            "import json, sys, main\n"
+            "from conversation import controller\n"
+            "print(json.dumps({'modules': sorted(sys.modules), "
+            "'service': controller._conversation_service is not None}))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        loaded = json.loads(output.splitlines()[-1])
+
+        assert not loaded["service"]
+        assert [name for name in HEAVY_MODULES if name in loaded["modules"]] == []
+
+    def test_wrapper_exports_are_lazy(self):
+        """Test that package exports resolve on access without loading the audio client"""
+        code = (
+            "import sys, elevenlabs_wrapper\n"
+            "elevenlabs_wrapper.PhoneCaller\n"
+            "print('elevenlabs_wrapper.client' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        assert output.strip().splitlines()[-1] == "False"
+
+    async def test_requests_use_injected_service(self, client, offline_env):
+        """Test that endpoints get the service through the dependency"""
+        response = await client.post(
+            "/api/conversation/start", json={"charge_id": offline_env.charge_ids[0]}
+        )
+        assert response.status_code == 202
+        conversation_id = response.json()["conversation_id"]
+
+        # Background tasks finish before the ASGI transport returns the response
+        result = await client.get(f"/api/conversation/{conversation_id}")
+        assert result.status_code == 200
+        assert result.json()["status"] == "completed"
@@ -0,0 +1,77 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from elevenlabs_wrapper import Agent, CallSimulator, CallSimulatorConfig, PhoneCaller
+from elevenlabs_wrapper.call_simulator import Duration
+
+
+def fast_config(**overrides) -> CallSimulatorConfig:
+    """Simulator config where a whole call takes a few hundred milliseconds"""
+    config = CallSimulatorConfig(
+        ring=Duration("fixed", 0.05),
+        talk=Duration("fixed", 0.2),
+        processing=Duration("fixed", 0.05),
+        seed=7,
+    )
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+@pytest.fixture
+def agent():
+    """Fixture providing an agent with dynamic variables"""
+    return Agent(
+        agent_id="agent_sim",
+        dynamic_variables={"first_name": "Shrek", "product_name": "Swamp Premium"},
+    )
+
+
+class TestCallSimulator:
+    """Test suite for the local ElevenLabs call simulator"""
+
+    def test_call_lifecycle(self, agent):
+        """Test that a call passes through every status and ends with a transcript"""
+        simulator = CallSimulator(fast_config())
+        caller = PhoneCaller(api_key="sim", phone_number_id="sim", transport=simulator.transport())
+
+        response = caller.make_call(agent, "+15555550100")
+        seen = set()
+        data = None
+        for _ in range(200):
+            data = caller.get_conversation_transcript(response.conversation_id)
+            seen.add(data.status)
+            if data.status == "done":
+                break
+            time.sleep(0.01)
+
+        assert {"initiated", "in-progress", "done"} <= seen
+        assert data.transcript
+        assert "Swamp Premium" in data.transcript[0].message
+        assert data.metadata.termination_reason == "user_ended_call"
+
+    def test_no_answer(self, agent):
+        """Test that unanswered calls fail with a no_answer termination reason"""
+        simulator = CallSimulator(fast_config(no_answer_rate=1.0))
+        caller = PhoneCaller(api_key="sim", phone_number_id="sim", transport=simulator.transport())
+
+        with pytest.raises(Exception, match="no_answer"):
+            caller.make_call_and_wait(agent, "+15555550100", poll_interval=0.02, print_transcript=False)
+
+    def test_concurrent_calls(self, agent):
+        """Test that many concurrent calls complete against the real wait loop"""
+        simulator = CallSimulator(fast_config())
+        caller = PhoneCaller(api_key="sim", phone_number_id="sim", transport=simulator.transport())
+
+        def call(i: int):
+            return caller.make_call_and_wait(
+                agent, f"+1555555{i:04d}", poll_interval=0.02, timeout=10, print_transcript=False
+            )
+
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            results = list(pool.map(call, range(100)))
+
+        assert all(r.status == "done" for r in results)
+        assert simulator.stats() == {"done": 100}
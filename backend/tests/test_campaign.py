@@ -0,0 +1,234 @@
+import datetime as dt
+import threading
+import time
+from zoneinfo import ZoneInfo
+
+import httpx
+import pytest
+
+from conversation.campaign import CallingWindow, CampaignScheduler, RetryPolicy, SlotPlanner, customer_timezone
+from conversation.controller import get_conversation_service
+from elevenlabs_wrapper.call_simulator import Duration
+
+NEW_YORK = ZoneInfo("America/New_York")
+WARSAW = ZoneInfo("Europe/Warsaw")
+LOS_ANGELES = ZoneInfo("America/Los_Angeles")
+
+# Monday 2026-10-19, 10:00 in New York
+MONDAY_MORNING = dt.datetime(2026, 10, 19, 10, tzinfo=NEW_YORK).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def scheduler(offline_env):
+    """Fixture providing a campaign scheduler on one line, open all day, with a fake clock"""
+    # Calls report 50 seconds of talk time but take 50 ms
+    offline_env.simulator.config.time_scale = 0.001
+    offline_env.simulator.config.talk = Duration("fixed", 50)
+    return CampaignScheduler(
+        offline_env.service,
+        lines=("line_a",),
+        window=CallingWindow(start=dt.time(0), end=dt.time(23, 59)),
+        retry=RetryPolicy(max_attempts=3, backoff_seconds=60),
+        clock=FakeClock(MONDAY_MORNING),
+    )
+
+
+def run_campaign(scheduler, campaign_id, step=900.0, timeout=20):
+    """Advance the clock and tick until the campaign is done; returns the most calls seen on the lines at once."""
+    most_on_line = 0
+    deadline = time.monotonic() + timeout
+    progress = scheduler.progress(campaign_id)
+    while not progress["done"] and time.monotonic() < deadline:
+        scheduler.clock.now += step
+        scheduler.tick()
+        progress = scheduler.progress(campaign_id)
+        most_on_line = max(most_on_line, progress["on_line"])
+        time.sleep(0.02)
+    return most_on_line
+
+
+class TestCallingWindows:
+    """Test suite for calling windows, slot planning and retry backoff"""
+
+    def test_customer_timezone(self):
+        """Test that the timezone comes from metadata, then the phone's country, then the default"""
+        assert customer_timezone({"customer_timezone": "Asia/Tokyo"}, "UTC").key == "Asia/Tokyo"
+        assert customer_timezone({"customer_phone": "+48 600 100 200"}, "UTC").key == "Europe/Warsaw"
+        assert customer_timezone({"customer_phone": "+1-555-123-4567"}, "America/Chicago").key == "America/Chicago"
+        assert customer_timezone({"customer_timezone": "Mars/Olympus"}, "UTC").key == "UTC"
+
+    def test_slots_fall_inside_local_windows(self):
+        """Test that each customer's slot is inside their own local calling window"""
+        window = CallingWindow.parse("09:00-20:00", "0,1,2,3,4")
+        planner = SlotPlanner(calls_per_hour=20)
+        # 03:00 UTC: 05:00 in Warsaw, 20:00 (Sunday) in Los Angeles
+        now = dt.datetime(2026, 10, 19, 3, tzinfo=dt.timezone.utc).timestamp()
+
+        warsaw = dt.datetime.fromtimestamp(planner.assign(window, WARSAW, now), WARSAW)
+        los_angeles = dt.datetime.fromtimestamp(planner.assign(window, LOS_ANGELES, now), LOS_ANGELES)
+        saturday = dt.datetime(2026, 10, 24, 12, tzinfo=NEW_YORK).timestamp()
+        weekend = dt.datetime.fromtimestamp(planner.assign(window, NEW_YORK, saturday), NEW_YORK)
+
+        assert warsaw.date() == dt.date(2026, 10, 19) and 9 <= warsaw.hour < 20
+        assert los_angeles.date() == dt.date(2026, 10, 19) and 9 <= los_angeles.hour < 20
+        assert weekend.date() == dt.date(2026, 10, 26) and weekend.hour == 9
+        with pytest.raises(ValueError):
+            CallingWindow.parse("20:00-09:00")
+
+    def test_load_is_spread_evenly(self):
+        """Test that calls fill the buckets of a window evenly before moving to the next day"""
+        window = CallingWindow.parse("09:00-11:00")
+        planner = SlotPlanner(calls_per_hour=8, bucket_seconds=900)  # 2 calls per bucket
+        now = dt.datetime(2026, 10, 19, 8, tzinfo=NEW_YORK).timestamp()
+
+        first_round = [planner.assign(window, NEW_YORK, now) for _ in range(8)]
+        second_round = [planner.assign(window, NEW_YORK, now) for _ in range(8)]
+        load = planner.load()
+        overflow = dt.datetime.fromtimestamp(planner.assign(window, NEW_YORK, now), NEW_YORK)
+
+        assert len({int(slot // 900) for slot in first_round}) == 8
+        assert sorted(load.values()) == [2] * 8
+        assert all(slot not in first_round for slot in second_round)
+        assert overflow.date() == dt.date(2026, 10, 20) and overflow.hour == 9
+
+    def test_retry_backoff(self):
+        """Test exponential backoff with a cap"""
+        policy = RetryPolicy(backoff_seconds=600, multiplier=2, max_backoff_seconds=1800)
+
+        assert [policy.delay(attempts) for attempts in (1, 2, 3)] == [600, 1200, 1800]
+
+
+class TestCampaignScheduler:
+    """Test suite for dispatching campaign calls on lines and retrying unanswered ones"""
+
+    def test_line_concurrency(self, offline_env, scheduler):
+        """Test that a line never runs more calls at once than its concurrency"""
+        campaign = scheduler.create(offline_env.charge_ids[:4] + ["ch_missing"], fake_conv=False)
+
+        most_on_line = run_campaign(scheduler, campaign.campaign_id, step=300)
+        progress = scheduler.progress(campaign.campaign_id)
+
+        assert most_on_line == 1
+        assert (progress["completed"], progress["failed"], progress["attempts"]) == (4, 1, 4)
+        assert progress["calls"][-1]["error"] == "No such charge: ch_missing"
+        assert {call["attempts"][0]["line"] for call in progress["calls"][:4]} == {"line_a"}
+        assert progress["completed_per_telephony_hour"] > 0
+        call_seconds = [
+            offline_env.service.get_conversation_result(call.attempts[0].conversation_id).duration_seconds
+            for call in campaign.calls[:4]
+        ]
+        assert progress["telephony_seconds"] == sum(call_seconds)
+
+    def test_line_is_freed_when_the_call_ends(self, offline_env, scheduler, monkeypatch):
+        """Test that the next call starts while the previous one's post-call stages still run"""
+        evaluator = offline_env.service.dispute_evaluator
+        fetch_dispute_context = evaluator.fetch_dispute_context
+        post_call = threading.Event()
+
+        def slow_dispute_lookup(charge_id):
+            post_call.wait(10)
+            return fetch_dispute_context(charge_id)
+
+        monkeypatch.setattr(evaluator, "fetch_dispute_context", slow_dispute_lookup)
+        campaign = scheduler.create(offline_env.charge_ids[:2])
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and any(call.status != "calling" for call in campaign.calls):
+            scheduler.clock.now += 300
+            scheduler.tick()
+            time.sleep(0.02)
+        statuses = [call.status for call in campaign.calls]
+        first_attempt = campaign.calls[0].attempts[0]
+        post_call.set()
+        run_campaign(scheduler, campaign.campaign_id, step=60)
+
+        assert statuses == ["calling", "calling"]
+        assert first_attempt.call_ended_at is not None and first_attempt.call_seconds > 0
+        assert scheduler.progress(campaign.campaign_id)["completed"] == 2
+
+    def test_unanswered_calls_are_retried_with_backoff(self, offline_env, scheduler):
+        """Test that no-answer calls are retried after the backoff until out of attempts"""
+        offline_env.simulator.config.no_answer_rate = 1.0
+        campaign = scheduler.create(offline_env.charge_ids[:1])
+
+        run_campaign(scheduler, campaign.campaign_id, step=30)
+        call = scheduler.progress(campaign.campaign_id)["calls"][0]
+        attempts = campaign.calls[0].attempts
+
+        assert call["status"] == "failed" and len(attempts) == 3
+        assert {attempt.outcome for attempt in attempts} == {"no_answer"}
+        assert attempts[1].started_at - attempts[0].ended_at >= 60
+        assert attempts[2].started_at - attempts[1].ended_at >= 120
+        result = offline_env.service.get_conversation_result(attempts[-1].conversation_id)
+        assert result.termination_reason == "no_answer"
+
+    def test_connected_call_that_fails_is_not_redialed(self, offline_env, scheduler, monkeypatch):
+        """Test that a call failing after the customer answered is not retried"""
+
+        def fail_save(*args, **kwargs):
+            raise OSError("Disk full")
+
+        monkeypatch.setattr(offline_env.service.storage, "save_transcript", fail_save)
+        campaign = scheduler.create(offline_env.charge_ids[:1])
+
+        run_campaign(scheduler, campaign.campaign_id, step=60)
+        call = campaign.calls[0]
+
+        assert call.status == "failed" and call.error == "Disk full"
+        assert [(attempt.outcome, attempt.termination_reason) for attempt in call.attempts] == [
+            ("failed", "user_ended_call")
+        ]
+
+    def test_retried_call_can_complete(self, offline_env, scheduler):
+        """Test that a call answered on its second attempt completes the campaign call"""
+        offline_env.simulator.config.no_answer_rate = 1.0
+        campaign = scheduler.create(offline_env.charge_ids[:1])
+        scheduler.clock.now += 900
+        scheduler.tick()
+        call = campaign.calls[0]
+        deadline = time.monotonic() + 10
+        while call.status == "calling" and time.monotonic() < deadline:
+            time.sleep(0.02)
+            scheduler.tick()
+
+        offline_env.simulator.config.no_answer_rate = 0.0
+        run_campaign(scheduler, campaign.campaign_id, step=60)
+        progress = scheduler.progress(campaign.campaign_id)
+
+        assert [attempt.outcome for attempt in call.attempts] == ["no_answer", "completed"]
+        assert (progress["completed"], progress["no_answers"]) == (1, 1)
+
+    async def test_campaign_endpoints(self, offline_env):
+        """Test POST /campaign and GET /campaign/{campaign_id}"""
+        from main import app
+
+        service = offline_env.service
+        service.campaigns.tick_interval = 3600  # Keep the dispatcher idle
+        app.dependency_overrides[get_conversation_service] = lambda: service
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                started = await client.post(
+                    "/api/conversation/campaign",
+                    json={"charge_ids": offline_env.charge_ids[:3] + ["ch_missing"]},
+                )
+                campaign_id = started.json()["campaign_id"]
+                progress = await client.get(f"/api/conversation/campaign/{campaign_id}")
+                missing = await client.get("/api/conversation/campaign/campaign_missing")
+        finally:
+            app.dependency_overrides.clear()
+            service.campaigns.stop()
+
+        assert started.status_code == 202
+        body = progress.json()
+        assert (body["total"], body["scheduled"], body["failed"]) == (4, 3, 1)
+        assert all(call["slot_at"] for call in body["calls"][:3])
+        assert body["calls"][0]["timezone"] == "America/New_York"
+        assert missing.status_code == 404
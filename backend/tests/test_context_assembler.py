@@ -0,0 +1,91 @@
+from conversation.context_assembler import ContextAssembler, ContextBudget, estimate_tokens
+
+POLICY = "Subscriptions renew automatically each month unless canceled at least 24 hours before the renewal date."
+
+
+def rag_context(**sections):
+    """RAG context with every section present"""
+    context = {
+        "policies": [],
+        "dispute_scripts": [],
+        "orders": [],
+        "resolution_authority": [],
+        "common_confusions": [],
+    }
+    context.update(sections)
+    return context
+
+
+class TestContextAssembler:
+    """Test suite for the token-budgeted prompt context assembler"""
+
+    def test_drops_low_scores_and_orders_by_score(self):
+        """Test that weak matches are dropped and the best match comes first"""
+        context = rag_context(
+            policies=[
+                {"score": 0.1, "content": "Irrelevant shipping policy for physical goods."},
+                {"score": 0.5, "content": "Refunds are prorated for annual plans."},
+                {"score": 0.9, "content": POLICY},
+            ]
+        )
+
+        assembled = ContextAssembler().assemble(context, "")
+        policies = next(s for s in assembled.sections if s.name == "policies")
+
+        assert policies.dropped_low_score == 1
+        assert assembled.knowledge.index("renew automatically") < assembled.knowledge.index("prorated")
+        assert "shipping" not in assembled.knowledge
+
+    def test_removes_near_duplicates_across_sections(self):
+        """Test that a snippet repeated with small edits is only kept once"""
+        context = rag_context(
+            policies=[{"score": 0.9, "content": POLICY}],
+            common_confusions=[{"score": 0.8, "content": POLICY.replace("each month", "every month")}],
+        )
+
+        assembled = ContextAssembler().assemble(context, f"1. {POLICY}")
+
+        assert assembled.knowledge.count("renew automatically") == 1
+        assert assembled.arguments == ""
+        assert sum(s.dropped_duplicate for s in assembled.sections) == 2
+
+    def test_enforces_section_budgets(self):
+        """Test that sections stay within budget and an oversized first snippet is trimmed"""
+        scripts = [{"score": 0.9 - i * 0.01, "content": f"Script {i}: " + "word " * 40} for i in range(10)]
+        arguments = "\n".join(f"{i}. Argument number {i} " + "detail " * 60 for i in range(1, 11))
+        budget = ContextBudget(dispute_scripts=120, arguments=60)
+
+        assembled = ContextAssembler(budget).assemble(rag_context(dispute_scripts=scripts), arguments)
+        reports = {s.name: s for s in assembled.sections}
+
+        assert reports["dispute_scripts"].tokens <= 120
+        assert reports["dispute_scripts"].dropped_over_budget > 0
+        assert reports["arguments"].kept == 1
+        assert estimate_tokens(assembled.arguments) <= 60
+        assert assembled.arguments.endswith("…")
+
+    def test_report_prompt(self, capsys):
+        """Test that the final prompt size is reported"""
+        assembler = ContextAssembler()
+        assembled = assembler.assemble(rag_context(policies=[{"score": 0.9, "content": POLICY}]), "1. Used the service")
+
+        tokens = assembler.report_prompt("x" * 400, assembled)
+
+        assert tokens == 100
+        assert "~100 tokens" in capsys.readouterr().out
+
+    def test_hashing_index_context_is_kept(self, offline_env):
+        """Test that matches of the local hashing index pass its own, lower score floor"""
+        generator = offline_env.service.dispute_response_generator
+        details = generator.get_charge_details(offline_env.charge_ids[0])
+        context = offline_env.service.rag_service.query_context(
+            chargeback_reason="fraudulent",
+            product_name=details["product_info"]["name"],
+            customer_name=details["customer_info"]["name"],
+        )
+
+        assembled = ContextAssembler().assemble(context, "")
+
+        assert all(item["score"] < 0.3 for section in context.values() for item in section)
+        assert "## DISPUTE RESOLUTION SCRIPTS" in assembled.knowledge
+        assert sum(section.kept for section in assembled.sections) >= 3
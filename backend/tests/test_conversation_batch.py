@@ -0,0 +1,113 @@
+import asyncio
+import tempfile
+import time
+
+import httpx
+import pytest
+
+from benchmarks.standins import build_offline_service
+from conversation.controller import get_conversation_service
+from conversation.job_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def batch_env(offline_config):
+    """Fixture providing an offline service with two charges per product"""
+    offline_config.scenario_copies = 2
+    with tempfile.TemporaryDirectory() as storage_dir:
+        yield build_offline_service(offline_config, storage_dir)
+
+
+def wait_until_done(service, batch_id, timeout=20):
+    deadline = time.monotonic() + timeout
+    progress = service.batch_progress(batch_id)
+    while not progress["done"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+        progress = service.batch_progress(batch_id)
+    return progress
+
+
+class TestConversationBatch:
+    """Test suite for batch conversation starts with shared preparation"""
+
+    def test_bulk_charge_load(self, batch_env):
+        """Test that charges load with a few list requests instead of one request each"""
+        generator = batch_env.service.dispute_response_generator
+        backend = batch_env.stripe_backend
+        before = backend.request_count
+
+        details = generator.get_charge_details_bulk(batch_env.charge_ids + ["ch_missing"])
+
+        assert set(details) == set(batch_env.charge_ids)
+        assert backend.request_count - before == 2  # One dispute page, one failed lookup
+        charge_id = batch_env.charge_ids[0]
+        assert details[charge_id] == generator.get_charge_details(charge_id)
+
+    def test_batch_shares_preparation(self, batch_env):
+        """Test that a batch runs every conversation with prepared charges and shared retrieval"""
+        service = batch_env.service
+        charge_ids = batch_env.charge_ids
+
+        batch = service.start_batch(charge_ids + ["ch_missing", charge_ids[0]], concurrency=3)
+        progress = wait_until_done(service, batch.batch_id)
+
+        assert (progress["total"], progress["completed"], progress["skipped"]) == (15, 14, 1)
+        assert progress["shared_retrievals"] == len(charge_ids) // 2
+        assert progress["conversations"][-1]["error"] == "No such charge: ch_missing"
+        result = service.get_conversation_result(batch.items[0].conversation_id)
+        stages = {stage.name for stage in result.timeline}
+        assert "pipeline.rag" in stages and "pipeline.stripe_fetch" not in stages
+        # The shared part is retrieved once per product; each conversation only queries its orders
+        assert service.rag_service.result_cache.stats()["misses"] == len(charge_ids) // 2
+
+    def test_queued_batch_carries_preparation(self, batch_env, tmp_path):
+        """Test that with a job queue the preparation travels in the job payload"""
+        service = batch_env.service
+        service.job_queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+        batch = service.start_batch(batch_env.charge_ids[:2])
+
+        job = service.job_queue.get(batch.items[0].conversation_id)
+        assert job.payload["prepared"]["charge_details"]["charge_info"]["charge_id"] == batch_env.charge_ids[0]
+        assert "policy" in job.payload["prepared"]["shared_context"]
+        assert service.batch_progress(batch.batch_id)["in_progress"] == 2
+
+    def test_release_forgets_preparation(self, batch_env):
+        """Test that releasing a conversation also drops its preparation and line"""
+        service = batch_env.service
+        charge_id = batch_env.charge_ids[0]
+        details = service.dispute_response_generator.get_charge_details(charge_id)
+        conversation_id = service.create_conversation(
+            charge_id, prepared={"charge_details": details}, phone_number_id="line_a"
+        )
+
+        service.release_conversation(conversation_id)
+
+        assert conversation_id not in service._prepared
+        assert conversation_id not in service._lines
+        assert service.get_conversation_result(conversation_id) is None
+
+    async def test_batch_endpoints(self, batch_env):
+        """Test POST /batch and GET /batch/{batch_id}"""
+        from main import app
+
+        service = batch_env.service
+        app.dependency_overrides[get_conversation_service] = lambda: service
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                started = await client.post(
+                    "/api/conversation/batch", json={"charge_ids": batch_env.charge_ids[:3]}
+                )
+                batch_id = started.json()["batch_id"]
+                await asyncio.to_thread(wait_until_done, service, batch_id)
+                progress = await client.get(f"/api/conversation/batch/{batch_id}")
+                missing = await client.get("/api/conversation/batch/batch_missing")
+                empty = await client.post("/api/conversation/batch", json={"charge_ids": []})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert started.status_code == 202
+        assert started.json()["total"] == 3
+        assert progress.json()["completed"] == 3 and progress.json()["done"]
+        assert missing.status_code == 404
+        assert empty.status_code == 422
@@ -0,0 +1,110 @@
+import numpy as np
+
+from benchmarks.retrieval_quality import RandomVectorProvider, evaluate_provider
+from benchmarks.standins import OpenAIEmbeddingsStandIn
+from observability import track_timeline
+from rag_service import RAGService
+from retrieval import HashingEmbeddingProvider, LocalVectorIndex, load_records
+
+
+class FailingEmbeddings:
+    """Remote provider whose API is down"""
+
+    model = "text-embedding-3-small"
+    dimensions = 1536
+    local = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        raise ConnectionError("OpenAI unavailable")
+
+
+class TestHashingEmbeddings:
+    """Test suite for the offline hashing embedding provider and local index"""
+
+    def test_vectors_are_stable_and_normalized(self):
+        """Test that vectors do not depend on the process and have unit length"""
+        provider = HashingEmbeddingProvider().fit([r.text for r in load_records()])
+        first = provider.embed(["Subscription cancellation policy", ""])
+        second = HashingEmbeddingProvider().fit([r.text for r in load_records()]).embed(
+            ["Subscription cancellation policy"]
+        )
+
+        assert first.shape == (2, 1536) and first.dtype == np.float32
+        assert np.allclose(first[0], second[0])
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+        assert not first[1].any()
+
+    def test_local_index_ranks_relevant_records(self):
+        """Test per-type filtered queries against the knowledge base"""
+        provider = HashingEmbeddingProvider().fit([r.text for r in load_records()])
+        index = LocalVectorIndex.from_records(load_records(), provider)
+        vector = provider.embed(["subscription_canceled Netflix Premium Subscription Michael Chen"])[0]
+
+        scripts = index.query(vector, top_k=2, filter={"type": {"$eq": "dispute_script"}})["matches"]
+        orders = index.query(vector, top_k=1, filter={"type": {"$in": ["order"]}})["matches"]
+
+        assert scripts[0]["id"] == "script-6"
+        assert scripts[0]["score"] >= scripts[1]["score"]
+        assert orders[0]["metadata"]["customer"] == "Michael Chen"
+
+    def test_upsert_and_delete_swap_snapshots(self):
+        """Test that writes replace rows by ID and bump the index version"""
+        index = LocalVectorIndex(dimensions=3)
+        index.upsert(vectors=[{"id": "a", "values": [1, 0, 0], "metadata": {"type": "policy"}}])
+        index.upsert(vectors=[{"id": "a", "values": [0, 2, 0], "metadata": {"type": "policy"}}])
+        assert len(index) == 1 and index.version == 2
+
+        match = index.query([0, 1, 0], top_k=5)["matches"][0]
+        assert match["id"] == "a" and np.isclose(match["score"], 1.0)
+
+        index.delete(ids=["a"])
+        assert index.describe_index_stats()["total_vector_count"] == 0
+        assert index.query([0, 1, 0])["matches"] == []
+
+    def test_rag_service_serves_local_provider_offline(self):
+        """Test that a local provider is served from the local index without Pinecone"""
+        rag = RAGService(embedding_provider=HashingEmbeddingProvider().fit([r.text for r in load_records()]))
+
+        with track_timeline() as timeline:
+            context = rag.query_context("product_not_received", "Blue Wireless Headphones", "John Smith")
+
+        names = [r.name for r in timeline.snapshot()]
+        assert names.count("local_index.query") == 5 and "pinecone.query" not in names
+        assert context["dispute_scripts"][0]["dispute_reason"] == "product_not_received"
+        assert context["orders"][0]["customer"] == "John Smith"
+
+    def test_falls_back_when_remote_embeddings_fail(self):
+        """Test the local fallback and the cooldown before the remote provider is retried"""
+        remote = FailingEmbeddings()
+        rag = RAGService(index=object(), embedding_provider=remote, fallback_cooldown=60)
+
+        context = rag.query_context("fraudulent", "Standing Desk Pro", "Sarah Johnson")
+        rag.query_context("fraudulent", "Standing Desk Pro", "Sarah Johnson")
+
+        assert context["orders"][0]["customer"] == "Sarah Johnson"
+        assert remote.calls == 1
+
+    def test_falls_back_when_remote_embeddings_are_slow(self):
+        """Test that a slow remote embedding is abandoned after the embedding timeout"""
+        embeddings = OpenAIEmbeddingsStandIn()
+        embeddings.latency.base_ms = 500
+        rag = RAGService(index=object(), openai_client=embeddings.client(), embedding_timeout=0.05)
+
+        with track_timeline() as timeline:
+            context = rag.query_context("duplicate", "Coffee Maker Deluxe", "Robert Taylor")
+
+        assert "local_index.query" in [r.name for r in timeline.snapshot()]
+        assert context["orders"][0]["customer"] == "Robert Taylor"
+
+    def test_hashing_beats_random_baseline(self):
+        """Test the retrieval quality report on the labelled knowledge base queries"""
+        provider = HashingEmbeddingProvider().fit([r.text for r in load_records()])
+        hashing = evaluate_provider(provider)
+        baseline = evaluate_provider(RandomVectorProvider())
+
+        assert hashing["mrr"] > baseline["mrr"]
+        assert hashing["hit@3"] >= 0.9
@@ -0,0 +1,115 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.standins import AnthropicStandIn
+from stripe_integration import DisputeEvaluator, EvidenceCache
+from stripe_integration.evidence_cache import evidence_cache_key
+
+EVALUATION = {"resolved": True, "resolution_type": "renewed", "customer_sentiment": "satisfied"}
+TRANSCRIPT = [{"role": "user", "message": "I'll renew.", "time_in_call_secs": 1.0}]
+
+
+def charge_metadata(customer_name: str, **overrides) -> dict:
+    metadata = {
+        "customer_name": customer_name,
+        "customer_email": f"{customer_name.lower()}@example.com",
+        "product_name": "Monthly SaaS subscription",
+        "product_type": "subscription",
+        "terms_agreed": "True",
+    }
+    metadata.update(overrides)
+    return metadata
+
+
+class TestEvidenceCache:
+    """Test suite for the content-addressed evidence cache"""
+
+    def test_call_independent_fields_are_shared(self, tmp_path):
+        """Test that product evidence is generated once per product, call evidence per dispute"""
+        standin = AnthropicStandIn()
+        evaluator = DisputeEvaluator(
+            stripe_api_key="sk_test_standin",
+            anthropic_client=standin.client(),
+            evidence_cache=EvidenceCache(directory=str(tmp_path)),
+        )
+
+        for name in ("Robert", "Alice"):
+            evaluator.generate_evidence_text("product_description", charge_metadata(name), TRANSCRIPT, EVALUATION)
+        assert standin.request_count == 1
+
+        for name in ("Robert", "Alice"):
+            evaluator.generate_evidence_text("cancellation_rebuttal", charge_metadata(name), TRANSCRIPT, EVALUATION)
+        assert standin.request_count == 3
+
+        # A different product is a different entry
+        evaluator.generate_evidence_text(
+            "product_description", charge_metadata("Robert", product_name="Annual plan"), TRANSCRIPT, EVALUATION
+        )
+        assert standin.request_count == 4
+        assert evaluator.evidence_cache.stats() == {"entries": 2, "hits": 1, "misses": 2}
+
+    def test_evidence_submission_uses_the_cache(self, tmp_path):
+        """Test that submitting evidence for two disputes on one product reuses the product fields"""
+        standin = AnthropicStandIn()
+        evaluator = DisputeEvaluator(
+            stripe_api_key="sk_test_standin",
+            anthropic_client=standin.client(),
+            evidence_cache=EvidenceCache(directory=str(tmp_path)),
+        )
+
+        for dispute_id, name in (("du_1", "Robert"), ("du_2", "Alice")):
+            result = evaluator.submit_evidence_to_stripe(
+                f"ch_{name}",
+                TRANSCRIPT,
+                send_to_stripe=False,
+                evaluation=EVALUATION,
+                dispute_context=(charge_metadata(name), SimpleNamespace(id=dispute_id, status="needs_response")),
+            )
+
+        assert len(result["evidence_generated"]) == 7
+        assert standin.request_count == 7 + 4  # The second dispute only generates its call fields
+        assert evaluator.evidence_cache.stats() == {"entries": 3, "hits": 3, "misses": 3}
+
+    def test_entries_persist_on_disk(self, tmp_path):
+        """Test that a new cache on the same directory reuses earlier generations"""
+        key = evidence_cache_key("refund_policy_disclosure", {"product_name": "Course"})
+        EvidenceCache(directory=str(tmp_path)).put(key, "Refunds within 14 days.")
+
+        cache = EvidenceCache(directory=str(tmp_path))
+        assert cache.get_or_generate(key, lambda: "regenerated") == "Refunds within 14 days."
+        assert key != evidence_cache_key("refund_policy_disclosure", {"product_name": "Course"}, "2")
+
+    def test_concurrent_misses_generate_once(self):
+        """Test that threads asking for the same key share one generation"""
+        cache = EvidenceCache()
+        calls = []
+
+        def generate():
+            calls.append(1)
+            time.sleep(0.05)
+            return "text"
+
+        threads = [threading.Thread(target=cache.get_or_generate, args=("key", generate)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 7
+
+    def test_failed_generation_is_retried(self):
+        """Test that a generation error releases the key for the next request"""
+        cache = EvidenceCache()
+
+        def fail():
+            raise RuntimeError("Claude unavailable")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_generate("key", fail)
+
+        assert cache._key_locks == {}
+        assert cache.get_or_generate("key", lambda: "text") == "text"
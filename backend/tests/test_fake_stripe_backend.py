@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+import stripe
+
+from stripe_integration import (
+    DisputeResponseGenerator,
+    FakeStripeBackend,
+    FakeStripeConfig,
+    StripeClient,
+    TRANSACTION_SCENARIOS,
+)
+from stripe_integration.fake_backend import serve
+
+
+pytestmark = pytest.mark.usefixtures("restore_stripe_globals")
+
+
+@pytest.fixture
+def backend():
+    """Fixture providing a seeded fake backend"""
+    return FakeStripeBackend(FakeStripeConfig(seed=1))
+
+
+class TestFakeStripeBackend:
+    """Test suite for the offline Stripe stand-in"""
+
+    def test_seed_from_scenarios(self, backend):
+        """Test that every disputing scenario gets a charge with a dispute"""
+        charge_ids = backend.seed_from_scenarios(copies=2)
+        expected = sum(1 for s in TRANSACTION_SCENARIOS if s.will_dispute) * 2
+        assert len(charge_ids) == expected
+
+    def test_charge_details_through_generator(self, backend):
+        """Test that DisputeResponseGenerator reads seeded charges in-process"""
+        charge_id = backend.seed_from_scenarios()[0]
+        StripeClient(backend=backend)
+
+        generator = DisputeResponseGenerator(anthropic_api_key="test")
+        details = generator.get_charge_details(charge_id)
+
+        assert details["customer_info"]["name"] == "John Fraudster"
+        assert details["charge_info"]["amount"] == 100.0
+        assert details["metadata"]["login_count"] == "45"
+
+    def test_submit_dispute_evidence(self, backend):
+        """Test that evidence is stored and submit moves the dispute to review"""
+        charge_id = backend.seed_from_scenarios()[0]
+        client = StripeClient(backend=backend)
+        dispute = client.get_charge_disputes(charge_id)[0]
+
+        updated = stripe.Dispute.modify(
+            dispute.id, evidence={"product_description": "Premium access"}, submit=True
+        )
+
+        assert updated.status == "under_review"
+        assert updated.evidence["product_description"] == "Premium access"
+
+    def test_dispute_card_opens_dispute(self, backend):
+        """Test that charges made with a dispute test card get a dispute"""
+        client = StripeClient(backend=backend)
+        token = client.create_token("4000000000000259")
+        charge = client.create_charge(amount=1000, currency="usd", source=token.id)
+
+        disputes = client.get_charge_disputes(charge.id)
+        assert len(disputes) == 1
+        assert disputes[0].reason == "fraudulent"
+
+    def test_missing_charge_raises(self, backend):
+        """Test that unknown IDs surface as Stripe InvalidRequestError"""
+        client = StripeClient(backend=backend)
+        with pytest.raises(stripe.InvalidRequestError, match="No such charge"):
+            client.get_charge("ch_missing")
+
+    def test_error_injection(self):
+        """Test that injected errors reach the caller"""
+        backend = FakeStripeBackend(FakeStripeConfig(error_rate=1.0, error_status=400))
+        client = StripeClient(backend=backend)
+        with pytest.raises(stripe.InvalidRequestError):
+            client.list_charges()
+        assert backend.error_count == 1
+
+    def test_local_http_server(self, backend, monkeypatch):
+        """Test that StripeClient can point at the local HTTP server"""
+        charge_id = backend.seed_from_scenarios()[0]
+        server = serve(backend, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            monkeypatch.setenv("STRIPE_API_BASE", f"http://127.0.0.1:{server.server_port}")
+            stripe.default_http_client = None
+            client = StripeClient(api_key="sk_test_fake")
+            assert client.get_charge(charge_id).id == charge_id
+        finally:
+            server.shutdown()
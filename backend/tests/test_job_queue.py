@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from conversation.job_queue import SQLiteJobQueue
+from conversation.worker import ConversationWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Fixture providing an empty queue with a short lease"""
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"), lease_seconds=0.2, max_attempts=2)
+
+
+class TestJobQueue:
+    """Test suite for the lease-based conversation job queue"""
+
+    def test_claim_and_complete(self, queue):
+        """Test that a job is claimed once and completed with its result"""
+        queue.enqueue("conv_1", {"charge_id": "ch_1"})
+
+        job = queue.claim("worker-a")
+        assert job.job_id == "conv_1"
+        assert job.payload == {"charge_id": "ch_1"}
+        assert job.attempts == 1
+        assert queue.claim("worker-b") is None
+
+        assert queue.complete("conv_1", "worker-a", {"status": "completed"})
+        stored = queue.get("conv_1")
+        assert stored.status == "done"
+        assert stored.result == {"status": "completed"}
+        assert queue.counts()["done"] == 1
+
+    def test_duplicate_job_rejected(self, queue):
+        """Test that job IDs are unique"""
+        queue.enqueue("conv_1", {})
+        with pytest.raises(ValueError):
+            queue.enqueue("conv_1", {})
+
+    def test_expired_lease_is_reclaimed(self, queue):
+        """Test that a crashed worker's job goes to another worker"""
+        queue.enqueue("conv_1", {})
+        queue.claim("crashed")
+        time.sleep(0.3)
+
+        job = queue.claim("worker-b")
+        assert job.worker_id == "worker-b"
+        assert job.attempts == 2
+        # The original worker can no longer heartbeat or finish the job
+        assert not queue.heartbeat("conv_1", "crashed")
+        assert not queue.complete("conv_1", "crashed", {})
+        assert queue.heartbeat("conv_1", "worker-b")
+
+    def test_gives_up_after_max_attempts(self, queue):
+        """Test that a job whose lease keeps expiring is failed"""
+        queue.enqueue("conv_1", {})
+        for worker in ("a", "b"):
+            assert queue.claim(worker) is not None
+            time.sleep(0.3)
+
+        assert queue.claim("c") is None
+        job = queue.get("conv_1")
+        assert job.status == "failed"
+        assert "lease expired" in job.error
+
+    def test_worker_runs_queued_conversation(self, offline_env, queue):
+        """Test that the API side enqueues and a worker stores the result"""
+        service = offline_env.service
+        service.job_queue = queue
+        conversation_id, created = service.start_conversation(offline_env.charge_ids[0], update_stripe=True)
+        assert created
+        assert service.get_conversation_result(conversation_id).status.value == "in_progress"
+
+        worker = ConversationWorker(queue, service, "worker-a", poll_interval=0.01)
+        assert worker.run(max_jobs=1) == 1
+
+        result = service.get_conversation_result(conversation_id)
+        assert result.status.value == "completed"
+        assert result.transcript
+        assert service.get_conversation_usage(conversation_id).totals.calls > 0
+        assert queue.get(conversation_id).status == "done"
+
+    def test_enqueue_is_unique_per_charge(self, queue):
+        """Test that a charge with an active job and a repeated key return the existing job"""
+        job, created = queue.enqueue_unique("conv_1", {}, dedupe_key="ch_1", idempotency_key="key-1")
+        assert created
+        duplicate, created = queue.enqueue_unique("conv_2", {}, dedupe_key="ch_1")
+        assert (duplicate.job_id, created) == ("conv_1", False)
+
+        claimed = queue.claim("worker-a")
+        queue.complete(claimed.job_id, "worker-a", {})
+        # The same key still answers after the job is done; a new key starts a new job
+        replay, created = queue.enqueue_unique("conv_3", {}, dedupe_key="ch_1", idempotency_key="key-1")
+        assert (replay.job_id, created) == ("conv_1", False)
+        fresh, created = queue.enqueue_unique("conv_4", {}, dedupe_key="ch_1", idempotency_key="key-2")
+        assert (fresh.job_id, created) == ("conv_4", True)
+
+    def test_redelivered_job_does_not_redial_within_cooldown(self, offline_env, queue):
+        """Test that a job redelivered after a crash mid-call fails instead of calling again"""
+        service = offline_env.service
+        service.job_queue = queue
+        service.start_guard.cooldown_seconds = 60
+        charge_id = offline_env.charge_ids[0]
+        queue.enqueue("conv_1", {"charge_id": charge_id, "phone_number_override": "+15550001"})
+
+        # The first worker dials the customer, then dies before finishing the job
+        queue.claim("crashed")
+        service.start_guard.claim_call("+15550001", charge_id)
+        time.sleep(0.3)
+
+        worker = ConversationWorker(queue, service, "worker-b", poll_interval=0.01)
+        assert worker.run_once()
+
+        job = queue.get("conv_1")
+        assert job.status == "failed"
+        assert "called recently" in job.error
+        assert offline_env.simulator.stats() == {}
@@ -0,0 +1,129 @@
+import json
+import shutil
+import threading
+import time
+
+import httpx
+
+from conversation.controller import peek_conversation_service
+from rag_service import RAGService
+from retrieval import DATA_DIR, HashingEmbeddingProvider
+
+NEW_POLICY = {
+    "id": "policy-8",
+    "type": "swamp_policy",
+    "content": "Swamp tour policy: Ogre swamp tours are refundable until the day before the tour.",
+}
+
+
+class SlowFitProvider(HashingEmbeddingProvider):
+    """Hashing provider whose refits take a while once `slow` is set"""
+
+    slow = False
+
+    def fit(self, texts):
+        if SlowFitProvider.slow:
+            time.sleep(0.5)
+        return super().fit(texts)
+
+
+def copy_data(tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR, data_dir)
+    return data_dir
+
+
+def add_policy(data_dir, policy=NEW_POLICY):
+    path = data_dir / "policies.json"
+    policies = json.loads(path.read_text())
+    path.write_text(json.dumps(policies + [policy]))
+
+
+class TestKnowledgeBaseHotReload:
+    """Test suite for hot-reloading the local knowledge base"""
+
+    def test_reload_swaps_in_edited_data(self, tmp_path):
+        """Test that a reload serves edited records and invalidates cached results"""
+        data_dir = copy_data(tmp_path)
+        rag = RAGService(embedding_provider=HashingEmbeddingProvider(), data_dir=data_dir, hot_reload=False)
+        before = rag.query_context("swamp tour", "Ogre Swamp Tour")
+        assert rag.knowledge_base_status()["version"] == 1
+
+        add_policy(data_dir)
+        assert rag.reload_knowledge_base()
+        after = rag.query_context("swamp tour", "Ogre Swamp Tour")
+
+        assert "Swamp tour policy" not in before["policies"][0]["content"]
+        assert after["policies"][0]["content"] == NEW_POLICY["content"]
+        status = rag.knowledge_base_status()
+        assert (status["version"], status["records"], status["source"]) == (2, 33, "local")
+
+    def test_watcher_reloads_on_file_change(self, tmp_path, monkeypatch):
+        """Test that the data directory watcher picks up edits by itself"""
+        monkeypatch.setenv("KB_RELOAD_INTERVAL", "0.02")
+        data_dir = copy_data(tmp_path)
+        rag = RAGService(embedding_provider=HashingEmbeddingProvider(), data_dir=data_dir, hot_reload=True)
+        rag.query_context("general", "Headphones")
+        assert rag.knowledge_base_status()["hot_reload"]
+
+        add_policy(data_dir)
+        deadline = time.monotonic() + 3
+        while rag.knowledge_base_status()["version"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        rag.close()
+
+        assert rag.knowledge_base_status()["records"] == 33
+
+    def test_invalid_file_keeps_current_index(self, tmp_path):
+        """Test that a half-written or broken file does not replace the index"""
+        data_dir = copy_data(tmp_path)
+        rag = RAGService(embedding_provider=HashingEmbeddingProvider(), data_dir=data_dir, hot_reload=False)
+        rag.query_context("general", "Headphones")
+
+        (data_dir / "policies.json").write_text('[{"id": "policy-1", ')
+        assert not rag.reload_knowledge_base()
+
+        status = rag.knowledge_base_status()
+        assert (status["version"], status["records"]) == (1, 32)
+        assert status["last_error"].startswith("JSONDecodeError")
+        assert len(rag.query_context("general", "Headphones")["policies"]) == 3
+
+    def test_queries_are_not_blocked_by_a_rebuild(self, tmp_path):
+        """Test that queries keep using the current index while the new one is built"""
+        data_dir = copy_data(tmp_path)
+        rag = RAGService(embedding_provider=SlowFitProvider(), data_dir=data_dir, hot_reload=False)
+        rag.query_context("general", "Headphones")
+
+        add_policy(data_dir)
+        SlowFitProvider.slow = True
+        try:
+            reload = threading.Thread(target=rag.reload_knowledge_base)
+            reload.start()
+            time.sleep(0.05)
+            start = time.perf_counter()
+            rag.query_context("swamp tour", "Ogre Swamp Tour", "Shrek")
+            elapsed = time.perf_counter() - start
+            reload.join()
+        finally:
+            SlowFitProvider.slow = False
+
+        assert elapsed < 0.3
+        assert rag.knowledge_base_status()["version"] == 2
+
+    async def test_health_reports_knowledge_base_version(self, offline_env):
+        """Test the knowledge base status on /health"""
+        from main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            before = (await client.get("/health")).json()
+            app.dependency_overrides[peek_conversation_service] = lambda: offline_env.service
+            try:
+                after = (await client.get("/health")).json()
+            finally:
+                app.dependency_overrides.clear()
+
+        assert before["knowledge_base"] is None
+        assert after["knowledge_base"]["source"] == "local"
+        assert after["knowledge_base"]["records"] == 32
+        assert after["knowledge_base"]["version"] == 1
@@ -0,0 +1,74 @@
+from dataclasses import replace
+
+from retrieval import (
+    HashingEmbeddingProvider,
+    LocalVectorIndex,
+    apply_sync,
+    load_manifest,
+    load_records,
+    plan_sync,
+)
+
+
+class CountingProvider(HashingEmbeddingProvider):
+    """Hashing provider that counts embedded texts"""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+class TestKnowledgeBaseSync:
+    """Test suite for the incremental, content-hash based knowledge base sync"""
+
+    def test_second_sync_embeds_only_the_diff(self, tmp_path):
+        """Test that unchanged records are skipped and changed, new and removed ones are applied"""
+        manifest_path = tmp_path / "manifest.json"
+        provider = CountingProvider()
+        index = LocalVectorIndex(dimensions=64)
+        records = load_records()
+
+        plan = plan_sync(records, load_manifest(manifest_path), provider.model)
+        apply_sync(plan, records, provider, index, {}, manifest_path, batch_size=8)
+        assert provider.embedded == len(records) == len(index)
+
+        policy = next(r for r in records if r.id == "policy-1")
+        edited = [replace(policy, text="Refunds within 60 days.")] + [
+            r for r in records if r.id not in ("policy-1", "order-10")
+        ]
+        edited.append(replace(policy, id="policy-99"))
+
+        manifest = load_manifest(manifest_path)
+        plan = plan_sync(edited, manifest, provider.model)
+        assert plan.summary() == {"added": 1, "changed": 1, "removed": 1, "unchanged": len(records) - 2}
+        assert plan.diff_lines() == ["+ policy-99", "~ policy-1", "- order-10"]
+
+        provider.embedded = 0
+        apply_sync(plan, edited, provider, index, manifest, manifest_path)
+        assert provider.embedded == 2
+        assert len(index) == len(records)
+        assert "order-10" not in load_manifest(manifest_path)
+        assert plan_sync(edited, load_manifest(manifest_path), provider.model).is_empty
+
+    def test_model_change_reembeds_everything(self, tmp_path):
+        """Test that records embedded with another model count as changed"""
+        records = load_records()
+        manifest_path = tmp_path / "manifest.json"
+        plan = plan_sync(records, {}, "model-a")
+        apply_sync(plan, records, CountingProvider(), LocalVectorIndex(64), {}, manifest_path)
+
+        assert len(plan_sync(records, load_manifest(manifest_path), "model-b").changed) == len(records)
+        assert plan_sync(records, load_manifest(manifest_path), "hashing-tfidf-64", full=True).added == []
+
+    def test_dry_run_plan_leaves_index_untouched(self, tmp_path):
+        """Test that planning alone neither embeds nor writes the manifest"""
+        provider = CountingProvider()
+        plan = plan_sync(load_records(), load_manifest(tmp_path / "manifest.json"), provider.model)
+
+        assert len(plan.added) == len(load_records())
+        assert provider.embedded == 0
+        assert not (tmp_path / "manifest.json").exists()
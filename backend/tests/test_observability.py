@@ -0,0 +1,61 @@
+import pytest
+
+from observability import render_metrics, span, track_timeline
+
+
+class TestTracing:
+    """Test suite for timing spans and metrics"""
+
+    def test_span_records_into_timeline(self):
+        """Test that spans land in the active timeline with their outcome"""
+        with track_timeline() as timeline:
+            with span("test.ok"):
+                pass
+            with pytest.raises(RuntimeError):
+                with span("test.fail"):
+                    raise RuntimeError("boom")
+
+        records = timeline.snapshot()
+        assert [(r.name, r.outcome) for r in records] == [("test.ok", "ok"), ("test.fail", "error")]
+        assert all(r.duration >= 0 for r in records)
+
+    def test_span_without_timeline(self):
+        """Test that spans outside a timeline are still exported as metrics"""
+        with span("test.untracked"):
+            pass
+
+        metrics = render_metrics().decode()
+        assert 'chargeback_span_duration_seconds_count{span="test.untracked"} 1.0' in metrics
+        assert 'chargeback_span_calls_total{outcome="ok",span="test.untracked"} 1.0' in metrics
+
+    def test_conversation_timeline(self, openai_offline_env):
+        """Test that a full offline conversation carries a stage timeline"""
+        service = openai_offline_env.service
+        service.outcome_classifier = None  # Always take the Claude path
+        conversation_id = service.create_conversation(openai_offline_env.charge_ids[0])
+        service.run_conversation(conversation_id, update_stripe=True)
+
+        result = service.get_conversation_result(conversation_id)
+        assert result.status.value == "completed"
+
+        names = {stage.name for stage in result.timeline}
+        assert {
+            "pipeline.stripe_fetch",
+            "pipeline.argument_generation",
+            "pipeline.rag",
+            "pipeline.call",
+            "pipeline.analysis",
+            "pipeline.evidence",
+            "stripe.get_charge",
+            "stripe.update_dispute",
+            "claude.arguments",
+            "claude.post_call_analysis",
+            "openai.embeddings",
+            "pinecone.query",
+            "elevenlabs.dial",
+            "elevenlabs.poll",
+            "disk.save_transcript",
+        } <= names
+        offsets = [stage.start_offset_ms for stage in result.timeline]
+        assert offsets == sorted(offsets)
+        assert 'chargeback_conversations_total{status="completed"}' in render_metrics().decode()
@@ -0,0 +1,120 @@
+from benchmarks.fast_path_report import build_report
+from benchmarks.standins import AnthropicStandIn
+from elevenlabs_wrapper.call_simulator import DEFAULT_TEMPLATES
+from stripe_integration import DisputeEvaluator, FastPathClassifier
+
+
+def transcript(*user_turns: str) -> list[dict]:
+    messages = [{"role": "agent", "message": "Would you like to cancel or renew?", "time_in_call_secs": 0.0}]
+    for i, text in enumerate(user_turns, 1):
+        messages.append({"role": "user", "message": text, "time_in_call_secs": float(i)})
+    return messages
+
+
+class TestOutcomeClassifier:
+    """Test suite for the deterministic fast-path outcome classifier"""
+
+    def test_explicit_decisions_are_confident(self):
+        """Test that clear final lines are decided without the LLM"""
+        classifier = FastPathClassifier()
+        cases = {
+            "I want to renew my subscription.": "renewed",
+            "Please just cancel it officially.": "canceled",
+            "I'll keep the chargeback. Goodbye.": "unresolved",
+            "I think I can renew it. I think it was a mistake to cancel it by a chargeback.": "renewed",
+        }
+        for line, expected in cases.items():
+            result = classifier.classify(transcript("Hello.", line))
+            assert (result.resolution_type, result.confident) == (expected, True), line
+
+    def test_ambiguous_turns_fall_back(self):
+        """Test negations, questions, bare keywords and changed minds"""
+        classifier = FastPathClassifier()
+        assert classifier.classify(transcript("I do not want to renew.")) is None
+        assert classifier.classify(transcript("Can I cancel instead?")) is None
+        assert not classifier.classify(transcript("Renewing is probably fine.")).confident
+
+        changed = classifier.classify(transcript("I want to cancel.", "Actually, I'll renew."))
+        assert changed.resolution_type == "renewed"
+        assert not changed.confident
+
+        reversed_in_turn = classifier.classify(
+            transcript("I will renew it. Actually no, I would like to cancel it.")
+        )
+        assert reversed_in_turn.resolution_type == "canceled"
+        assert not reversed_in_turn.confident
+
+    def test_chargeback_and_hedged_decisions_fall_back(self):
+        """Test that canceling the dispute, conditions and deferrals are left to the LLM"""
+        classifier = FastPathClassifier()
+        lines = [
+            "I will cancel the chargeback.",
+            "I want to cancel my dispute with the bank.",
+            "I would like to cancel, but only if I get a refund.",
+            "I'll renew it later, not now.",
+            "I want to renew but I need to ask my wife first.",
+        ]
+        for line in lines:
+            result = classifier.classify(transcript("Hello.", line))
+            assert not result.confident, line
+        assert classifier.classify(transcript("I will cancel the chargeback.")).pattern == "cancel_keyword"
+
+    def test_calibration_round_trip(self, tmp_path):
+        """Test that calibration follows the LLM labels and survives save/load"""
+        classifier = FastPathClassifier()
+        samples = [(transcript("I want to renew."), "unresolved")] * 4
+        calibrated = classifier.calibrate(samples)
+        confidences = {p.name: p.confidence for p in calibrated.patterns}
+        assert confidences["renew_intent"] == 0.475  # (0 + 4 * 0.95) / (4 + 4)
+        assert confidences["cancel_intent"] == 0.93  # No matches: unchanged
+
+        path = tmp_path / "calibration.json"
+        calibrated.save(str(path))
+        loaded = FastPathClassifier.load(str(path), threshold=0.9)
+        assert not loaded.classify(transcript("I want to renew.")).confident
+
+    def test_evaluator_skips_claude_when_confident(self):
+        """Test that evaluate_transcript only calls Claude below the threshold"""
+        standin = AnthropicStandIn()
+        evaluator = DisputeEvaluator(
+            stripe_api_key="sk_test_standin",
+            anthropic_client=standin.client(),
+            outcome_classifier=FastPathClassifier(),
+        )
+
+        evaluation = evaluator.evaluate_transcript(transcript("I want to renew my subscription."), "ch_1")
+        assert evaluation["resolution_type"] == "renewed"
+        assert evaluation["resolved"] is True
+        assert standin.request_count == 0
+
+        evaluator.evaluate_transcript(transcript("Hmm, let me think about it."), "ch_1")
+        assert standin.request_count == 1
+
+    def test_pipeline_uses_fast_path(self, offline_env):
+        """Test that an unambiguous call is evaluated without Claude and only summarized by it"""
+        service = offline_env.service
+        offline_env.simulator.config.templates = [DEFAULT_TEMPLATES[0]]  # "renewed"
+        conversation_id = service.create_conversation(offline_env.charge_ids[0])
+        service.run_conversation(conversation_id, update_stripe=True)
+
+        result = service.get_conversation_result(conversation_id)
+        names = [stage.name for stage in result.timeline]
+        assert result.evidence_result.evaluation.resolution_type == "renewed"
+        assert result.summary == "user decided to renew"
+        assert "claude.summary" in names
+        assert "claude.post_call_analysis" not in names
+        assert "claude.evaluation" not in names
+
+    def test_report_hit_rate_and_agreement(self):
+        """Test the hit rate and agreement figures of the report"""
+        transcripts = {
+            "conv_1": transcript("I want to renew my subscription."),
+            "conv_2": transcript("Please just cancel it officially."),
+            "conv_3": transcript("Let me think about it."),
+        }
+        labels = {"conv_1": "renewed", "conv_2": "unresolved", "conv_3": "pending"}
+
+        report = build_report(FastPathClassifier(), transcripts, labels)
+        assert report["hit_rate"] == round(2 / 3, 4)
+        assert report["agreement_on_hits"] == 0.5
+        assert [row["conversation_id"] for row in report["disagreements"]] == ["conv_2"]
@@ -0,0 +1,127 @@
+import threading
+
+from elevenlabs_wrapper import ConversationData, PostCallAnalysis, TranscriptMessage
+from elevenlabs_wrapper.call_simulator import DEFAULT_TEMPLATES
+from elevenlabs_wrapper.conversation_manager import ConversationMetadata
+from elevenlabs_wrapper.outcome_scorer import IncrementalOutcomeScorer, detect_decision
+
+
+def message(role: str, text: str) -> TranscriptMessage:
+    return TranscriptMessage(role=role, message=text, time_in_call_secs=0.0)
+
+
+def conversation(status: str, messages: list[TranscriptMessage]) -> ConversationData:
+    return ConversationData(
+        agent_id="agent_1",
+        conversation_id="conv_1",
+        status=status,
+        transcript=messages,
+        metadata=ConversationMetadata(start_time_unix_secs=0, call_duration_secs=0, cost=0),
+    )
+
+
+class TestOutcomeScorer:
+    """Test suite for the incremental in-call outcome scorer"""
+
+    def test_detect_decision(self):
+        """Test the keyword pass, including negations and questions"""
+        assert detect_decision("I want to renew my subscription.") == "renewed"
+        assert detect_decision("Please just cancel it officially.") == "canceled"
+        assert detect_decision("I'll keep the chargeback. Goodbye.") == "unresolved"
+        assert detect_decision("I don't want to cancel, I'll renew.") == "renewed"
+        assert detect_decision("I do not want to renew.") is None
+        assert detect_decision("Can I cancel instead?") is None
+
+    def test_estimate_updates_with_each_turn(self):
+        """Test that only new messages are scored and agent confirmation raises confidence"""
+        updates = []
+        scorer = IncrementalOutcomeScorer(on_update=updates.append)
+        transcript = [message("agent", "Would you like a 30% discount on your next year?")]
+
+        scorer.observe(conversation("in-progress", transcript))
+        assert scorer.estimate.resolution_type == "pending"
+
+        transcript = transcript + [message("user", "Yes, okay.")]
+        estimate = scorer.observe(conversation("in-progress", transcript))
+        assert (estimate.resolution_type, estimate.resolved) == ("discount", True)
+        assert estimate.customer_decision == "Yes, okay."
+
+        transcript = transcript + [message("agent", "Great, the discount has been applied.")]
+        confirmed = scorer.observe(conversation("in-progress", transcript))
+        assert confirmed.confidence > estimate.confidence
+        assert confirmed.turns == 3
+        assert len(updates) == 3
+
+        scorer.observe(conversation("in-progress", transcript))  # Poll without new messages
+        assert len(updates) == 3
+
+    def test_final_checkpoint_is_reused(self):
+        """Test that the end of the call starts one checkpoint on the final transcript"""
+        calls = []
+        release = threading.Event()
+
+        def checkpoint(transcript):
+            calls.append(len(transcript))
+            release.wait(5)
+            return PostCallAnalysis(
+                summary="renewed", resolved=True, resolution_type="renewed",
+                customer_sentiment="satisfied", confidence=0.95,
+            )
+
+        scorer = IncrementalOutcomeScorer(checkpoint=checkpoint, min_checkpoint_interval=60)
+        transcript = [message("agent", "Cancel or renew?"), message("user", "Cancel it.")]
+        scorer.observe(conversation("in-progress", transcript))  # First decision: rules only
+        transcript = transcript + [
+            message("agent", "Are you sure?"),
+            message("user", "Actually, I'll renew."),
+        ]
+        scorer.observe(conversation("in-progress", transcript))  # Changed decision: checkpoint
+        scorer.observe(conversation("in-progress", transcript))  # Nothing new
+        transcript = transcript + [message("agent", "Your subscription will be renewed.")]
+        scorer.observe(conversation("processing", transcript))  # Call ended: final checkpoint
+        scorer.observe(conversation("done", transcript))
+
+        final = scorer.analysis_for(transcript)
+        assert final is not None
+        release.set()
+        assert final.result().resolution_type == "renewed"
+        scorer.close()
+
+        assert calls == [4, 5]
+        assert scorer.estimate.source == "llm"
+        assert scorer.estimate.confidence == 0.95
+
+    def test_conversation_reports_live_outcome(self, offline_env):
+        """Test that a finished call carries the outcome estimate"""
+        service = offline_env.service
+        offline_env.simulator.config.templates = [DEFAULT_TEMPLATES[0]]  # "renewed"
+        conversation_id = service.create_conversation(offline_env.charge_ids[0])
+        service.run_conversation(conversation_id, update_stripe=True)
+
+        result = service.get_conversation_result(conversation_id)
+        assert result.status.value == "completed"
+        assert result.live_outcome.resolution_type == "renewed"
+        assert result.live_outcome.turns == len(result.transcript)
+        assert result.live_outcome.source == "rules"
+
+    def test_live_result_keeps_its_etag_between_unchanged_polls(self, offline_env):
+        """Test that the in-progress result carries the transcript so far and only changes with it"""
+        service = offline_env.service
+        conversation_id = service.create_conversation(offline_env.charge_ids[0])
+        scorer = service._outcome_scorer(conversation_id)
+        transcript = [message("agent", "Cancel or renew?"), message("user", "I'll renew.")]
+
+        scorer.observe(conversation("in-progress", transcript))
+        first = service.get_stored_result(conversation_id)
+        first_texts = [entry.text for entry in first.result.transcript]
+        scorer.observe(conversation("in-progress", transcript))
+        scorer.observe(conversation("in-progress", transcript))
+        unchanged = service.get_stored_result(conversation_id)
+        scorer.observe(conversation("in-progress", transcript + [message("agent", "Renewed.")]))
+        changed = service.get_stored_result(conversation_id)
+        scorer.close()
+
+        assert first_texts == ["Cancel or renew?", "I'll renew."]
+        assert unchanged.etag == first.etag
+        assert changed.etag != first.etag
+        assert len(changed.result.transcript) == 3
@@ -0,0 +1,16 @@
+from benchmarks.pipeline_benchmark import STAGES, run_benchmark
+
+
+class TestPipelineBenchmark:
+    """Test suite for the offline pipeline benchmark"""
+
+    def test_runs_offline(self, offline_config):
+        """Test that the full pipeline runs against stand-ins and reports every stage"""
+        report = run_benchmark(offline_config, conversations=4, concurrency=2, warmup=0, memory=True)
+
+        assert report["throughput"]["completed"] == 4
+        assert all(report["stages"][stage]["count"] == 4 for stage in STAGES)
+        assert report["end_to_end"]["p99_ms"] >= report["end_to_end"]["p50_ms"]
+        assert report["memory"]["bytes_per_in_flight_conversation"] > 0
+        assert "local_index.query" in report["spans"]
+        assert report["stages"]["waiting"]["p50_ms"] > report["stages"]["dialing"]["p50_ms"]
@@ -0,0 +1,60 @@
+import asyncio
+
+from benchmarks.standins import AnthropicStandIn
+from elevenlabs_wrapper import PostCallAnalyzer, TranscriptMessage
+
+
+class TestPostCallAnalyzer:
+    """Test suite for the single-pass post-call analyzer"""
+
+    def test_analyze_returns_summary_and_evaluation(self):
+        """Test that one tool-use request yields both the summary and the evaluation"""
+        standin = AnthropicStandIn()
+        transcript = [
+            TranscriptMessage(role="agent", message="Do you want to cancel or renew?", time_in_call_secs=0.0),
+            TranscriptMessage(role="user", message="I'll renew.", time_in_call_secs=3.0),
+        ]
+
+        analysis = asyncio.run(PostCallAnalyzer().analyze(standin.async_client(), transcript))
+
+        assert standin.request_count == 1
+        assert analysis.summary == "user decided to renew"
+        evaluation = analysis.to_evaluation()
+        assert "summary" not in evaluation
+        assert evaluation["resolved"] is True
+        assert evaluation["resolution_type"] == "renewed"
+        assert evaluation["confidence"] == 0.9
+
+    def test_conversation_uses_single_analysis(self, offline_env):
+        """Test that the pipeline feeds the analysis into the evidence step"""
+        service = offline_env.service
+        service.outcome_classifier = None  # Always take the Claude path
+        conversation_id = service.create_conversation(offline_env.charge_ids[0])
+        service.run_conversation(conversation_id, update_stripe=True)
+
+        result = service.get_conversation_result(conversation_id)
+        names = [stage.name for stage in result.timeline]
+        assert result.summary == "user decided to renew"
+        assert result.evidence_result.evaluation.reasoning == "Customer explicitly agreed to renew"
+        assert names.count("claude.post_call_analysis") == 1
+        assert "claude.evaluation" not in names
+
+    def test_unsaved_transcript_submits_no_evidence(self, offline_env, monkeypatch):
+        """Test that evidence waits for the transcript, so a failed save submits nothing"""
+        service = offline_env.service
+        submitted = []
+
+        def fail_save(*args, **kwargs):
+            raise OSError("Disk full")
+
+        monkeypatch.setattr(service.storage, "save_transcript", fail_save)
+        monkeypatch.setattr(
+            service.dispute_evaluator, "submit_evidence_to_stripe", lambda **kwargs: submitted.append(kwargs)
+        )
+        conversation_id = service.create_conversation(offline_env.charge_ids[0])
+        service.run_conversation(conversation_id, update_stripe=True)
+
+        result = service.get_conversation_result(conversation_id)
+        assert result.status.value == "failed"
+        assert result.error == "Disk full"
+        assert submitted == []
@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import REGISTRY
+
+from benchmarks.standins import OpenAIEmbeddingsStandIn, PineconeIndexStandIn
+from observability import track_timeline
+from rag_service import RAGService
+
+
+class SlowOrdersIndex(PineconeIndexStandIn):
+    """Index stand-in where order queries are slow"""
+
+    def query(self, vector, top_k=10, include_metadata=True, filter=None, **kwargs):
+        if filter and filter.get("type", {}).get("$eq") == "order":
+            time.sleep(0.5)
+        return super().query(vector, top_k, include_metadata, filter, **kwargs)
+
+
+class SlowIndex(PineconeIndexStandIn):
+    """Index stand-in where every query takes 0.1s"""
+
+    def query(self, vector, top_k=10, include_metadata=True, filter=None, **kwargs):
+        time.sleep(0.1)
+        return super().query(vector, top_k, include_metadata, filter, **kwargs)
+
+
+class TestPerTypeRetrieval:
+    """Test suite for per-type filtered parallel retrieval"""
+
+    def test_quotas_per_type(self):
+        """Test that every record type gets its own quota from one shared embedding"""
+        embeddings = OpenAIEmbeddingsStandIn()
+        index = PineconeIndexStandIn()
+        rag = RAGService(index=index, openai_client=embeddings.client())
+
+        with track_timeline() as timeline:
+            context = rag.query_context("subscription_canceled", "Shrek Premium", "Fiona", top_k=10)
+
+        assert len(context["dispute_scripts"]) == 2
+        assert len(context["policies"]) == 3
+        assert len(context["resolution_authority"]) == 2
+        assert len(context["orders"]) == 3
+        assert len(context["common_confusions"]) == 2
+        assert embeddings.request_count == 1
+        assert index.request_count == 5
+        assert [r.name for r in timeline.snapshot()].count("pinecone.query") == 5
+
+    def test_top_k_caps_quotas(self):
+        """Test that top_k caps the results of any single type"""
+        rag = RAGService(index=PineconeIndexStandIn(), openai_client=OpenAIEmbeddingsStandIn().client())
+
+        context = rag.query_context("fraudulent", "Swamp Tour", top_k=1, type_quotas={"policy": 3, "order": 2})
+
+        assert len(context["policies"]) == 1
+        assert len(context["orders"]) == 1
+        assert context["dispute_scripts"] == []
+
+    def test_latency_budget(self):
+        """Test that slow types are skipped once the fan-out budget is spent"""
+        rag = RAGService(
+            index=SlowOrdersIndex(), openai_client=OpenAIEmbeddingsStandIn().client(), latency_budget=0.1
+        )
+
+        start = time.perf_counter()
+        context = rag.query_context("product_not_received", "Headphones", "John Smith")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.4
+        assert context["orders"] == []
+        assert len(context["policies"]) == 3
+
+    def test_skipped_types_are_counted(self):
+        """Test that types skipped by the budget are exported as a metric"""
+        rag = RAGService(
+            index=SlowOrdersIndex(), openai_client=OpenAIEmbeddingsStandIn().client(), latency_budget=0.1
+        )
+        before = REGISTRY.get_sample_value("chargeback_rag_skipped_types_total", {"type": "order", "reason": "budget"}) or 0
+
+        rag.query_context("product_not_received", "Headphones", "John Smith")
+
+        after = REGISTRY.get_sample_value("chargeback_rag_skipped_types_total", {"type": "order", "reason": "budget"})
+        assert after == before + 1
+
+    def test_queue_wait_does_not_spend_budget(self):
+        """Test that queries queued behind other conversations still get their full budget"""
+        rag = RAGService(
+            index=SlowIndex(), openai_client=OpenAIEmbeddingsStandIn().client(),
+            latency_budget=0.25, concurrent_queries=1,
+        )
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            contexts = list(pool.map(lambda _: rag.query_context("fraudulent", "Swamp Tour"), range(3)))
+
+        for context in contexts:
+            assert len(context["orders"]) == 3
+            assert len(context["policies"]) == 3
@@ -0,0 +1,17 @@
+from benchmarks.result_polling import PATHS, run_benchmark
+
+
+class TestResultPollingBenchmark:
+    """Test suite for the result polling micro-benchmark"""
+
+    def test_runs_every_path(self):
+        """Test that every response path is measured and returns the expected statuses"""
+        report = run_benchmark(conversations=3, requests=30, pollers=4)
+        paths = report["paths"]
+
+        assert set(paths) == set(PATHS)
+        assert paths["validated"]["statuses"] == paths["preserialized"]["statuses"] == [200]
+        assert paths["not_modified"]["statuses"] == [304]
+        assert paths["not_modified"]["mean_response_bytes"] == 0
+        assert paths["preserialized"]["mean_response_bytes"] == paths["validated"]["mean_response_bytes"]
+        assert paths["fields"]["mean_response_bytes"] < 500
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+
+from conversation.controller import get_conversation_service
+from conversation.models import ConversationResult, ConversationStatus, TranscriptEntry
+from conversation.result_store import ResultStore, result_size
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def completed(conversation_id, turns=20):
+    return ConversationResult(
+        conversation_id=conversation_id,
+        status=ConversationStatus.COMPLETED,
+        transcript=[
+            TranscriptEntry(speaker="user", text=f"Message {i} of {conversation_id}", timestamp=float(i))
+            for i in range(turns)
+        ],
+    )
+
+
+class TestResultStore:
+    """Test suite for the memory-bounded conversation result store"""
+
+    def test_size_budget_spills_least_recently_used(self, tmp_path):
+        """Test that results over the byte budget are spilled, oldest read first"""
+        size = result_size(completed("conv_a"))
+        store = ResultStore(tmp_path, max_bytes=int(size * 2.5))
+        for conversation_id in ("conv_a", "conv_b"):
+            store.put(completed(conversation_id))
+        store.get("conv_a")
+        store.put(completed("conv_c"))
+
+        stats = store.stats()
+        assert (stats["entries"], stats["spilled"], stats["spills"]) == (2, 1, 1)
+        assert stats["bytes"] <= stats["max_bytes"]
+        assert (tmp_path / "conv_b.json").exists()
+
+    def test_spilled_result_is_rehydrated(self, tmp_path):
+        """Test that a spilled result reads back unchanged and is served from memory again"""
+        clock = FakeClock()
+        store = ResultStore(tmp_path, ttl=60, clock=clock)
+        original = completed("conv_a")
+        store.put(original)
+
+        clock.now = 61
+        assert store.stats()["expirations"] == 1
+        assert store.stats()["entries"] == 0
+
+        assert store.get("conv_a") == original
+        assert store.get("conv_a") == original
+        stats = store.stats()
+        assert (stats["rehydrations"], stats["hits"], stats["entries"]) == (1, 1, 1)
+        assert "conv_a" in store
+
+    def test_body_is_serialized_once_per_version(self, tmp_path):
+        """Test that the stored body and ETag match the result at the version they were stored"""
+        store = ResultStore(tmp_path)
+        result = completed("conv_a")
+        store.put(result)
+        first = store.get_stored("conv_a")
+        result.summary = "Renewed"
+
+        assert store.get_stored("conv_a") is first
+        assert first.body == result.model_copy(update={"summary": None}).model_dump_json().encode()
+        store.put(result)
+        second = store.get_stored("conv_a")
+        assert b'"summary":"Renewed"' in second.body
+        assert (first.etag, second.etag) == ('"1-completed"', '"2-completed"')
+
+    def test_in_progress_results_are_never_evicted(self, tmp_path):
+        """Test that running conversations stay in memory past the TTL and budget"""
+        clock = FakeClock()
+        store = ResultStore(tmp_path, max_bytes=1, ttl=1, clock=clock)
+        running = ConversationResult(conversation_id="conv_a", status=ConversationStatus.IN_PROGRESS)
+        store.put(running)
+        store.put(completed("conv_b"))
+        clock.now = 10
+
+        assert store.get("conv_a") is running
+        stats = store.stats()
+        assert (stats["in_progress"], stats["spilled"]) == (1, 1)
+
+    def test_spilled_results_survive_a_restart_and_pop_removes_them(self, tmp_path):
+        """Test that a new store serves results spilled by a previous one"""
+        store = ResultStore(tmp_path, max_bytes=0)
+        store.put(completed("conv_a"))
+
+        restarted = ResultStore(tmp_path)
+        assert restarted.get("conv_a").transcript[0].text == "Message 0 of conv_a"
+        assert restarted.get_stored("conv_a").body == (tmp_path / "conv_a.json").read_bytes()
+        restarted.pop("conv_a")
+        assert "conv_a" not in restarted
+        assert restarted.get("../conv_a") is None
+        assert not list(tmp_path.glob("*.json"))
+
+    async def test_service_serves_spilled_results_and_reports_memory(self, offline_env, tmp_path):
+        """Test a conversation result spilled by the service and the memory endpoint"""
+        from main import app
+
+        service = offline_env.service
+        service.results = ResultStore(tmp_path, max_bytes=0)
+        conversation_id, _ = service.start_conversation(offline_env.charge_ids[0])
+        await asyncio.to_thread(service.run_conversation, conversation_id)
+
+        app.dependency_overrides[get_conversation_service] = lambda: service
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                result = (await client.get(f"/api/conversation/{conversation_id}")).json()
+                memory = (await client.get("/api/conversation/memory")).json()
+        finally:
+            app.dependency_overrides.clear()
+
+        assert result["status"] == "completed"
+        assert result["timeline"] and result["usage"]
+        assert memory["spilled"] == 1 and memory["rehydrations"] >= 1
+        assert memory["entries"] == 0
+        assert memory["peak_rss_bytes"] > 0
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from conversation.controller import get_conversation_service
+from conversation.models import ConversationResult, ConversationStatus
+from conversation.result_view import etag_matches, parse_fields, render_result, result_etag
+
+
+@pytest.fixture
+async def completed_conversation(offline_env):
+    """Fixture providing an API client and the ID of a completed offline conversation"""
+    from main import app
+
+    service = offline_env.service
+    conversation_id, _ = service.start_conversation(offline_env.charge_ids[0])
+    await asyncio.to_thread(service.run_conversation, conversation_id)
+
+    app.dependency_overrides[get_conversation_service] = lambda: service
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, conversation_id
+    app.dependency_overrides.clear()
+
+
+class TestResultView:
+    """Test suite for ETags, transcript deltas and field projections of conversation results"""
+
+    async def test_unchanged_result_returns_304(self, completed_conversation):
+        """Test that a poll with the current ETag gets an empty 304"""
+        client, conversation_id = completed_conversation
+        url = f"/api/conversation/{conversation_id}"
+        first = await client.get(url)
+        etag = first.headers["etag"]
+
+        again = await client.get(url, headers={"If-None-Match": etag})
+        stale = await client.get(url, headers={"If-None-Match": '"1-in_progress"'})
+
+        assert first.status_code == 200 and first.json()["version"] >= 3
+        assert again.status_code == 304 and again.content == b""
+        assert again.headers["etag"] == etag
+        assert stale.status_code == 200
+
+    async def test_since_returns_only_new_transcript_entries(self, completed_conversation):
+        """Test transcript deltas with since=<message index>"""
+        client, conversation_id = completed_conversation
+        url = f"/api/conversation/{conversation_id}"
+        transcript = (await client.get(url)).json()["transcript"]
+
+        delta = (await client.get(url, params={"since": 2})).json()["transcript"]
+        past_end = (await client.get(url, params={"since": len(transcript)})).json()["transcript"]
+
+        assert delta == transcript[2:]
+        assert past_end == []
+        assert (await client.get(url, params={"since": -1})).status_code == 422
+
+    async def test_fields_projection(self, completed_conversation):
+        """Test that fields= returns only the requested fields"""
+        client, conversation_id = completed_conversation
+        url = f"/api/conversation/{conversation_id}"
+        full = await client.get(url)
+        projected = await client.get(url, params={"fields": "status,summary"})
+
+        assert set(projected.json()) == {"conversation_id", "version", "status", "summary"}
+        assert len(projected.content) < len(full.content) / 10
+        bad = await client.get(url, params={"fields": "status,evidence"})
+        assert bad.status_code == 400
+        assert "evidence" in bad.json()["detail"]
+
+    def test_versions_and_etags(self, offline_env):
+        """Test that every stored change bumps the version and changes the ETag"""
+        store = offline_env.service.results
+        result = ConversationResult(conversation_id="conv_a", status=ConversationStatus.IN_PROGRESS)
+        store.put(result)
+        first = result_etag(result)
+        result.summary = "Renewed"
+        store.put(result)
+
+        assert result.version == 2
+        assert result_etag(result) != first
+        assert etag_matches(f'W/{first}, "x"', first)
+        assert etag_matches("*", first)
+        assert not etag_matches(None, first)
+
+    def test_result_view_without_transcript(self):
+        """Test that since is ignored when there is no transcript and fields are validated"""
+        result = ConversationResult(conversation_id="conv_a", status=ConversationStatus.IN_PROGRESS)
+
+        assert json.loads(render_result(result, since=3))["transcript"] is None
+        assert parse_fields(" status , ") == ("status",)
+        assert parse_fields("") is None
@@ -0,0 +1,139 @@
+import threading
+import time
+
+from benchmarks.standins import OpenAIEmbeddingsStandIn, PineconeIndexStandIn
+from rag_service import RAGService
+from retrieval import (
+    HashingEmbeddingProvider,
+    LocalVectorIndex,
+    RetrievalCache,
+    load_records,
+    publish_kb_version,
+    read_kb_version,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class VersionedIndex(PineconeIndexStandIn):
+    """Index stand-in that keeps upserted records for fetch()"""
+
+    def __init__(self):
+        super().__init__()
+        self.vectors = {}
+
+    def upsert(self, vectors, **kwargs):
+        for vector in vectors:
+            self.vectors[vector["id"]] = vector
+
+    def fetch(self, ids, **kwargs):
+        return {"vectors": {i: self.vectors[i] for i in ids if i in self.vectors}}
+
+
+class SlowPoliciesIndex(PineconeIndexStandIn):
+    """Index stand-in where policy queries are slow"""
+
+    def query(self, vector, top_k=10, include_metadata=True, filter=None, **kwargs):
+        if filter and filter.get("type", {}).get("$eq") == "policy":
+            time.sleep(0.3)
+        return super().query(vector, top_k, include_metadata, filter, **kwargs)
+
+
+class TestRetrievalCache:
+    """Test suite for the RAG retrieval result cache"""
+
+    def test_shared_part_is_cached_across_customers(self):
+        """Test that only the order lookup is repeated for another customer of the same product"""
+        embeddings = OpenAIEmbeddingsStandIn()
+        index = PineconeIndexStandIn()
+        rag = RAGService(index=index, openai_client=embeddings.client())
+
+        first = rag.query_context("subscription_canceled", "Shrek Premium", "Fiona")
+        second = rag.query_context("Subscription Canceled", " shrek premium", "Donkey")
+
+        assert (embeddings.request_count, index.request_count) == (2, 6)
+        assert second["policies"] == first["policies"]
+        assert len(second["orders"]) == 3
+        assert rag.result_cache.stats()["hits"] == 1
+
+    def test_ttl_and_lru_eviction(self):
+        """Test that entries expire after the TTL and the least recently used is evicted"""
+        clock = FakeClock()
+        cache = RetrievalCache(max_entries=2, ttl=10, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)  # Evicts "b", the least recently used
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+        clock.now = 10
+        assert cache.get("a") is None
+
+    def test_concurrent_misses_are_coalesced(self):
+        """Test that identical concurrent queries retrieve once"""
+        cache = RetrievalCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"policy": []}, True
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"policy": []}] * 5
+        assert cache.stats()["coalesced"] == 4
+
+    def test_upsert_invalidates_local_index(self):
+        """Test that writing to the local index drops cached results"""
+        records = load_records()
+        provider = HashingEmbeddingProvider().fit([r.text for r in records])
+        index = LocalVectorIndex.from_records(records, provider)
+        rag = RAGService(index=index, embedding_provider=provider)
+
+        rag.query_context("chargeback_fee", "Shrek Premium")
+        vector = provider.embed(["Chargeback fee policy: Shrek Premium chargebacks carry no fee."])[0]
+        index.upsert(vectors=[{"id": "policy-8", "values": vector, "metadata": {"type": "policy", "content": "fee"}}])
+        context = rag.query_context("chargeback_fee", "Shrek Premium")
+
+        assert context["policies"][0]["content"] == "fee"
+        assert rag.result_cache.stats()["hits"] == 0
+
+    def test_published_version_invalidates_pinecone_cache(self):
+        """Test the knowledge base version marker written by the ingestion pipeline"""
+        index = VersionedIndex()
+        rag = RAGService(index=index, openai_client=OpenAIEmbeddingsStandIn().client())
+        rag.result_cache.version_check_interval = 0
+
+        rag.query_context("fraudulent", "Swamp Tour")
+        rag.query_context("fraudulent", "Swamp Tour")
+        version = publish_kb_version(index, dimensions=4)
+        rag.query_context("fraudulent", "Swamp Tour")
+
+        assert read_kb_version(index) == version == rag.result_cache.version
+        assert rag.result_cache.stats()["hits"] == 1
+        assert rag.result_cache.stats()["misses"] == 2
+
+    def test_incomplete_results_are_not_cached(self):
+        """Test that types skipped by the latency budget are retried on the next call"""
+        rag = RAGService(
+            index=SlowPoliciesIndex(), openai_client=OpenAIEmbeddingsStandIn().client(), latency_budget=0.1
+        )
+
+        assert rag.query_context("general", "Headphones")["policies"] == []
+        assert rag.result_cache.stats()["entries"] == 0
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from conversation.stage_graph import StageGraph
+from observability import track_timeline
+
+
+class TestStageGraph:
+    """Test suite for the post-call stage DAG executor"""
+
+    def test_independent_stages_run_concurrently(self):
+        """Test that wall time follows the critical path, not the sum of stages"""
+
+        def slow_sync():
+            time.sleep(0.2)
+            return "sync"
+
+        async def slow_async():
+            await asyncio.sleep(0.2)
+            return "async"
+
+        def combine(a, b):
+            return f"{a}+{b}"
+
+        graph = StageGraph().add("a", slow_sync).add("b", slow_async).add("c", combine, depends_on=("a", "b"))
+
+        start = time.perf_counter()
+        with track_timeline() as timeline:
+            outcomes = graph.run()
+        elapsed = time.perf_counter() - start
+
+        assert outcomes["c"].result == "sync+async"
+        assert elapsed < 0.35
+        assert {r.name for r in timeline.snapshot()} == {"pipeline.a", "pipeline.b", "pipeline.c"}
+
+    def test_retry(self):
+        """Test that a failing stage is retried until it succeeds"""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RuntimeError("temporary")
+            return "done"
+
+        outcome = StageGraph().add("flaky", flaky, retries=2, retry_delay=0.01).run()["flaky"]
+
+        assert outcome.ok
+        assert outcome.attempts == 3
+
+    def test_failure_propagation(self):
+        """Test that required failures skip dependents and optional ones pass None"""
+
+        def broken():
+            raise RuntimeError("boom")
+
+        graph = (
+            StageGraph()
+            .add("required", broken)
+            .add("optional", broken, optional=True)
+            .add("after_required", lambda required: "ran", depends_on=("required",))
+            .add("after_optional", lambda optional: optional, depends_on=("optional",))
+        )
+        outcomes = graph.run()
+
+        assert outcomes["required"].status == "failed"
+        assert str(outcomes["required"].error) == "boom"
+        assert outcomes["after_required"].status == "skipped"
+        assert outcomes["after_optional"].ok
+        assert outcomes["after_optional"].result is None
+
+    def test_unknown_dependency(self):
+        """Test that dependencies must be added before their dependents"""
+        with pytest.raises(ValueError, match="unknown stage"):
+            StageGraph().add("evidence", lambda analysis: None, depends_on=("analysis",))
@@ -0,0 +1,85 @@
+import pytest
+
+from config import Settings
+from conversation.start_guard import (
+    CustomerCooldownError,
+    IdempotencyKeyConflictError,
+    StartGuard,
+)
+
+
+class TestStartGuard:
+    """Test suite for idempotent conversation starts"""
+
+    def test_active_charge_returns_existing_conversation(self):
+        """Test that a second start for a running charge is deduplicated until released"""
+        guard = StartGuard()
+        assert guard.reserve("ch_1", "conv_1") == ("conv_1", True)
+        assert guard.reserve("ch_1", "conv_2") == ("conv_1", False)
+
+        guard.release("conv_1")
+        assert guard.reserve("ch_1", "conv_3") == ("conv_3", True)
+
+    def test_idempotency_key(self):
+        """Test that a key keeps returning its conversation and is bound to its charge"""
+        guard = StartGuard()
+        guard.reserve("ch_1", "conv_1", idempotency_key="key-1")
+        guard.release("conv_1")
+
+        assert guard.reserve("ch_1", "conv_2", idempotency_key="key-1") == ("conv_1", False)
+        with pytest.raises(IdempotencyKeyConflictError):
+            guard.reserve("ch_2", "conv_3", idempotency_key="key-1")
+
+    def test_customer_cooldown(self):
+        """Test that a customer cannot be dialed or started again within the cooldown"""
+        guard = StartGuard(cooldown_seconds=60)
+        guard.claim_call("+15550001", charge_id="ch_1")
+
+        with pytest.raises(CustomerCooldownError) as error:
+            guard.claim_call("+15550001", charge_id="ch_2")
+        assert 0 < error.value.retry_after <= 60
+
+        # A start for the same charge (customer looked up from the last call) is refused
+        with pytest.raises(CustomerCooldownError):
+            guard.reserve("ch_1", "conv_1", before_create=lambda: guard.check_cooldown("ch_1"))
+        assert guard.reserve("ch_9", "conv_2") == ("conv_2", True)
+
+    def test_cooldown_is_opt_in(self, monkeypatch):
+        """Test that the cooldown is off unless CUSTOMER_CALL_COOLDOWN_SECONDS is set"""
+        monkeypatch.delenv("CUSTOMER_CALL_COOLDOWN_SECONDS", raising=False)
+        assert Settings.from_env().customer_cooldown_seconds == 0
+
+        guard = StartGuard()
+        guard.claim_call("+15550001", charge_id="ch_1")
+        guard.claim_call("+15550001", charge_id="ch_2")
+
+        monkeypatch.setenv("CUSTOMER_CALL_COOLDOWN_SECONDS", "600")
+        assert Settings.from_env().customer_cooldown_seconds == 600
+
+    async def test_double_start_over_http(self, offline_env):
+        """Test that two /start requests for one charge make a single call"""
+        import httpx
+
+        from conversation.controller import get_conversation_service
+        from main import app
+
+        service = offline_env.service
+        service.start_guard.cooldown_seconds = 3600
+        app.dependency_overrides[get_conversation_service] = lambda: service
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                body = {"charge_id": offline_env.charge_ids[0]}
+                headers = {"Idempotency-Key": "double-click"}
+                first = await client.post("/api/conversation/start", json=body, headers=headers)
+                second = await client.post("/api/conversation/start", json=body, headers=headers)
+                third = await client.post("/api/conversation/start", json=body)
+        finally:
+            app.dependency_overrides.clear()
+
+        assert first.status_code == 202 and not first.json()["deduplicated"]
+        assert second.json() == {**first.json(), "deduplicated": True}
+        # The first call finished; the customer is now cooling down
+        assert third.status_code == 429
+        assert int(third.headers["Retry-After"]) > 0
+        assert sum(offline_env.simulator.stats().values()) == 1
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from elevenlabs_wrapper import TranscriptBus, TranscriptManager
+from elevenlabs_wrapper.transcript_bus import TranscriptBuffer
+
+
+class TestTranscriptBuffer:
+    """Test suite for the append-only transcript buffer"""
+
+    def test_snapshots_are_immutable(self):
+        """Test that later appends and corrections do not change a snapshot"""
+        buffer = TranscriptBuffer()
+        buffer.append("agent", "Hello.", 0.0)
+        buffer.append("user", "Hi.", 1.5)
+        before = buffer.snapshot()
+
+        buffer.append("agent", "How can I help?", 2.0)
+        buffer.correct_agent_message("Hello.", "Hello there.")
+
+        assert list(before) == [("agent", "Hello.", 0.0), ("user", "Hi.", 1.5)]
+        after = buffer.snapshot()
+        assert len(after) == 3
+        assert after[0] == ("agent", "Hello there.", 0.0)
+        assert after.to_entries()[-1].text == "How can I help?"
+
+    def test_correction_targets_latest_matching_agent_message(self):
+        """Test that corrections are indexed by text and apply to the latest match"""
+        buffer = TranscriptBuffer()
+        buffer.append("agent", "Okay.", 0.0)
+        buffer.append("user", "Okay.", 1.0)
+        buffer.append("agent", "Okay.", 2.0)
+
+        assert buffer.correct_agent_message("Okay.", "Okay, noted.") == 2
+        assert buffer.correct_agent_message("Okay.", "Alright.") == 0
+        with pytest.raises(ValueError):
+            buffer.correct_agent_message("Okay.", "again")
+        assert [text for _, text, _ in buffer.snapshot()] == ["Alright.", "Okay.", "Okay, noted."]
+
+
+class TestTranscriptBus:
+    """Test suite for transcript event delivery"""
+
+    def test_callbacks_share_events_per_session(self):
+        """Test that subscribers get the same event objects, filtered by session"""
+        bus = TranscriptBus()
+        everything, only_a = [], []
+        bus.subscribe(everything.append)
+        unsubscribe = bus.subscribe(only_a.append, session_id="a")
+
+        session_a = TranscriptManager(bus=bus, session_id="a")
+        session_b = TranscriptManager(bus=bus, session_id="b")
+        session_a.add_agent_message("Hello.")
+        session_b.add_user_message("Hi.")
+        session_a.correct_last_agent_message("Hello.", "Hello there.")
+        unsubscribe()
+        session_a.close()
+
+        assert [(e.session_id, e.kind) for e in everything] == [
+            ("a", "message"),
+            ("b", "message"),
+            ("a", "correction"),
+            ("a", "end"),
+        ]
+        assert only_a == [everything[0], everything[2]]
+        assert only_a[0] is everything[0]
+        assert everything[2].text == "Hello there." and everything[2].index == 0
+
+    async def test_async_subscription_across_threads(self):
+        """Test that concurrent sessions in threads reach an async subscriber"""
+        bus = TranscriptBus()
+        sessions = [TranscriptManager(bus=bus, session_id=f"s{i}") for i in range(4)]
+
+        async def collect(subscription):
+            async with subscription as events:
+                return [event async for event in events]
+
+        collectors = [
+            asyncio.create_task(collect(bus.subscribe_async(s.session_id))) for s in sessions
+        ]
+
+        def talk(session):
+            for turn in range(20):
+                session.add_agent_message(f"{session.session_id} agent {turn}")
+                session.add_user_message(f"{session.session_id} user {turn}")
+            session.close()
+
+        threads = [threading.Thread(target=talk, args=(s,)) for s in sessions]
+        for thread in threads:
+            thread.start()
+        results = await asyncio.wait_for(asyncio.gather(*collectors), timeout=5)
+        for thread in threads:
+            thread.join()
+
+        for session, events in zip(sessions, results):
+            assert [e.index for e in events if e.kind == "message"] == list(range(40))
+            assert events[-1].kind == "end"
+            assert len(session.snapshot()) == 40
@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+from config import get_settings
+from observability import UsageLedger, UsageRecord, estimate_cost_usd, get_ledger, set_ledger, span, track_timeline
+
+
+@pytest.fixture
+def ledger():
+    """Fixture installing a fresh process-wide usage ledger"""
+    fresh = UsageLedger()
+    previous = set_ledger(fresh)
+    yield fresh
+    set_ledger(previous)
+
+
+def claude_response(input_tokens: int, output_tokens: int, cache_read: int = 0):
+    """Minimal object shaped like an Anthropic Message"""
+    return SimpleNamespace(
+        model="claude-sonnet-4-20250514",
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_read_input_tokens=cache_read,
+            cache_creation_input_tokens=0,
+        ),
+    )
+
+
+class TestUsageLedger:
+    """Test suite for token and cost accounting"""
+
+    def test_estimate_cost(self):
+        """Test that dated model IDs resolve to their family's prices"""
+        assert estimate_cost_usd("claude-sonnet-4-20250514", 1_000_000, 0) == pytest.approx(3.0)
+        assert estimate_cost_usd("claude-sonnet-4-20250514", 0, 1000, 1000) == pytest.approx(0.0153)
+        assert estimate_cost_usd("some-unknown-model", 1000, 1000) is None
+
+    def test_span_records_usage(self, ledger):
+        """Test that usage attached to a span is attributed to the active conversation"""
+        with track_timeline("conv_1"):
+            with span("claude.evaluation") as active:
+                active.record_usage(claude_response(1000, 200, cache_read=500))
+
+        [record] = ledger.records()
+        assert record.conversation_id == "conv_1"
+        assert record.stage == "claude.evaluation"
+        assert record.provider == "anthropic"
+        assert (record.input_tokens, record.output_tokens, record.cache_read_tokens) == (1000, 200, 500)
+        assert record.cost_usd > 0
+
+    def test_rollup(self, ledger):
+        """Test grouping, ordering and validation of rollups"""
+        ledger.record(UsageRecord.from_response("claude.summary", claude_response(100, 10), 0.1, "conv_1"))
+        ledger.record(UsageRecord.from_response("claude.summary", claude_response(300, 30), 0.3, "conv_2"))
+        ledger.record(UsageRecord.from_response("claude.arguments", claude_response(5000, 900), 1.0, "conv_1"))
+        ledger.record(UsageRecord(stage="elevenlabs.call", provider="elevenlabs", conversation_id="conv_1", call_credits=200))
+
+        rows = ledger.rollup(group_by=["stage"])
+        assert [row["stage"] for row in rows][:2] == ["claude.arguments", "claude.summary"]
+        summary = next(row for row in rows if row["stage"] == "claude.summary")
+        assert summary["calls"] == 2
+        assert summary["input_tokens"] == 400
+
+        by_conversation = {row["conversation_id"]: row for row in ledger.rollup(group_by=["conversation_id"])}
+        assert by_conversation["conv_1"]["call_credits"] == 200
+
+        with pytest.raises(ValueError, match="Unsupported group_by"):
+            ledger.rollup(group_by=["customer"])
+
+    def test_persistence(self, tmp_path):
+        """Test that a ledger with a path reloads its records"""
+        path = str(tmp_path / "usage.jsonl")
+        UsageLedger(path).record(UsageRecord.from_response("claude.summary", claude_response(10, 1), 0.01))
+
+        assert UsageLedger(path).records()[0].input_tokens == 10
+
+    def test_bounded_window_and_rotation(self, tmp_path):
+        """Test that only the last max_records are kept and the file is rotated at that size"""
+        path = str(tmp_path / "usage.jsonl")
+        ledger = UsageLedger(path, max_records=3)
+        for i in range(5):
+            ledger.record(UsageRecord(stage="claude.summary", provider="anthropic", conversation_id=f"conv_{i % 2}", input_tokens=i))
+
+        assert [r.input_tokens for r in ledger.records()] == [2, 3, 4]
+        assert [r.input_tokens for r in ledger.records(conversation_id="conv_0")] == [2, 4]
+        assert ledger.conversation_usage("conv_1")["totals"]["input_tokens"] == 3
+        assert (tmp_path / "usage.jsonl.1").exists()
+
+        reloaded = UsageLedger(path, max_records=3)
+        assert [r.input_tokens for r in reloaded.records()] == [2, 3, 4]
+
+    def test_default_ledger_reads_settings_on_first_use(self, tmp_path, monkeypatch):
+        """Test that the process-wide ledger takes its path from the settings when first used"""
+        path = str(tmp_path / "usage.jsonl")
+        UsageLedger(path).record(UsageRecord.from_response("claude.summary", claude_response(10, 1), 0.01))
+        monkeypatch.setenv("USAGE_LEDGER_PATH", path)
+        get_settings.cache_clear()
+        previous = set_ledger(None)
+        try:
+            assert get_ledger().path == path
+            assert get_ledger().records()[0].input_tokens == 10
+        finally:
+            set_ledger(previous)
+            get_settings.cache_clear()
+
+    def test_conversation_usage(self, ledger, openai_offline_env):
+        """Test that an offline conversation carries Claude, embedding and call usage"""
+        service = openai_offline_env.service
+        service.outcome_classifier = None  # Always take the Claude path
+        conversation_id = service.create_conversation(openai_offline_env.charge_ids[0])
+        service.run_conversation(conversation_id, update_stripe=True)
+
+        usage = service.get_conversation_result(conversation_id).usage
+        assert {"claude.arguments", "claude.post_call_analysis", "claude.evidence_text", "openai.embeddings", "elevenlabs.call"} <= set(usage.by_stage)
+        assert usage.totals.input_tokens > 0
+        assert usage.totals.cost_usd > 0
+        assert usage.by_stage["elevenlabs.call"].calls == 1
+        assert service.usage_rollup(group_by=["provider"])
@@ -1,133 +1,76 @@
-import json
+"""
+Sync backend/data to the Pinecone index.
+
+Only records that are new or changed since the last sync (per the manifest,
+see retrieval/sync.py) are embedded and upserted; records removed from the
+data files are deleted from the index.
+
+    python upload_to_pinecone.py --dry-run     # show the diff, change nothing
+    python upload_to_pinecone.py               # apply it
+    python upload_to_pinecone.py --full        # re-embed and upsert everything
+"""
+
+import argparse
 import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
+
 from pinecone import Pinecone
-from openai import OpenAI
 
-# Load environment variables
-load_dotenv()
+from config import load_config
+from retrieval import (
+    apply_sync,
+    build_embedding_provider,
+    load_manifest,
+    load_records,
+    plan_sync,
+    publish_kb_version,
+)
+from retrieval.sync import DEFAULT_MANIFEST
 
-# Initialize clients
-pinecone_client = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+BATCH_SIZE = 64
 
-index = pinecone_client.Index("chargeback-rag")
 
-def get_embedding(text):
-    """Generate embedding using OpenAI"""
-    response = openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text
-    )
-    return response.data[0].embedding
+def main():
+    parser = argparse.ArgumentParser(description="Sync the knowledge base to Pinecone")
+    parser.add_argument("--dry-run", action="store_true", help="Print the diff without embedding or upserting")
+    parser.add_argument("--full", action="store_true", help="Re-embed and upsert every record")
+    parser.add_argument("--manifest", type=Path, default=Path(os.getenv("KB_MANIFEST_PATH", DEFAULT_MANIFEST)))
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
 
-def upload_orders():
-    """Upload orders to Pinecone"""
-    with open('data/orders.json', 'r') as f:
-        orders = json.load(f)
-    vectors = []
-    for order in orders:
-        # Embed the description (natural language)
-        embedding = get_embedding(order['description'])
-        # Prepare vector
-        vectors.append({
-            "id": order['id'],
-            "values": embedding,
-            "metadata": {
-                "type": "order",
-                "charge_id": order['charge_id'],
-                "customer": order['customer'],
-                "product": order['product'],
-                "amount": order['amount'],
-                "date": order['date'],
-                "status": order['status']
-            }
-        })
-    # Upload in batch
-    index.upsert(vectors=vectors)
-    print(f"✅ Uploaded {len(vectors)} orders")
+    load_config()
+    # The index must be queried with the provider it was built with; RAGService
+    # serves local providers from its in-process index, so Pinecone holds OpenAI vectors
+    provider = build_embedding_provider(os.getenv("EMBEDDING_PROVIDER", "openai"))
+    if provider.local:
+        sys.exit("❌ Local embedding providers do not use Pinecone; set EMBEDDING_PROVIDER=openai")
 
-def upload_policies():
-    """Upload policies to Pinecone"""
-    with open('data/policies.json', 'r') as f:
-        policies = json.load(f)
-    vectors = []
-    for policy in policies:
-        embedding = get_embedding(policy['content'])
-        vectors.append({
-            "id": policy['id'],
-            "values": embedding,
-            "metadata": {
-                "type": "policy",
-                "policy_type": policy['type'],
-                "content": policy['content']
-            }
-        })
-    index.upsert(vectors=vectors)
-    print(f"✅ Uploaded {len(vectors)} policies")
+    records = load_records()
+    manifest = load_manifest(args.manifest)
+    plan = plan_sync(records, manifest, provider.model, full=args.full)
+    summary = plan.summary()
+    print(
+        f"🔍 {summary['added']} new, {summary['changed']} changed, "
+        f"{summary['removed']} removed, {summary['unchanged']} unchanged ({provider.model})"
+    )
 
-def upload_dispute_scripts():
-    """Upload dispute scripts to Pinecone"""
-    with open('data/dispute_scripts.json', 'r') as f:
-        scripts = json.load(f)
-    vectors = []
-    for script in scripts:
-        embedding = get_embedding(script['content'])
-        vectors.append({
-            "id": script['id'],
-            "values": embedding,
-            "metadata": {
-                "type": "dispute_script",
-                "dispute_reason": script['dispute_reason'],
-                "content": script['content']
-            }
-        })
-    index.upsert(vectors=vectors)
-    print(f"✅ Uploaded {len(vectors)} dispute scripts")
+    if args.dry_run:
+        for line in plan.diff_lines():
+            print(f"   {line}")
+        return
+    if plan.is_empty:
+        print("✨ Knowledge base is up to date")
+        return
 
-def upload_resolution_authority():
-    """Upload resolution authority to Pinecone"""
-    with open('data/resolution_authority.json', 'r') as f:
-        authorities = json.load(f)
-    vectors = []
-    for authority in authorities:
-        embedding = get_embedding(authority['content'])
-        vectors.append({
-            "id": authority['id'],
-            "values": embedding,
-            "metadata": {
-                "type": "resolution_authority",
-                "authority_type": authority['type'],
-                "content": authority['content']
-            }
-        })
-    index.upsert(vectors=vectors)
-    print(f"✅ Uploaded {len(vectors)} resolution authorities")
+    index = Pinecone(api_key=os.getenv("PINECONE_API_KEY")).Index("chargeback-rag")
+    print("🚀 Syncing to Pinecone...")
+    apply_sync(plan, records, provider, index, manifest, args.manifest, args.batch_size)
+    # Drop the RAG result caches of running services (checked every few seconds)
+    version = publish_kb_version(index, provider.dimensions)
+    print(f"✅ Upserted {summary['added'] + summary['changed']}, deleted {summary['removed']}")
+    print(f"✨ Knowledge base synced (version {version}); manifest: {args.manifest}")
 
-def upload_common_confusions():
-    """Upload common confusions to Pinecone"""
-    with open('data/common_confusions.json', 'r') as f:
-        confusions = json.load(f)
-    vectors = []
-    for confusion in confusions:
-        embedding = get_embedding(confusion['content'])
-        vectors.append({
-            "id": confusion['id'],
-            "values": embedding,
-            "metadata": {
-                "type": "common_confusion",
-                "confusion_type": confusion['type'],
-                "content": confusion['content']
-            }
-        })
-    index.upsert(vectors=vectors)
-    print(f"✅ Uploaded {len(vectors)} common confusions")
 
 if __name__ == "__main__":
-    print("🚀 Starting upload to Pinecone...")
-    upload_orders()
-    upload_policies()
-    upload_dispute_scripts()
-    upload_resolution_authority()
-    upload_common_confusions()
-    print("✨ All data uploaded successfully!")
\ No newline at end of file
+    main()
@@ -330,6 +330,27 @@ const Disputes: React.FC<DisputesProps> = ({ disputes }) => {
                     {conversationResult.status === ConversationStatus.FAILED && 'Failed'}
                   </div>
 
+                  {/* Live Outcome - running estimate while the call is in progress */}
+                  {conversationResult.status === ConversationStatus.IN_PROGRESS && conversationResult.live_outcome && (
+                    <div className="bg-amber-50 border border-amber-200 rounded-xl p-4 space-y-2">
+                      <div className="flex items-center justify-between">
+                        <span className="text-sm font-bold text-slate-700">Likely Outcome:</span>
+                        <span className="text-sm font-bold text-amber-700 uppercase">
+                          {conversationResult.live_outcome.resolution_type}
+                        </span>
+                      </div>
+                      <div className="flex items-center justify-between text-xs font-medium text-slate-500">
+                        <span>{conversationResult.live_outcome.source === 'llm' ? 'AI checkpoint' : 'Keyword match'}</span>
+                        <span>{(conversationResult.live_outcome.confidence * 100).toFixed(0)}% confidence</span>
+                      </div>
+                      {conversationResult.live_outcome.customer_decision && (
+                        <p className="text-xs italic text-slate-600">
+                          "{conversationResult.live_outcome.customer_decision}"
+                        </p>
+                      )}
+                    </div>
+                  )}
+
                   {/* Evidence Result - MOVED TO TOP */}
                   {conversationResult.evidence_result && (
                     <div className="bg-gradient-to-br from-purple-50 to-pink-50 border-2 border-purple-200 rounded-2xl p-5 shadow-lg">
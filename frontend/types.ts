@@ -68,6 +68,15 @@ export interface EvidenceResult {
   submitted_to_stripe: boolean;
 }
 
+export interface LiveOutcome {
+  resolution_type: string;
+  resolved: boolean;
+  confidence: number;
+  customer_decision?: string;
+  source: 'rules' | 'llm';
+  turns: number;
+}
+
 export interface ConversationResult {
   conversation_id: string;
   status: ConversationStatus;
@@ -76,9 +85,13 @@ export interface ConversationResult {
   summary?: string;
   evidence_result?: EvidenceResult;
   error?: string;
+  termination_reason?: string;
+  live_outcome?: LiveOutcome;
+  version?: number;
 }
 
 export interface ConversationStartResponse {
   conversation_id: string;
-  status: 'started';
+  status: 'started' | 'queued';
+  deduplicated: boolean;
 }
\ No newline at end of file